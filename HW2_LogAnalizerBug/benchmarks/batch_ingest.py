@@ -0,0 +1,120 @@
+"""Compara la ingesta JSON (POST /logs) con la binaria (POST /logs/batch).
+
+Envía `--total` logs (mensajes de `data/logs.txt`) en lotes de 1k, 10k y
+100k logs, codificados como JSON, MessagePack y Arrow IPC, y mide:
+- bytes: tamaño del cuerpo de cada lote
+- decode: del cuerpo a LogEntry con `seq`, sin red ni cache. Para JSON es lo
+  que hace FastAPI (`json.loads` + validación de LogList + `seq` por log);
+  para los binarios, `LogBatchCodec.decode` + `LogBatch.entries`
+- request: la petición completa contra la API (TestClient), que además
+  agrega los logs al TemporalCache
+
+La salida estándar de la API se descarta durante las mediciones.
+
+Uso:
+    python -m benchmarks.batch_ingest [--total 100000]
+"""
+import argparse
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from json import dumps, loads
+from os import devnull
+from os.path import join
+from sqlite3 import connect
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from fastapi.testclient import TestClient
+
+from benchmarks.spark_logs import SparkLogReader
+from src.application.api import API
+from src.model.log_entry import LogEntry
+from src.model.log_list import LogList
+from src.services.log_batch_codec import LogBatchCodec
+from src.services.log_pruner import LogPruner
+from src.services.sqlite_conn import SQliteConn
+from src.services.temporal_cache import TemporalCache
+
+START: datetime = datetime(2025, 4, 16, 11, 0, 0)
+BATCH_SIZES: tuple[int, ...] = (1_000, 10_000, 100_000)
+MEDIA_TYPES: dict[str, str] = {"json": "application/json", **LogBatchCodec.MEDIA_TYPES}
+
+
+def generate(total: int) -> list[LogEntry]:
+    """`total` logs con timestamps crecientes, repitiendo los mensajes de data/logs.txt."""
+    samples: list[LogEntry] = SparkLogReader().read()
+    step: timedelta = timedelta(milliseconds=1)
+    return [
+        LogEntry(
+            timestamp=START + step * index,
+            tag=samples[index % len(samples)].tag,
+            message=samples[index % len(samples)].message,
+        )
+        for index in range(total)
+    ]
+
+
+def encode(codec: LogBatchCodec, logs: list[LogEntry], file_format: str) -> bytes:
+    if file_format == "json":
+        return dumps({"logs": [log.model_dump(mode="json", exclude={"seq"}) for log in logs]}).encode("utf-8")
+    return codec.encode(logs, file_format)
+
+
+def decode(codec: LogBatchCodec, body: bytes, file_format: str) -> list[LogEntry]:
+    if file_format == "json":
+        logs: list[LogEntry] = LogList.model_validate(loads(body)).logs
+        return [log.model_copy(update={"seq": seq}) for seq, log in enumerate(logs, 1)]
+    return codec.decode(body, MEDIA_TYPES[file_format]).entries(1)
+
+
+def post_all(db_path: str, bodies: list[bytes], file_format: str) -> float:
+    """Envía los lotes a una API nueva (con su propia base) y devuelve los segundos que tardó."""
+    connect(db_path).close()
+    cache: TemporalCache = TemporalCache(LogPruner(window_minutes=24 * 60))
+    client: TestClient = TestClient(API(cache, SQliteConn(db_path)).app)
+    path: str = "/logs" if file_format == "json" else "/logs/batch"
+
+    start: float = perf_counter()
+    for body in bodies:
+        response = client.post(path, content=body, headers={"Content-Type": MEDIA_TYPES[file_format]})
+        assert response.status_code == 201, response.text
+    return perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--total", type=int, default=100_000, help="Logs enviados por formato y tamaño de lote")
+    args = parser.parse_args()
+
+    codec: LogBatchCodec = LogBatchCodec()
+    formats: list[str] = ["json"] + [name for name in LogBatchCodec.MEDIA_TYPES if codec.available(name)]
+    logs: list[LogEntry] = generate(args.total)
+
+    with TemporaryDirectory() as directory, open(devnull, "w") as sink:
+        for batch_size in BATCH_SIZES:
+            batches: list[list[LogEntry]] = [
+                logs[offset:offset + batch_size] for offset in range(0, len(logs), batch_size)
+            ]
+            print(f"{args.total:,} logs in batches of {batch_size:,}")
+            for file_format in formats:
+                bodies: list[bytes] = [encode(codec, batch, file_format) for batch in batches]
+                decoded: list[LogEntry] = decode(codec, bodies[0], file_format)
+                assert [(log.timestamp, log.tag, log.message) for log in decoded] == \
+                    [(log.timestamp, log.tag, log.message) for log in batches[0]], "Round trip must keep every log"
+
+                decode_start: float = perf_counter()
+                for body in bodies:
+                    decode(codec, body, file_format)
+                decode_time: float = perf_counter() - decode_start
+                with redirect_stdout(sink):
+                    request_time: float = post_all(join(directory, f"{file_format}-{batch_size}.db"), bodies, file_format)
+
+                print(
+                    f"{file_format:>8}: {len(bodies[0]) / batch_size:6.1f} bytes/log | "
+                    f"decode {args.total / decode_time:>10,.0f} logs/s | "
+                    f"request {args.total / request_time:>10,.0f} logs/s"
+                )
+
+
+if __name__ == "__main__":
+    main()
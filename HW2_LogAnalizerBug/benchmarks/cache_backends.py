@@ -0,0 +1,101 @@
+"""Compara los backends del TemporalCache con ingesta sostenida.
+
+Simula un flujo de `--rate` logs por segundo (tiempo de evento) con un poco
+de desorden y los ingiere en TemporalCache como lo hace la cola de ingesta:
+`add_log` por cada log y una limpieza cada `--batch` logs. Reporta el
+throughput alcanzado, la latencia de la limpieza y de una consulta de 1 s.
+
+Uso:
+    python -m benchmarks.cache_backends [--rate 100000] [--seconds 30] [--window-seconds 10]
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+from statistics import quantiles
+from time import perf_counter
+
+from src.model.log_entry import LogEntry
+from src.services.log_pruner import LogPruner
+from src.services.ring_buffer_log_store import RingBufferLogStore
+from src.services.sorted_log_store import SortedLogStore
+from src.services.temporal_cache import TemporalCache
+
+START: datetime = datetime(2025, 4, 16, 11, 0, 0)
+TAGS: tuple[str, ...] = ("INFO", "INFO", "INFO", "WARN", "ERROR")
+
+
+def generate_second(second: int, rate: int, jitter_ms: int, first_seq: int) -> list[LogEntry]:
+    """Logs de un segundo de tiempo de evento, con hasta `jitter_ms` de desorden."""
+    step: timedelta = timedelta(seconds=1) / rate
+    base: datetime = START + timedelta(seconds=second)
+    return [
+        LogEntry.model_construct(
+            timestamp=base + step * index - timedelta(milliseconds=random.randint(0, jitter_ms)),
+            tag=TAGS[index % len(TAGS)],
+            message="Finished task",
+            seq=first_seq + index,
+        )
+        for index in range(rate)
+    ]
+
+
+def run(cache: TemporalCache, args: argparse.Namespace) -> dict[str, float]:
+    """Ingiere `--seconds` segundos de logs y mide tiempos (sin contar la generación)."""
+    random.seed(7)
+    ingest_time: float = 0.0
+    prune_latencies: list[float] = list()
+    for second in range(args.seconds):
+        logs: list[LogEntry] = generate_second(second, args.rate, args.jitter_ms, second * args.rate)
+        start: float = perf_counter()
+        for offset in range(0, len(logs), args.batch):
+            for log in logs[offset:offset + args.batch]:
+                cache.add_log(log)
+            prune_start: float = perf_counter()
+            cache.prune_cache()
+            prune_latencies.append(perf_counter() - prune_start)
+        ingest_time += perf_counter() - start
+
+    query_end: datetime = START + timedelta(seconds=args.seconds - args.window_seconds / 2)
+    query_start: float = perf_counter()
+    queried: int = len(cache.get_logs(query_end - timedelta(seconds=1), query_end))
+    query_time: float = perf_counter() - query_start
+
+    return {
+        "throughput": args.seconds * args.rate / ingest_time,
+        "prune_p50": quantiles(prune_latencies, n=100)[49],
+        "prune_p99": quantiles(prune_latencies, n=100)[98],
+        "query": query_time,
+        "queried": queried,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=int, default=100_000, help="Logs por segundo de tiempo de evento")
+    parser.add_argument("--seconds", type=int, default=30, help="Segundos de tiempo de evento simulados")
+    parser.add_argument("--window-seconds", type=int, default=10, help="Ventana del cache en segundos")
+    parser.add_argument("--jitter-ms", type=int, default=200, help="Desorden máximo de los timestamps")
+    parser.add_argument("--batch", type=int, default=500, help="Logs entre limpiezas")
+    parser.add_argument("--slot-ms", type=int, default=1000, help="Ancho de intervalo del buffer circular")
+    args = parser.parse_args()
+
+    print(
+        f"Steady state: {args.rate:,} logs/s for {args.seconds} s, "
+        f"window {args.window_seconds} s, prune every {args.batch} logs"
+    )
+    backends: dict[str, callable] = {
+        "sorted": SortedLogStore,
+        "ring": lambda: RingBufferLogStore(span_seconds=args.window_seconds + 2, slot_ms=args.slot_ms),
+    }
+    for label, store_factory in backends.items():
+        pruner: LogPruner = LogPruner(window_minutes=args.window_seconds / 60)
+        result: dict[str, float] = run(TemporalCache(pruner, store=store_factory()), args)
+        print(
+            f"{label:>7}: ingest {result['throughput']:>10,.0f} logs/s | "
+            f"prune p50 {result['prune_p50'] * 1e3:6.3f} ms p99 {result['prune_p99'] * 1e3:6.3f} ms | "
+            f"1 s query {result['query'] * 1e3:7.2f} ms ({result['queried']:,} logs)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Mide el throughput de ingesta del CacheServer con N workers (modo `--workers N`).
+
+Levanta un CacheServer en su propio proceso (base SQLite temporal, sin
+journal) y N procesos que, como los workers de uvicorn, envían `--total`
+logs entre todos con `RemoteTemporalCache.add_logs` en lotes de `--batch`
+logs. Todos arrancan a la vez y se reporta, para cada cantidad de workers:
+- throughput: logs por segundo entre todos los workers
+- p50 / p99: tiempo de ida y vuelta de cada lote (codificar, enviar y
+  recibir la secuencia asignada)
+
+Uso:
+    python -m benchmarks.cache_server [--total 200000] [--batch 500] [--workers 1 2 4 8]
+"""
+import argparse
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from multiprocessing import Barrier, Process, Queue
+from os import devnull
+from os.path import exists, join
+from sqlite3 import connect
+from statistics import quantiles
+from tempfile import TemporaryDirectory
+from time import perf_counter, sleep
+
+from src.model.log_entry import LogEntry
+from src.services.cache_server import CacheServer
+from src.services.log_pruner import LogPruner
+from src.services.partitioned_temporal_cache import PartitionedTemporalCache
+from src.services.remote_temporal_cache import RemoteTemporalCache
+from src.services.sqlite_conn import SQliteConn
+from src.services.temporal_cache import TemporalCache
+
+TAGS: tuple[str, ...] = ("INFO", "INFO", "INFO", "WARN", "ERROR")
+SOURCES: tuple[str, ...] = ("spark-etl", "spark-ml", "api")
+
+
+def serve(socket_path: str, db_path: str) -> None:
+    """Proceso del CacheServer, con las mismas particiones por fuente que main.py."""
+    cache: PartitionedTemporalCache = PartitionedTemporalCache(lambda source: TemporalCache(LogPruner(
+        window_minutes=5, allowed_lateness_seconds=30, max_future_seconds=60, future_policy="quarantine"
+    )))
+    with open(devnull, "w") as sink, redirect_stdout(sink):
+        CacheServer(socket_path, cache, SQliteConn(db_path)).run()
+
+
+def generate(worker: int, count: int, start: datetime) -> list[LogEntry]:
+    """Logs de un worker, con timestamps crecientes y sin solaparse con los de otros workers."""
+    step: timedelta = timedelta(microseconds=1)
+    return [
+        LogEntry.model_construct(
+            timestamp=start + step * (worker * count + index),
+            tag=TAGS[index % len(TAGS)],
+            message=f"executor.Executor: Finished task {index} in stage {worker}",
+            seq=None,
+            source=SOURCES[index % len(SOURCES)],
+        )
+        for index in range(count)
+    ]
+
+
+def ingest(socket_path: str, worker: int, count: int, batch: int, start: datetime, barrier, results: Queue) -> None:
+    """Proceso worker: espera a los demás y envía sus logs de a `batch`."""
+    logs: list[LogEntry] = generate(worker, count, start)
+    cache: RemoteTemporalCache = RemoteTemporalCache(socket_path)
+    cache.add_logs(logs[:1])  # Abre la conexión antes de medir
+    latencies: list[float] = list()
+    barrier.wait()
+    for offset in range(1, count, batch):
+        batch_start: float = perf_counter()
+        cache.add_logs(logs[offset:offset + batch])
+        latencies.append(perf_counter() - batch_start)
+    cache.close()
+    results.put(latencies)
+
+
+def run(directory: str, workers: int, args: argparse.Namespace) -> dict[str, float]:
+    """Mide una ronda con `workers` procesos contra un CacheServer nuevo."""
+    socket_path: str = join(directory, f"cache-{workers}.sock")
+    db_path: str = join(directory, f"logs-{workers}.db")
+    connect(db_path).close()
+    server: Process = Process(target=serve, args=(socket_path, db_path), daemon=True)
+    server.start()
+    while not exists(socket_path):
+        sleep(0.01)
+
+    count: int = args.total // workers
+    start: datetime = datetime.now() - timedelta(minutes=1)
+    barrier = Barrier(workers + 1)
+    results: Queue = Queue()
+    processes: list[Process] = [
+        Process(target=ingest, args=(socket_path, worker, count, args.batch, start, barrier, results))
+        for worker in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    elapsed_start: float = perf_counter()
+    latencies: list[float] = [latency for _ in processes for latency in results.get()]
+    elapsed: float = perf_counter() - elapsed_start
+    for process in processes:
+        process.join()
+    server.terminate()
+    server.join()
+
+    percentiles: list[float] = quantiles(latencies, n=100)
+    return {
+        "throughput": workers * (count - 1) / elapsed,
+        "p50": percentiles[49],
+        "p99": percentiles[98],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--total", type=int, default=200_000, help="Logs enviados entre todos los workers")
+    parser.add_argument("--batch", type=int, default=500, help="Logs por llamada a add_logs")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Cantidades de workers a medir")
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as directory:
+        print(f"{args.total:,} logs in batches of {args.batch:,}")
+        for workers in args.workers:
+            result: dict[str, float] = run(directory, workers, args)
+            print(
+                f"{workers:>3} workers: {result['throughput']:>10,.0f} logs/s | "
+                f"batch p50 {result['p50'] * 1000:6.2f} ms | p99 {result['p99'] * 1000:6.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Compara la respuesta de un rango de SQLite con LogEntry y con filas planas.
+
+Crea una base temporal con `--rows` logs (mensajes de `data/logs.txt`
+codificados con el TemplateMiner, como los guarda la API) y mide, para un
+rango que los cubre a todos:
+- models: `SQliteConn.get_logs` (un LogEntry por fila, con
+  `datetime.fromisoformat`) + `jsonable_encoder(model_dump())` + JSONResponse,
+  el camino que usaba GET /logs
+- rows: `SQliteConn.get_rows_in_ranges` + `log_rows_json`, el camino actual
+
+Ambos caminos producen el mismo JSON; se verifica antes de reportar.
+
+Uso:
+    python -m benchmarks.row_decoding [--rows 1000000]
+"""
+import argparse
+from datetime import datetime, timedelta
+from os.path import join
+from sqlite3 import connect
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from benchmarks.spark_logs import SparkLogReader
+from src.model.log_entry import LogEntry
+from src.model.log_row import LogRow, log_rows_json
+from src.services.sqlite_conn import SQliteConn
+from src.services.template_miner import TemplateMiner
+
+START: datetime = datetime(2025, 4, 16, 11, 0, 0)
+
+
+def fill(sqlite: SQliteConn, template_miner: TemplateMiner, rows: int, batch_size: int = 100_000) -> None:
+    """Guarda `rows` logs con timestamps crecientes, repitiendo los mensajes de data/logs.txt."""
+    samples: list[LogEntry] = SparkLogReader().read()
+    step: timedelta = timedelta(milliseconds=7)
+    for offset in range(0, rows, batch_size):
+        sqlite.save_logs([
+            template_miner.encode(LogEntry.model_construct(
+                timestamp=START + step * index,
+                tag=samples[index % len(samples)].tag,
+                message=samples[index % len(samples)].message,
+                seq=index + 1,
+            ))
+            for index in range(offset, min(offset + batch_size, rows))
+        ])
+
+
+def with_models(sqlite: SQliteConn, start_time: datetime, end_time: datetime) -> tuple[bytes, float, float]:
+    fetch_start: float = perf_counter()
+    logs: list[LogEntry] = sqlite.get_logs.__wrapped__(sqlite, start_time, end_time)
+    fetched: float = perf_counter()
+    body: bytes = JSONResponse(content={"logs": [jsonable_encoder(log.model_dump()) for log in logs]}).body
+    return body, fetched - fetch_start, perf_counter() - fetched
+
+
+def with_rows(sqlite: SQliteConn, start_time: datetime, end_time: datetime) -> tuple[bytes, float, float]:
+    fetch_start: float = perf_counter()
+    rows: list[LogRow] = sqlite.get_rows_in_ranges([(start_time, end_time)])[0]
+    fetched: float = perf_counter()
+    body: bytes = ('{"logs":' + log_rows_json(rows) + "}").encode("utf-8")
+    return body, fetched - fetch_start, perf_counter() - fetched
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Logs en la base y en el rango consultado")
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as directory:
+        db_path: str = join(directory, "logs.db")
+        connect(db_path).close()
+        template_miner: TemplateMiner = TemplateMiner(depth=4, similarity_threshold=0.4)
+        sqlite: SQliteConn = SQliteConn(db_path, template_miner=template_miner)
+        fill(sqlite, template_miner, args.rows)
+
+        start_time: datetime = START
+        end_time: datetime = START + timedelta(days=365)
+        results: dict[str, tuple[bytes, float, float]] = {
+            "models": with_models(sqlite, start_time, end_time),
+            "rows": with_rows(sqlite, start_time, end_time),
+        }
+        assert results["models"][0] == results["rows"][0], "Both paths must produce the same JSON"
+
+        print(f"Range of {args.rows:,} rows ({len(results['rows'][0]) / 1e6:,.1f} MB of JSON)")
+        for label, (_, fetch, serialize) in results.items():
+            total: float = fetch + serialize
+            print(
+                f"{label:>7}: fetch {fetch:6.2f} s | serialize {serialize:6.2f} s | "
+                f"total {total:6.2f} s ({args.rows / total:>10,.0f} rows/s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
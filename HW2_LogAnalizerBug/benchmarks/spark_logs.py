@@ -0,0 +1,44 @@
+import re
+from datetime import datetime
+from os.path import dirname, join
+from typing import ClassVar
+
+from src.model.log_entry import LogEntry
+
+
+class SparkLogReader:
+    """Lee archivos de log de Spark (como `data/logs.txt`) y los convierte en LogEntry.
+
+    Cada línea con formato `yy/mm/dd HH:MM:SS TAG mensaje` inicia un log nuevo.
+    Las líneas sin ese prefijo (trazas, bloques de configuración) se agregan
+    al mensaje del log anterior; las que aparecen antes del primer log se descartan.
+    """
+    DEFAULT_PATH: ClassVar[str] = join(dirname(dirname(__file__)), "data", "logs.txt")
+    LINE_PATTERN: ClassVar[re.Pattern] = re.compile(r"^(\d{2}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) (\w+) (.*)$")
+    TIMESTAMP_FORMAT: ClassVar[str] = "%y/%m/%d %H:%M:%S"
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.__path: str = path
+
+    def read(self) -> list[LogEntry]:
+        """Devuelve los logs del archivo en orden de aparición."""
+        logs: list[LogEntry] = list()
+        pending: dict | None = None
+        with open(self.__path, "r", encoding="utf-8", errors="replace") as file:
+            for line in file:
+                line = line.rstrip("\n")
+                match: re.Match | None = self.LINE_PATTERN.match(line)
+                if match is None:
+                    if pending is not None:
+                        pending["message"] += "\n" + line
+                    continue
+                if pending is not None:
+                    logs.append(LogEntry(**pending))
+                pending = {
+                    "timestamp": datetime.strptime(match.group(1), self.TIMESTAMP_FORMAT),
+                    "tag": match.group(2),
+                    "message": match.group(3),
+                }
+        if pending is not None:
+            logs.append(LogEntry(**pending))
+        return logs
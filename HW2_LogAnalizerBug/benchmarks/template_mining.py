@@ -0,0 +1,112 @@
+"""Mide el efecto del TemplateMiner sobre `data/logs.txt`.
+
+Compara la ingesta en TemporalCache y el almacenamiento en SQLite con y sin
+minado de plantillas: tiempo de ingesta, memoria retenida por el cache y
+tamaño del archivo SQLite.
+
+Uso:
+    python -m benchmarks.template_mining [--repeat 20]
+"""
+import argparse
+import tracemalloc
+from datetime import timedelta
+from os import remove
+from os.path import getsize, join
+from sqlite3 import connect
+from tempfile import mkdtemp
+from time import perf_counter
+
+from benchmarks.spark_logs import SparkLogReader
+from src.model.log_entry import LogEntry
+from src.model.log_record import LogRecord
+from src.services.log_pruner import LogPruner
+from src.services.sqlite_conn import SQliteConn
+from src.services.temporal_cache import TemporalCache
+from src.services.template_miner import TemplateMiner
+
+
+def replicate(logs: list[LogEntry], repeat: int) -> list[LogEntry]:
+    """Repite el dataset desplazando los timestamps para simular más volumen."""
+    span: timedelta = logs[-1].timestamp - logs[0].timestamp + timedelta(seconds=1)
+    return [
+        log.model_copy(update={"timestamp": log.timestamp + span * round_})
+        for round_ in range(repeat)
+        for log in logs
+    ]
+
+
+def measure_ingest(logs: list[LogEntry], template_miner: TemplateMiner | None) -> float:
+    """Tiempo de `TemporalCache.add_log` para logs ya validados."""
+    cache: TemporalCache = TemporalCache(LogPruner(window_minutes=10**6), template_miner=template_miner)
+    start: float = perf_counter()
+    for log in logs:
+        cache.add_log(log)
+    return perf_counter() - start
+
+
+def measure_memory(lines: list[str], template_miner: TemplateMiner | None) -> int:
+    """Memoria retenida por el cache tras ingerir los logs recibidos como JSON.
+
+    Cada LogEntry se crea y descarta dentro de la medición, como en POST /logs,
+    de modo que solo cuenta lo que el cache conserva.
+    """
+    tracemalloc.start()
+    cache: TemporalCache = TemporalCache(LogPruner(window_minutes=10**6), template_miner=template_miner)
+    for line in lines:
+        cache.add_log(LogEntry.model_validate_json(line))
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained
+
+
+def measure_storage(logs: list[LogEntry], template_miner: TemplateMiner | None, directory: str) -> int:
+    """Tamaño del archivo SQLite (tras VACUUM) con todos los logs persistidos."""
+    db_path: str = join(directory, "bench.db")
+    open(db_path, "w").close()
+    sqlite: SQliteConn = SQliteConn(db_path, template_miner=template_miner)
+    records: list[LogRecord] = [
+        LogRecord(log.timestamp, log.tag, None, log.message, log.seq) if template_miner is None
+        else template_miner.encode(log)
+        for log in logs
+    ]
+    sqlite.save_logs(records)
+    with connect(db_path) as conn:
+        conn.execute("VACUUM")
+    size: int = getsize(db_path)
+    remove(db_path)
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20, help="Veces que se replica logs.txt")
+    args = parser.parse_args()
+
+    logs: list[LogEntry] = replicate(SparkLogReader().read(), args.repeat)
+    lines: list[str] = [log.model_dump_json() for log in logs]
+    directory: str = mkdtemp()
+    print(f"Dataset: {len(logs)} logs ({args.repeat} x data/logs.txt)")
+
+    results: dict[str, tuple[float, int, int]] = dict()
+    for label, template_miner in (("raw", None), ("templates", TemplateMiner())):
+        elapsed: float = measure_ingest(logs, template_miner)
+        retained: int = measure_memory(lines, template_miner)
+        size: int = measure_storage(logs, template_miner, directory)
+        results[label] = (elapsed, retained, size)
+        extra: str = "" if template_miner is None else \
+            f" ({template_miner.clusters_count} clusters, {template_miner.templates_count} versions)"
+        print(
+            f"{label:>10}: ingest {len(logs) / elapsed:>10,.0f} logs/s | "
+            f"cache {retained / 2**20:6.2f} MiB | sqlite {size / 2**20:6.2f} MiB{extra}"
+        )
+
+    raw, templated = results["raw"], results["templates"]
+    print(
+        f"Ingest overhead: {templated[0] / raw[0]:.2f}x | "
+        f"cache memory reduction: {1 - templated[1] / raw[1]:.1%} | "
+        f"sqlite size reduction: {1 - templated[2] / raw[2]:.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
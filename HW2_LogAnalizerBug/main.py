@@ -1,14 +1,116 @@
-import uvicorn 
+import argparse
+from multiprocessing import Process
+from os import environ, remove
+from os.path import exists
+from time import sleep
+
+import uvicorn
+from fastapi import FastAPI
 
 from src.services.log_pruner import LogPruner
 from src.services.temporal_cache import TemporalCache
+from src.services.partitioned_temporal_cache import PartitionedTemporalCache
 from src.services.sqlite_conn import SQliteConn
+from src.services.ingest_journal import IngestJournal
+from src.services.template_miner import TemplateMiner
+from src.services.log_broadcaster import LogBroadcaster
+from src.services.ingest_queue import IngestQueue
+from src.services.stream_analytics import StreamAnalytics
+from src.services.heavy_hitters import HeavyHitters
+from src.services.standing_queries import StandingQueries
+from src.services.request_profiler import RequestProfiler
+from src.services.source_quotas import SourceQuotas
+from src.services.cache_server import CacheServer
+from src.services.remote_temporal_cache import RemoteTemporalCache
 from src.application.api import API
 
+DB_PATH: str = r"data/logs.db"
+JOURNAL_DIR: str = r"data/journal"
+CACHE_SOCKET_ENV: str = "LOG_CACHE_SOCKET"
+# Ventana del cache (minutos) de las fuentes que no usan la de por defecto
+SOURCE_WINDOW_MINUTES: dict[str, int] = {}
+# Cuotas de ingesta (logs por segundo, ráfaga) de las fuentes que no usan la de por defecto
+SOURCE_QUOTAS: dict[str, tuple[float, int]] = {}
+# Fuentes con partición y cuota propias (None: cualquiera, hasta MAX_SOURCES); el resto comparte "_other"
+ALLOWED_SOURCES: set[str] | None = None
+MAX_SOURCES: int = 256
+# Inactividad tras la cual la partición de una fuente se persiste y se descarta
+SOURCE_IDLE_SECONDS: int = 900
+
+
+def build_partition(template_miner: TemplateMiner, source: str) -> TemporalCache:
+    pruner: LogPruner = LogPruner(
+        window_minutes=SOURCE_WINDOW_MINUTES.get(source, 5),
+        allowed_lateness_seconds=30, max_future_seconds=60, future_policy="quarantine"
+    )
+    heavy_hitters: HeavyHitters = HeavyHitters(capacity=256, slot_seconds=10)
+    return TemporalCache(pruner=pruner, template_miner=template_miner, heavy_hitters=heavy_hitters)
+
+
+def build_cache(template_miner: TemplateMiner) -> PartitionedTemporalCache:
+    return PartitionedTemporalCache(
+        lambda source: build_partition(template_miner, source),
+        max_sources=MAX_SOURCES, allowed_sources=ALLOWED_SOURCES, idle_seconds=SOURCE_IDLE_SECONDS
+    )
+
+
+def build_api(
+    cache: PartitionedTemporalCache | RemoteTemporalCache, template_miner: TemplateMiner, journal: IngestJournal | None
+) -> API:
+    sqlite: SQliteConn = SQliteConn(db_path = DB_PATH, template_miner=template_miner)
+    broadcaster: LogBroadcaster = LogBroadcaster(queue_size=1000, slow_consumer_policy="sample")
+    ingest_queue: IngestQueue = IngestQueue(high_watermark=10_000, low_watermark=5_000, shed_tags=("DEBUG",))
+    analytics: StreamAnalytics = StreamAnalytics(interval_seconds=10, window_seconds=300, alpha=0.1, k_sigma=3.0)
+    # Las consultas permanentes se mantienen con los logs del cache local; cada worker
+    # solo ve los logs que ingiere él, así que en modo multi-worker no se habilitan
+    standing_queries: StandingQueries | None = \
+        StandingQueries(max_queries=100) if isinstance(cache, PartitionedTemporalCache) else None
+    profiler: RequestProfiler = RequestProfiler(slow_threshold_ms=250, history=1000, slowest=20)
+    # Cada worker lleva sus propias cuotas: en modo multi-worker el límite efectivo se multiplica
+    quotas: SourceQuotas = SourceQuotas(
+        rate=5_000, burst=20_000, overrides=SOURCE_QUOTAS, max_sources=MAX_SOURCES, allowed_sources=ALLOWED_SOURCES
+    )
+    return API(
+        cache=cache, db_service=sqlite, journal=journal, template_miner=template_miner,
+        broadcaster=broadcaster, ingest_queue=ingest_queue, analytics=analytics,
+        standing_queries=standing_queries, profiler=profiler, quotas=quotas
+    )
+
+
+def run_cache_server(socket_path: str) -> None:
+    """Proceso que mantiene la ventana caliente compartida por los workers."""
+    template_miner: TemplateMiner = TemplateMiner(depth=4, similarity_threshold=0.4)
+    sqlite: SQliteConn = SQliteConn(db_path = DB_PATH, template_miner=template_miner)
+    journal: IngestJournal = IngestJournal(journal_dir=JOURNAL_DIR, sync_interval_ms=50, sync_batch_size=256)
+    CacheServer(socket_path, build_cache(template_miner), sqlite, journal, template_miner).run()
+
+
+def create_worker_app() -> FastAPI:
+    """Aplicación de cada worker de uvicorn en modo multi-worker (sin journal ni cache propios)."""
+    template_miner: TemplateMiner = TemplateMiner(depth=4, similarity_threshold=0.4)
+    cache: RemoteTemporalCache = RemoteTemporalCache(environ[CACHE_SOCKET_ENV], template_miner=template_miner)
+    app: FastAPI = build_api(cache, template_miner, journal=None).app
+    app.add_event_handler("shutdown", cache.close)
+    return app
+
+
 if __name__ == "__main__":
-    pruner: LogPruner = LogPruner(window_minutes=5)
-    cache: TemporalCache = TemporalCache(pruner=pruner)
-    sqlite: SQliteConn = SQliteConn(db_path = r"data/logs.db")
-    api: API = API(cache=cache, db_service=sqlite)
+    parser = argparse.ArgumentParser(description="Log Analyzer API")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos de uvicorn")
+    parser.add_argument("--cache-socket", default=r"data/cache.sock", help="Socket Unix del cache compartido")
+    args = parser.parse_args()
 
-    uvicorn.run(api.app)
+    if args.workers == 1:
+        template_miner: TemplateMiner = TemplateMiner(depth=4, similarity_threshold=0.4)
+        journal: IngestJournal = IngestJournal(journal_dir=JOURNAL_DIR, sync_interval_ms=50, sync_batch_size=256)
+        api: API = build_api(build_cache(template_miner), template_miner, journal)
+        uvicorn.run(api.app)
+    else:
+        if exists(args.cache_socket):
+            remove(args.cache_socket)
+        cache_server: Process = Process(target=run_cache_server, args=(args.cache_socket,), daemon=True)
+        cache_server.start()
+        while not exists(args.cache_socket):
+            sleep(0.05)
+        environ[CACHE_SOCKET_ENV] = args.cache_socket
+        uvicorn.run("main:create_worker_app", factory=True, workers=args.workers)
@@ -1,13 +1,42 @@
-from datetime import datetime
+import re
+from asyncio import CancelledError, Task, TimeoutError, create_task, to_thread, wait_for
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import datetime, timedelta
+from heapq import merge
+from json import dumps
+from typing import AsyncIterator, Callable, ClassVar, Iterable, Iterator, TypeVar
 
-from fastapi import FastAPI, Query, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Query, BackgroundTasks, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.encoders import jsonable_encoder
 
 from src.services.temporal_cache import TemporalCache
+from src.services.partitioned_temporal_cache import PartitionedTemporalCache
+from src.services.remote_temporal_cache import RemoteTemporalCache
 from src.services.sqlite_conn import SQliteConn
+from src.services.sharded_sqlite_conn import ShardedSQliteConn
+from src.services.ingest_journal import IngestJournal
+from src.services.template_miner import TemplateMiner
+from src.services.sequence_generator import SequenceGenerator
+from src.services.log_broadcaster import LogBroadcaster, Subscription
+from src.services.ingest_queue import IngestQueue
+from src.services.stream_analytics import StreamAnalytics
+from src.services.heavy_hitters import HeavyHitters
+from src.services.log_exporter import LogExporter
+from src.services.log_filter import LogFilter
+from src.services.log_batch_codec import LogBatchCodec
+from src.services.standing_queries import StandingQueries, StandingQuery
+from src.services.request_profiler import NULL_TIMING, NullTiming, RequestProfiler, RequestTiming
+from src.services.source_quotas import SourceQuotas
 from src.model.log_entry import LogEntry
+from src.model.log_batch import LogBatch
+from src.model.log_record import LogRecord
+from src.model.log_row import LogRow, log_row_json, log_rows_json
 from src.model.log_list import LogList
+from src.model.log_query import BatchQuery, RangeQuery, StandingQueryDefinition
+
+T = TypeVar("T")
 
 
 class API:
@@ -18,21 +47,85 @@ class API:
     2. Proporciona endpoints para consultar logs por rango temporal
     3. Gestiona la limpieza automática del cache
     4. Persiste logs antiguos en base de datos
+    5. Registra cada log en un journal durable antes de aceptarlo (opcional)
+    6. Transmite en vivo los logs ingeridos (SSE y WebSocket)
+    7. Aplica backpressure a la ingesta con una cola acotada (opcional)
+    8. Detecta picos de logs por tag y componente sobre el stream de ingesta (opcional)
+    9. Exporta rangos de logs como CSV, Arrow o Parquet en streaming
+    10. Recibe lotes columnares en MessagePack o Arrow IPC (ingesta binaria)
+    11. Mantiene consultas permanentes con cada log ingerido y las sirve con ETag (opcional)
+    12. Mide las consultas por fase (Server-Timing) y registra las lentas con su plan de SQLite (opcional)
+    13. Separa los logs por fuente (aplicación de Spark): particiones de cache, consultas
+        por fuente y cuotas de ingesta (opcional)
     
     Attributes:
         __app (FastAPI): Instancia de FastAPI que maneja los endpoints
-        __cache (TemporalCache): Cache temporal para almacenar logs recientes
-        __db_service (SQliteConn): Servicio de base de datos para persistencia
+        __cache (TemporalCache | PartitionedTemporalCache): Cache temporal para almacenar logs recientes
+        __db_service (SQliteConn | ShardedSQliteConn): Servicio de base de datos para persistencia
+        __journal (IngestJournal | None): Journal de ingesta para recuperación ante caídas
+        __template_miner (TemplateMiner | None): Minero de plantillas compartido por cache y base de datos
+        __sequence (SequenceGenerator): Secuencias de ingesta asignadas a cada log aceptado
+        __broadcaster (LogBroadcaster): Distribuidor de logs para los clientes del live-tail
+        __ingest_queue (IngestQueue | None): Cola acotada entre POST /logs y el cache
+        __analytics (StreamAnalytics | None): Tasas y alertas de picos sobre los logs ingeridos
+        __exporter (LogExporter): Exportador de rangos de logs a formatos de archivo
+        __codec (LogBatchCodec): Decodificador de los lotes de la ingesta binaria
+        __standing_queries (StandingQueries | None): Consultas permanentes mantenidas en la ingesta
+        __profiler (RequestProfiler | None): Tiempos por fase y registro de consultas lentas
+        __quotas (SourceQuotas | None): Cuotas de ingesta por fuente
     """
-    def __init__(self, cache: TemporalCache, db_service: SQliteConn):
+    TAIL_HEARTBEAT_SECONDS: ClassVar[float] = 15.0
+    
+    def __init__(
+        self,
+        cache: TemporalCache | PartitionedTemporalCache | RemoteTemporalCache,
+        db_service: SQliteConn | ShardedSQliteConn,
+        journal: IngestJournal | None = None,
+        template_miner: TemplateMiner | None = None,
+        broadcaster: LogBroadcaster | None = None,
+        ingest_queue: IngestQueue | None = None,
+        analytics: StreamAnalytics | None = None,
+        exporter: LogExporter | None = None,
+        codec: LogBatchCodec | None = None,
+        standing_queries: StandingQueries | None = None,
+        profiler: RequestProfiler | None = None,
+        quotas: SourceQuotas | None = None,
+    ):
         self.__app = FastAPI(
             title = "Log API",
             description= "API for managing logs",
             version= "1.0.0",
         )
-        self.__cache: TemporalCache = cache 
-        self.__db_service: SQliteConn = db_service
+        self.__cache: TemporalCache | PartitionedTemporalCache | RemoteTemporalCache = cache 
+        self.__db_service: SQliteConn | ShardedSQliteConn = db_service
+        self.__journal: IngestJournal | None = journal
+        self.__template_miner: TemplateMiner | None = template_miner
+        self.__sequence: SequenceGenerator = SequenceGenerator(self.__db_service.max_seq())
+        self.__broadcaster: LogBroadcaster = broadcaster if broadcaster is not None else LogBroadcaster()
+        self.__ingest_queue: IngestQueue | None = ingest_queue
+        self.__analytics: StreamAnalytics | None = analytics
+        self.__exporter: LogExporter = exporter if exporter is not None else LogExporter()
+        self.__codec: LogBatchCodec = codec if codec is not None else LogBatchCodec()
+        self.__standing_queries: StandingQueries | None = standing_queries
+        self.__profiler: RequestProfiler | None = profiler
+        self.__quotas: SourceQuotas | None = quotas
+        self.__consumer: Task | None = None
+        self.__replay_journal()
+        self.__cache.add_listener(self.__broadcaster.publish)
+        if self.__analytics is not None:
+            # Después del replay: los logs recuperados del journal no disparan alertas
+            self.__cache.add_listener(self.__analytics.observe)
+            self.__analytics.add_listener(lambda alert: self.__broadcaster.publish_event("alert", alert))
+        if self.__standing_queries is not None:
+            self.__cache.add_listener(
+                lambda log_entry: self.__standing_queries.observe(log_entry, self.__cache.watermark_of)
+            )
         self.__set_up_routes()
+        if self.__ingest_queue is not None:
+            self.__app.add_event_handler("startup", self.__start_consumer)
+            self.__app.add_event_handler("shutdown", self.__stop_consumer)
+        if self.__journal is not None:
+            self.__app.add_event_handler("shutdown", self.__journal.close)
     
     @property
     def app(self) -> FastAPI:
@@ -43,63 +136,229 @@ class API:
 
         Establece los endpoints disponibles:
         - POST /logs: Añadir nuevos logs
+        - POST /logs/batch: Añadir un lote columnar en MessagePack o Arrow IPC
         - GET /logs: Obtener logs por rango temporal
+        - POST /logs/query: Obtener logs de varios rangos en una sola petición
         - GET /logs/all: Obtener todos los logs en cache
+        - GET /logs/export: Exportar un rango de logs como Parquet, Arrow o CSV
+        - GET /logs/watermark: Estado del watermark y logs tardíos o en cuarentena
+        - GET /logs/top: Tags, componentes o plantillas más frecuentes en el cache
+        - GET /logs/tail: Logs en vivo como Server-Sent Events
+        - WS /logs/tail/ws: Logs en vivo por WebSocket
+        - GET /logs/ingest/stats: Profundidad de la cola de ingesta y logs descartados
+        - GET /alerts: Picos detectados y tasas por tag y componente (si hay StreamAnalytics)
+        - POST /queries: Registrar una consulta permanente (si hay StandingQueries)
+        - GET /queries: Consultas permanentes registradas
+        - GET /queries/{query_id}: Resultado de una consulta permanente, con ETag / 304
+        - DELETE /queries/{query_id}: Borrar una consulta permanente
+        - GET /debug/slow: Consultas más lentas con su plan y percentiles por fase (si hay RequestProfiler)
+        - GET /sources: Particiones del cache y cuotas de ingesta por fuente
+        - GET /logs/templates: Conteo de logs por plantilla (si hay TemplateMiner)
+        - GET /logs/templates/{cluster_id}/timeline: Conteo de una plantilla en el tiempo
 
         Returns:
             API: Self para permitir encadenamiento
         """
         self.__app.post("/logs")(self.add_logs)
+        self.__app.post("/logs/batch", status_code=201, openapi_extra={
+            "requestBody": {
+                "required": True,
+                "content": {media_type: {} for media_type in LogBatchCodec.MEDIA_TYPES.values()},
+            }
+        })(self.add_log_batch)
         self.__app.get("/logs")(self.get_logs)
+        self.__app.post("/logs/query")(self.query_logs)
         self.__app.get("/logs/all")(self.get_all_logs)
+        self.__app.get("/logs/export")(self.export_logs)
+        self.__app.get("/logs/watermark")(self.get_watermark)
+        self.__app.get("/logs/top")(self.get_top)
+        self.__app.get("/logs/tail")(self.tail_logs)
+        self.__app.websocket("/logs/tail/ws")(self.tail_logs_ws)
+        self.__app.get("/logs/ingest/stats")(self.get_ingest_stats)
+        if self.__analytics is not None:
+            self.__app.get("/alerts")(self.get_alerts)
+        if self.__standing_queries is not None:
+            self.__app.post("/queries", status_code=201)(self.register_query)
+            self.__app.get("/queries")(self.get_queries)
+            self.__app.get("/queries/{query_id}")(self.get_query)
+            self.__app.delete("/queries/{query_id}", status_code=204)(self.delete_query)
+        if self.__profiler is not None:
+            self.__app.get("/debug/slow")(self.get_slow_requests)
+        if isinstance(self.__cache, PartitionedTemporalCache) or self.__quotas is not None:
+            self.__app.get("/sources")(self.get_sources)
+        if self.__template_miner is not None:
+            self.__app.get("/logs/templates")(self.get_templates)
+            self.__app.get("/logs/templates/{cluster_id}/timeline")(self.get_template_timeline)
+        return self
+    
+    def __replay_journal(self) -> 'API':
+        """Reconstruye el cache temporal a partir del journal de ingesta.
+
+        Los logs que no llegaron a persistirse antes de una caída se vuelven
+        a cargar en el TemporalCache al iniciar la API, conservando su secuencia
+        de ingesta. Los logs de segmentos anteriores a las secuencias reciben
+        una nueva y se vuelven a registrar en el journal.
+
+        Returns:
+            API: Self para permitir encadenamiento
+        """
+        if self.__journal is None:
+            return self
+        
+        replayed: list[LogEntry] = list(self.__journal.replay())
+        for log_entry in replayed:
+            if log_entry.seq is not None:
+                self.__sequence.advance_to(log_entry.seq)
+        
+        for log_entry in replayed:
+            if log_entry.seq is None:
+                self.__ingest(log_entry)
+            else:
+                self.__cache.add_log(log_entry)
+        self.__journal.discard_legacy()
+        print(f"Replayed {len(replayed)} logs from journal")
         return self
     
-    def __prune_logs(self) -> list[LogEntry]:
+    async def __on_cache(self, operation: Callable[..., T], *args) -> T:
+        """Ejecuta una operación del cache sin bloquear el event loop.
+
+        Con RemoteTemporalCache cada operación espera la respuesta del
+        CacheServer por un socket, así que corre en un hilo. El cache local no
+        hace I/O y no es seguro entre hilos, así que se llama directamente.
+
+        Args:
+            operation (Callable[..., T]): Método del cache
+            *args: Argumentos del método
+
+        Returns:
+            T: Resultado del método
+        """
+        if isinstance(self.__cache, RemoteTemporalCache):
+            return await to_thread(operation, *args)
+        return operation(*args)
+    
+    def __prune_logs(self) -> tuple[list[LogRecord], list[LogRecord]]:
         """Ejecuta la limpieza del cache temporal.
 
         Delega la limpieza al TemporalCache y retorna los logs eliminados
-        para su posterior persistencia en base de datos.
+        para su posterior persistencia en base de datos, junto con los logs
+        en cuarentena, que se guardan aparte.
 
         Returns:
-            list[LogEntry]: Logs eliminados del cache
+            tuple[list[LogRecord], list[LogRecord]]: Registros eliminados del cache y registros en cuarentena
         """
         try:
-            pruned_logs: list[LogEntry] = self.__cache.prune_cache()
+            pruned_logs: list[LogRecord] = self.__cache.prune_cache()
             print(f"Pruned logs: {pruned_logs}")
-            return pruned_logs
+            return pruned_logs, self.__cache.drain_quarantine()
         except Exception as e:
             print(f"Error during pruning: {e}")
+            return list(), list()
             
-    def __save_pruned_logs(self, pruned_logs: list[LogEntry]) -> 'API':
-        """Persiste los logs eliminados en la base de datos.
+    def __save_pruned_logs(self, pruned_logs: list[LogRecord], quarantined: list[LogRecord]) -> 'API':
+        """Persiste los logs eliminados en la base de datos y los de cuarentena en su tabla.
 
         Args:
-            pruned_logs (list[LogEntry]): Logs a persistir
+            pruned_logs (list[LogRecord]): Registros a persistir
+            quarantined (list[LogRecord]): Registros en cuarentena, fuera de las consultas de logs
 
         Returns:
             API: Self para permitir encadenamiento
         """
-        if not pruned_logs:
-            return self
-        
-        self.__db_service.save_logs(pruned_logs)
+        if pruned_logs:
+            self.__db_service.save_logs(pruned_logs)
+        if quarantined:
+            self.__db_service.save_quarantined(quarantined)
+        if self.__journal is not None and (pruned_logs or quarantined):
+            self.__journal.mark_persisted(pruned_logs + quarantined)
         return self
             
     
+    def __stamp(self, log_entry: LogEntry) -> LogEntry:
+        """Asigna la secuencia de ingesta y registra el log en el journal.
+
+        Args:
+            log_entry (LogEntry): Log recibido
+
+        Returns:
+            LogEntry: Log con su `seq` asignado
+        """
+        log_entry = log_entry.model_copy(update={"seq": self.__sequence.next()})
+        if self.__journal is not None:
+            self.__journal.append(log_entry)
+        return log_entry
+    
+    def __ingest(self, log_entry: LogEntry) -> 'API':
+        """Asigna la secuencia de ingesta, registra el log en el journal y lo añade al cache.
+
+        Args:
+            log_entry (LogEntry): Log recibido
+
+        Returns:
+            API: Self para permitir encadenamiento
+        """
+        self.__cache.add_log(self.__stamp(log_entry))
+        return self
+    
+    async def __consume_ingest_queue(self) -> None:
+        """Vacía la cola de ingesta hacia el cache, de a lotes.
+
+        Tras cada lote ejecuta una sola limpieza del cache y persiste los logs
+        eliminados en un hilo, sin bloquear el event loop.
+        """
+        while True:
+            batch: list[LogEntry] = await self.__ingest_queue.take()
+            try:
+                await self.__on_cache(self.__cache.add_logs, batch)
+                await to_thread(self.__save_pruned_logs, *self.__prune_logs())
+            except Exception as e:
+                print(f"Error consuming ingest queue: {e}")
+    
+    async def __start_consumer(self) -> None:
+        self.__consumer = create_task(self.__consume_ingest_queue())
+    
+    async def __stop_consumer(self) -> None:
+        """Detiene la tarea consumidora y pasa al cache los logs que quedaron en la cola.
+
+        Los logs ya están en el journal, así que no se pierden aunque no
+        lleguen a persistirse antes de cerrar.
+        """
+        if self.__consumer is not None:
+            self.__consumer.cancel()
+            try:
+                await self.__consumer
+            except CancelledError:
+                pass
+            self.__consumer = None
+        await self.__on_cache(self.__cache.add_logs, self.__ingest_queue.drain())
+    
     async def add_logs(self, log_list: LogEntry | LogList, background_task: BackgroundTasks) -> JSONResponse:
         """Añade uno o varios logs al sistema.
 
         Procesa la entrada (log individual o lista) y:
-        1. Almacena los logs en el cache temporal
+        1. Registra los logs en el journal (si está configurado) y los almacena en el cache temporal
         2. Ejecuta limpieza (pruning) en background
         3. Persiste logs eliminados en base de datos
 
+        Si hay una IngestQueue configurada, los logs admitidos se registran en
+        el journal y se encolan; la tarea consumidora hace los pasos 1 a 3.
+        Con la cola saturada se responde 429 con Retry-After y no se acepta
+        ningún log de la petición. Lo mismo ocurre si alguna fuente de la
+        petición agotó su cuota de ingesta (si hay SourceQuotas). La cuota se
+        consume después de la cola, solo por los logs que esta admite: un 429
+        de la cola o los logs descartados por prioridad no la gastan.
+
         Args:
             log_list (LogEntry | LogList): Log individual o lista de logs
             background_task (BackgroundTasks): Manejador de tareas en background
 
         Returns:
-            JSONResponse: Confirmación con cantidad de logs procesados
+            JSONResponse: Confirmación con cantidad de logs procesados (y descartados
+                          por prioridad, si hay IngestQueue)
+
+        Raises:
+            HTTPException: 429 si la cola de ingesta está saturada o una fuente agotó
+                           su cuota, 413 si la petición supera la ráfaga de una fuente
 
         Example:
             POST /logs
@@ -108,24 +367,36 @@ class API:
                     {
                         "timestamp": "2023-04-23T10:00:00",
                         "tag": "INFO",
-                        "message": "Test log"
+                        "message": "Test log",
+                        "source": "spark-etl"
                     }
                 ]
             }
         """
         assert isinstance(log_list, (LogEntry, LogList)), "Invalid input type"
         
+        if self.__ingest_queue is not None:
+            return self.__enqueue_logs(log_list.logs if isinstance(log_list, LogList) else [log_list])
+        
+        if self.__quotas is not None:
+            self.__check_quotas(
+                dict(Counter(log.source for log in log_list.logs)) if isinstance(log_list, LogList)
+                else {log_list.source: 1}
+            )
+        
         if isinstance(log_list, LogList):
             logs: list[LogEntry] = log_list.logs
+            stamped: list[LogEntry] = list()
             for log_entry in logs:
                 print(log_entry)
-                self.__cache.add_log(log_entry)
+                stamped.append(self.__stamp(log_entry))
+            await self.__on_cache(self.__cache.add_logs, stamped)
             logs_count: int = len(logs)
         else:
-             self.__cache.add_log(log_list)
+             await self.__on_cache(self.__cache.add_log, self.__stamp(log_list))
              logs_count: int = 1
         
-        background_task.add_task(self.__save_pruned_logs, self.__prune_logs())
+        background_task.add_task(self.__save_pruned_logs, *self.__prune_logs())
         return JSONResponse(
             content={
                 "message": f"Successfully added {logs_count} logs",
@@ -134,34 +405,236 @@ class API:
             status_code=201
         )
         
+    async def add_log_batch(self, request: Request, background_task: BackgroundTasks) -> JSONResponse:
+        """Añade un lote columnar de logs codificado en MessagePack o Arrow IPC.
+
+        Alternativa binaria a POST /logs para shippers de alto volumen: el
+        cuerpo trae las columnas timestamp, tag, message y opcionalmente source (ver LogBatchCodec)
+        y se decodifica por columna, sin un objeto JSON por log. Los logs
+        reciben secuencias consecutivas en una sola reserva y entran al cache
+        con un único `add_logs`; el resto (journal, IngestQueue, limpieza y
+        persistencia) es igual que en POST /logs.
+
+        Args:
+            request (Request): Petición con Content-Type `application/msgpack`
+                               o `application/vnd.apache.arrow.stream`
+            background_task (BackgroundTasks): Manejador de tareas en background
+
+        Returns:
+            JSONResponse: Confirmación con cantidad de logs procesados (y descartados
+                          por prioridad, si hay IngestQueue)
+
+        Raises:
+            HTTPException: 415 si el Content-Type no es soportado o es Arrow IPC sin pyarrow,
+                           400 si el cuerpo está mal formado, 429 si la cola de
+                           ingesta está saturada o una fuente agotó su cuota,
+                           413 si el lote supera la ráfaga de una fuente
+
+        Example:
+            codec = LogBatchCodec()
+            POST /logs/batch
+            Content-Type: application/msgpack
+            <codec.encode(logs, "msgpack")>
+        """
+        media_type: str = request.headers.get("content-type", "")
+        if self.__codec.format_of(media_type) is None:
+            raise HTTPException(
+                status_code=415,
+                detail=f"Content-Type must be one of {tuple(LogBatchCodec.MEDIA_TYPES.values())} "
+                       f"with its library installed"
+            )
+        try:
+            batch: LogBatch = self.__codec.decode(await request.body(), media_type)
+            if self.__ingest_queue is not None:
+                return self.__enqueue_logs(batch.entries())
+            if self.__quotas is not None:
+                self.__check_quotas(batch.source_counts())
+            logs: list[LogEntry] = batch.entries(self.__sequence.reserve(len(batch)) if len(batch) else None)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        if self.__journal is not None:
+            for log_entry in logs:
+                self.__journal.append(log_entry)
+        await self.__on_cache(self.__cache.add_logs, logs)
+        background_task.add_task(self.__save_pruned_logs, *self.__prune_logs())
+        return JSONResponse(
+            content={
+                "message": f"Successfully added {len(logs)} logs",
+                "count": len(logs)
+            },
+            status_code=201
+        )
+        
+    def __check_quotas(self, counts: dict[str, int]) -> None:
+        """Consume la cuota de ingesta de cada fuente de la petición o la rechaza completa.
+
+        Args:
+            counts (dict[str, int]): Cantidad de logs de la petición por fuente
+
+        Raises:
+            HTTPException: 429 con Retry-After si una fuente no tiene cuota suficiente,
+                           413 si la petición supera la ráfaga de una fuente
+        """
+        rejection: tuple[str, int | None] | None = self.__quotas.admit(counts)
+        if rejection is None:
+            return
+        source, retry_after = rejection
+        if retry_after is None:
+            raise HTTPException(
+                status_code=413, detail=f"Request exceeds the ingest burst of source {source}; split it"
+            )
+        raise HTTPException(
+            status_code=429,
+            detail=f"Ingest quota exceeded for source {source}",
+            headers={"Retry-After": str(retry_after)}
+        )
+    
+    def __enqueue_logs(self, logs: list[LogEntry]) -> JSONResponse:
+        """Admite los logs en la cola de ingesta o rechaza la petición con 429.
+
+        La cuota de cada fuente (si hay SourceQuotas) se consume recién cuando
+        la cola admitió la petición, y solo por los logs que no se descartaron
+        por prioridad, así que reintentar ante una cola saturada no la agota.
+
+        Args:
+            logs (list[LogEntry]): Logs de la petición
+
+        Returns:
+            JSONResponse: Confirmación con cantidad de logs encolados y descartados
+
+        Raises:
+            HTTPException: 429 si la cola de ingesta está saturada o una fuente agotó
+                           su cuota, 413 si la petición supera la ráfaga de una fuente
+        """
+        admitted: list[LogEntry] | None = self.__ingest_queue.admit(logs)
+        if admitted is None:
+            raise HTTPException(
+                status_code=429,
+                detail="Ingest queue is saturated",
+                headers={"Retry-After": str(self.__ingest_queue.retry_after_seconds)}
+            )
+        if self.__quotas is not None:
+            self.__check_quotas(dict(Counter(log.source for log in admitted)))
+        
+        self.__ingest_queue.put([self.__stamp(log_entry) for log_entry in admitted])
+        logs_count: int = len(admitted)
+        return JSONResponse(
+            content={
+                "message": f"Successfully added {logs_count} logs",
+                "count": logs_count,
+                "shed": len(logs) - logs_count
+            },
+            status_code=201
+        )
+    
     #Aqui encontramos un bug: si NO hay logs en caché , busca en la base de datos. Si hay logs en caché, 
     # usa SOLO los del caché. Esto significa que si existe aunque sea un solo logs en caché dentro del rango,
     #nunca buscará, en la base de datos , perdiendo logs que podrían estar almacenados alli.
     #Necesitariamos buscar en ambos lugares
+    @staticmethod
+    def __merge_tiers(cache_rows: Iterable[LogRow], db_rows: Iterable[LogRow]) -> Iterator[LogRow]:
+        """Combina las filas del cache y de la base de datos sin duplicados.
+
+        Ambas fuentes llegan ordenadas por (timestamp, seq), así que se mezclan
+        en una sola pasada y un log presente en los dos niveles aparece en
+        posiciones consecutivas con el mismo seq. Las líneas repetidas con
+        distinto seq son logs distintos y se conservan.
+
+        Se trabaja con filas planas (timestamp ISO, tag, message, seq, source): los
+        timestamps ISO ordenan igual como texto, que es además como los
+        compara SQLite, así que no hace falta construir LogEntry.
+
+        Args:
+            cache_rows (Iterable[LogRow]): Filas obtenidas del cache temporal
+            db_rows (Iterable[LogRow]): Filas obtenidas de la base de datos (puede ser un cursor)
+
+        Yields:
+            LogRow: Filas únicas en orden cronológico
+        """
+        last_seq: int | None = None
+        for row in merge(cache_rows, db_rows, key=lambda row: (row[0], row[3] or 0)):
+            if row[3] is not None and row[3] == last_seq:
+                continue
+            last_seq = row[3]
+            yield row
+    
+    def __timing_headers(
+        self,
+        timing: RequestTiming | NullTiming,
+        ranges: list[tuple[datetime, datetime]],
+        log_filter: LogFilter | None,
+        source: str | None,
+    ) -> dict[str, str] | None:
+        """Registra la petición en el profiler y arma el header Server-Timing (None si no hay profiler)."""
+        if self.__profiler is None:
+            return None
+        explain = lambda: self.__db_service.explain_rows_in_ranges(ranges, log_filter, source)
+        return {"Server-Timing": self.__profiler.finish(timing, explain)}
+    
+    def __range_rows(
+        self, start_time: datetime, end_time: datetime, log_filter: LogFilter | None, source: str | None
+    ) -> list[LogRow]:
+        """Filas de un rango en el cache y en la base de datos, mezcladas y sin duplicados."""
+        cache_rows: list[LogRow] = self.__cache.get_rows(start_time, end_time, log_filter, source)
+        db_rows: list[LogRow] = self.__db_service.get_rows_in_ranges([(start_time, end_time)], log_filter, source)[0]
+        return list(self.__merge_tiers(cache_rows, db_rows))
+    
+    @staticmethod
+    def __normalize_ranges(ranges: list[RangeQuery]) -> list[tuple[datetime, datetime]]:
+        """Ordena los rangos y fusiona los que se solapan o son contiguos.
+
+        Args:
+            ranges (list[RangeQuery]): Rangos solicitados
+
+        Returns:
+            list[tuple[datetime, datetime]]: Conjunto mínimo de rangos disjuntos
+        """
+        merged: list[tuple[datetime, datetime]] = list()
+        for query in sorted(ranges, key=lambda query: query.start_time):
+            if merged and query.start_time <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], query.end_time))
+            else:
+                merged.append((query.start_time, query.end_time))
+        return merged
+    
     async def get_logs(
         self, 
         start_time: datetime = Query(..., description="Start time in ISO format"), 
-        end_time: datetime = Query(..., description="End time in ISO format")
-    ) -> JSONResponse:
+        end_time: datetime = Query(..., description="End time in ISO format"),
+        contains: str | None = Query(None, description="Substring the message must contain"),
+        regex: str | None = Query(None, description="Regular expression searched in the message"),
+        source: str | None = Query(None, description="Only logs of this source (application)")
+    ) -> Response:
         """Obtiene logs dentro de un rango temporal específico.
 
         Este método:
-        1. Busca primero en el cache temporal
-        2. Si no encuentra logs en cache, busca en la base de datos
-        3. Convierte los logs encontrados a formato JSON
+        1. Busca en el cache temporal y en la base de datos, filtrando los mensajes
+           en cada nivel (dentro de SQLite para la base de datos). Con `source`
+           solo se leen la partición del cache y las filas de esa fuente
+        2. Mezcla ambos niveles sin duplicados
+        3. Serializa las filas directamente a JSON, sin construir LogEntry
 
         Args:
             start_time (datetime): Inicio del rango temporal en formato ISO (YYYY-MM-DDTHH:MM:SS)
             end_time (datetime): Fin del rango temporal en formato ISO (YYYY-MM-DDTHH:MM:SS)
+            contains (str | None): Subcadena que debe contener el mensaje
+            regex (str | None): Expresión regular que debe encontrarse en el mensaje
+            source (str | None): Fuente (aplicación) de los logs; None para todas
 
         Returns:
-            JSONResponse: Respuesta HTTP con:
+            Response: Respuesta HTTP JSON con:
                 - content: {"logs": [lista de logs encontrados]}
                 - media_type: "application/json"
                 - status_code: 200
 
+        Raises:
+            HTTPException: 400 si `regex` no es una expresión regular válida
+
         Example:
             GET /logs?start_time=2023-04-23T10:00:00&end_time=2023-04-23T10:05:00
+            GET /logs?start_time=2023-04-23T10:00:00&end_time=2023-04-23T10:05:00&contains=Executor&regex=^Lost
+            GET /logs?start_time=2023-04-23T10:00:00&end_time=2023-04-23T10:05:00&source=spark-etl
             
             Response:
             {
@@ -175,33 +648,118 @@ class API:
             }
         """
 
+        # Sin profiler las marcas son no-ops y no se arman los parámetros
+        timing: RequestTiming | NullTiming = self.__profiler.start(
+            "GET /logs",
+            {
+                "start_time": start_time.isoformat(), "end_time": end_time.isoformat(),
+                "contains": contains, "regex": regex, "source": source
+            }
+        ) if self.__profiler is not None else NULL_TIMING
+        try:
+            log_filter: LogFilter | None = LogFilter.of(contains=contains, regex=regex) if contains or regex else None
+        except re.error as e:
+            raise HTTPException(status_code=400, detail=f"Invalid regex: {e}")
+        
         #Buscamos en ambos lugares
-        cache_logs: list[LogEntry] = self.__cache.get_logs(start_time, end_time)
-        db_logs: list[LogEntry] = self.__db_service.get_logs(start_time, end_time)
-        all_logs: list[LogEntry] = cache_logs + db_logs
-        # Eliminar duplicados basándose en timestamp, tag y message
-        # Utilizamos un set para identificar logs únicos
-        seen_logs = set()
-        unique_logs: list[LogEntry] = []
-        
-        for log in all_logs:
-            # Crear una tupla única para cada log
-            log_signature = (log.timestamp, log.tag, log.message)
-            if log_signature not in seen_logs:
-                seen_logs.add(log_signature)
-                unique_logs.append(log)
-        
-        # Ordenar por timestamp para mantener orden cronológico
-        unique_logs.sort(key=lambda x: x.timestamp)
-        
-        # overall_logs: list[LogEntry] = self.__db_service.get_logs(start_time, end_time) \
-        #     if not cache_logs else cache_logs  # buscamos en la base de datos si no estan en el cache
-        jsonable_logs: list[dict] = [
-            jsonable_encoder(log.model_dump() )
-            for log in unique_logs
+        cache_rows: list[LogRow] = await self.__on_cache(
+            self.__cache.get_rows, start_time, end_time, log_filter, source
+        )
+        timing.mark("cache")
+        db_rows: list[LogRow] = self.__db_service.get_rows_in_ranges([(start_time, end_time)], log_filter, source)[0]
+        timing.mark("sqlite")
+        
+        rows: list[LogRow] = list(self.__merge_tiers(cache_rows, db_rows))
+        timing.mark("merge")
+        # Las filas se serializan directamente, sin construir LogEntry por cada log
+        content: str = '{"logs":' + log_rows_json(rows) + '}'
+        timing.mark("encode")
+        return Response(
+            content=content, media_type="application/json", status_code=200,
+            headers=self.__timing_headers(timing, [(start_time, end_time)], log_filter, source)
+        )
+    
+    async def query_logs(self, batch: BatchQuery) -> Response:
+        """Obtiene los logs de varios rangos temporales en una sola pasada.
+
+        Este método:
+        1. Normaliza los rangos (los ordena y fusiona los solapados o contiguos)
+        2. Recorre cache y base de datos una sola vez por rango fusionado
+        3. Serializa cada fila a JSON una única vez, sin construir LogEntry
+        4. Reparte los resultados a cada rango solicitado, aplicando el filtro de tags
+
+        Args:
+            batch (BatchQuery): Lista de rangos con filtros de tags opcionales y, opcionalmente,
+                                la fuente a la que se limita toda la consulta
+
+        Returns:
+            Response: JSON con un resultado por rango, en el orden de la petición
+
+        Example:
+            POST /logs/query
+            {
+                "ranges": [
+                    {"start_time": "2023-04-23T10:00:00", "end_time": "2023-04-23T10:05:00"},
+                    {"start_time": "2023-04-23T10:03:00", "end_time": "2023-04-23T10:10:00", "tags": ["ERROR"]}
+                ]
+            }
+            
+            Response:
+            {
+                "results": [
+                    {"start_time": "2023-04-23T10:00:00", "end_time": "2023-04-23T10:05:00", "tags": null, "logs": [...]},
+                    {"start_time": "2023-04-23T10:03:00", "end_time": "2023-04-23T10:10:00", "tags": ["ERROR"], "logs": [...]}
+                ]
+            }
+        """
+        merged_ranges: list[tuple[datetime, datetime]] = self.__normalize_ranges(batch.ranges)
+        timing: RequestTiming | NullTiming = self.__profiler.start(
+            "POST /logs/query",
+            {"ranges": [[start.isoformat(), end.isoformat()] for start, end in merged_ranges], "source": batch.source}
+        ) if self.__profiler is not None else NULL_TIMING
+        cache_results: list[list[LogRow]] = [
+            await self.__on_cache(self.__cache.get_rows, start_time, end_time, None, batch.source)
+            for start_time, end_time in merged_ranges
         ]
+        timing.mark("cache")
+        # Si todos los rangos filtran por tags, la base solo lee esos tags (y con shards "hash", solo sus shards)
+        db_tags: list[str] | None = sorted({tag for query in batch.ranges for tag in query.tags}) \
+            if all(query.tags is not None for query in batch.ranges) else None
+        db_results: list[list[LogRow]] = self.__db_service.get_rows_in_ranges(
+            merged_ranges, None, batch.source, db_tags
+        )
+        timing.mark("sqlite")
         
-        return JSONResponse(content={"logs": jsonable_logs}, media_type="application/json", status_code=200)
+        scanned_rows: list[LogRow] = list()
+        for cache_rows, db_rows in zip(cache_results, db_results):
+            scanned_rows.extend(self.__merge_tiers(cache_rows, db_rows))
+        timing.mark("merge")
+        
+        # El filtro de tags y los cortes por rango se resuelven sobre las filas (timestamps ISO como texto)
+        timestamps: list[str] = [row[0] for row in scanned_rows]
+        json_logs: list[str] = [log_row_json(row) for row in scanned_rows]
+        
+        results: list[str] = list()
+        for query in batch.ranges:
+            first: int = bisect_left(timestamps, query.start_time.isoformat())
+            last: int = bisect_right(timestamps, query.end_time.isoformat())
+            tags: set[str] | None = set(query.tags) if query.tags is not None else None
+            logs: str = ",".join(
+                json_logs[index] for index in range(first, last)
+                if tags is None or scanned_rows[index][1] in tags
+            )
+            header: str = dumps(
+                {"start_time": query.start_time.isoformat(), "end_time": query.end_time.isoformat(), "tags": query.tags},
+                ensure_ascii=False, separators=(",", ":")
+            )
+            results.append(header[:-1] + ',"logs":[' + logs + "]}")
+        content: str = '{"results":[' + ",".join(results) + "]}"
+        timing.mark("encode")
+        
+        return Response(
+            content=content, media_type="application/json", status_code=200,
+            headers=self.__timing_headers(timing, merged_ranges, None, batch.source)
+        )
     
     async def get_all_logs(self) -> JSONResponse:
         """Obtiene todos los logs almacenados en el cache temporal.
@@ -214,8 +772,508 @@ class API:
         """
         logs: list[LogEntry] = [
             jsonable_encoder(log.model_dump())
-            for log in self.__cache.get_all_logs()
+            for log in await self.__on_cache(self.__cache.get_all_logs)
         ]
         return JSONResponse(content={"logs": logs}, media_type="application/json", status_code=200)
+    
+    async def export_logs(
+        self,
+        start_time: datetime = Query(..., description="Start time in ISO format"),
+        end_time: datetime = Query(..., description="End time in ISO format"),
+        format: str = Query("parquet", description="parquet, arrow or csv"),
+        row_group_size: int | None = Query(None, ge=1, description="Rows per record batch / row group"),
+        source: str | None = Query(None, description="Only logs of this source (application)")
+    ) -> StreamingResponse:
+        """Exporta los logs de un rango como archivo Parquet, Arrow IPC o CSV.
+
+        Las filas se leen de SQLite de a lotes y se escriben de a un row group
+        por vez, sin construir LogEntry, así que la memoria no depende del
+        tamaño del rango. Los logs que siguen en el cache se incluyen también.
+
+        Args:
+            start_time (datetime): Inicio del rango temporal en formato ISO
+            end_time (datetime): Fin del rango temporal en formato ISO
+            format (str): "parquet", "arrow" (stream IPC) o "csv"
+            row_group_size (int | None): Filas por row group; por defecto el del LogExporter
+            source (str | None): Fuente (aplicación) de los logs; None para todas
+
+        Returns:
+            StreamingResponse: Archivo con columnas timestamp, tag, message, seq y source
+
+        Raises:
+            HTTPException: 400 si el formato no existe o requiere pyarrow y no está instalado
+
+        Example:
+            GET /logs/export?format=parquet&start_time=2025-04-16T00:00:00&end_time=2025-04-17T00:00:00
+
+            import pandas as pd
+            df = pd.read_parquet("http://localhost:8000/logs/export?format=parquet&start_time=...&end_time=...")
+        """
+        cache_rows: list[LogRow] = await self.__on_cache(self.__cache.get_rows, start_time, end_time, None, source)
+        try:
+            chunks: Iterator[bytes] = self.__exporter.export(
+                self.__merge_tiers(cache_rows, self.__db_service.iter_rows(start_time, end_time, source=source)),
+                format, row_group_size
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return StreamingResponse(
+            chunks,
+            media_type=LogExporter.MEDIA_TYPES[format],
+            headers={"Content-Disposition": f'attachment; filename="logs.{format}"'}
+        )
+    
+    async def get_watermark(self) -> JSONResponse:
+        """Obtiene el estado del watermark del cache temporal.
+
+        Returns:
+            JSONResponse: Watermark, umbral de la ventana y contadores de logs
+                          tardíos y en cuarentena (por fuente si el cache está particionado)
+
+        Example:
+            GET /logs/watermark
+        """
+        return JSONResponse(
+            content=await self.__on_cache(self.__cache.watermark_stats), media_type="application/json", status_code=200
+        )
+    
+    async def get_top(
+        self,
+        field: str = Query("component", description="Field to rank: tag, component or template"),
+        k: int = Query(20, ge=1, le=1000, description="Number of values to return")
+    ) -> JSONResponse:
+        """Obtiene los valores más frecuentes de un campo en la ventana caliente.
+
+        Los conteos salen de los resúmenes Space-Saving que el cache mantiene
+        al ingerir, con memoria acotada y sin recorrer los logs.
+
+        Args:
+            field (str): "tag", "component" o "template"
+            k (int): Cantidad de valores
+
+        Returns:
+            JSONResponse: Valores por cuenta descendente; `max_error` acota la
+                          sobreestimación de cada cuenta
+
+        Raises:
+            HTTPException: 400 si el campo no es válido, 404 si el cache no mantiene el top-k
+
+        Example:
+            GET /logs/top?field=component&k=3
+            
+            Response:
+            {
+                "field": "component",
+                "top": [{"value": "scheduler.TaskSetManager", "count": 446, "max_error": 0}]
+            }
+        """
+        if field not in HeavyHitters.FIELDS:
+            raise HTTPException(status_code=400, detail=f"field must be one of {HeavyHitters.FIELDS}")
+        if field == "template" and self.__template_miner is None:
+            raise HTTPException(status_code=400, detail="Template mining is not enabled")
+        try:
+            ranked: list[tuple[str | int, int, int]] = await self.__on_cache(self.__cache.top, field, k)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        
+        top: list[dict] = list()
+        for value, count, max_error in ranked:
+            entry: dict = {"value": value, "count": count, "max_error": max_error}
+            if field == "template":
+                entry["template"] = self.__template_miner.template(value)
+            top.append(entry)
+        return JSONResponse(content={"field": field, "top": top}, media_type="application/json", status_code=200)
+    
+    async def get_templates(
+        self, 
+        start_time: datetime = Query(..., description="Start time in ISO format"), 
+        end_time: datetime = Query(..., description="End time in ISO format")
+    ) -> JSONResponse:
+        """Agrupa los logs de un rango temporal por plantilla de mensaje.
+
+        Los conteos se obtienen de los índices de plantillas del cache y de
+        la base de datos, sin reconstruir los mensajes.
+
+        Args:
+            start_time (datetime): Inicio del rango temporal en formato ISO
+            end_time (datetime): Fin del rango temporal en formato ISO
+
+        Returns:
+            JSONResponse: Plantillas ordenadas por cantidad de logs descendente
+
+        Example:
+            GET /logs/templates?start_time=2025-04-16T11:00:00&end_time=2025-04-16T12:00:00
+            
+            Response:
+            {
+                "templates": [
+                    {"cluster_id": 3, "template": "Finished task <*> in stage <*>", "count": 120}
+                ]
+            }
+        """
+        counts: dict[int, int] = await self.__on_cache(self.__cache.count_by_template, start_time, end_time)
+        for cluster_id, count in self.__db_service.count_by_template(start_time, end_time).items():
+            counts[cluster_id] = counts.get(cluster_id, 0) + count
         
-        
\ No newline at end of file
+        templates: list[dict] = [
+            {"cluster_id": cluster_id, "template": self.__template_miner.template(cluster_id), "count": count}
+            for cluster_id, count in sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        ]
+        return JSONResponse(content={"templates": templates}, media_type="application/json", status_code=200)
+    
+    async def get_template_timeline(
+        self,
+        cluster_id: int,
+        start_time: datetime = Query(..., description="Start time in ISO format"), 
+        end_time: datetime = Query(..., description="End time in ISO format"),
+        bucket_seconds: int = Query(60, gt=0, description="Bucket size in seconds")
+    ) -> JSONResponse:
+        """Cuenta los logs de una plantilla por intervalos de tiempo.
+
+        Args:
+            cluster_id (int): Cluster de plantilla
+            start_time (datetime): Inicio del rango temporal en formato ISO
+            end_time (datetime): Fin del rango temporal en formato ISO
+            bucket_seconds (int): Tamaño de cada intervalo en segundos
+
+        Returns:
+            JSONResponse: Conteos por intervalo en orden cronológico
+
+        Raises:
+            HTTPException: 404 si la plantilla no existe
+
+        Example:
+            GET /logs/templates/3/timeline?start_time=2025-04-16T11:00:00&end_time=2025-04-16T12:00:00&bucket_seconds=300
+        """
+        if not 0 <= cluster_id < self.__template_miner.clusters_count:
+            raise HTTPException(status_code=404, detail=f"Template {cluster_id} not found")
+        
+        bucket: timedelta = timedelta(seconds=bucket_seconds)
+        counts: dict[datetime, int] = await self.__on_cache(
+            self.__cache.template_timeline, cluster_id, start_time, end_time, bucket
+        )
+        for bucket_start, count in self.__db_service.template_timeline(cluster_id, start_time, end_time, bucket).items():
+            counts[bucket_start] = counts.get(bucket_start, 0) + count
+        
+        timeline: list[dict] = [
+            {"timestamp": bucket_start.isoformat(), "count": count}
+            for bucket_start, count in sorted(counts.items())
+        ]
+        return JSONResponse(
+            content={
+                "cluster_id": cluster_id,
+                "template": self.__template_miner.template(cluster_id),
+                "timeline": timeline
+            },
+            media_type="application/json",
+            status_code=200
+        )
+    
+    async def get_ingest_stats(self) -> JSONResponse:
+        """Obtiene el estado de la cola de ingesta.
+
+        Returns:
+            JSONResponse: Profundidad, watermarks, saturación y contadores de logs
+                          aceptados, rechazados y descartados por tag
+
+        Raises:
+            HTTPException: 404 si la API no usa cola de ingesta
+
+        Example:
+            GET /logs/ingest/stats
+        """
+        if self.__ingest_queue is None:
+            raise HTTPException(status_code=404, detail="Ingest queue is not enabled")
+        return JSONResponse(content=self.__ingest_queue.stats(), media_type="application/json", status_code=200)
+    
+    async def get_alerts(
+        self,
+        dimension: str | None = Query(None, description="Filter by dimension: tag or component"),
+        top: int = Query(20, ge=0, description="Number of keys with the highest windowed counts to include")
+    ) -> JSONResponse:
+        """Obtiene los picos detectados y las tasas actuales por tag y componente.
+
+        Se responde con el estado que StreamAnalytics mantiene en memoria,
+        sin consultar el cache ni SQLite.
+
+        Args:
+            dimension (str | None): "tag" o "component"; ambas si se omite
+            top (int): Cantidad de claves con más logs en la ventana a incluir
+
+        Returns:
+            JSONResponse: Alertas recientes, tasas de las claves más activas y estadísticas
+
+        Raises:
+            HTTPException: 400 si la dimensión no es válida
+
+        Example:
+            GET /alerts?dimension=component&top=5
+        """
+        if dimension is not None and dimension not in StreamAnalytics.DIMENSIONS:
+            raise HTTPException(status_code=400, detail=f"dimension must be one of {StreamAnalytics.DIMENSIONS}")
+        return JSONResponse(
+            content={
+                "alerts": self.__analytics.alerts(dimension),
+                "rates": self.__analytics.rates(dimension)[:top],
+                "stats": self.__analytics.stats(),
+            },
+            media_type="application/json",
+            status_code=200
+        )
+    
+    async def register_query(self, definition: StandingQueryDefinition) -> JSONResponse:
+        """Registra una consulta permanente y devuelve su id.
+
+        El resultado inicial se calcula una vez con el cache y la base de
+        datos; desde entonces se actualiza con cada log que recibe el cache y
+        GET /queries/{query_id} lo devuelve sin volver a consultar. Registrar
+        una definición que ya existe devuelve la misma consulta (200).
+
+        Args:
+            definition (StandingQueryDefinition): Tags, componente, contains, regex
+                                                  y ventana en segundos
+
+        Returns:
+            JSONResponse: Id, definición, cantidad de logs y ETag de la consulta
+
+        Raises:
+            HTTPException: 400 si `regex` no es válida o se alcanzó el máximo de consultas
+
+        Example:
+            POST /queries
+            {"tags": ["ERROR"], "component": "scheduler", "window_seconds": 600}
+        """
+        try:
+            query, created = self.__standing_queries.register(
+                definition, self.__cache.watermark_of(definition.source), self.__range_rows
+            )
+        except re.error as e:
+            raise HTTPException(status_code=400, detail=f"Invalid regex: {e}")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return JSONResponse(content=query.stats(), status_code=201 if created else 200)
+    
+    async def get_queries(self) -> JSONResponse:
+        """Lista las consultas permanentes registradas."""
+        return JSONResponse(content={"queries": self.__standing_queries.stats()}, status_code=200)
+    
+    async def get_query(self, query_id: str, request: Request) -> Response:
+        """Devuelve el resultado actual de una consulta permanente.
+
+        El cuerpo ({"logs": [...]}, el mismo JSON que GET /logs) se arma una
+        sola vez por versión del resultado. Si el cliente envía el ETag de la
+        versión actual en If-None-Match se responde 304 sin cuerpo.
+
+        Args:
+            query_id (str): Id devuelto por POST /queries
+            request (Request): Petición, para leer If-None-Match
+
+        Returns:
+            Response: 200 con los logs y ETag, o 304 si no cambiaron
+
+        Raises:
+            HTTPException: 404 si la consulta no existe
+
+        Example:
+            GET /queries/3f2a9c0d1e4b5a6c
+            If-None-Match: "3f2a9c0d1e4b5a6c-42"
+        """
+        query: StandingQuery | None = self.__standing_queries.get(query_id)
+        if query is None:
+            raise HTTPException(status_code=404, detail=f"Standing query {query_id} not found")
+        headers: dict[str, str] = {"ETag": query.etag, "Cache-Control": "no-cache"}
+        if_none_match: str = request.headers.get("if-none-match", "")
+        if_none_match_tags: set[str] = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if query.etag in if_none_match_tags or "*" in if_none_match_tags:
+            return Response(status_code=304, headers=headers)
+        return Response(content=query.body(), media_type="application/json", status_code=200, headers=headers)
+    
+    async def delete_query(self, query_id: str) -> Response:
+        """Borra una consulta permanente.
+
+        Raises:
+            HTTPException: 404 si la consulta no existe
+        """
+        if not self.__standing_queries.remove(query_id):
+            raise HTTPException(status_code=404, detail=f"Standing query {query_id} not found")
+        return Response(status_code=204)
+    
+    async def get_slow_requests(
+        self, limit: int = Query(20, ge=1, description="Number of slow requests to return")
+    ) -> JSONResponse:
+        """Devuelve las consultas más lentas con su plan de SQLite y los percentiles por fase.
+
+        Cada consulta medida (GET /logs y POST /logs/query) se descompone en
+        las fases cache, sqlite, merge y encode, las mismas que informa su
+        header Server-Timing.
+
+        Args:
+            limit (int): Cantidad de consultas lentas a devolver
+
+        Returns:
+            JSONResponse: Consultas lentas (de la más lenta a la más rápida) y estadísticas
+
+        Example:
+            GET /debug/slow?limit=5
+        """
+        return JSONResponse(
+            content={"slowest": self.__profiler.slowest(limit), "stats": self.__profiler.stats()},
+            status_code=200
+        )
+
+    async def get_sources(self) -> JSONResponse:
+        """Devuelve las fuentes conocidas con el watermark de su partición y su cuota de ingesta.
+
+        Returns:
+            JSONResponse: Por fuente, el estado del watermark de su partición del cache
+                          (si el cache está particionado) y su cuota (si hay SourceQuotas)
+
+        Example:
+            GET /sources
+
+            Response:
+            {
+                "sources": {
+                    "spark-etl": {
+                        "watermark": {"watermark": "2025-04-16T10:04:58", ...},
+                        "quota": {"rate": 5000.0, "burst": 20000, "tokens": 19500, "accepted": 500, "rejected": 0}
+                    }
+                }
+            }
+        """
+        sources: dict[str, dict] = dict()
+        if isinstance(self.__cache, PartitionedTemporalCache):
+            for source, stats in self.__cache.watermark_stats().items():
+                sources.setdefault(source, dict())["watermark"] = stats
+        if self.__quotas is not None:
+            for source, stats in self.__quotas.stats().items():
+                sources.setdefault(source, dict())["quota"] = stats
+        return JSONResponse(content=jsonable_encoder({"sources": sources}), status_code=200)
+
+    async def __next_tail_message(self, subscription: Subscription) -> str | dict:
+        """Espera el siguiente mensaje del live-tail de una suscripción.
+
+        Args:
+            subscription (Subscription): Suscripción del cliente
+
+        Returns:
+            str | dict: Log serializado o evento de control:
+                        {"event": "keep-alive"} si no llegan logs en TAIL_HEARTBEAT_SECONDS,
+                        {"event": "skipped", "count": n, "log": ...} si se descartaron logs antes de este,
+                        {"event": "disconnected", "reason": ...} si el broadcaster cerró la suscripción,
+                        {"event": "alert", ...} con cada pico detectado por StreamAnalytics
+        """
+        try:
+            payload: str | dict | None = await wait_for(subscription.queue.get(), self.TAIL_HEARTBEAT_SECONDS)
+        except TimeoutError:
+            return {"event": "keep-alive"}
+        if payload is None:
+            return {"event": "disconnected", "reason": "slow consumer"}
+        if isinstance(payload, dict):
+            return dict(payload)
+        dropped: int = subscription.take_dropped()
+        if dropped:
+            return {"event": "skipped", "count": dropped, "log": payload}
+        return payload
+    
+    async def __stream_tail(self, subscription: Subscription) -> AsyncIterator[str]:
+        """Genera los eventos SSE de una suscripción hasta que el cliente se desconecta.
+
+        Args:
+            subscription (Subscription): Suscripción del cliente
+
+        Yields:
+            str: Eventos en formato text/event-stream
+        """
+        try:
+            while True:
+                message: str | dict = await self.__next_tail_message(subscription)
+                if isinstance(message, str):
+                    yield f"data: {message}\n\n"
+                    continue
+                
+                event: str = message.pop("event")
+                if event == "keep-alive":
+                    yield ": keep-alive\n\n"
+                    continue
+                payload: str | None = message.pop("log", None)
+                yield f"event: {event}\ndata: {dumps(message)}\n\n"
+                if event == "disconnected":
+                    return
+                if payload is not None:
+                    yield f"data: {payload}\n\n"
+        finally:
+            self.__broadcaster.unsubscribe(subscription)
+    
+    async def tail_logs(
+        self,
+        tags: list[str] | None = Query(None, description="Tags to stream (all if omitted)"),
+        contains: str | None = Query(None, description="Substring the message must contain")
+    ) -> StreamingResponse:
+        """Transmite en vivo los logs ingeridos como Server-Sent Events.
+
+        Cada log aceptado por `TemporalCache.add_log` que cumple los filtros se
+        envía como un evento `data`. Si el cliente no consume a tiempo, según la
+        política del LogBroadcaster recibe un evento `skipped` con la cantidad de
+        logs perdidos o un evento `disconnected` y el stream se cierra. Si la API
+        tiene StreamAnalytics, cada pico detectado llega como un evento `alert`.
+
+        Args:
+            tags (list[str] | None): Tags a recibir; todos si se omite
+            contains (str | None): Subcadena que debe contener el mensaje
+
+        Returns:
+            StreamingResponse: Stream text/event-stream
+
+        Example:
+            GET /logs/tail?tags=ERROR&tags=WARN&contains=Executor
+            
+            data: {"timestamp":"2025-04-16T11:00:00","tag":"ERROR","message":"Executor lost","seq":42}
+        """
+        subscription: Subscription = self.__broadcaster.subscribe(tags, contains)
+        return StreamingResponse(
+            self.__stream_tail(subscription),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
+    async def tail_logs_ws(
+        self,
+        websocket: WebSocket,
+        tags: list[str] | None = Query(None),
+        contains: str | None = Query(None)
+    ) -> None:
+        """Transmite en vivo los logs ingeridos por WebSocket.
+
+        Equivalente a GET /logs/tail: cada log se envía como un mensaje de texto
+        JSON y los eventos de control como {"event": ...}. Un consumidor lento
+        desconectado recibe el cierre con código 1013 (Try Again Later).
+
+        Args:
+            websocket (WebSocket): Conexión del cliente
+            tags (list[str] | None): Tags a recibir; todos si se omite
+            contains (str | None): Subcadena que debe contener el mensaje
+
+        Example:
+            WS /logs/tail/ws?tags=ERROR
+        """
+        await websocket.accept()
+        subscription: Subscription = self.__broadcaster.subscribe(tags, contains)
+        try:
+            while True:
+                message: str | dict = await self.__next_tail_message(subscription)
+                if isinstance(message, str):
+                    await websocket.send_text(message)
+                    continue
+                
+                if message["event"] == "disconnected":
+                    await websocket.close(code=1013, reason=message["reason"])
+                    return
+                payload: str | None = message.pop("log", None)
+                await websocket.send_text(dumps(message))
+                if payload is not None:
+                    await websocket.send_text(payload)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            self.__broadcaster.unsubscribe(subscription)
@@ -0,0 +1,88 @@
+from itertools import islice
+from json import loads
+from time import sleep
+from typing import Iterable, Iterator
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from src.model.log_entry import LogEntry
+from src.services.log_batch_codec import LogBatchCodec
+
+
+class LogShipper:
+    """Cliente que envía logs a POST /logs/batch en lotes columnares binarios.
+
+    Agrupa los logs de a `batch_size`, codifica cada lote en MessagePack o
+    Arrow IPC con LogBatchCodec y lo envía en una sola petición. Si la API
+    responde 429 (cola de ingesta saturada) espera lo indicado en
+    Retry-After y reintenta el mismo lote: la API acepta o rechaza cada
+    petición completa, así que el reintento no duplica logs.
+
+    Attributes:
+        __url (str): URL de POST /logs/batch
+        __file_format (str): "msgpack" o "arrow"
+        __batch_size (int): Logs por petición
+        __max_retries (int): Reintentos por lote ante un 429
+        __timeout (float): Timeout de cada petición, en segundos
+    """
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        file_format: str = "msgpack",
+        batch_size: int = 10_000,
+        max_retries: int = 5,
+        timeout: float = 30.0,
+        codec: LogBatchCodec | None = None,
+    ):
+        assert file_format in LogBatchCodec.MEDIA_TYPES, f"file_format must be one of {tuple(LogBatchCodec.MEDIA_TYPES)}"
+        assert batch_size > 0, "batch_size must be positive"
+        assert max_retries >= 0, "max_retries must not be negative"
+
+        self.__url: str = base_url.rstrip("/") + "/logs/batch"
+        self.__file_format: str = file_format
+        self.__batch_size: int = batch_size
+        self.__max_retries: int = max_retries
+        self.__timeout: float = timeout
+        self.__codec: LogBatchCodec = codec if codec is not None else LogBatchCodec()
+
+    def __batches(self, logs: Iterable[LogEntry]) -> Iterator[list[LogEntry]]:
+        iterator: Iterator[LogEntry] = iter(logs)
+        while batch := list(islice(iterator, self.__batch_size)):
+            yield batch
+
+    def __post(self, body: bytes) -> dict:
+        request: Request = Request(
+            self.__url,
+            data=body,
+            method="POST",
+            headers={"Content-Type": LogBatchCodec.MEDIA_TYPES[self.__file_format]},
+        )
+        for attempt in range(self.__max_retries + 1):
+            try:
+                with urlopen(request, timeout=self.__timeout) as response:
+                    return loads(response.read())
+            except HTTPError as e:
+                if e.code != 429 or attempt == self.__max_retries:
+                    raise ConnectionError(f"POST {self.__url} failed with {e.code}: {e.read().decode(errors='replace')}") from e
+                sleep(float(e.headers.get("Retry-After", 1)))
+
+    def ship(self, logs: Iterable[LogEntry]) -> int:
+        """Envía los logs en lotes y devuelve cuántos aceptó la API.
+
+        Args:
+            logs (Iterable[LogEntry]): Logs a enviar, en cualquier cantidad
+
+        Returns:
+            int: Logs aceptados (sin los descartados por prioridad en la IngestQueue)
+
+        Raises:
+            ConnectionError: Si la API rechaza un lote o se agotan los reintentos
+
+        Example:
+            shipper = LogShipper("http://localhost:8000", file_format="arrow", batch_size=50_000)
+            shipper.ship(SparkLogReader().read())
+        """
+        accepted: int = 0
+        for batch in self.__batches(logs):
+            accepted += self.__post(self.__codec.encode(batch, self.__file_format))["count"]
+        return accepted
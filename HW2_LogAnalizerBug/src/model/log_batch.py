@@ -0,0 +1,73 @@
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import repeat
+from typing import Iterable
+
+from src.model.log_entry import LogEntry
+
+
+@dataclass(frozen=True, slots=True)
+class LogBatch:
+    """Lote columnar de logs recibido por la ingesta binaria.
+
+    Cada columna trae los valores ya decodificados (datetime y str) en el
+    orden de llegada; los LogEntry se construyen una sola vez, con su `seq`
+    ya asignado, al aceptar el lote.
+
+    Attributes:
+        timestamps (list[datetime]): Marca temporal de cada log
+        tags (list[str]): Tag de cada log
+        messages (list[str]): Mensaje de cada log
+        sources (list[str] | None): Fuente de cada log; None si el lote no trae la columna
+                                    (todos son de la fuente "default")
+    """
+    timestamps: list[datetime]
+    tags: list[str]
+    messages: list[str]
+    sources: list[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def source_counts(self) -> dict[str, int]:
+        """Cantidad de logs del lote por fuente (para las cuotas de ingesta)."""
+        if self.sources is None:
+            return {"default": len(self)} if len(self) else dict()
+        return dict(Counter(self.sources))
+
+    def entries(self, first_seq: int | None = None, validate: bool = True) -> list[LogEntry]:
+        """Construye los LogEntry del lote.
+
+        Args:
+            first_seq (int | None): Secuencia del primer log; los siguientes son
+                                    consecutivos. None deja los logs sin `seq`
+            validate (bool): False construye los LogEntry sin validarlos, para
+                             lotes que ya validó otro proceso (el CacheServer
+                             recibe los que aceptó un worker)
+
+        Returns:
+            list[LogEntry]: Logs en el orden del lote
+
+        Raises:
+            ValueError: Si algún valor no es válido para LogEntry
+        """
+        sources: list[str] = self.sources if self.sources is not None else ["default"] * len(self)
+        if not validate:
+            seqs: Iterable[int | None] = \
+                repeat(None, len(self)) if first_seq is None else range(first_seq, first_seq + len(self))
+            return [
+                LogEntry.model_construct(timestamp=timestamp, tag=tag, message=message, seq=seq, source=source)
+                for seq, timestamp, tag, message, source in zip(seqs, self.timestamps, self.tags, self.messages, sources)
+            ]
+        if first_seq is None:
+            return [
+                LogEntry(timestamp=timestamp, tag=tag, message=message, source=source)
+                for timestamp, tag, message, source in zip(self.timestamps, self.tags, self.messages, sources)
+            ]
+        return [
+            LogEntry(timestamp=timestamp, tag=tag, message=message, seq=seq, source=source)
+            for seq, timestamp, tag, message, source in zip(
+                range(first_seq, first_seq + len(self)), self.timestamps, self.tags, self.messages, sources
+            )
+        ]
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 
 from pydantic import BaseModel
 
@@ -8,6 +9,8 @@ class LogEntry(BaseModel):
     timestamp: datetime
     tag: str  # e.g., "INFO", "ERROR", "DEBUG"
     message: str
+    seq: Optional[int] = None  # secuencia de ingesta asignada por la API
+    source: str = "default"  # aplicación o job de Spark que emitió el log
     
     def __lt__(self, other: 'LogEntry'):
         """Compara dos objetos LogEntry basándose en sus timestamps.
@@ -39,6 +42,27 @@ class LogEntry(BaseModel):
         assert isinstance(other, LogEntry), NotImplemented
         return self.timestamp < other.timestamp
     
+    @property
+    def component(self) -> Optional[str]:
+        """Componente que emitió el log, tomado del prefijo del mensaje.
+
+        Los logs de Spark empiezan con el componente seguido de ": "
+        (`util.SignalUtils: Registered signal handler for TERM`). Si el mensaje
+        no tiene ese formato devuelve None.
+
+        Returns:
+            Optional[str]: Componente (`util.SignalUtils`) o None
+        """
+        return LogEntry.component_of(self.message)
+    
+    @staticmethod
+    def component_of(message: str) -> Optional[str]:
+        """Componente de un mensaje de log, o None si no empieza con `componente: `."""
+        head, separator, _ = message.partition(": ")
+        if not separator or not head or " " in head:
+            return None
+        return head
+    
     @staticmethod
     def from_db_row(row: tuple) -> 'LogEntry':
         """Crea una instancia de LogEntry desde una tupla de la base de datos.
@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, model_validator
+
+
+class RangeQuery(BaseModel):
+    start_time: datetime
+    end_time: datetime
+    tags: Optional[List[str]] = None  # e.g., ["ERROR", "WARN"]; None = todos
+
+    @model_validator(mode="after")
+    def check_range(self) -> 'RangeQuery':
+        if self.start_time > self.end_time:
+            raise ValueError("start_time must be before or equal to end_time")
+        return self
+
+
+class BatchQuery(BaseModel):
+    ranges: List[RangeQuery]
+    source: Optional[str] = None  # solo los logs de esta aplicación; None = todas
+
+
+class StandingQueryDefinition(BaseModel):
+    """Consulta permanente: filtro + ventana relativa al watermark de tiempo de evento."""
+    tags: Optional[List[str]] = None  # e.g., ["ERROR"]; None = todos
+    component: Optional[str] = None  # e.g., "scheduler" incluye "scheduler.DAGScheduler"
+    contains: Optional[str] = None
+    regex: Optional[str] = None
+    source: Optional[str] = None  # solo los logs de esta aplicación; None = todas
+    window_seconds: int = 600
+
+    @model_validator(mode="after")
+    def check_window(self) -> 'StandingQueryDefinition':
+        if self.window_seconds <= 0:
+            raise ValueError("window_seconds must be positive")
+        return self
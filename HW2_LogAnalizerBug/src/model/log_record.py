@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True, slots=True)
+class LogRecord:
+    """Representación compacta de un log dentro del cache y hacia SQLite.
+
+    Si el mensaje fue asignado a una plantilla por el TemplateMiner,
+    `template_id` identifica la versión de la plantilla y `payload` contiene
+    los parámetros separados por espacios. Si no, `template_id` es None y
+    `payload` es el mensaje original. `seq` es la secuencia de ingesta y
+    `source` la aplicación que emitió el log.
+
+    Attributes:
+        timestamp (datetime): Marca temporal del log
+        tag (str): Nivel o categoría del log
+        template_id (int | None): Versión de plantilla del mensaje
+        payload (str): Parámetros de la plantilla o mensaje sin codificar
+        seq (int | None): Secuencia de ingesta monótona del log
+        source (str): Aplicación o job que emitió el log
+    """
+    timestamp: datetime
+    tag: str
+    template_id: int | None
+    payload: str
+    seq: int | None
+    source: str = "default"
@@ -0,0 +1,32 @@
+from json.encoder import encode_basestring
+from typing import Iterable, Optional
+
+# Fila plana de un log: (timestamp ISO, tag, message, seq, source). Es la forma en que
+# SQLite devuelve los logs y evita construir un LogEntry (y parsear el
+# timestamp) cuando solo hay que devolverlos como JSON o exportarlos.
+LogRow = tuple[str, str, str, Optional[int], str]
+
+
+def log_row_json(row: LogRow) -> str:
+    """Serializa una fila con el mismo JSON que `LogEntry` en las respuestas de la API.
+
+    El timestamp se emite tal como está guardado (ISO 8601, sin caracteres a
+    escapar); tag, message y source se escapan con el codificador en C de `json`.
+
+    Args:
+        row (LogRow): Fila (timestamp ISO, tag, message, seq, source)
+
+    Returns:
+        str: Objeto JSON {"timestamp", "tag", "message", "seq", "source"}
+    """
+    timestamp, tag, message, seq, source = row
+    return (
+        f'{{"timestamp":"{timestamp}","tag":{encode_basestring(tag)},'
+        f'"message":{encode_basestring(message)},"seq":{"null" if seq is None else seq},'
+        f'"source":{encode_basestring(source)}}}'
+    )
+
+
+def log_rows_json(rows: Iterable[LogRow]) -> str:
+    """Serializa varias filas como un arreglo JSON."""
+    return "[" + ",".join(map(log_row_json, rows)) + "]"
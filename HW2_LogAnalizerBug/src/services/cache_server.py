@@ -0,0 +1,238 @@
+from asyncio import IncompleteReadError, StreamReader, StreamWriter, run, start_unix_server, to_thread
+from datetime import datetime, timedelta
+from os import remove
+from os.path import exists
+from struct import Struct
+from typing import Callable, ClassVar
+
+import msgpack
+
+from src.model.log_batch import LogBatch
+from src.model.log_entry import LogEntry
+from src.model.log_record import LogRecord
+from src.model.log_row import LogRow
+from src.services.ingest_journal import IngestJournal
+from src.services.log_batch_codec import LogBatchCodec
+from src.services.log_pruner import Admission
+from src.services.sequence_generator import SequenceGenerator
+from src.services.sqlite_conn import SQliteConn
+from src.services.temporal_cache import TemporalCache
+from src.services.partitioned_temporal_cache import PartitionedTemporalCache
+from src.services.template_miner import TemplateMiner
+from src.services.log_filter import LogFilter
+
+FRAME_HEADER: Struct = Struct("!I")
+
+
+def encode_frame(payload: dict) -> bytes:
+    """Serializa un mensaje del protocolo: longitud (4 bytes) + MessagePack."""
+    body: bytes = msgpack.packb(payload, use_bin_type=True)
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+def decode_frame(body: bytes) -> dict:
+    """Deserializa el cuerpo de un mensaje del protocolo."""
+    return msgpack.unpackb(body, raw=False)
+
+
+class CacheServer:
+    """Proceso dueño de la ventana caliente compartida por varios workers de uvicorn.
+
+    Con `--workers N` cada worker es un proceso distinto, así que el
+    TemporalCache no puede ser un objeto Python de cada uno. El CacheServer
+    mantiene el único TemporalCache, asigna las secuencias de ingesta, escribe
+    el journal y persiste en SQLite los logs que salen de la ventana. Los
+    workers (RemoteTemporalCache) le hablan por un socket Unix con mensajes
+    MessagePack precedidos por su longitud.
+
+    La ingesta viaja como un lote columnar (el mismo formato MessagePack de
+    POST /logs/batch, ver LogBatchCodec), sin un objeto por log. El servidor
+    reserva secuencias consecutivas para el lote y responde la primera junto
+    con las posiciones de los logs que no entraron a la ventana, así el
+    worker notifica a sus listeners solo los logs aceptados y con el mismo
+    `seq` que queda guardado. Las lecturas de logs responden filas planas
+    (timestamp ISO, tag, message, seq, source).
+
+    Cada respuesta incluye las plantillas creadas desde la última que conoce
+    el worker, para que su TemplateMiner pueda reconstruir los mensajes que
+    lee de SQLite y mostrar las plantillas del cache.
+
+    Attributes:
+        __socket_path (str): Ruta del socket Unix
+        __cache (TemporalCache | PartitionedTemporalCache): Ventana caliente compartida
+        __db_service (SQliteConn): Base donde se persisten los logs podados
+        __journal (IngestJournal | None): Journal de ingesta
+        __template_miner (TemplateMiner | None): Minero usado por cache y base de datos
+        __sequence (SequenceGenerator): Secuencias de ingesta
+        __codec (LogBatchCodec): Decodificador de los lotes de ingesta
+    """
+    # Formato de los lotes de `add_logs`
+    BATCH_MEDIA_TYPE: ClassVar[str] = LogBatchCodec.MEDIA_TYPES["msgpack"]
+
+    def __init__(
+        self,
+        socket_path: str,
+        cache: TemporalCache | PartitionedTemporalCache,
+        db_service: SQliteConn,
+        journal: IngestJournal | None = None,
+        template_miner: TemplateMiner | None = None,
+    ):
+        self.__socket_path: str = socket_path
+        self.__cache: TemporalCache | PartitionedTemporalCache = cache
+        self.__db_service: SQliteConn = db_service
+        self.__journal: IngestJournal | None = journal
+        self.__template_miner: TemplateMiner | None = template_miner
+        self.__sequence: SequenceGenerator = SequenceGenerator(self.__db_service.max_seq())
+        self.__codec: LogBatchCodec = LogBatchCodec()
+        self.__handlers: dict[str, Callable[[dict], object]] = {
+            "add_logs": self.__add_logs,
+            "get_logs": self.__get_logs,
+            "get_rows": self.__get_rows,
+            "get_all_logs": self.__get_all_logs,
+            "count_by_template": self.__count_by_template,
+            "template_timeline": self.__template_timeline,
+            "watermark_stats": self.__watermark_stats,
+            "top": self.__top,
+        }
+        self.__replay_journal()
+
+    def __replay_journal(self) -> None:
+        """Reconstruye el cache a partir del journal, igual que API en modo de un solo proceso."""
+        if self.__journal is None:
+            return
+        replayed: list[LogEntry] = list(self.__journal.replay())
+        for log_entry in replayed:
+            if log_entry.seq is not None:
+                self.__sequence.advance_to(log_entry.seq)
+        self.__cache.add_logs([
+            self.__stamp(log_entry) if log_entry.seq is None else log_entry
+            for log_entry in replayed
+        ])
+        self.__journal.discard_legacy()
+        print(f"Replayed {len(replayed)} logs from journal")
+
+    def __stamp(self, log_entry: LogEntry) -> LogEntry:
+        log_entry = log_entry.model_copy(update={"seq": self.__sequence.next()})
+        if self.__journal is not None:
+            self.__journal.append(log_entry)
+        return log_entry
+
+    def __save_pruned_logs(self, pruned_logs: list[LogRecord], quarantined: list[LogRecord]) -> None:
+        if pruned_logs:
+            self.__db_service.save_logs(pruned_logs)
+        if quarantined:
+            self.__db_service.save_quarantined(quarantined)
+        if self.__journal is not None:
+            self.__journal.mark_persisted(pruned_logs + quarantined)
+
+    def __add_logs(self, args: dict) -> dict:
+        """Asigna secuencias consecutivas al lote, lo registra en el journal y lo añade al cache.
+
+        Returns:
+            dict: `first_seq` (secuencia del primer log; los demás son consecutivos)
+                  y `rejected` (posiciones de los logs tardíos o en cuarentena)
+        """
+        batch: LogBatch = self.__codec.decode(args["batch"], self.BATCH_MEDIA_TYPE)
+        if not len(batch):
+            return {"first_seq": None, "rejected": []}
+        first_seq: int = self.__sequence.reserve(len(batch))
+        # El worker ya validó los logs al recibirlos
+        logs: list[LogEntry] = batch.entries(first_seq, validate=False)
+        if self.__journal is not None:
+            for log_entry in logs:
+                self.__journal.append(log_entry)
+        rejected: list[int] = [
+            index for index, log_entry in enumerate(logs)
+            if self.__cache.admit_log(log_entry) is not Admission.ACCEPTED
+        ]
+        return {"first_seq": first_seq, "rejected": rejected}
+
+    def __get_logs(self, args: dict) -> list[LogRow]:
+        return self.__cache.get_rows(
+            datetime.fromisoformat(args["start_time"]), datetime.fromisoformat(args["end_time"])
+        )
+
+    def __get_rows(self, args: dict) -> list[list]:
+        log_filter: LogFilter = LogFilter.of(contains=args.get("contains"), regex=args.get("regex"))
+        return self.__cache.get_rows(
+            datetime.fromisoformat(args["start_time"]), datetime.fromisoformat(args["end_time"]), log_filter,
+            args.get("source")
+        )
+
+    def __get_all_logs(self, args: dict) -> list[LogRow]:
+        return [
+            (log.timestamp.isoformat(), log.tag, log.message, log.seq, log.source) for log in self.__cache.get_all_logs()
+        ]
+
+    def __count_by_template(self, args: dict) -> list[list[int]]:
+        counts: dict[int, int] = self.__cache.count_by_template(
+            datetime.fromisoformat(args["start_time"]), datetime.fromisoformat(args["end_time"])
+        )
+        return [[cluster_id, count] for cluster_id, count in counts.items()]
+
+    def __template_timeline(self, args: dict) -> list[list]:
+        counts: dict[datetime, int] = self.__cache.template_timeline(
+            args["cluster_id"],
+            datetime.fromisoformat(args["start_time"]),
+            datetime.fromisoformat(args["end_time"]),
+            timedelta(seconds=args["bucket_seconds"]),
+        )
+        return [[bucket_start.isoformat(), count] for bucket_start, count in counts.items()]
+
+    def __top(self, args: dict) -> list[list]:
+        return [list(entry) for entry in self.__cache.top(args["field"], args["k"])]
+
+    def __watermark_stats(self, args: dict) -> dict:
+        return self.__cache.watermark_stats()
+
+    async def __handle(self, reader: StreamReader, writer: StreamWriter) -> None:
+        """Atiende los mensajes de un worker hasta que cierra la conexión.
+
+        Las operaciones se ejecutan en el event loop del servidor, una a la
+        vez, así que el TemporalCache no necesita locks. Tras cada ingesta
+        se limpia el cache y los logs podados se persisten en un hilo.
+        """
+        try:
+            while True:
+                (length,) = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+                request: dict = decode_frame(await reader.readexactly(length))
+                response: dict
+                try:
+                    result: object = self.__handlers[request["op"]](request.get("args", {}))
+                    response = {"ok": True, "result": result}
+                except Exception as e:
+                    response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+                if self.__template_miner is not None:
+                    response["templates"] = self.__template_miner.templates_since(request.get("known_templates", 0))
+                writer.write(encode_frame(response))
+                await writer.drain()
+
+                if request["op"] == "add_logs" and response["ok"]:
+                    pruned: list[LogRecord] = self.__cache.prune_cache()
+                    quarantined: list[LogRecord] = self.__cache.drain_quarantine()
+                    if pruned or quarantined:
+                        try:
+                            await to_thread(self.__save_pruned_logs, pruned, quarantined)
+                        except Exception as e:
+                            print(f"Error saving pruned logs: {e}")
+        except IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self) -> None:
+        """Escucha en el socket Unix hasta que el proceso termina."""
+        if exists(self.__socket_path):
+            remove(self.__socket_path)
+        server = await start_unix_server(self.__handle, path=self.__socket_path)
+        print(f"Cache server listening on {self.__socket_path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self.__journal is not None:
+                self.__journal.close()
+
+    def run(self) -> None:
+        run(self.serve())
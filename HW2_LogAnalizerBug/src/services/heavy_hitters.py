@@ -0,0 +1,215 @@
+from datetime import datetime, timedelta, timezone
+from typing import ClassVar, Hashable, Iterator
+
+from sortedcontainers import SortedDict
+
+
+class _Bucket:
+    """Nodo del stream-summary: los valores que tienen la misma cuenta, con su error."""
+    __slots__ = ("count", "values", "prev", "next")
+
+    def __init__(self, count: int):
+        self.count: int = count
+        self.values: dict[Hashable, int] = dict()
+        self.prev: _Bucket | None = None
+        self.next: _Bucket | None = None
+
+
+class SpaceSaving:
+    """Resumen Space-Saving de los valores más frecuentes de un stream.
+
+    Mantiene a lo sumo `capacity` contadores. Cuando llega un valor nuevo y
+    el resumen está lleno, reemplaza al contador mínimo y hereda su cuenta
+    como error. Todo valor con frecuencia mayor a N / capacity está
+    garantizado en el resumen y su cuenta sobreestima la real en a lo sumo
+    `error`.
+
+    Los contadores se guardan en un stream-summary: una lista doblemente
+    enlazada de buckets ordenados por cuenta, cada uno con los valores que
+    tienen esa cuenta. Incrementar un valor lo mueve al bucket siguiente y el
+    mínimo es siempre el primer bucket, así que `add` y `min_count` son O(1)
+    sin importar `capacity`.
+
+    Attributes:
+        __capacity (int): Cantidad máxima de contadores
+        __buckets (dict[Hashable, _Bucket]): Valor -> bucket con su cuenta
+        __head (_Bucket | None): Bucket de menor cuenta
+    """
+    def __init__(self, capacity: int):
+        self.__capacity: int = capacity
+        self.__buckets: dict[Hashable, _Bucket] = dict()
+        self.__head: _Bucket | None = None
+
+    @property
+    def full(self) -> bool:
+        return len(self.__buckets) >= self.__capacity
+
+    def min_count(self) -> int:
+        return self.__head.count if self.full else 0
+
+    def __contains__(self, value: Hashable) -> bool:
+        return value in self.__buckets
+
+    def __unlink(self, bucket: _Bucket) -> None:
+        if bucket.prev is None:
+            self.__head = bucket.next
+        else:
+            bucket.prev.next = bucket.next
+        if bucket.next is not None:
+            bucket.next.prev = bucket.prev
+
+    def __increment(self, value: Hashable, bucket: _Bucket) -> None:
+        """Mueve un valor al bucket de la cuenta siguiente, creándolo si no existe."""
+        error: int = bucket.values.pop(value)
+        target: _Bucket | None = bucket.next
+        if target is None or target.count != bucket.count + 1:
+            target = _Bucket(bucket.count + 1)
+            target.prev, target.next = bucket, bucket.next
+            if bucket.next is not None:
+                bucket.next.prev = target
+            bucket.next = target
+        target.values[value] = error
+        self.__buckets[value] = target
+        if not bucket.values:
+            self.__unlink(bucket)
+
+    def add(self, value: Hashable) -> None:
+        bucket: _Bucket | None = self.__buckets.get(value)
+        if bucket is not None:
+            self.__increment(value, bucket)
+        elif not self.full:
+            if self.__head is None or self.__head.count != 1:
+                bucket = _Bucket(1)
+                bucket.next = self.__head
+                if self.__head is not None:
+                    self.__head.prev = bucket
+                self.__head = bucket
+            self.__head.values[value] = 0
+            self.__buckets[value] = self.__head
+        else:
+            # El nuevo valor ocupa el lugar de uno de cuenta mínima y hereda esa cuenta como error
+            bucket = self.__head
+            evicted, _ = bucket.values.popitem()
+            del self.__buckets[evicted]
+            bucket.values[value] = bucket.count
+            self.__buckets[value] = bucket
+            self.__increment(value, bucket)
+
+    def items(self) -> Iterator[tuple[Hashable, tuple[int, int]]]:
+        """(valor, (cuenta, error)) de cada contador."""
+        bucket: _Bucket | None = self.__head
+        while bucket is not None:
+            for value, error in bucket.values.items():
+                yield value, (bucket.count, error)
+            bucket = bucket.next
+
+
+class HeavyHitters:
+    """Valores más frecuentes por campo (tag, componente, plantilla) en la ventana caliente.
+
+    Los logs aceptados por el cache se cuentan en un resumen Space-Saving por
+    campo y por intervalo de `slot_seconds` de tiempo de evento. Al limpiar el
+    cache se descartan los intervalos que quedaron enteros antes del umbral,
+    de modo que el top-k sigue a la ventana sin decrementar contadores. La
+    memoria queda acotada a `capacity` contadores por campo e intervalo, sin
+    importar cuántos valores distintos aparezcan.
+
+    Las cuentas del top-k son la suma de los intervalos vivos: pueden incluir
+    hasta un intervalo de logs ya podados y, si algún resumen se llenó,
+    sobreestimar en a lo sumo `max_error`.
+
+    Attributes:
+        __slot (timedelta): Ancho de cada intervalo
+        __capacity (int): Contadores por campo e intervalo
+        __slots (SortedDict): Intervalo -> {campo: SpaceSaving}
+    """
+    FIELDS: ClassVar[tuple[str, ...]] = ("tag", "component", "template")
+    EPOCH: ClassVar[datetime] = datetime(1970, 1, 1)
+    EPOCH_UTC: ClassVar[datetime] = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+    def __init__(self, capacity: int = 256, slot_seconds: int = 10):
+        assert capacity > 0, "capacity must be positive"
+        assert slot_seconds > 0, "slot_seconds must be positive"
+
+        self.__slot: timedelta = timedelta(seconds=slot_seconds)
+        self.__capacity: int = capacity
+        self.__slots: SortedDict = SortedDict()
+
+    def __slot_id(self, timestamp: datetime) -> int:
+        epoch: datetime = self.EPOCH if timestamp.tzinfo is None else self.EPOCH_UTC
+        return (timestamp - epoch) // self.__slot
+
+    def add(self, timestamp: datetime, values: dict[str, Hashable | None]) -> 'HeavyHitters':
+        """Cuenta los valores de un log aceptado por el cache.
+
+        Args:
+            timestamp (datetime): Timestamp del log
+            values (dict[str, Hashable | None]): Valor de cada campo; None si el log no lo tiene
+
+        Returns:
+            HeavyHitters: Self para permitir encadenamiento de métodos
+        """
+        slot_id: int = self.__slot_id(timestamp)
+        summaries: dict[str, SpaceSaving] | None = self.__slots.get(slot_id)
+        if summaries is None:
+            summaries = {field: SpaceSaving(self.__capacity) for field in self.FIELDS}
+            self.__slots[slot_id] = summaries
+        for field, value in values.items():
+            if value is not None:
+                summaries[field].add(value)
+        return self
+
+    def expire(self, threshold: datetime | None) -> 'HeavyHitters':
+        """Descarta los intervalos que terminan antes del umbral de la ventana.
+
+        Args:
+            threshold (datetime | None): Umbral del LogPruner; None no descarta nada
+
+        Returns:
+            HeavyHitters: Self para permitir encadenamiento de métodos
+        """
+        if threshold is None:
+            return self
+        oldest_live: int = self.__slot_id(threshold)
+        while self.__slots and self.__slots.peekitem(0)[0] < oldest_live:
+            self.__slots.popitem(0)
+        return self
+
+    def top(self, field: str, k: int) -> list[tuple[Hashable, int, int]]:
+        """Devuelve los k valores más frecuentes de un campo en la ventana.
+
+        Args:
+            field (str): "tag", "component" o "template"
+            k (int): Cantidad de valores
+
+        Returns:
+            list[tuple[Hashable, int, int]]: (valor, cuenta, max_error) por cuenta descendente
+        """
+        assert field in self.FIELDS, f"field must be one of {self.FIELDS}"
+        counts: dict[Hashable, int] = dict()
+        errors: dict[Hashable, int] = dict()
+        full_summaries: list[SpaceSaving] = list()
+        for summaries in self.__slots.values():
+            summary: SpaceSaving = summaries[field]
+            if summary.full:
+                full_summaries.append(summary)
+            for value, (count, error) in summary.items():
+                counts[value] = counts.get(value, 0) + count
+                errors[value] = errors.get(value, 0) + error
+
+        # Un valor ausente de un resumen lleno pudo tener hasta su mínimo en ese intervalo
+        for summary in full_summaries:
+            minimum: int = summary.min_count()
+            for value in counts:
+                if value not in summary:
+                    errors[value] += minimum
+
+        ranked: list[tuple[Hashable, int]] = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        return [(value, count, errors[value]) for value, count in ranked[:k]]
+
+    def stats(self) -> dict:
+        return {
+            "slots": len(self.__slots),
+            "slot_seconds": int(self.__slot.total_seconds()),
+            "capacity": self.__capacity,
+        }
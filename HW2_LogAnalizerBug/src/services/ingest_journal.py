@@ -0,0 +1,259 @@
+from bisect import bisect_right
+from os import fsync, listdir, makedirs, remove
+from os.path import abspath, join
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import ClassVar, Iterator, TextIO
+
+from src.model.log_entry import LogEntry
+from src.model.log_record import LogRecord
+
+
+class IngestJournal:
+    """Journal append-only de los logs aceptados por la API.
+
+    Cada log se escribe como una línea JSON en el segmento activo antes de
+    entrar al TemporalCache. Las escrituras se agrupan (group commit): el
+    fsync se hace cada `sync_interval_ms` milisegundos o cada
+    `sync_batch_size` entradas, lo que ocurra primero.
+
+    Cada línea incluye la secuencia de ingesta (`seq`) del log. Un segmento se
+    elimina cuando todos sus logs fueron persistidos en SQLite (ver
+    `mark_persisted`). Tras una caída, un segmento parcialmente persistido se
+    reproduce completo; SQLite ignora las secuencias ya guardadas.
+
+    Attributes:
+        __journal_dir (str): Directorio donde se guardan los segmentos
+        __sync_interval (float): Intervalo máximo entre fsync, en segundos
+        __sync_batch_size (int): Cantidad máxima de entradas sin fsync
+        __segment_max_entries (int): Entradas por segmento antes de rotar
+    """
+    SEGMENT_PREFIX: ClassVar[str] = "segment-"
+    SEGMENT_SUFFIX: ClassVar[str] = ".log"
+
+    def __init__(
+        self,
+        journal_dir: str,
+        sync_interval_ms: int = 50,
+        sync_batch_size: int = 256,
+        segment_max_entries: int = 10_000,
+    ):
+        assert sync_interval_ms > 0, "sync_interval_ms must be positive"
+        assert sync_batch_size > 0, "sync_batch_size must be positive"
+        assert segment_max_entries > 0, "segment_max_entries must be positive"
+
+        self.__journal_dir: str = abspath(journal_dir)
+        makedirs(self.__journal_dir, exist_ok=True)
+
+        self.__sync_interval: float = sync_interval_ms / 1000
+        self.__sync_batch_size: int = sync_batch_size
+        self.__segment_max_entries: int = segment_max_entries
+
+        self.__lock: Lock = Lock()
+        self.__pending_sync: int = 0
+        self.__last_sync: float = monotonic()
+
+        # Logs pendientes de persistir por segmento y primera y última secuencia
+        # de cada segmento (listas paralelas ordenadas) para ubicar un seq con bisect.
+        self.__outstanding: dict[int, int] = dict()
+        self.__segment_first_seqs: list[int] = list()
+        self.__segment_last_seqs: list[int] = list()
+        self.__segment_ids: list[int] = list()
+        # Segmentos con logs sin secuencia (formato anterior), ver discard_legacy
+        self.__legacy_segments: set[int] = set()
+
+        existing: list[int] = self.__list_segments()
+        self.__active_segment: int = existing[-1] + 1 if existing else 1
+        self.__active_entries: int = 0
+        self.__file: TextIO = self.__open_segment(self.__active_segment)
+
+        self.__stop: Event = Event()
+        self.__syncer: Thread = Thread(target=self.__sync_loop, daemon=True)
+        self.__syncer.start()
+
+    def __segment_path(self, segment: int) -> str:
+        return join(self.__journal_dir, f"{self.SEGMENT_PREFIX}{segment:08d}{self.SEGMENT_SUFFIX}")
+
+    def __list_segments(self) -> list[int]:
+        segments: list[int] = list()
+        for name in listdir(self.__journal_dir):
+            if name.startswith(self.SEGMENT_PREFIX) and name.endswith(self.SEGMENT_SUFFIX):
+                segments.append(int(name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)]))
+        return sorted(segments)
+
+    def __open_segment(self, segment: int) -> TextIO:
+        self.__outstanding.setdefault(segment, 0)
+        return open(self.__segment_path(segment), "a", encoding="utf-8")
+
+    def __track(self, seq: int | None, segment: int) -> None:
+        if seq is None:
+            self.__legacy_segments.add(segment)
+            return
+        self.__outstanding[segment] += 1
+        if not self.__segment_ids or self.__segment_ids[-1] != segment:
+            self.__segment_first_seqs.append(seq)
+            self.__segment_last_seqs.append(seq)
+            self.__segment_ids.append(segment)
+        else:
+            self.__segment_last_seqs[-1] = max(self.__segment_last_seqs[-1], seq)
+
+    def __forget(self, segment: int) -> None:
+        """Deja de seguir un segmento y lo elimina del disco. Requiere el lock."""
+        self.__outstanding.pop(segment, None)
+        if segment in self.__segment_ids:
+            index: int = self.__segment_ids.index(segment)
+            del self.__segment_ids[index]
+            del self.__segment_first_seqs[index]
+            del self.__segment_last_seqs[index]
+        remove(self.__segment_path(segment))
+
+    def __sync(self) -> None:
+        """Vuelca el buffer del segmento activo a disco. Requiere el lock."""
+        if not self.__pending_sync:
+            return
+        self.__file.flush()
+        fsync(self.__file.fileno())
+        self.__pending_sync = 0
+        self.__last_sync = monotonic()
+
+    def __sync_loop(self) -> None:
+        """Garantiza el fsync periódico aunque no lleguen nuevas entradas."""
+        while not self.__stop.wait(self.__sync_interval):
+            with self.__lock:
+                if monotonic() - self.__last_sync >= self.__sync_interval:
+                    self.__sync()
+
+    def __rotate(self) -> None:
+        """Cierra el segmento activo y abre uno nuevo. Requiere el lock."""
+        self.__sync()
+        self.__file.close()
+        finished: int = self.__active_segment
+        self.__active_segment += 1
+        self.__active_entries = 0
+        self.__file = self.__open_segment(self.__active_segment)
+        self.__drop_if_persisted(finished)
+
+    def __drop_if_persisted(self, segment: int) -> None:
+        """Elimina un segmento cerrado cuyos logs ya están en SQLite. Requiere el lock."""
+        if (
+            segment == self.__active_segment
+            or segment in self.__legacy_segments
+            or self.__outstanding.get(segment)
+        ):
+            return
+        self.__forget(segment)
+
+    def append(self, log_entry: LogEntry) -> 'IngestJournal':
+        """Escribe un log en el segmento activo.
+
+        El fsync se difiere hasta completar el lote (`sync_batch_size`) o
+        hasta que venza `sync_interval_ms`.
+
+        Args:
+            log_entry (LogEntry): Log recibido por la API, con su `seq` asignado
+
+        Returns:
+            IngestJournal: Self para permitir encadenamiento de métodos
+        """
+        line: str = log_entry.model_dump_json() + "\n"
+        with self.__lock:
+            self.__file.write(line)
+            self.__track(log_entry.seq, self.__active_segment)
+            self.__active_entries += 1
+            self.__pending_sync += 1
+
+            if self.__active_entries >= self.__segment_max_entries:
+                self.__rotate()
+            elif (
+                self.__pending_sync >= self.__sync_batch_size
+                or monotonic() - self.__last_sync >= self.__sync_interval
+            ):
+                self.__sync()
+        return self
+
+    def replay(self) -> Iterator[LogEntry]:
+        """Reproduce los logs de los segmentos existentes, del más antiguo al más nuevo.
+
+        Se usa al iniciar la aplicación para reconstruir el TemporalCache.
+        Las líneas incompletas (escritura interrumpida por una caída) se ignoran.
+        Los segmentos reproducidos quedan registrados como pendientes hasta
+        que sus logs se persistan. Los logs escritos antes de que existieran
+        las secuencias de ingesta se devuelven con `seq=None`.
+
+        Yields:
+            LogEntry: Logs en el orden en que fueron aceptados
+        """
+        for segment in self.__list_segments():
+            if segment == self.__active_segment:
+                continue
+            with self.__lock:
+                self.__outstanding.setdefault(segment, 0)
+            with open(self.__segment_path(segment), "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        log_entry: LogEntry = LogEntry.model_validate_json(line)
+                    except ValueError:
+                        print(f"Skipping corrupt journal line in segment {segment}")
+                        continue
+                    with self.__lock:
+                        self.__track(log_entry.seq, segment)
+                    yield log_entry
+            with self.__lock:
+                self.__drop_if_persisted(segment)
+
+    def mark_persisted(self, logs: list[LogRecord]) -> 'IngestJournal':
+        """Registra que los logs ya fueron guardados en SQLite.
+
+        Los segmentos cerrados sin logs pendientes se eliminan del disco.
+        Como las secuencias de ingesta crecen junto con los segmentos, el
+        segmento de cada log se obtiene con una búsqueda binaria sobre la
+        primera secuencia de cada segmento. Los logs de segmentos ya eliminados
+        (por ejemplo, persistidos otra vez) se ignoran.
+
+        Args:
+            logs (list[LogRecord]): Registros persistidos por `SQliteConn.save_logs`
+
+        Returns:
+            IngestJournal: Self para permitir encadenamiento de métodos
+        """
+        with self.__lock:
+            released: set[int] = set()
+            for log in logs:
+                if log.seq is None:
+                    continue
+                index: int = bisect_right(self.__segment_first_seqs, log.seq) - 1
+                if index < 0 or log.seq > self.__segment_last_seqs[index]:
+                    continue
+                segment: int = self.__segment_ids[index]
+                if not self.__outstanding.get(segment):
+                    continue
+                self.__outstanding[segment] -= 1
+                released.add(segment)
+
+            for segment in released:
+                self.__drop_if_persisted(segment)
+        return self
+
+    def discard_legacy(self) -> 'IngestJournal':
+        """Elimina los segmentos escritos antes de que existieran las secuencias de ingesta.
+
+        La API vuelve a registrar sus logs (ya con secuencia) en el segmento
+        activo durante la reproducción; este método se llama al terminar.
+
+        Returns:
+            IngestJournal: Self para permitir encadenamiento de métodos
+        """
+        with self.__lock:
+            self.__sync()
+            for segment in self.__legacy_segments:
+                self.__forget(segment)
+            self.__legacy_segments.clear()
+        return self
+
+    def close(self) -> None:
+        """Sincroniza el segmento activo y detiene el hilo de fsync."""
+        self.__stop.set()
+        self.__syncer.join()
+        with self.__lock:
+            self.__sync()
+            self.__file.close()
@@ -0,0 +1,152 @@
+from asyncio import Queue, QueueEmpty
+from collections import Counter
+
+from src.model.log_entry import LogEntry
+
+
+class IngestQueue:
+    """Cola acotada de ingesta entre la API y el TemporalCache.
+
+    Los productores (peticiones POST /logs) encolan los logs y una única tarea
+    consumidora los vacía hacia el cache, de modo que una ráfaga no dispara
+    trabajo ilimitado en memoria ni tareas en background.
+
+    La admisión usa dos watermarks con histéresis:
+    - A partir de `low_watermark` se descartan los logs con tags de baja
+      prioridad (`shed_tags`, por ejemplo DEBUG).
+    - Al alcanzar `high_watermark` la cola se satura y se rechazan las
+      peticiones completas (429) hasta que la profundidad baje a `low_watermark`.
+
+    Attributes:
+        __high_watermark (int): Profundidad a partir de la cual se rechazan peticiones
+        __low_watermark (int): Profundidad a partir de la cual se descartan `shed_tags`
+                               y a la que hay que bajar para volver a aceptar
+        __shed_tags (frozenset[str]): Tags de baja prioridad descartables
+        __batch_size (int): Máximo de logs entregados al consumidor por lote
+        __saturated (bool): True mientras se rechazan peticiones
+    """
+    def __init__(
+        self,
+        high_watermark: int = 10_000,
+        low_watermark: int = 5_000,
+        shed_tags: tuple[str, ...] = (),
+        batch_size: int = 500,
+        retry_after_seconds: int = 1,
+    ):
+        assert 0 < low_watermark <= high_watermark, "Watermarks must satisfy 0 < low_watermark <= high_watermark"
+        assert batch_size > 0, "batch_size must be positive"
+        assert retry_after_seconds > 0, "retry_after_seconds must be positive"
+
+        self.__high_watermark: int = high_watermark
+        self.__low_watermark: int = low_watermark
+        self.__shed_tags: frozenset[str] = frozenset(shed_tags)
+        self.__batch_size: int = batch_size
+        self.__retry_after_seconds: int = retry_after_seconds
+        self.__queue: Queue = Queue()
+        self.__saturated: bool = False
+
+        self.__accepted_count: int = 0
+        self.__rejected_count: int = 0
+        self.__rejected_requests: int = 0
+        self.__shed_counts: Counter = Counter()
+
+    @property
+    def depth(self) -> int:
+        return self.__queue.qsize()
+
+    @property
+    def retry_after_seconds(self) -> int:
+        return self.__retry_after_seconds
+
+    def admit(self, logs: list[LogEntry]) -> list[LogEntry] | None:
+        """Decide qué logs de una petición entran a la cola.
+
+        La petición se acepta o rechaza completa para que el cliente pueda
+        reintentarla sin duplicar logs; solo los `shed_tags` se descartan
+        individualmente.
+
+        Args:
+            logs (list[LogEntry]): Logs de la petición
+
+        Returns:
+            list[LogEntry] | None: Logs a encolar, o None si la cola está saturada
+
+        Example:
+            queue = IngestQueue(high_watermark=1000, low_watermark=500, shed_tags=("DEBUG",))
+            admitted = queue.admit(logs)  # None -> responder 429
+        """
+        depth: int = self.depth
+        if self.__saturated and depth <= self.__low_watermark:
+            self.__saturated = False
+
+        admitted: list[LogEntry] = logs
+        if depth >= self.__low_watermark and self.__shed_tags:
+            admitted = [log for log in logs if log.tag not in self.__shed_tags]
+
+        # Con la cola vacía se acepta cualquier petición, aunque supere el watermark por sí sola
+        if self.__saturated or (depth and depth + len(admitted) > self.__high_watermark):
+            self.__saturated = True
+            self.__rejected_count += len(logs)
+            self.__rejected_requests += 1
+            return None
+
+        if len(admitted) != len(logs):
+            self.__shed_counts.update(log.tag for log in logs if log.tag in self.__shed_tags)
+        return admitted
+
+    def put(self, logs: list[LogEntry]) -> 'IngestQueue':
+        """Encola logs previamente admitidos.
+
+        Args:
+            logs (list[LogEntry]): Logs devueltos por `admit`
+
+        Returns:
+            IngestQueue: Self para permitir encadenamiento de métodos
+        """
+        for log in logs:
+            self.__queue.put_nowait(log)
+        self.__accepted_count += len(logs)
+        return self
+
+    async def take(self) -> list[LogEntry]:
+        """Espera al menos un log y devuelve hasta `batch_size` logs en orden de llegada.
+
+        Returns:
+            list[LogEntry]: Lote de logs para el consumidor
+        """
+        batch: list[LogEntry] = [await self.__queue.get()]
+        batch.extend(self.drain(self.__batch_size - 1))
+        return batch
+
+    def drain(self, limit: int | None = None) -> list[LogEntry]:
+        """Extrae sin esperar hasta `limit` logs (todos si es None).
+
+        Returns:
+            list[LogEntry]: Logs extraídos en orden de llegada
+        """
+        logs: list[LogEntry] = list()
+        while limit is None or len(logs) < limit:
+            try:
+                logs.append(self.__queue.get_nowait())
+            except QueueEmpty:
+                break
+        return logs
+
+    def stats(self) -> dict:
+        """Devuelve la profundidad de la cola y los contadores de admisión.
+
+        Returns:
+            dict: depth, watermarks, estado de saturación y cantidades de logs
+                  aceptados, rechazados y descartados por tag
+        """
+        return {
+            "depth": self.depth,
+            "high_watermark": self.__high_watermark,
+            "low_watermark": self.__low_watermark,
+            "saturated": self.__saturated,
+            "accepted_count": self.__accepted_count,
+            "rejected_count": self.__rejected_count,
+            "rejected_requests": self.__rejected_requests,
+            "shed_count": sum(self.__shed_counts.values()),
+            "shed_by_tag": dict(self.__shed_counts),
+        }
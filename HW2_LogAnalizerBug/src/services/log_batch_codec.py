@@ -0,0 +1,208 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, ClassVar, Iterable
+
+import msgpack
+
+from src.model.log_batch import LogBatch
+from src.model.log_entry import LogEntry
+
+try:
+    import numpy as np
+    import pyarrow as pa
+except ImportError:  # pyarrow solo es necesario para application/vnd.apache.arrow.stream
+    np = None
+    pa = None
+
+
+class LogBatchCodec:
+    """Codifica y decodifica lotes columnares de logs en MessagePack o Arrow IPC.
+
+    Los shippers de alto volumen envían un lote como tres columnas
+    (timestamp, tag, message), más una columna `source` opcional con la
+    aplicación de cada log, en lugar de una lista de objetos JSON:
+    - MessagePack: un mapa {"timestamp": [...], "tag": [...], "message": [...]}.
+      Los timestamps son enteros (microsegundos desde 1970-01-01, sin zona),
+      strings ISO 8601 o timestamps nativos de MessagePack (UTC).
+    - Arrow IPC stream: record batches con las columnas timestamp
+      (`timestamp[us]`, con o sin zona), tag y message (string), el mismo
+      esquema que exporta GET /logs/export.
+
+    Cada columna se decodifica entera en C (msgpack, o Arrow + NumPy para los
+    timestamps), sin armar un dict por log.
+
+    Example:
+        codec = LogBatchCodec()
+        body = codec.encode(logs, "msgpack")
+        batch = codec.decode(body, "application/msgpack")
+    """
+    MEDIA_TYPES: ClassVar[dict[str, str]] = {
+        "msgpack": "application/msgpack",
+        "arrow": "application/vnd.apache.arrow.stream",
+    }
+    COLUMNS: ClassVar[tuple[str, ...]] = ("timestamp", "tag", "message")
+    SOURCE_COLUMN: ClassVar[str] = "source"
+    EPOCH: ClassVar[datetime] = datetime(1970, 1, 1)
+
+    @staticmethod
+    def available(file_format: str) -> bool:
+        """True si el formato ("msgpack" o "arrow") se puede usar; Arrow requiere pyarrow."""
+        return file_format == "msgpack" or pa is not None
+
+    def format_of(self, media_type: str) -> str | None:
+        """Formato ("msgpack" o "arrow") de un Content-Type, o None si no es soportado."""
+        media_type = media_type.split(";")[0].strip().lower()
+        for file_format, known in self.MEDIA_TYPES.items():
+            if media_type == known and self.available(file_format):
+                return file_format
+        return None
+
+    def __check_strings(self, name: str, values: list) -> None:
+        if not set(map(type, values)) <= {str}:
+            raise ValueError(f"Column {name} must contain only strings")
+
+    def __msgpack_timestamps(self, values: list) -> list[datetime]:
+        kinds: set[type] = set(map(type, values))
+        if kinds <= {int}:
+            if np is not None:
+                return np.array(values, dtype="datetime64[us]").astype(object).tolist()
+            return [self.EPOCH + timedelta(microseconds=value) for value in values]
+        if kinds <= {str}:
+            return list(map(datetime.fromisoformat, values))
+        if kinds <= {datetime}:
+            return values
+        raise ValueError("Column timestamp must contain only integers, ISO strings or timestamps")
+
+    def __decode_msgpack(self, body: bytes) -> LogBatch:
+        try:
+            columns: Any = msgpack.unpackb(body, raw=False, timestamp=3)
+        except (ValueError, TypeError, msgpack.UnpackException) as e:
+            raise ValueError(f"Invalid MessagePack body: {e}") from e
+        if not isinstance(columns, dict) or not all(isinstance(columns.get(name), list) for name in self.COLUMNS):
+            raise ValueError(f"MessagePack body must be a map of {self.COLUMNS} arrays")
+        timestamps, tags, messages = (columns[name] for name in self.COLUMNS)
+        sources: Any = columns.get(self.SOURCE_COLUMN)
+        if sources is not None and not isinstance(sources, list):
+            raise ValueError(f"Column {self.SOURCE_COLUMN} must be an array")
+        if not len(timestamps) == len(tags) == len(messages) == len(sources if sources is not None else tags):
+            raise ValueError("All columns must have the same length")
+
+        self.__check_strings("tag", tags)
+        self.__check_strings("message", messages)
+        if sources is not None:
+            self.__check_strings(self.SOURCE_COLUMN, sources)
+        return LogBatch(self.__msgpack_timestamps(timestamps), tags, messages, sources)
+
+    def __arrow_timestamps(self, column: 'pa.ChunkedArray') -> list[datetime]:
+        if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+            try:
+                column = column.cast(pa.timestamp("us"))
+            except pa.ArrowInvalid:
+                column = column.cast(pa.timestamp("us", tz="UTC"))
+        elif pa.types.is_integer(column.type):
+            column = column.cast(pa.timestamp("us"))
+        elif not pa.types.is_timestamp(column.type):
+            raise ValueError(f"Column timestamp has unsupported type {column.type}")
+
+        if column.type.tz is not None:
+            return column.cast(pa.timestamp("us", tz="UTC")).to_pylist()
+        return column.cast(pa.timestamp("us")).to_numpy().astype(object).tolist()
+
+    def __arrow_strings(self, column: 'pa.ChunkedArray', name: str) -> list[str]:
+        if not (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+            raise ValueError(f"Column {name} must be a string column, got {column.type}")
+        return column.to_pylist()
+
+    def __decode_arrow(self, body: bytes) -> LogBatch:
+        try:
+            table: pa.Table = pa.ipc.open_stream(body).read_all()
+        except (pa.ArrowException, OSError) as e:
+            raise ValueError(f"Invalid Arrow IPC stream: {e}") from e
+        missing: list[str] = [name for name in self.COLUMNS if name not in table.column_names]
+        if missing:
+            raise ValueError(f"Arrow stream is missing columns {missing}")
+        has_source: bool = self.SOURCE_COLUMN in table.column_names
+        for name in self.COLUMNS + ((self.SOURCE_COLUMN,) if has_source else ()):
+            if table.column(name).null_count:
+                raise ValueError(f"Column {name} must not contain nulls")
+
+        return LogBatch(
+            self.__arrow_timestamps(table.column("timestamp")),
+            self.__arrow_strings(table.column("tag"), "tag"),
+            self.__arrow_strings(table.column("message"), "message"),
+            self.__arrow_strings(table.column(self.SOURCE_COLUMN), self.SOURCE_COLUMN) if has_source else None,
+        )
+
+    def decode(self, body: bytes, media_type: str) -> LogBatch:
+        """Decodifica el cuerpo de una petición de ingesta binaria.
+
+        Args:
+            body (bytes): Cuerpo de la petición
+            media_type (str): Content-Type de la petición
+
+        Returns:
+            LogBatch: Columnas decodificadas
+
+        Raises:
+            ValueError: Si el Content-Type no es soportado o el cuerpo está mal formado
+        """
+        file_format: str | None = self.format_of(media_type)
+        if file_format is None:
+            raise ValueError(f"Unsupported media type {media_type}")
+        if file_format == "msgpack":
+            return self.__decode_msgpack(body)
+        return self.__decode_arrow(body)
+
+    def encode(self, logs: Iterable[LogEntry], file_format: str) -> bytes:
+        """Codifica logs como un lote columnar, del lado del shipper.
+
+        Los timestamps sin zona viajan como microsegundos desde 1970-01-01
+        (MessagePack) o `timestamp[us]` (Arrow); si alguno tiene zona se
+        envían todos en UTC (ISO 8601 o `timestamp[us, tz=UTC]`).
+
+        Args:
+            logs (Iterable[LogEntry]): Logs a enviar
+            file_format (str): "msgpack" o "arrow"
+
+        Returns:
+            bytes: Cuerpo de la petición para POST /logs/batch
+
+        Raises:
+            ValueError: Si el formato no existe o es "arrow" y pyarrow no está instalado
+        """
+        if file_format not in self.MEDIA_TYPES:
+            raise ValueError(f"format must be one of {tuple(self.MEDIA_TYPES)}")
+        if not self.available(file_format):
+            raise ValueError(f"Format {file_format} requires pyarrow")
+
+        logs = list(logs)
+        timestamps: list[datetime] = [log.timestamp for log in logs]
+        tags: list[str] = [log.tag for log in logs]
+        messages: list[str] = [log.message for log in logs]
+        sources: list[str] = [log.source for log in logs]
+        aware: bool = any(timestamp.tzinfo is not None for timestamp in timestamps)
+
+        if file_format == "msgpack":
+            return msgpack.packb({
+                "timestamp": [
+                    timestamp.astimezone(timezone.utc).isoformat() if aware
+                    else (timestamp - self.EPOCH) // timedelta(microseconds=1)
+                    for timestamp in timestamps
+                ],
+                "tag": tags,
+                "message": messages,
+                self.SOURCE_COLUMN: sources,
+            })
+
+        batch: pa.RecordBatch = pa.RecordBatch.from_arrays(
+            [
+                pa.array(timestamps, pa.timestamp("us", tz="UTC" if aware else None)),
+                pa.array(tags, pa.string()),
+                pa.array(messages, pa.string()),
+                pa.array(sources, pa.string()),
+            ],
+            names=[*self.COLUMNS, self.SOURCE_COLUMN],
+        )
+        sink: pa.BufferOutputStream = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, batch.schema) as stream_writer:
+            stream_writer.write_batch(batch)
+        return sink.getvalue().to_pybytes()
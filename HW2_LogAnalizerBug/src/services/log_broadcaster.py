@@ -0,0 +1,140 @@
+from asyncio import Queue, QueueEmpty, QueueFull
+from typing import ClassVar
+
+from src.model.log_entry import LogEntry
+
+
+class Subscription:
+    """Suscripción de un cliente al stream de logs en vivo.
+
+    Los logs que cumplen los filtros se encolan ya serializados a JSON en una
+    cola acotada. Si el cliente no consume a tiempo, se aplica la política de
+    consumidores lentos del LogBroadcaster.
+
+    Attributes:
+        queue (Queue): Cola acotada de logs serializados y eventos (dict); None indica cierre
+        tags (frozenset[str] | None): Tags aceptados; None acepta todos
+        contains (str | None): Subcadena que debe contener el mensaje
+        dropped (int): Logs descartados desde la última entrega
+        closed (bool): True si el broadcaster desconectó la suscripción
+    """
+    def __init__(self, queue_size: int, tags: list[str] | None, contains: str | None):
+        self.queue: Queue = Queue(maxsize=queue_size)
+        self.tags: frozenset[str] | None = frozenset(tags) if tags else None
+        self.contains: str | None = contains or None
+        self.dropped: int = 0
+        self.closed: bool = False
+
+    def matches(self, log_entry: LogEntry) -> bool:
+        if self.tags is not None and log_entry.tag not in self.tags:
+            return False
+        return self.contains is None or self.contains in log_entry.message
+
+    def take_dropped(self) -> int:
+        """Devuelve y reinicia la cantidad de logs descartados."""
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+class LogBroadcaster:
+    """Distribuye los logs ingeridos a los clientes suscritos al live-tail.
+
+    `publish` nunca bloquea la ingesta: cada log se serializa una sola vez y se
+    encola sin esperar en la cola de cada suscriptor. Cuando la cola de un
+    suscriptor está llena se aplica `slow_consumer_policy`:
+    - "drop": se desconecta al suscriptor
+    - "sample": se descarta el log para ese suscriptor y se informa la cantidad
+      de logs perdidos en la siguiente entrega
+
+    Attributes:
+        __queue_size (int): Capacidad de la cola de cada suscriptor
+        __slow_consumer_policy (str): "drop" o "sample"
+        __subscriptions (set[Subscription]): Suscripciones activas
+    """
+    SLOW_CONSUMER_POLICIES: ClassVar[tuple[str, ...]] = ("drop", "sample")
+
+    def __init__(self, queue_size: int = 1000, slow_consumer_policy: str = "sample"):
+        assert queue_size > 0, "queue_size must be positive"
+        assert slow_consumer_policy in self.SLOW_CONSUMER_POLICIES, \
+            f"slow_consumer_policy must be one of {self.SLOW_CONSUMER_POLICIES}"
+
+        self.__queue_size: int = queue_size
+        self.__slow_consumer_policy: str = slow_consumer_policy
+        self.__subscriptions: set[Subscription] = set()
+
+    @property
+    def subscribers_count(self) -> int:
+        return len(self.__subscriptions)
+
+    def subscribe(self, tags: list[str] | None = None, contains: str | None = None) -> Subscription:
+        """Registra un nuevo suscriptor con filtros opcionales.
+
+        Args:
+            tags (list[str] | None): Tags a recibir; None recibe todos
+            contains (str | None): Subcadena que debe contener el mensaje
+
+        Returns:
+            Subscription: Suscripción cuya cola recibe los logs
+        """
+        subscription: Subscription = Subscription(self.__queue_size, tags, contains)
+        self.__subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> 'LogBroadcaster':
+        self.__subscriptions.discard(subscription)
+        return self
+
+    def __disconnect(self, subscription: Subscription) -> None:
+        """Desconecta a un consumidor lento dejando solo la marca de cierre en su cola."""
+        subscription.closed = True
+        self.__subscriptions.discard(subscription)
+        while True:
+            try:
+                subscription.queue.get_nowait()
+            except QueueEmpty:
+                break
+        subscription.queue.put_nowait(None)
+
+    def publish(self, log_entry: LogEntry) -> None:
+        """Entrega un log a todas las suscripciones cuyos filtros lo aceptan.
+
+        Debe llamarse desde el event loop (es el listener de TemporalCache.add_log).
+
+        Args:
+            log_entry (LogEntry): Log recién ingerido
+        """
+        if not self.__subscriptions:
+            return
+
+        payload: str | None = None
+        for subscription in list(self.__subscriptions):
+            if not subscription.matches(log_entry):
+                continue
+            if payload is None:
+                payload = log_entry.model_dump_json()
+            try:
+                subscription.queue.put_nowait(payload)
+            except QueueFull:
+                if self.__slow_consumer_policy == "drop":
+                    self.__disconnect(subscription)
+                else:
+                    subscription.dropped += 1
+
+    def publish_event(self, event: str, data: dict) -> None:
+        """Entrega un evento a todas las suscripciones, sin aplicar sus filtros.
+
+        Se usa para las alertas de StreamAnalytics, que interesan aunque el
+        cliente solo siga algunos tags.
+
+        Args:
+            event (str): Nombre del evento (por ejemplo "alert")
+            data (dict): Contenido del evento, serializable a JSON
+        """
+        for subscription in list(self.__subscriptions):
+            try:
+                subscription.queue.put_nowait({"event": event, **data})
+            except QueueFull:
+                if self.__slow_consumer_policy == "drop":
+                    self.__disconnect(subscription)
+                else:
+                    subscription.dropped += 1
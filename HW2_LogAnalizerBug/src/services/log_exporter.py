@@ -0,0 +1,180 @@
+from csv import writer
+from io import StringIO
+from itertools import islice
+from typing import ClassVar, Iterable, Iterator
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow solo es necesario para los formatos columnares
+    pa = None
+    pq = None
+
+
+class ChunkSink:
+    """Archivo de solo escritura que acumula bytes hasta que el exportador los entrega.
+
+    Los writers de pyarrow escriben sobre este objeto y, después de cada
+    lote, el exportador toma lo acumulado y lo envía al cliente, así que en
+    memoria queda a lo sumo un row group.
+    """
+    def __init__(self):
+        self.__chunks: list[bytes] = list()
+        self.__position: int = 0
+        self.closed: bool = False
+
+    def write(self, data) -> int:
+        chunk: bytes = bytes(data)
+        self.__chunks.append(chunk)
+        self.__position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self.__position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def take(self) -> bytes:
+        data: bytes = b"".join(self.__chunks)
+        self.__chunks = list()
+        return data
+
+
+class LogExporter:
+    """Exporta filas de logs como CSV, Arrow IPC o Parquet en un stream de bytes.
+
+    Recibe filas (timestamp ISO, tag, message, seq, source) ya ordenadas, sin
+    construir LogEntry, y las agrupa de a `row_group_size`: cada grupo se
+    convierte en un record batch (Arrow), un row group (Parquet) o un bloque
+    de líneas (CSV) y se entrega apenas se escribe, por lo que la memoria no
+    depende del tamaño del rango exportado.
+
+    Los timestamps se exportan como `timestamp[us]`; los que tienen zona
+    horaria se normalizan a UTC.
+
+    Attributes:
+        __row_group_size (int): Filas por record batch o row group
+        __compression (str): Códec de compresión de Arrow y Parquet
+    """
+    FORMATS: ClassVar[tuple[str, ...]] = ("parquet", "arrow", "csv")
+    MEDIA_TYPES: ClassVar[dict[str, str]] = {
+        "parquet": "application/vnd.apache.parquet",
+        "arrow": "application/vnd.apache.arrow.stream",
+        "csv": "text/csv",
+    }
+    COLUMNS: ClassVar[tuple[str, ...]] = ("timestamp", "tag", "message", "seq", "source")
+
+    def __init__(self, row_group_size: int = 50_000, compression: str = "zstd"):
+        assert row_group_size > 0, "row_group_size must be positive"
+        self.__row_group_size: int = row_group_size
+        self.__compression: str = compression
+
+    @staticmethod
+    def columnar_available() -> bool:
+        """True si pyarrow está instalado (necesario para "arrow" y "parquet")."""
+        return pa is not None
+
+    def __groups(self, rows: Iterable[tuple], row_group_size: int) -> Iterator[list[tuple]]:
+        iterator: Iterator[tuple] = iter(rows)
+        while group := list(islice(iterator, row_group_size)):
+            yield group
+
+    def __schema(self) -> 'pa.Schema':
+        return pa.schema([
+            ("timestamp", pa.timestamp("us")),
+            ("tag", pa.string()),
+            ("message", pa.string()),
+            ("seq", pa.int64()),
+            ("source", pa.string()),
+        ])
+
+    def __timestamps(self, values: list[str]) -> 'pa.Array':
+        array: pa.Array = pa.array(values, pa.string())
+        try:
+            return array.cast(pa.timestamp("us"))
+        except pa.ArrowInvalid:
+            return array.cast(pa.timestamp("us", tz="UTC")).cast(pa.timestamp("us"))
+
+    def __record_batch(self, group: list[tuple]) -> 'pa.RecordBatch':
+        timestamps, tags, messages, seqs, sources = zip(*group)
+        return pa.RecordBatch.from_arrays(
+            [
+                self.__timestamps(list(timestamps)),
+                pa.array(tags, pa.string()),
+                pa.array(messages, pa.string()),
+                pa.array(seqs, pa.int64()),
+                pa.array(sources, pa.string()),
+            ],
+            schema=self.__schema(),
+        )
+
+    def __export_csv(self, rows: Iterable[tuple], row_group_size: int) -> Iterator[bytes]:
+        buffer: StringIO = StringIO()
+        csv_writer = writer(buffer)
+        csv_writer.writerow(self.COLUMNS)
+        for group in self.__groups(rows, row_group_size):
+            csv_writer.writerows(group)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    def __export_arrow(self, rows: Iterable[tuple], row_group_size: int) -> Iterator[bytes]:
+        sink: ChunkSink = ChunkSink()
+        options: pa.ipc.IpcWriteOptions = pa.ipc.IpcWriteOptions(compression=self.__compression)
+        with pa.ipc.new_stream(sink, self.__schema(), options=options) as stream_writer:
+            for group in self.__groups(rows, row_group_size):
+                stream_writer.write_batch(self.__record_batch(group))
+                yield sink.take()
+        yield sink.take()
+
+    def __export_parquet(self, rows: Iterable[tuple], row_group_size: int) -> Iterator[bytes]:
+        sink: ChunkSink = ChunkSink()
+        with pq.ParquetWriter(sink, self.__schema(), compression=self.__compression) as parquet_writer:
+            for group in self.__groups(rows, row_group_size):
+                parquet_writer.write_batch(self.__record_batch(group), row_group_size=len(group))
+                yield sink.take()
+        yield sink.take()
+
+    def export(self, rows: Iterable[tuple], file_format: str, row_group_size: int | None = None) -> Iterator[bytes]:
+        """Genera el archivo exportado de a un row group por vez.
+
+        Args:
+            rows (Iterable[tuple]): Filas (timestamp ISO, tag, message, seq, source) ordenadas
+            file_format (str): "parquet", "arrow" o "csv"
+            row_group_size (int | None): Filas por grupo; por defecto el del exportador
+
+        Yields:
+            bytes: Fragmentos consecutivos del archivo
+
+        Raises:
+            ValueError: Si el formato no existe o requiere pyarrow y no está instalado
+
+        Example:
+            exporter = LogExporter(row_group_size=10_000)
+            with open("logs.parquet", "wb") as file:
+                for chunk in exporter.export(sqlite.iter_rows(start, end), "parquet"):
+                    file.write(chunk)
+        """
+        if file_format not in self.FORMATS:
+            raise ValueError(f"format must be one of {self.FORMATS}")
+        if file_format != "csv" and not self.columnar_available():
+            raise ValueError(f"Format {file_format} requires pyarrow")
+        row_group_size = row_group_size or self.__row_group_size
+
+        if file_format == "csv":
+            return self.__export_csv(rows, row_group_size)
+        if file_format == "arrow":
+            return self.__export_arrow(rows, row_group_size)
+        return self.__export_parquet(rows, row_group_size)
@@ -0,0 +1,91 @@
+import re
+from functools import lru_cache
+from threading import Lock
+from typing import Callable
+
+from src.services.template_miner import TemplateMiner
+
+
+class LogFilter:
+    """Filtro de mensajes por subcadena y/o expresión regular, aplicable en cache y SQLite.
+
+    Se construye con `LogFilter.of`, que guarda un filtro por firma
+    (contains, regex): el patrón se compila una sola vez y el registro de
+    qué plantillas contienen la subcadena en su texto fijo se reutiliza entre
+    peticiones (las versiones de plantilla son inmutables).
+
+    Los logs codificados con una plantilla cuyo texto fijo contiene la
+    subcadena la cumplen sin reconstruir el mensaje; el resto se evalúa sobre
+    el mensaje.
+
+    Attributes:
+        contains (str | None): Subcadena que debe contener el mensaje
+        regex (str | None): Expresión regular que debe encontrarse en el mensaje
+        __search (Callable | None): `search` del patrón compilado
+        __template_hits (list[bool]): Por template_id, si su texto fijo contiene `contains`
+    """
+    def __init__(self, contains: str | None = None, regex: str | None = None):
+        self.contains: str | None = contains or None
+        self.regex: str | None = regex or None
+        self.__search: Callable[[str], re.Match | None] | None = \
+            None if self.regex is None else re.compile(self.regex).search
+        self.__template_hits: list[bool] = list()
+        # Los shards consultan el mismo filtro desde varios hilos
+        self.__lock: Lock = Lock()
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def of(contains: str | None = None, regex: str | None = None) -> 'LogFilter':
+        """Devuelve el filtro de una firma, compilándolo solo la primera vez.
+
+        Raises:
+            re.error: Si `regex` no es una expresión regular válida
+        """
+        return LogFilter(contains, regex)
+
+    @property
+    def active(self) -> bool:
+        return self.contains is not None or self.regex is not None
+
+    def __sync_templates(self, template_miner: TemplateMiner) -> None:
+        if len(self.__template_hits) >= template_miner.templates_count:
+            return
+        with self.__lock:
+            for template_id in range(len(self.__template_hits), template_miner.templates_count):
+                self.__template_hits.append(
+                    any(self.contains in literal for literal in template_miner.literals(template_id))
+                )
+
+    def template_hits(self, template_miner: TemplateMiner | None) -> list[int]:
+        """Versiones de plantilla cuyos logs contienen `contains` sin importar sus parámetros."""
+        if self.contains is None or template_miner is None:
+            return list()
+        self.__sync_templates(template_miner)
+        return [template_id for template_id, hit in enumerate(self.__template_hits) if hit]
+
+    def matches(self, message: str) -> bool:
+        if self.contains is not None and self.contains not in message:
+            return False
+        return self.__search is None or self.__search(message) is not None
+
+    def accepts(self, template_id: int | None, message: str, template_miner: TemplateMiner | None = None) -> bool:
+        """Evalúa el filtro sobre un log, evitando buscar la subcadena si la garantiza la plantilla.
+
+        Args:
+            template_id (int | None): Versión de plantilla del log (None si no está codificado)
+            message (str): Mensaje del log
+            template_miner (TemplateMiner | None): Minero que codificó el log
+
+        Returns:
+            bool: True si el log cumple el filtro
+        """
+        if self.contains is not None and template_id is not None and template_miner is not None:
+            self.__sync_templates(template_miner)
+            if self.__template_hits[template_id]:
+                return self.__search is None or self.__search(message) is not None
+        return self.matches(message)
+
+    @staticmethod
+    def regexp(pattern: str, value: str | None) -> bool:
+        """Función REGEXP de SQLite (`value REGEXP pattern`); el patrón sale de la caché de firmas."""
+        return value is not None and LogFilter.of(regex=pattern).matches(value)
@@ -1,70 +1,183 @@
 from collections import deque
 from datetime import datetime, timedelta
+from enum import Enum
+from typing import ClassVar
 
 from sortedcontainers import SortedDict
-from src.model.log_entry import LogEntry
+from src.model.log_record import LogRecord
+
+
+class Admission(Enum):
+    """Resultado de admitir un timestamp en la ventana del cache."""
+    ACCEPTED = "accepted"
+    LATE = "late"
+    QUARANTINED = "quarantined"
+
 
 class LogPruner:
-    def __init__(self, window_minutes: int):
-        self.__window_minutes: int = window_minutes
-        self.__timestamps: deque[datetime] = deque()
-    
+    """Mantiene la ventana temporal del cache usando watermarks de tiempo de evento.
+
+    El watermark es el timestamp más reciente observado menos la demora
+    permitida (`allowed_lateness_seconds`). Todo log anterior a
+    `watermark - window_minutes` se considera fuera de la ventana: si ya está
+    en el cache se elimina en `prune` y si llega tarde se envía directo a la
+    base de datos.
+
+    Los timestamps más de `max_future_seconds` por delante del reloj del
+    servidor (hosts con el reloj adelantado) no pueden adelantar el watermark:
+    con la política "clamp" avanzan el watermark solo hasta el límite permitido
+    y con "quarantine" se desvían a la base de datos sin entrar al cache.
+
+    Attributes:
+        __window (timedelta): Ventana temporal del cache
+        __allowed_lateness (timedelta): Demora máxima tolerada para logs desordenados
+        __max_future (timedelta | None): Adelanto máximo sobre el reloj del servidor
+        __future_policy (str): "clamp" o "quarantine"
+        __max_event_time (datetime | None): Timestamp más reciente admitido (acotado)
+    """
+    FUTURE_POLICIES: ClassVar[tuple[str, ...]] = ("clamp", "quarantine")
+
+    def __init__(
+        self,
+        window_minutes: int,
+        allowed_lateness_seconds: int = 0,
+        max_future_seconds: int | None = None,
+        future_policy: str = "clamp",
+        quarantine_size: int = 100,
+    ):
+        assert allowed_lateness_seconds >= 0, "allowed_lateness_seconds must be non-negative"
+        assert future_policy in self.FUTURE_POLICIES, f"future_policy must be one of {self.FUTURE_POLICIES}"
+
+        self.__window: timedelta = timedelta(minutes=window_minutes)
+        self.__allowed_lateness: timedelta = timedelta(seconds=allowed_lateness_seconds)
+        self.__max_future: timedelta | None = \
+            None if max_future_seconds is None else timedelta(seconds=max_future_seconds)
+        self.__future_policy: str = future_policy
+        self.__max_event_time: datetime | None = None
+
+        self.__late_count: int = 0
+        self.__quarantined_count: int = 0
+        self.__quarantine: deque[datetime] = deque(maxlen=quarantine_size)
+
+    @property
+    def watermark(self) -> datetime | None:
+        if self.__max_event_time is None:
+            return None
+        return self.__max_event_time - self.__allowed_lateness
+
+    @property
+    def threshold(self) -> datetime | None:
+        """Límite inferior de la ventana: los logs anteriores salen del cache."""
+        watermark: datetime | None = self.watermark
+        return None if watermark is None else watermark - self.__window
+
+    def __future_limit(self, timestamp: datetime) -> datetime | None:
+        if self.__max_future is None:
+            return None
+        return datetime.now(timestamp.tzinfo) + self.__max_future
+
     def register_timestamp(self, timestamp: datetime) -> 'LogPruner':
-        """Registra un nuevo timestamp para el seguimiento temporal de logs.
-    
-        Este método mantiene un registro ordenado de timestamps que se utilizan
-        para determinar qué logs deben ser eliminados del cache (pruning).
-        Los timestamps se almacenan en una cola doblemente terminada (deque)
-        para facilitar operaciones eficientes tanto al inicio como al final.
-        
+        """Registra un nuevo timestamp y avanza el watermark si corresponde.
+
+        Mantener solo el máximo hace que el registro sea O(1) por evento, sin
+        importar el orden de llegada de los logs. Los timestamps por delante de
+        `max_future_seconds` adelantan el watermark solo hasta ese límite.
+
         Args:
             timestamp (datetime): Marca temporal del log a registrar
-        
+
         Returns:
             LogPruner: Retorna self para permitir encadenamiento de métodos
-        
+
         Example:
             pruner = LogPruner(window_minutes=5)
             pruner.register_timestamp(datetime.now())
         """
-        self.__timestamps.append(timestamp)
+        limit: datetime | None = self.__future_limit(timestamp)
+        if limit is not None and timestamp > limit:
+            timestamp = limit
+        if self.__max_event_time is None or timestamp > self.__max_event_time:
+            self.__max_event_time = timestamp
         return self
 
-    def prune(self, logs_cache: SortedDict) -> list[LogEntry]:
-        """Elimina logs antiguos basándose en una ventana temporal deslizante.
-    
+    def admit(self, timestamp: datetime) -> Admission:
+        """Decide si un log entra al cache o se envía directo a la base de datos.
+
+        Args:
+            timestamp (datetime): Marca temporal del log
+
+        Returns:
+            Admission: ACCEPTED si entra al cache, LATE si ya está fuera de la
+                       ventana, QUARANTINED si es un timestamp futuro atípico
+                       y la política es "quarantine"
+        """
+        limit: datetime | None = self.__future_limit(timestamp)
+        if limit is not None and timestamp > limit and self.__future_policy == "quarantine":
+            self.__quarantined_count += 1
+            self.__quarantine.append(timestamp)
+            return Admission.QUARANTINED
+
+        threshold: datetime | None = self.threshold
+        if threshold is not None and timestamp < threshold:
+            self.__late_count += 1
+            return Admission.LATE
+
+        self.register_timestamp(timestamp)
+        return Admission.ACCEPTED
+
+    def prune(self, logs_cache: SortedDict) -> list[LogRecord]:
+        """Elimina logs antiguos basándose en el watermark.
+
         Este método implementa la lógica de limpieza del cache temporal:
-        1. Encuentra el timestamp más reciente
-        2. Calcula un umbral restando window_minutes al más reciente
-        3. Elimina todos los logs anteriores al umbral
-        
+        1. Calcula el umbral como watermark - window_minutes
+        2. Extrae del inicio del cache (ordenado por timestamp) todas las
+           entradas anteriores al umbral
+
+        Como el cache está ordenado, los logs que llegaron desordenados también
+        se eliminan a tiempo, y cada entrada se visita una sola vez (costo
+        amortizado constante por evento).
+
         Args:
             logs_cache (SortedDict): Diccionario ordenado que contiene los logs,
                                     donde las claves son timestamps y los valores
-                                    son listas de LogEntry
-        
+                                    son listas de LogRecord
+
         Returns:
-            list[LogEntry]: Lista de logs que fueron eliminados del cache
-        
+            list[LogRecord]: Lista de registros que fueron eliminados del cache
+
         Example:
             cache = SortedDict()
             pruner = LogPruner(window_minutes=5)
             logs_eliminados = pruner.prune(cache)  # Elimina logs > 5 min
-        
+
         Note:
             La ventana temporal se configura en el constructor de LogPruner
             mediante el parámetro window_minutes.
         """
-        if not self.__timestamps:
-            return list()
-        
-        most_recent: datetime = max(self.__timestamps)
-        threshold = most_recent - timedelta(minutes=self.__window_minutes)
-        pruned_logs = list()
-        
-        while self.__timestamps and self.__timestamps[0] < threshold:
-            timestamp: datetime = self.__timestamps.popleft()
-            if timestamp in logs_cache:
-                pruned_logs.extend(logs_cache.pop(timestamp))
-        
-        return pruned_logs
\ No newline at end of file
+        threshold: datetime | None = self.threshold
+        pruned_logs: list[LogRecord] = list()
+        if threshold is None:
+            return pruned_logs
+
+        while logs_cache and logs_cache.peekitem(0)[0] < threshold:
+            _, records = logs_cache.popitem(0)
+            pruned_logs.extend(records)
+
+        return pruned_logs
+
+    def stats(self) -> dict:
+        """Devuelve el estado del watermark y los contadores de logs desviados.
+
+        Returns:
+            dict: watermark, threshold, late_count, quarantined_count y los
+                  últimos timestamps en cuarentena
+        """
+        watermark: datetime | None = self.watermark
+        threshold: datetime | None = self.threshold
+        return {
+            "watermark": watermark.isoformat() if watermark else None,
+            "threshold": threshold.isoformat() if threshold else None,
+            "late_count": self.__late_count,
+            "quarantined_count": self.__quarantined_count,
+            "recent_quarantined": [timestamp.isoformat() for timestamp in self.__quarantine],
+        }
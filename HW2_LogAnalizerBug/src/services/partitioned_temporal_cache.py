@@ -0,0 +1,292 @@
+from datetime import datetime, timedelta
+from heapq import merge
+from time import monotonic
+from typing import Callable, ClassVar, Iterable
+
+from src.model.log_entry import LogEntry
+from src.model.log_record import LogRecord
+from src.model.log_row import LogRow
+from src.services.log_pruner import Admission
+from src.services.temporal_cache import TemporalCache
+from src.services.log_filter import LogFilter
+
+
+class PartitionedTemporalCache:
+    """Cache temporal con una partición (TemporalCache) por fuente de logs.
+
+    Cada fuente (aplicación o job de Spark) tiene su propio TemporalCache,
+    creado a demanda por `build_partition`, con su propio LogPruner: la
+    ventana y el watermark de una fuente no dependen de las demás, así que un
+    job ruidoso o con el reloj adelantado no expulsa los logs de los otros.
+    Las consultas de una fuente leen solo su partición; las demás mezclan las
+    particiones por (timestamp, seq).
+
+    La fuente la elige el cliente, así que la cantidad de particiones está
+    acotada: las fuentes fuera de `allowed_sources` (si se indica) y las que
+    llegan cuando ya hay `max_sources` particiones comparten la partición
+    `OVERFLOW_SOURCE`, cuyos logs conservan su fuente. Una partición que no
+    recibe logs durante `idle_seconds` se descarta en `prune_cache`, que
+    devuelve todos sus registros para que se persistan en SQLite; si la
+    fuente vuelve, empieza una partición nueva.
+
+    Tiene la misma interfaz que TemporalCache, por lo que la API y el
+    CacheServer lo usan sin cambios.
+
+    Attributes:
+        __build_partition (Callable[[str], TemporalCache]): Crea la partición de una fuente
+        __max_sources (int): Máximo de particiones propias (sin contar la compartida)
+        __allowed_sources (frozenset[str] | None): Fuentes con partición propia; None para cualquiera
+        __idle_seconds (float | None): Inactividad tras la cual se descarta una partición; None nunca
+        __partitions (dict[str, TemporalCache]): Particiones por fuente
+        __last_seen (dict[str, float]): Instante del último log de cada partición
+        __evicted_quarantine (list[LogRecord]): Cuarentena de particiones descartadas, pendiente de persistir
+        __listeners (list[Callable[[LogEntry], None]]): Funciones notificadas con cada log
+
+    Example:
+        cache = PartitionedTemporalCache(
+            lambda source: TemporalCache(LogPruner(window_minutes=WINDOWS.get(source, 5))),
+            max_sources=256, idle_seconds=900
+        )
+    """
+    # Cantidad de valores pedida a cada partición al combinar sus top-k
+    TOP_CANDIDATES: ClassVar[int] = 1 << 20
+    # Partición compartida por las fuentes sin partición propia
+    OVERFLOW_SOURCE: ClassVar[str] = "_other"
+
+    def __init__(
+        self,
+        build_partition: Callable[[str], TemporalCache],
+        max_sources: int = 256,
+        allowed_sources: Iterable[str] | None = None,
+        idle_seconds: float | None = 900,
+        clock: Callable[[], float] = monotonic,
+    ):
+        assert max_sources > 0, "max_sources must be positive"
+        assert idle_seconds is None or idle_seconds > 0, "idle_seconds must be positive"
+
+        self.__build_partition: Callable[[str], TemporalCache] = build_partition
+        self.__max_sources: int = max_sources
+        self.__allowed_sources: frozenset[str] | None = \
+            None if allowed_sources is None else frozenset(allowed_sources)
+        self.__idle_seconds: float | None = idle_seconds
+        self.__clock: Callable[[], float] = clock
+        self.__partitions: dict[str, TemporalCache] = dict()
+        self.__last_seen: dict[str, float] = dict()
+        self.__evicted_quarantine: list[LogRecord] = list()
+        self.__listeners: list[Callable[[LogEntry], None]] = list()
+
+    @property
+    def sources(self) -> list[str]:
+        return sorted(self.__partitions)
+
+    def partition(self, source: str) -> TemporalCache | None:
+        return self.__partitions.get(source)
+
+    def __own_partitions(self) -> int:
+        return len(self.__partitions) - (self.OVERFLOW_SOURCE in self.__partitions)
+
+    def __partition_for(self, source: str) -> TemporalCache:
+        """Partición de una fuente, creándola si hay lugar; si no, la compartida."""
+        key: str = source
+        if key not in self.__partitions and (
+            (self.__allowed_sources is not None and key not in self.__allowed_sources)
+            or self.__own_partitions() >= self.__max_sources
+        ):
+            key = self.OVERFLOW_SOURCE
+        partition: TemporalCache | None = self.__partitions.get(key)
+        if partition is None:
+            partition = self.__build_partition(key)
+            self.__partitions[key] = partition
+        self.__last_seen[key] = self.__clock()
+        return partition
+
+    def __scoped(self, source: str | None) -> list[tuple[TemporalCache, str | None]]:
+        """Particiones que lee una consulta, con el filtro de fuente que necesita cada una.
+
+        Sin fuente se leen todas; con fuente, su partición (si tiene) y la
+        compartida, filtrada por fuente porque mezcla los logs de varias.
+        """
+        if source is None:
+            return [(partition, None) for partition in self.__partitions.values()]
+        scoped: list[tuple[TemporalCache, str | None]] = list()
+        partition: TemporalCache | None = self.__partitions.get(source)
+        if partition is not None:
+            scoped.append((partition, None))
+        overflow: TemporalCache | None = self.__partitions.get(self.OVERFLOW_SOURCE)
+        if overflow is not None and overflow is not partition:
+            scoped.append((overflow, source))
+        return scoped
+
+    def add_listener(self, listener: Callable[[LogEntry], None]) -> 'PartitionedTemporalCache':
+        """Registra una función que recibe cada log aceptado por `add_log`, de cualquier fuente.
+
+        Args:
+            listener (Callable[[LogEntry], None]): Función a notificar
+
+        Returns:
+            PartitionedTemporalCache: Self para permitir encadenamiento de métodos
+        """
+        self.__listeners.append(listener)
+        return self
+
+    def add_log(self, log_entry: LogEntry) -> 'PartitionedTemporalCache':
+        """Añade un log a la partición de su fuente (o a la compartida) y lo notifica si fue aceptado.
+
+        Args:
+            log_entry (LogEntry): Log a añadir al cache
+
+        Returns:
+            PartitionedTemporalCache: Self para permitir encadenamiento de métodos
+        """
+        if self.admit_log(log_entry) is Admission.ACCEPTED:
+            for listener in self.__listeners:
+                listener(log_entry)
+        return self
+
+    def admit_log(self, log_entry: LogEntry) -> Admission:
+        """Como `add_log`, pero sin notificar a los listeners; devuelve la admisión en la partición de su fuente."""
+        return self.__partition_for(log_entry.source).admit_log(log_entry)
+
+    def add_logs(self, log_entries: list[LogEntry]) -> 'PartitionedTemporalCache':
+        for log_entry in log_entries:
+            self.add_log(log_entry)
+        return self
+
+    def get_logs(self, start_time: datetime, end_time: datetime) -> list[LogEntry]:
+        """Logs de todas las fuentes dentro del rango, en orden (timestamp, seq)."""
+        return list(merge(
+            *(partition.get_logs(start_time, end_time) for partition in self.__partitions.values()),
+            key=lambda log: (log.timestamp, log.seq or 0)
+        ))
+
+    def get_rows(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        log_filter: LogFilter | None = None,
+        source: str | None = None,
+    ) -> list[LogRow]:
+        """Filas del rango; con `source` solo se recorre la partición de esa fuente.
+
+        Args:
+            start_time (datetime): Inicio del rango temporal (inclusive)
+            end_time (datetime): Fin del rango temporal (inclusive)
+            log_filter (LogFilter | None): Filtro por subcadena o expresión regular del mensaje
+            source (str | None): Solo los logs de esta fuente; None para todas
+
+        Returns:
+            list[LogRow]: Filas del rango que cumplen el filtro, en orden (timestamp, seq)
+        """
+        partitions: list[tuple[TemporalCache, str | None]] = self.__scoped(source)
+        if len(partitions) == 1:
+            partition, partition_source = partitions[0]
+            return partition.get_rows(start_time, end_time, log_filter, partition_source)
+        return list(merge(
+            *(
+                partition.get_rows(start_time, end_time, log_filter, partition_source)
+                for partition, partition_source in partitions
+            ),
+            key=lambda row: (row[0], row[3] or 0)
+        ))
+
+    def get_all_logs(self) -> list[LogEntry]:
+        return list(merge(
+            *(partition.get_all_logs() for partition in self.__partitions.values()),
+            key=lambda log: (log.timestamp, log.seq or 0)
+        ))
+
+    def count_by_template(self, start_time: datetime, end_time: datetime) -> dict[int, int]:
+        """Suma los conteos por cluster de plantilla de todas las particiones."""
+        counts: dict[int, int] = dict()
+        for partition in self.__partitions.values():
+            for cluster_id, count in partition.count_by_template(start_time, end_time).items():
+                counts[cluster_id] = counts.get(cluster_id, 0) + count
+        return counts
+
+    def template_timeline(
+        self, cluster_id: int, start_time: datetime, end_time: datetime, bucket: timedelta
+    ) -> dict[datetime, int]:
+        """Suma las series por intervalo de un cluster de plantilla de todas las particiones."""
+        counts: dict[datetime, int] = dict()
+        for partition in self.__partitions.values():
+            for bucket_start, count in partition.template_timeline(cluster_id, start_time, end_time, bucket).items():
+                counts[bucket_start] = counts.get(bucket_start, 0) + count
+        return counts
+
+    def top(self, field: str, k: int) -> list[tuple[str | int, int, int]]:
+        """Valores más frecuentes de un campo entre todas las fuentes.
+
+        Se suman los contadores de cada partición; como cada una es aproximada,
+        el error máximo combinado es la suma de los errores de las particiones.
+
+        Raises:
+            ValueError: Si las particiones no tienen HeavyHitters configurado
+        """
+        totals: dict[str | int, list[int]] = dict()
+        for partition in self.__partitions.values():
+            for value, count, max_error in partition.top(field, self.TOP_CANDIDATES):
+                total: list[int] = totals.setdefault(value, [0, 0])
+                total[0] += count
+                total[1] += max_error
+        ranked: list[tuple[str | int, int, int]] = sorted(
+            ((value, count, max_error) for value, (count, max_error) in totals.items()),
+            key=lambda entry: entry[1], reverse=True
+        )
+        return ranked[:k]
+
+    @property
+    def watermark(self) -> datetime | None:
+        """Watermark más avanzado entre las particiones (None si no llegó ningún log)."""
+        return max(
+            (partition.watermark for partition in self.__partitions.values() if partition.watermark is not None),
+            default=None
+        )
+
+    def watermark_of(self, source: str | None) -> datetime | None:
+        """Watermark de la partición de una fuente; sin fuente, el más avanzado entre las particiones.
+
+        Args:
+            source (str | None): Fuente de los logs; None para todas
+
+        Returns:
+            datetime | None: Watermark, o None si la partición todavía no recibió logs
+        """
+        if source is None:
+            return self.watermark
+        # Una fuente sin partición propia comparte el watermark de la partición compartida
+        partition: TemporalCache | None = \
+            self.__partitions.get(source) or self.__partitions.get(self.OVERFLOW_SOURCE)
+        return None if partition is None else partition.watermark
+
+    def watermark_stats(self) -> dict:
+        """Estado del watermark de cada partición, por fuente."""
+        return {source: self.__partitions[source].watermark_stats() for source in self.sources}
+
+    def prune_cache(self) -> list[LogRecord]:
+        """Limpia cada partición con su propia ventana y devuelve todos los registros a persistir.
+
+        Las particiones inactivas durante `idle_seconds` se descartan: todos
+        sus registros se devuelven para persistirlos y su cuarentena queda
+        para el siguiente `drain_quarantine`.
+        """
+        pruned: list[LogRecord] = list()
+        idle_since: float | None = \
+            None if self.__idle_seconds is None else self.__clock() - self.__idle_seconds
+        for source, partition in list(self.__partitions.items()):
+            if idle_since is not None and self.__last_seen[source] <= idle_since:
+                records, quarantine = partition.evict()
+                pruned.extend(records)
+                self.__evicted_quarantine.extend(quarantine)
+                del self.__partitions[source]
+                del self.__last_seen[source]
+            else:
+                pruned.extend(partition.prune_cache())
+        return pruned
+
+    def drain_quarantine(self) -> list[LogRecord]:
+        """Logs en cuarentena de todas las particiones (incluidas las descartadas) pendientes de persistir."""
+        quarantine: list[LogRecord] = self.__evicted_quarantine
+        self.__evicted_quarantine = list()
+        for partition in self.__partitions.values():
+            quarantine.extend(partition.drain_quarantine())
+        return quarantine
@@ -0,0 +1,209 @@
+from datetime import datetime, timedelta
+from queue import Empty, SimpleQueue
+from socket import AF_UNIX, SOCK_STREAM, socket
+from threading import Lock
+from typing import Callable
+
+from src.model.log_entry import LogEntry
+from src.model.log_record import LogRecord
+from src.model.log_row import LogRow
+from src.services.cache_server import FRAME_HEADER, decode_frame, encode_frame
+from src.services.log_batch_codec import LogBatchCodec
+from src.services.template_miner import TemplateMiner
+from src.services.log_filter import LogFilter
+
+
+class RemoteTemporalCache:
+    """Cliente del CacheServer con la misma interfaz que TemporalCache.
+
+    Cada worker de uvicorn usa un RemoteTemporalCache en lugar de su propio
+    TemporalCache, de modo que los POST y GET que llegan a distintos workers
+    ven la misma ventana caliente. El CacheServer asigna la secuencia de
+    ingesta, escribe el journal y persiste los logs podados, por lo que los
+    workers corren sin journal y `prune_cache` no devuelve registros.
+
+    Las llamadas son síncronas: la API las ejecuta en un hilo (`to_thread`)
+    para no bloquear el event loop, y cada hilo toma una conexión de un pool
+    de conexiones persistentes, así que varias peticiones del mismo worker
+    pueden estar esperando al servidor a la vez. Los logs se envían como un
+    lote columnar MessagePack (ver LogBatchCodec) y las lecturas vuelven como
+    filas planas, sin un objeto JSON ni una validación de pydantic por log.
+
+    Attributes:
+        __socket_path (str): Ruta del socket Unix del CacheServer
+        __template_miner (TemplateMiner | None): Minero local, sincronizado con las
+                                                 plantillas que envía el servidor
+        __listeners (list[Callable[[LogEntry], None]]): Listeners de los logs ingeridos por este worker
+        __idle (SimpleQueue[socket]): Conexiones abiertas que no está usando ningún hilo
+        __codec (LogBatchCodec): Codificador de los lotes de `add_logs`
+    """
+    def __init__(self, socket_path: str, template_miner: TemplateMiner | None = None):
+        self.__socket_path: str = socket_path
+        self.__template_miner: TemplateMiner | None = template_miner
+        self.__listeners: list[Callable[[LogEntry], None]] = list()
+        self.__idle: SimpleQueue[socket] = SimpleQueue()
+        self.__codec: LogBatchCodec = LogBatchCodec()
+        # Protege la restauración de plantillas, que pueden recibir varios hilos a la vez
+        self.__templates_lock: Lock = Lock()
+
+    def __acquire(self) -> socket:
+        try:
+            return self.__idle.get_nowait()
+        except Empty:
+            conn: socket = socket(AF_UNIX, SOCK_STREAM)
+            conn.connect(self.__socket_path)
+            return conn
+
+    def __read_exactly(self, conn: socket, size: int) -> bytes:
+        data: bytearray = bytearray()
+        while len(data) < size:
+            chunk: bytes = conn.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Cache server closed the connection")
+            data.extend(chunk)
+        return bytes(data)
+
+    def __sync_templates(self, templates: list[list]) -> None:
+        with self.__templates_lock:
+            known: int = self.__template_miner.templates_count
+            self.__template_miner.restore(template for template in templates if template[0] >= known)
+
+    def __call(self, operation: str, **args) -> object:
+        """Envía una operación al CacheServer y devuelve su resultado.
+
+        Raises:
+            ConnectionError: Si el servidor no responde o la operación falla
+        """
+        request: dict = {
+            "op": operation,
+            "args": args,
+            "known_templates": 0 if self.__template_miner is None else self.__template_miner.templates_count,
+        }
+        conn: socket | None = None
+        try:
+            conn = self.__acquire()
+            conn.sendall(encode_frame(request))
+            (length,) = FRAME_HEADER.unpack(self.__read_exactly(conn, FRAME_HEADER.size))
+            response: dict = decode_frame(self.__read_exactly(conn, length))
+        except OSError as e:
+            # Una conexión a medio leer no se puede reutilizar
+            if conn is not None:
+                conn.close()
+            raise ConnectionError(f"Error talking to cache server: {e}") from e
+        self.__idle.put(conn)
+
+        if self.__template_miner is not None and response.get("templates"):
+            self.__sync_templates(response["templates"])
+        if not response["ok"]:
+            raise ConnectionError(f"Cache server error: {response['error']}")
+        return response["result"]
+
+    @staticmethod
+    def __entries(rows: list[list]) -> list[LogEntry]:
+        """LogEntry de las filas que devuelve el servidor (ya validadas al ingerirse)."""
+        return [
+            LogEntry.model_construct(
+                timestamp=datetime.fromisoformat(timestamp), tag=tag, message=message, seq=seq, source=source
+            )
+            for timestamp, tag, message, seq, source in rows
+        ]
+
+    def add_listener(self, listener: Callable[[LogEntry], None]) -> 'RemoteTemporalCache':
+        """Registra un listener para los logs aceptados que ingiere este worker."""
+        self.__listeners.append(listener)
+        return self
+
+    def add_log(self, log_entry: LogEntry) -> 'RemoteTemporalCache':
+        return self.add_logs([log_entry])
+
+    def add_logs(self, log_entries: list[LogEntry]) -> 'RemoteTemporalCache':
+        """Envía los logs al CacheServer como un lote columnar en un solo mensaje.
+
+        Los listeners se notifican después de la respuesta, con el `seq` que
+        asignó el servidor y solo para los logs que entraron a la ventana.
+
+        Args:
+            log_entries (list[LogEntry]): Logs a añadir; el servidor reemplaza su `seq`
+
+        Returns:
+            RemoteTemporalCache: Self para permitir encadenamiento de métodos
+        """
+        if not log_entries:
+            return self
+        result: dict = self.__call("add_logs", batch=self.__codec.encode(log_entries, "msgpack"))
+        if not self.__listeners:
+            return self
+        rejected: set[int] = set(result["rejected"])
+        for index, log_entry in enumerate(log_entries):
+            if index in rejected:
+                continue
+            log_entry = log_entry.model_copy(update={"seq": result["first_seq"] + index})
+            for listener in self.__listeners:
+                listener(log_entry)
+        return self
+
+    def get_logs(self, start_time: datetime, end_time: datetime) -> list[LogEntry]:
+        return self.__entries(
+            self.__call("get_logs", start_time=start_time.isoformat(), end_time=end_time.isoformat())
+        )
+
+    def get_rows(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        log_filter: LogFilter | None = None,
+        source: str | None = None,
+    ) -> list[LogRow]:
+        """Filas del cache compartido; los filtros de mensaje y de fuente se aplican en el CacheServer."""
+        rows: list[list] = self.__call(
+            "get_rows",
+            start_time=start_time.isoformat(),
+            end_time=end_time.isoformat(),
+            contains=None if log_filter is None else log_filter.contains,
+            regex=None if log_filter is None else log_filter.regex,
+            source=source,
+        )
+        return [tuple(row) for row in rows]
+
+    def get_all_logs(self) -> list[LogEntry]:
+        return self.__entries(self.__call("get_all_logs"))
+
+    def count_by_template(self, start_time: datetime, end_time: datetime) -> dict[int, int]:
+        counts: list[list[int]] = self.__call(
+            "count_by_template", start_time=start_time.isoformat(), end_time=end_time.isoformat()
+        )
+        return {cluster_id: count for cluster_id, count in counts}
+
+    def template_timeline(
+        self, cluster_id: int, start_time: datetime, end_time: datetime, bucket: timedelta
+    ) -> dict[datetime, int]:
+        counts: list[list] = self.__call(
+            "template_timeline",
+            cluster_id=cluster_id,
+            start_time=start_time.isoformat(),
+            end_time=end_time.isoformat(),
+            bucket_seconds=bucket.total_seconds(),
+        )
+        return {datetime.fromisoformat(bucket_start): count for bucket_start, count in counts}
+
+    def top(self, field: str, k: int) -> list[tuple[str | int, int, int]]:
+        return [tuple(entry) for entry in self.__call("top", field=field, k=k)]
+
+    def watermark_stats(self) -> dict:
+        return self.__call("watermark_stats")
+
+    def prune_cache(self) -> list[LogRecord]:
+        """La limpieza y la persistencia ocurren en el CacheServer tras cada ingesta."""
+        return list()
+
+    def drain_quarantine(self) -> list[LogRecord]:
+        """La cuarentena también se persiste en el CacheServer."""
+        return list()
+
+    def close(self) -> None:
+        """Cierra las conexiones abiertas con el CacheServer."""
+        while True:
+            try:
+                self.__idle.get_nowait().close()
+            except Empty:
+                return
@@ -0,0 +1,152 @@
+from collections import deque
+from datetime import datetime
+from heapq import heappush, heapreplace
+from itertools import count
+from statistics import quantiles
+from time import perf_counter
+from typing import Callable
+
+
+class RequestTiming:
+    """Tiempos por fase de una petición.
+
+    Cada `mark` cierra la fase en curso con el tiempo transcurrido desde la
+    marca anterior (una llamada a `perf_counter` y un append).
+
+    Attributes:
+        route (str): Ruta de la petición
+        params (dict): Parámetros relevantes (rango, filtros)
+        phases (list[tuple[str, float]]): (fase, segundos) en orden
+    """
+    __slots__ = ("route", "params", "phases", "started_at", "__start", "__last")
+
+    def __init__(self, route: str, params: dict):
+        self.route: str = route
+        self.params: dict = params
+        self.phases: list[tuple[str, float]] = list()
+        self.started_at: datetime = datetime.now()
+        self.__start: float = perf_counter()
+        self.__last: float = self.__start
+
+    def mark(self, phase: str) -> None:
+        now: float = perf_counter()
+        self.phases.append((phase, now - self.__last))
+        self.__last = now
+
+    @property
+    def total(self) -> float:
+        return self.__last - self.__start
+
+    def server_timing(self) -> str:
+        """Valor del header Server-Timing (`fase;dur=ms`, más `total`)."""
+        return ", ".join(
+            f"{phase};dur={seconds * 1000:.3f}" for phase, seconds in (*self.phases, ("total", self.total))
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "route": self.route,
+            "params": self.params,
+            "started_at": self.started_at.isoformat(),
+            "total_ms": round(self.total * 1000, 3),
+            "phases_ms": {phase: round(seconds * 1000, 3) for phase, seconds in self.phases},
+        }
+
+
+class NullTiming:
+    """Timing inactivo: `mark` no hace nada. Se usa cuando la API no tiene RequestProfiler."""
+    __slots__ = ()
+
+    def mark(self, phase: str) -> None:
+        pass
+
+
+NULL_TIMING: NullTiming = NullTiming()
+
+
+class RequestProfiler:
+    """Registra los tiempos por fase de las consultas y guarda las más lentas con su plan de SQLite.
+
+    Las últimas `history` peticiones quedan en un buffer circular para
+    calcular percentiles por fase. Las que superan `slow_threshold_ms` se
+    imprimen junto al `EXPLAIN QUERY PLAN` de su consulta a SQLite, y las
+    `slowest` más lentas se conservan para GET /debug/slow. El plan se pide
+    solo para las peticiones lentas, después de armar la respuesta.
+
+    Attributes:
+        __slow_threshold (float): Segundos a partir de los cuales una petición es lenta
+        __recent (deque[RequestTiming]): Últimas peticiones
+        __slowest (list[tuple[float, int, dict]]): Min-heap de las peticiones más lentas
+        __slowest_size (int): Cantidad de peticiones lentas conservadas
+        __slow_count (int): Peticiones lentas desde el inicio
+    """
+    def __init__(self, slow_threshold_ms: float = 250.0, history: int = 1000, slowest: int = 20):
+        assert slow_threshold_ms >= 0, "slow_threshold_ms must not be negative"
+        assert history > 0, "history must be positive"
+        assert slowest > 0, "slowest must be positive"
+
+        self.__slow_threshold: float = slow_threshold_ms / 1000
+        self.__recent: deque[RequestTiming] = deque(maxlen=history)
+        self.__slowest: list[tuple[float, int, dict]] = list()
+        self.__slowest_size: int = slowest
+        self.__slow_count: int = 0
+        self.__tiebreak = count()
+
+    def start(self, route: str, params: dict) -> RequestTiming:
+        return RequestTiming(route, params)
+
+    def finish(self, timing: RequestTiming, explain: Callable[[], list[str]] | None = None) -> str:
+        """Registra una petición terminada y, si fue lenta, su plan de consulta.
+
+        Args:
+            timing (RequestTiming): Tiempos de la petición
+            explain (Callable[[], list[str]] | None): Devuelve el plan de su consulta a SQLite
+
+        Returns:
+            str: Valor del header Server-Timing
+        """
+        self.__recent.append(timing)
+        total: float = timing.total
+        if total >= self.__slow_threshold:
+            self.__slow_count += 1
+            entry: dict = timing.to_dict()
+            try:
+                entry["query_plan"] = explain() if explain is not None else list()
+            except ConnectionError as e:
+                entry["query_plan"] = [str(e)]
+            print(
+                f"Slow request {timing.route} {timing.params}: {entry['total_ms']} ms {entry['phases_ms']}\n  "
+                + "\n  ".join(entry["query_plan"])
+            )
+            item: tuple[float, int, dict] = (total, next(self.__tiebreak), entry)
+            if len(self.__slowest) < self.__slowest_size:
+                heappush(self.__slowest, item)
+            elif total > self.__slowest[0][0]:
+                heapreplace(self.__slowest, item)
+        return timing.server_timing()
+
+    def slowest(self, limit: int | None = None) -> list[dict]:
+        """Peticiones lentas conservadas, de la más lenta a la más rápida."""
+        return [entry for _, _, entry in sorted(self.__slowest, reverse=True)][:limit]
+
+    def stats(self) -> dict:
+        """Percentiles (ms) del total y de cada fase sobre las últimas peticiones."""
+        samples: dict[str, list[float]] = {"total": [timing.total for timing in self.__recent]}
+        for timing in self.__recent:
+            for phase, seconds in timing.phases:
+                samples.setdefault(phase, list()).append(seconds)
+
+        percentiles: dict[str, dict[str, float]] = dict()
+        for phase, values in samples.items():
+            if len(values) < 2:
+                continue
+            cuts: list[float] = quantiles(values, n=100)
+            percentiles[phase] = {
+                "p50": round(cuts[49] * 1000, 3), "p95": round(cuts[94] * 1000, 3), "p99": round(cuts[98] * 1000, 3)
+            }
+        return {
+            "recorded": len(self.__recent),
+            "slow_threshold_ms": self.__slow_threshold * 1000,
+            "slow_count": self.__slow_count,
+            "percentiles_ms": percentiles,
+        }
@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta, timezone
+from heapq import merge
+from operator import attrgetter
+from typing import ClassVar, Iterator
+
+from sortedcontainers import SortedDict
+
+from src.model.log_record import LogRecord
+from src.services.log_pruner import LogPruner
+
+
+class RingBufferLogStore:
+    """Almacenamiento del TemporalCache en un buffer circular de intervalos fijos.
+
+    Como la ventana del cache es fija, los logs se agrupan en intervalos de
+    `slot_ms` milisegundos y cada intervalo ocupa la posición
+    `intervalo % slots` de un arreglo de tamaño fijo. Insertar es un append en
+    la lista del intervalo y la limpieza avanza el puntero del intervalo más
+    antiguo (`__head`) hasta el umbral del pruner, sin reordenar nada.
+
+    La limpieza trabaja por intervalos completos: un log sale del cache cuando
+    todo su intervalo queda antes del umbral, es decir, con hasta `slot_ms`
+    de demora respecto del SortedLogStore.
+
+    Los logs cuyo intervalo no entra en el buffer (timestamps muy por delante
+    de los demás, por ejemplo con la política "clamp") van a un SortedDict de
+    desborde que se consulta y limpia junto con el buffer.
+
+    Attributes:
+        __slot (timedelta): Ancho de cada intervalo
+        __slots (list[list[LogRecord] | None]): Registros de cada posición del buffer
+        __slot_ids (list[int | None]): Intervalo que ocupa cada posición
+        __head (int): Intervalo más antiguo en el buffer
+        __tail (int): Intervalo más reciente en el buffer (vacío si head > tail)
+        __overflow (SortedDict): Registros fuera del alcance del buffer, por timestamp
+    """
+    EPOCH: ClassVar[datetime] = datetime(1970, 1, 1)
+    EPOCH_UTC: ClassVar[datetime] = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    TIMESTAMP: ClassVar[attrgetter] = attrgetter("timestamp")
+
+    def __init__(self, span_seconds: int, slot_ms: int = 1000):
+        """Crea el buffer.
+
+        Args:
+            span_seconds (int): Tiempo que debe cubrir el buffer; debe abarcar la
+                                ventana del pruner más su demora permitida y un margen
+            slot_ms (int): Ancho de cada intervalo en milisegundos
+        """
+        assert slot_ms > 0, "slot_ms must be positive"
+        assert span_seconds * 1000 >= slot_ms, "span_seconds must cover at least one slot"
+
+        self.__slot: timedelta = timedelta(milliseconds=slot_ms)
+        self.__size: int = -(-span_seconds * 1000 // slot_ms)
+        self.__slots: list[list[LogRecord] | None] = [None] * self.__size
+        self.__slot_ids: list[int | None] = [None] * self.__size
+        self.__head: int = 0
+        self.__tail: int = -1
+        self.__overflow: SortedDict = SortedDict()
+
+    def __slot_id(self, timestamp: datetime) -> int:
+        epoch: datetime = self.EPOCH if timestamp.tzinfo is None else self.EPOCH_UTC
+        return (timestamp - epoch) // self.__slot
+
+    def __add_overflow(self, record: LogRecord) -> None:
+        records: list[LogRecord] | None = self.__overflow.get(record.timestamp)
+        if records is None:
+            self.__overflow[record.timestamp] = [record]
+        else:
+            records.append(record)
+
+    def add(self, record: LogRecord) -> 'RingBufferLogStore':
+        """Agrega un registro a su intervalo, ampliando el alcance del buffer si hace falta.
+
+        Returns:
+            RingBufferLogStore: Self para permitir encadenamiento de métodos
+        """
+        slot_id: int = self.__slot_id(record.timestamp)
+        if self.__head > self.__tail:
+            self.__head = self.__tail = slot_id
+        elif slot_id < self.__head:
+            if self.__tail - slot_id >= self.__size:
+                self.__add_overflow(record)
+                return self
+            self.__head = slot_id
+        elif slot_id > self.__tail:
+            if slot_id - self.__head >= self.__size:
+                self.__add_overflow(record)
+                return self
+            self.__tail = slot_id
+
+        index: int = slot_id % self.__size
+        if self.__slot_ids[index] != slot_id:
+            self.__slot_ids[index] = slot_id
+            self.__slots[index] = [record]
+        else:
+            self.__slots[index].append(record)
+        return self
+
+    def __walk(self, first: int, last: int) -> Iterator[list[LogRecord]]:
+        """Recorre los intervalos ocupados entre first y last, con los registros ordenados."""
+        for slot_id in range(max(first, self.__head), min(last, self.__tail) + 1):
+            index: int = slot_id % self.__size
+            if self.__slot_ids[index] == slot_id:
+                # Los registros se ordenan en el lugar al consultarlos: el ordenamiento
+                # es estable (conserva el orden de llegada de timestamps iguales) y casi
+                # lineal en las consultas siguientes, que encuentran la lista ya ordenada
+                records: list[LogRecord] = self.__slots[index]
+                records.sort(key=self.TIMESTAMP)
+                yield records
+
+    def irange(self, start_time: datetime, end_time: datetime) -> Iterator[LogRecord]:
+        """Recorre los registros del rango [start_time, end_time] en orden temporal.
+
+        Solo se visitan los intervalos del rango; los de los extremos se filtran
+        por timestamp.
+        """
+        first: int = self.__slot_id(start_time)
+        last: int = self.__slot_id(end_time)
+
+        def ring() -> Iterator[LogRecord]:
+            for records in self.__walk(first, last):
+                for record in records:
+                    if start_time <= record.timestamp <= end_time:
+                        yield record
+
+        if not self.__overflow:
+            return ring()
+        overflow: Iterator[LogRecord] = (
+            record
+            for timestamp in self.__overflow.irange(start_time, end_time, inclusive=(True, True))
+            for record in self.__overflow[timestamp]
+        )
+        return merge(ring(), overflow, key=self.TIMESTAMP)
+
+    def __iter__(self) -> Iterator[LogRecord]:
+        ring: Iterator[LogRecord] = (
+            record for records in self.__walk(self.__head, self.__tail) for record in records
+        )
+        overflow: Iterator[LogRecord] = (record for records in self.__overflow.values() for record in records)
+        return merge(ring, overflow, key=self.TIMESTAMP)
+
+    def prune(self, pruner: LogPruner) -> list[LogRecord]:
+        """Libera los intervalos que quedaron completos antes del umbral del pruner.
+
+        Cada intervalo se libera una sola vez avanzando `__head`, así que el
+        costo es constante por intervalo. El desborde se limpia como un SortedDict.
+
+        Returns:
+            list[LogRecord]: Registros eliminados
+        """
+        threshold: datetime | None = pruner.threshold
+        pruned: list[LogRecord] = list()
+        if threshold is None:
+            return pruned
+
+        limit: int = self.__slot_id(threshold)
+        while self.__head < limit and self.__head <= self.__tail:
+            index: int = self.__head % self.__size
+            if self.__slot_ids[index] == self.__head:
+                pruned.extend(self.__slots[index])
+                self.__slots[index] = None
+                self.__slot_ids[index] = None
+            self.__head += 1
+
+        if self.__overflow:
+            pruned.extend(pruner.prune(self.__overflow))
+        return pruned
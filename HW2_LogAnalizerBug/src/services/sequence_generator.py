@@ -0,0 +1,66 @@
+from threading import Lock
+from typing import ClassVar
+
+
+class SequenceGenerator:
+    """Genera números de secuencia de ingesta monótonos de 64 bits.
+
+    Cada log aceptado recibe un `seq` único y creciente que lo acompaña por el
+    cache, el pruner, el journal y SQLite. Permite resolver solapamientos
+    entre niveles comparando enteros en lugar de comparar el contenido del log.
+
+    Attributes:
+        __last (int): Último número de secuencia entregado
+    """
+    MAX_SEQ: ClassVar[int] = 2**63 - 1
+
+    def __init__(self, last: int = 0):
+        assert 0 <= last <= self.MAX_SEQ, "last must fit in a signed 64-bit integer"
+        self.__last: int = last
+        self.__lock: Lock = Lock()
+
+    @property
+    def last(self) -> int:
+        return self.__last
+
+    def next(self) -> int:
+        """Devuelve el siguiente número de secuencia.
+
+        Raises:
+            OverflowError: Si se agotó el rango de 64 bits
+        """
+        with self.__lock:
+            if self.__last >= self.MAX_SEQ:
+                raise OverflowError("Sequence id space exhausted")
+            self.__last += 1
+            return self.__last
+
+    def reserve(self, count: int) -> int:
+        """Reserva `count` números consecutivos de una vez, para un lote de logs.
+
+        Returns:
+            int: Primer número reservado; el lote usa [primero, primero + count)
+
+        Raises:
+            OverflowError: Si el lote no entra en el rango de 64 bits
+        """
+        assert count > 0, "count must be positive"
+        with self.__lock:
+            if self.__last > self.MAX_SEQ - count:
+                raise OverflowError("Sequence id space exhausted")
+            first: int = self.__last + 1
+            self.__last += count
+            return first
+
+    def advance_to(self, seq: int) -> 'SequenceGenerator':
+        """Garantiza que los próximos números sean mayores que `seq`.
+
+        Se usa al iniciar para continuar después de lo ya persistido o
+        registrado en el journal.
+
+        Returns:
+            SequenceGenerator: Self para permitir encadenamiento de métodos
+        """
+        with self.__lock:
+            self.__last = max(self.__last, seq)
+        return self
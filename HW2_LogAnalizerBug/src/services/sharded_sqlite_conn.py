@@ -0,0 +1,414 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from heapq import merge
+from os import makedirs
+from os.path import abspath, exists, join
+from sqlite3 import connect, Cursor
+from threading import Lock
+from typing import Callable, ClassVar, Iterable
+from zlib import crc32
+
+from src.model.log_record import LogRecord
+from src.model.log_row import LogRow
+from src.services.sqlite_conn import SQliteConn
+from src.services.template_miner import TemplateMiner
+from src.services.log_filter import LogFilter
+
+
+class ShardedSQliteConn:
+    """Almacenamiento de logs repartido en varios archivos SQLite (shards).
+
+    Cada shard es una base independiente con su propio lock de escritura, de
+    modo que los guardados de distintos shards avanzan en paralelo. Hay tres
+    estrategias de partición:
+    - "time": un shard por intervalo de `shard_span_hours` horas, creado a
+      demanda; las consultas solo visitan los shards que solapan el rango.
+    - "hash": `shards` archivos fijos elegidos por CRC32 del tag; las
+      consultas filtradas por tags visitan solo los shards de esos tags y
+      las demás, todos.
+    - "source": `shards` archivos fijos elegidos por CRC32 de la fuente; las
+      consultas de una fuente visitan solo su shard y las demás, todos.
+
+    Las consultas se reparten en un pool de hilos y los resultados de cada
+    shard (ordenados por timestamp y seq) se combinan con una mezcla k-way.
+
+    La distribución de shards y las plantillas del TemplateMiner se guardan en
+    un catálogo (`catalog.db`) dentro del directorio, lo que permite abrir el
+    almacenamiento de nuevo o reparticionarlo offline con `reshard`. Si el
+    directorio ya tiene un catálogo, la estrategia y sus parámetros deben
+    coincidir con los registrados.
+
+    Attributes:
+        __directory (str): Directorio de los shards y el catálogo
+        __strategy (str): "time", "hash" o "source"
+        __shard_count (int): Cantidad de shards de las estrategias "hash" y "source"
+        __shard_span (timedelta): Intervalo de cada shard de la estrategia "time"
+        __shards (dict[int, SQliteConn]): Shards abiertos por clave de partición
+        __pool (ThreadPoolExecutor): Hilos para escrituras y consultas en paralelo (`max_workers`)
+
+    Example:
+        sharded = ShardedSQliteConn("data/shards", strategy="hash", shards=8, template_miner=miner)
+        errors = sharded.get_rows_in_ranges([(start_time, end_time)], tags=["ERROR"])  # solo el shard de ERROR
+    """
+    STRATEGIES: ClassVar[tuple[str, ...]] = ("time", "hash", "source")
+    CATALOG_FILE: ClassVar[str] = "catalog.db"
+    EPOCH: ClassVar[datetime] = datetime(1970, 1, 1)
+    EPOCH_UTC: ClassVar[datetime] = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    CREATE_SETTINGS_TABLE_QUERY: ClassVar[str] = """
+    CREATE TABLE IF NOT EXISTS settings (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """
+    CREATE_SHARDS_TABLE_QUERY: ClassVar[str] = """
+    CREATE TABLE IF NOT EXISTS shards (
+        shard_key INTEGER PRIMARY KEY,
+        path TEXT NOT NULL
+    )
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        strategy: str = "time",
+        shards: int = 4,
+        shard_span_hours: int = 24,
+        template_miner: TemplateMiner | None = None,
+        max_workers: int | None = None,
+    ):
+        assert strategy in self.STRATEGIES, f"strategy must be one of {self.STRATEGIES}"
+        assert shards > 0, "shards must be positive"
+        assert shard_span_hours > 0, "shard_span_hours must be positive"
+
+        self.__directory: str = abspath(directory)
+        makedirs(self.__directory, exist_ok=True)
+        self.__catalog_path: str = join(self.__directory, self.CATALOG_FILE)
+
+        self.__strategy: str = strategy
+        self.__shard_count: int = shards
+        self.__shard_span: timedelta = timedelta(hours=shard_span_hours)
+        self.__template_miner: TemplateMiner | None = template_miner
+        self.__persisted_templates: int = 0
+        self.__shards: dict[int, SQliteConn] = dict()
+        self.__lock: Lock = Lock()
+        self.__pool: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="shard")
+        self.__init_catalog()
+
+    @property
+    def settings(self) -> dict[str, str]:
+        """Parámetros de partición registrados en el catálogo."""
+        settings: dict[str, str] = {"strategy": self.__strategy}
+        if self.__strategy in ("hash", "source"):
+            settings["shards"] = str(self.__shard_count)
+        else:
+            settings["shard_span_hours"] = str(int(self.__shard_span.total_seconds() // 3600))
+        return settings
+
+    def __init_catalog(self) -> None:
+        """Crea o valida el catálogo, abre los shards registrados y restaura las plantillas."""
+        with connect(self.__catalog_path) as conn:
+            conn.execute(self.CREATE_SETTINGS_TABLE_QUERY)
+            conn.execute(self.CREATE_SHARDS_TABLE_QUERY)
+            conn.execute(SQliteConn.CREATE_TEMPLATES_TABLE_QUERY.format("log_templates"))
+
+            stored: dict[str, str] = dict(conn.execute("SELECT key, value FROM settings"))
+            if stored:
+                assert stored == self.settings, \
+                    f"Shard layout {stored} differs from {self.settings}; use reshard to change it"
+            else:
+                conn.executemany("INSERT INTO settings (key, value) VALUES (?, ?)", self.settings.items())
+            conn.commit()
+
+            for shard_key, path in conn.execute("SELECT shard_key, path FROM shards"):
+                self.__shards[shard_key] = self.__open_shard(path)
+
+            if self.__template_miner is not None:
+                # Las plantillas ya cargadas en el minero (por ejemplo al reparticionar) no se repiten
+                cursor: Cursor = conn.execute(
+                    "SELECT template_id, cluster_id, template FROM log_templates WHERE template_id >= ? "
+                    "ORDER BY template_id",
+                    (self.__template_miner.templates_count,)
+                )
+                self.__template_miner.restore(cursor)
+                (self.__persisted_templates,) = conn.execute("SELECT COUNT(*) FROM log_templates").fetchone()
+
+    def __open_shard(self, path: str) -> SQliteConn:
+        path = join(self.__directory, path)
+        if not exists(path):
+            connect(path).close()
+        return SQliteConn(path, template_miner=self.__template_miner, persist_templates=False)
+
+    def __shard_key(self, record: LogRecord) -> int:
+        if self.__strategy == "hash":
+            return self.__tag_key(record.tag)
+        if self.__strategy == "source":
+            return self.__source_key(record.source)
+        return self.__time_key(record.timestamp)
+
+    def __tag_key(self, tag: str) -> int:
+        return crc32(tag.encode("utf-8")) % self.__shard_count
+
+    def __source_key(self, source: str) -> int:
+        return crc32(source.encode("utf-8")) % self.__shard_count
+
+    def __time_key(self, timestamp: datetime) -> int:
+        epoch: datetime = self.EPOCH if timestamp.tzinfo is None else self.EPOCH_UTC
+        return (timestamp - epoch) // self.__shard_span
+
+    def __get_or_create_shard(self, shard_key: int) -> SQliteConn:
+        """Devuelve el shard de una clave, creándolo y registrándolo en el catálogo si no existe."""
+        with self.__lock:
+            shard: SQliteConn | None = self.__shards.get(shard_key)
+            if shard is None:
+                path: str = f"shard-{shard_key}.db"
+                shard = self.__open_shard(path)
+                with connect(self.__catalog_path) as conn:
+                    conn.execute("INSERT OR IGNORE INTO shards (shard_key, path) VALUES (?, ?)", (shard_key, path))
+                    conn.commit()
+                self.__shards[shard_key] = shard
+            return shard
+
+    def __shards_for(
+        self, start_time: datetime, end_time: datetime, source: str | None = None, tags: Iterable[str] | None = None
+    ) -> list[SQliteConn]:
+        """Shards que pueden contener logs del rango [start_time, end_time] (y de la fuente o los tags, si se indican)."""
+        with self.__lock:
+            if self.__strategy == "source" and source is not None:
+                shard: SQliteConn | None = self.__shards.get(self.__source_key(source))
+                return [shard] if shard is not None else list()
+            if self.__strategy == "hash" and tags is not None:
+                keys: set[int] = {self.__tag_key(tag) for tag in tags}
+                return [shard for shard_key, shard in sorted(self.__shards.items()) if shard_key in keys]
+            if self.__strategy in ("hash", "source"):
+                return list(self.__shards.values())
+            first: int = self.__time_key(start_time)
+            last: int = self.__time_key(end_time)
+            return [shard for shard_key, shard in sorted(self.__shards.items()) if first <= shard_key <= last]
+
+    def __persist_templates(self) -> None:
+        """Guarda en el catálogo las plantillas nuevas, antes que los logs que las usan."""
+        if self.__template_miner is None:
+            return
+        with self.__lock:
+            new_templates: list[tuple[int, int, str]] = \
+                self.__template_miner.templates_since(self.__persisted_templates)
+            if not new_templates:
+                return
+            with connect(self.__catalog_path) as conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO log_templates (template_id, cluster_id, template) VALUES (?, ?, ?)",
+                    new_templates
+                )
+                conn.commit()
+            self.__persisted_templates += len(new_templates)
+
+    def __scatter(self, items: list, task: Callable) -> list:
+        """Ejecuta `task` sobre cada elemento (shard o par shard-lote) en el pool y devuelve los resultados en orden."""
+        if len(items) == 1:
+            return [task(items[0])]
+        return list(self.__pool.map(task, items))
+
+    def max_seq(self) -> int:
+        """Devuelve la mayor secuencia de ingesta persistida en cualquier shard."""
+        return max((shard.max_seq() for shard in list(self.__shards.values())), default=0)
+
+    def save_logs(self, logs: list[LogRecord] | LogRecord) -> None:
+        """Reparte los logs por shard y los guarda en paralelo.
+
+        Las plantillas nuevas se guardan primero en el catálogo. Cada shard usa
+        `SQliteConn.save_logs`, por lo que los reintentos siguen siendo
+        idempotentes por secuencia.
+
+        Args:
+            logs (list[LogRecord] | LogRecord): Registro individual o lista de registros a guardar
+
+        Raises:
+            ConnectionError: Si falla el guardado en algún shard
+        """
+        self.__save(logs, SQliteConn.save_logs)
+
+    def save_quarantined(self, logs: list[LogRecord] | LogRecord) -> None:
+        """Como `save_logs`, pero en la tabla de cuarentena de cada shard (ver `SQliteConn.save_quarantined`)."""
+        self.__save(logs, SQliteConn.save_quarantined)
+
+    def __save(self, logs: list[LogRecord] | LogRecord, save: Callable[[SQliteConn, list[LogRecord]], None]) -> None:
+        if not logs:
+            return
+        logs = [logs] if isinstance(logs, LogRecord) else logs
+
+        self.__persist_templates()
+        batches: dict[int, list[LogRecord]] = dict()
+        for log in logs:
+            batches.setdefault(self.__shard_key(log), list()).append(log)
+
+        work: list[tuple[SQliteConn, list[LogRecord]]] = [
+            (self.__get_or_create_shard(shard_key), batch) for shard_key, batch in batches.items()
+        ]
+        self.__scatter(work, lambda item: save(*item))
+
+    def get_rows_in_ranges(
+        self,
+        ranges: list[tuple[datetime, datetime]],
+        log_filter: LogFilter | None = None,
+        source: str | None = None,
+        tags: Iterable[str] | None = None,
+    ) -> list[list[LogRow]]:
+        """Recupera las filas de varios rangos; cada shard resuelve sus rangos con una conexión.
+
+        Los filtros de mensaje, fuente y tags se resuelven en cada shard y los
+        resultados se combinan por (timestamp, seq). Con la estrategia "hash"
+        y `tags`, solo se consultan los shards que guardan esos tags.
+
+        Args:
+            ranges (list[tuple[datetime, datetime]]): Rangos (inicio, fin) inclusivos, normalizados
+            log_filter (LogFilter | None): Filtro por subcadena o expresión regular del mensaje
+            source (str | None): Solo los logs de esta fuente; None para todas
+            tags (Iterable[str] | None): Solo los logs con alguno de estos tags; None para todos
+
+        Returns:
+            list[list[LogRow]]: Filas de cada rango ordenadas por (timestamp, seq)
+
+        Raises:
+            ConnectionError: Si ocurre un error durante la consulta a algún shard
+        """
+        if not ranges:
+            return list()
+        tags = None if tags is None else sorted(set(tags))
+        shards: list[SQliteConn] = self.__shards_for(ranges[0][0], ranges[-1][1], source, tags)
+        if not shards:
+            return [list() for _ in ranges]
+        per_shard: list[list[list[LogRow]]] = self.__scatter(
+            shards, lambda shard: shard.get_rows_in_ranges(ranges, log_filter, source, tags)
+        )
+        return [
+            list(merge(*(results[index] for results in per_shard), key=lambda row: (row[0], row[3] or 0)))
+            for index in range(len(ranges))
+        ]
+
+    def explain_rows_in_ranges(
+        self, ranges: list[tuple[datetime, datetime]], log_filter: LogFilter | None = None, source: str | None = None
+    ) -> list[str]:
+        """Plan de `get_rows_in_ranges` en los shards que toca la consulta (todos tienen el mismo esquema)."""
+        if not ranges:
+            return list()
+        shards: list[SQliteConn] = self.__shards_for(ranges[0][0], ranges[-1][1], source)
+        if not shards:
+            return list()
+        return [f"{len(shards)} shard(s), plan of each:"] + \
+            shards[0].explain_rows_in_ranges(ranges, log_filter, source)
+
+    def count_by_template(self, start_time: datetime, end_time: datetime) -> dict[int, int]:
+        """Suma los conteos por cluster de plantilla de los shards del rango."""
+        counts: dict[int, int] = dict()
+        shards: list[SQliteConn] = self.__shards_for(start_time, end_time)
+        for shard_counts in self.__scatter(shards, lambda shard: shard.count_by_template(start_time, end_time)):
+            for cluster_id, count in shard_counts.items():
+                counts[cluster_id] = counts.get(cluster_id, 0) + count
+        return counts
+
+    def template_timeline(
+        self, cluster_id: int, start_time: datetime, end_time: datetime, bucket: timedelta
+    ) -> dict[datetime, int]:
+        """Suma las series por intervalo de un cluster de plantilla de los shards del rango."""
+        counts: dict[datetime, int] = dict()
+        shards: list[SQliteConn] = self.__shards_for(start_time, end_time)
+        for shard_counts in self.__scatter(
+            shards, lambda shard: shard.template_timeline(cluster_id, start_time, end_time, bucket)
+        ):
+            for bucket_start, count in shard_counts.items():
+                counts[bucket_start] = counts.get(bucket_start, 0) + count
+        return counts
+
+    def iter_rows(
+        self, start_time: datetime, end_time: datetime, batch_size: int = 10_000, source: str | None = None
+    ) -> Iterable[LogRow]:
+        """Recorre los logs de un rango como filas planas, mezclando los cursores de los shards.
+
+        Cada shard se lee de a `batch_size` filas en el hilo que consume el
+        iterador (ver `SQliteConn.iter_rows`).
+
+        Yields:
+            LogRow: (timestamp ISO, tag, message, seq, source) en orden (timestamp, seq)
+        """
+        return merge(
+            *(
+                shard.iter_rows(start_time, end_time, batch_size, source)
+                for shard in self.__shards_for(start_time, end_time, source)
+            ),
+            key=lambda row: (row[0], row[3] or 0)
+        )
+
+    def iter_records(self, batch_size: int = 10_000) -> Iterable[LogRecord]:
+        """Recorre los logs de todos los shards como LogRecord, en orden (timestamp, seq)."""
+        return merge(
+            *(shard.iter_records(batch_size) for _, shard in sorted(self.__shards.items())),
+            key=lambda record: (record.timestamp, record.seq or 0)
+        )
+
+    def reshard(
+        self,
+        directory: str,
+        strategy: str = "time",
+        shards: int = 4,
+        shard_span_hours: int = 24,
+        batch_size: int = 10_000,
+    ) -> 'ShardedSQliteConn':
+        """Copia todos los logs a un nuevo directorio con otra distribución de shards.
+
+        Pensado para ejecutarse offline: los logs se copian de a lotes sin
+        reconstruir mensajes y el nuevo catálogo recibe las mismas plantillas.
+
+        Args:
+            directory (str): Directorio destino (sin catálogo)
+            strategy (str): Estrategia de partición del destino
+            shards (int): Cantidad de shards "hash" o "source" del destino
+            shard_span_hours (int): Horas por shard "time" del destino
+            batch_size (int): Logs copiados por lote
+
+        Returns:
+            ShardedSQliteConn: Almacenamiento destino
+
+        Example:
+            source = ShardedSQliteConn("data/shards", strategy="time", template_miner=miner)
+            target = source.reshard("data/shards-by-tag", strategy="hash", shards=8)
+        """
+        return ShardedSQliteConn.build(
+            directory, self.iter_records(batch_size), batch_size,
+            strategy=strategy, shards=shards, shard_span_hours=shard_span_hours,
+            template_miner=self.__template_miner
+        )
+
+    def close(self) -> None:
+        """Detiene el pool de hilos."""
+        self.__pool.shutdown(wait=True)
+
+    @classmethod
+    def build(
+        cls, directory: str, records: Iterable[LogRecord], batch_size: int = 10_000, **options
+    ) -> 'ShardedSQliteConn':
+        """Crea un almacenamiento particionado nuevo y lo llena con los registros recibidos.
+
+        Args:
+            directory (str): Directorio destino (sin catálogo)
+            records (Iterable[LogRecord]): Registros a copiar, por ejemplo `SQliteConn.iter_records()`
+            batch_size (int): Logs copiados por lote
+            **options: Parámetros del constructor (strategy, shards, shard_span_hours, template_miner)
+
+        Returns:
+            ShardedSQliteConn: Almacenamiento destino
+
+        Example:
+            miner = TemplateMiner()
+            single = SQliteConn("data/logs.db", template_miner=miner)
+            sharded = ShardedSQliteConn.build("data/shards", single.iter_records(), template_miner=miner)
+        """
+        assert not exists(join(abspath(directory), cls.CATALOG_FILE)), "Target directory already has a catalog"
+        target: ShardedSQliteConn = cls(directory, **options)
+        batch: list[LogRecord] = list()
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                target.save_logs(batch)
+                batch = list()
+        target.save_logs(batch)
+        return target
@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Iterator
+
+from sortedcontainers import SortedDict
+
+from src.model.log_record import LogRecord
+from src.services.log_pruner import LogPruner
+
+
+class SortedLogStore:
+    """Almacenamiento del TemporalCache sobre un SortedDict timestamp -> registros.
+
+    Es el backend por defecto: mantiene los logs ordenados al insertarlos, por
+    lo que las consultas por rango son exactas con `irange` y la limpieza
+    extrae las claves del inicio del diccionario.
+
+    Attributes:
+        __logs (SortedDict): Registros agrupados por timestamp
+    """
+    def __init__(self):
+        self.__logs: SortedDict = SortedDict()
+
+    def add(self, record: LogRecord) -> 'SortedLogStore':
+        records: list[LogRecord] | None = self.__logs.get(record.timestamp)
+        if records is None:
+            self.__logs[record.timestamp] = [record]
+        else:
+            records.append(record)
+        return self
+
+    def irange(self, start_time: datetime, end_time: datetime) -> Iterator[LogRecord]:
+        """Recorre los registros del rango [start_time, end_time] en orden temporal."""
+        for timestamp in self.__logs.irange(start_time, end_time, inclusive=(True, True)):
+            yield from self.__logs[timestamp]
+
+    def __iter__(self) -> Iterator[LogRecord]:
+        for records in self.__logs.values():
+            yield from records
+
+    def prune(self, pruner: LogPruner) -> list[LogRecord]:
+        """Extrae los registros anteriores al umbral del pruner.
+
+        Returns:
+            list[LogRecord]: Registros eliminados
+        """
+        return pruner.prune(self.__logs)
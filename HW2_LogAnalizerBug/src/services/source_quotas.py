@@ -0,0 +1,186 @@
+from collections import OrderedDict
+from math import ceil
+from time import monotonic
+from typing import Callable, ClassVar, Iterable
+
+
+class TokenBucket:
+    """Cubeta de tokens: se recarga a `rate` tokens por segundo hasta `burst`.
+
+    Attributes:
+        rate (float): Tokens agregados por segundo
+        burst (int): Capacidad máxima de la cubeta
+        tokens (float): Tokens disponibles en la última recarga
+    """
+    __slots__ = ("rate", "burst", "tokens", "updated_at")
+
+    def __init__(self, rate: float, burst: int, now: float):
+        self.rate: float = rate
+        self.burst: int = burst
+        self.tokens: float = float(burst)
+        self.updated_at: float = now
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    @property
+    def full(self) -> bool:
+        return self.tokens >= self.burst
+
+    def wait_seconds(self, count: int) -> float:
+        """Segundos hasta tener `count` tokens (infinito si supera la capacidad)."""
+        missing: float = count - self.tokens
+        if missing <= 0:
+            return 0.0
+        if count > self.burst:
+            return float("inf")
+        return missing / self.rate
+
+
+class SourceQuotas:
+    """Cuotas de ingesta por fuente de logs (aplicación o job de Spark).
+
+    Cada fuente tiene una cubeta de tokens (`rate` logs por segundo con
+    ráfagas de hasta `burst` logs); las fuentes sin una cuota propia en
+    `overrides` usan la cuota por defecto. Una petición se acepta o rechaza
+    completa: si alguna de sus fuentes no tiene tokens suficientes no se
+    consume nada y la API responde 429 con Retry-After, así un job ruidoso
+    agota su propia cuota sin frenar la ingesta de los demás.
+
+    La fuente la elige el cliente, así que las cubetas propias están
+    acotadas a `max_sources` (más las de `overrides`). Las fuentes fuera de
+    `allowed_sources` (si se indica) y las que llegan con el límite alcanzado
+    consumen de una cubeta compartida, `SHARED_SOURCE`, con la cuota por
+    defecto. Una cubeta que se recargó por completo equivale a una nueva, así
+    que para hacer lugar se descarta la menos usada recientemente si ya está
+    llena; sus contadores de aceptados y rechazados se pierden con ella.
+
+    Attributes:
+        __rate (float): Logs por segundo por defecto
+        __burst (int): Ráfaga máxima por defecto
+        __overrides (dict[str, tuple[float, int]]): (rate, burst) de fuentes particulares
+        __max_sources (int): Máximo de cubetas propias de fuentes sin override
+        __allowed_sources (frozenset[str] | None): Fuentes con cubeta propia; None para cualquiera
+        __buckets (OrderedDict[str, TokenBucket]): Cubetas por fuente, de la menos a la más usada
+    """
+    # Cubeta compartida por las fuentes sin cubeta propia
+    SHARED_SOURCE: ClassVar[str] = "_other"
+
+    def __init__(
+        self,
+        rate: float = 5_000.0,
+        burst: int = 20_000,
+        overrides: dict[str, tuple[float, int]] | None = None,
+        max_sources: int = 1024,
+        allowed_sources: Iterable[str] | None = None,
+        clock: Callable[[], float] = monotonic,
+    ):
+        assert rate > 0, "rate must be positive"
+        assert burst > 0, "burst must be positive"
+        assert max_sources > 0, "max_sources must be positive"
+        for source, (source_rate, source_burst) in (overrides or dict()).items():
+            assert source_rate > 0 and source_burst > 0, f"Quota of {source} must be positive"
+
+        self.__rate: float = rate
+        self.__burst: int = burst
+        self.__overrides: dict[str, tuple[float, int]] = dict(overrides or dict())
+        self.__max_sources: int = max_sources
+        self.__allowed_sources: frozenset[str] | None = \
+            None if allowed_sources is None else frozenset(allowed_sources)
+        self.__clock: Callable[[], float] = clock
+        self.__buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self.__accepted: dict[str, int] = dict()
+        self.__rejected: dict[str, int] = dict()
+
+    def __has_room(self, now: float) -> bool:
+        """Indica si se puede crear otra cubeta propia, descartando la menos usada si ya se recargó."""
+        own: int = len(self.__buckets) - (self.SHARED_SOURCE in self.__buckets) - sum(
+            source in self.__buckets for source in self.__overrides
+        )
+        if own < self.__max_sources:
+            return True
+        for source, bucket in self.__buckets.items():
+            if source == self.SHARED_SOURCE or source in self.__overrides:
+                continue
+            # Una cubeta de la petición en curso ya se actualizó en `now`
+            if bucket.updated_at >= now:
+                return False
+            bucket.refill(now)
+            if not bucket.full:
+                return False
+            del self.__buckets[source]
+            self.__accepted.pop(source, None)
+            self.__rejected.pop(source, None)
+            return True
+        return False
+
+    def __key(self, source: str, now: float) -> str:
+        """Cubeta que paga los logs de una fuente: la propia o la compartida."""
+        if source in self.__buckets or source in self.__overrides:
+            return source
+        if self.__allowed_sources is not None and source not in self.__allowed_sources:
+            return self.SHARED_SOURCE
+        return source if self.__has_room(now) else self.SHARED_SOURCE
+
+    def __bucket(self, source: str, now: float) -> TokenBucket:
+        bucket: TokenBucket | None = self.__buckets.get(source)
+        if bucket is None:
+            rate, burst = self.__overrides.get(source, (self.__rate, self.__burst))
+            bucket = TokenBucket(rate, burst, now)
+            self.__buckets[source] = bucket
+        else:
+            bucket.refill(now)
+            self.__buckets.move_to_end(source)
+        return bucket
+
+    def admit(self, counts: dict[str, int]) -> tuple[str, int | None] | None:
+        """Consume los tokens de una petición si todas sus fuentes tienen cuota.
+
+        Args:
+            counts (dict[str, int]): Cantidad de logs de la petición por fuente
+
+        Returns:
+            tuple[str, int | None] | None: None si se aceptó; si no, (cubeta sin cuota,
+                segundos de Retry-After). Retry-After es None si la petición supera
+                la ráfaga de la fuente y no entrará nunca (hay que partirla)
+
+        Example:
+            quotas = SourceQuotas(rate=1000, burst=5000, overrides={"etl-nightly": (100, 500)})
+            rejected = quotas.admit({"etl-nightly": 800})  # ("etl-nightly", ...) -> responder 429
+        """
+        now: float = self.__clock()
+        # Varias fuentes sin cubeta propia suman sus logs en la compartida
+        charges: dict[str, int] = dict()
+        buckets: dict[str, TokenBucket] = dict()
+        for source, count in counts.items():
+            key: str = self.__key(source, now)
+            charges[key] = charges.get(key, 0) + count
+            # Se crea antes de asignar la siguiente fuente para que cuente en el límite
+            buckets[key] = self.__bucket(key, now)
+        for key, count in charges.items():
+            wait: float = buckets[key].wait_seconds(count)
+            if wait > 0:
+                for rejected_key, rejected_count in charges.items():
+                    self.__rejected[rejected_key] = self.__rejected.get(rejected_key, 0) + rejected_count
+                return key, None if wait == float("inf") else max(1, ceil(wait))
+        for key, count in charges.items():
+            buckets[key].tokens -= count
+            self.__accepted[key] = self.__accepted.get(key, 0) + count
+        return None
+
+    def stats(self) -> dict[str, dict]:
+        """Cuota, tokens disponibles y logs aceptados/rechazados de cada cubeta (fuente o compartida)."""
+        now: float = self.__clock()
+        stats: dict[str, dict] = dict()
+        for source in sorted(self.__buckets):
+            bucket: TokenBucket = self.__buckets[source]
+            bucket.refill(now)
+            stats[source] = {
+                "rate": bucket.rate,
+                "burst": bucket.burst,
+                "tokens": int(bucket.tokens),
+                "accepted": self.__accepted.get(source, 0),
+                "rejected": self.__rejected.get(source, 0),
+            }
+        return stats
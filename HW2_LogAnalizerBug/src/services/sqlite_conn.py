@@ -1,73 +1,321 @@
-from typing import ClassVar
-from datetime import datetime
-from functools import lru_cache
+from typing import ClassVar, Iterator
+from datetime import datetime, timedelta
 
 from os.path import abspath, exists
-from sqlite3 import connect, Cursor
+from sqlite3 import connect, Connection, Cursor
 
-from src.model.log_entry import LogEntry
+from src.model.log_record import LogRecord
+from src.model.log_row import LogRow
+from src.services.template_miner import TemplateMiner
+from src.services.log_filter import LogFilter
 
 class SQliteConn:
     NON_EXISTENT_PATH: ClassVar[str] = "The path to the database does not exist."
+    LOGS_COLUMNS: ClassVar[tuple[str, ...]] = ("timestamp", "tag", "message", "template_id", "params", "seq", "source")
     CREATE_TABLE_QUERY: ClassVar[str] = """
     CREATE TABLE IF NOT EXISTS {} (
         timestamp TEXT NOT NULL,
         tag TEXT NOT NULL,
-        message TEXT NOT NULL
+        message TEXT,
+        template_id INTEGER,
+        params TEXT,
+        seq INTEGER,
+        source TEXT NOT NULL DEFAULT 'default'
+    )
+    """
+    CREATE_SEQ_INDEX_QUERY: ClassVar[str] = """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_{0}_seq ON {0} (seq)
+    """
+    CREATE_TIMESTAMP_INDEX_QUERY: ClassVar[str] = """
+    CREATE INDEX IF NOT EXISTS idx_{0}_timestamp ON {0} (timestamp)
+    """
+    CREATE_TEMPLATE_INDEX_QUERY: ClassVar[str] = """
+    CREATE INDEX IF NOT EXISTS idx_{0}_template ON {0} (template_id, timestamp)
+    """
+    CREATE_SOURCE_INDEX_QUERY: ClassVar[str] = """
+    CREATE INDEX IF NOT EXISTS idx_{0}_source ON {0} (source, timestamp, seq)
+    """
+    CREATE_TEMPLATES_TABLE_QUERY: ClassVar[str] = """
+    CREATE TABLE IF NOT EXISTS {} (
+        template_id INTEGER PRIMARY KEY,
+        cluster_id INTEGER NOT NULL,
+        template TEXT NOT NULL
     )
     """
     GET_LOGS_QUERY: ClassVar[str] = """
     SELECT 
-        timestamp, tag, message 
+        timestamp, tag, message, template_id, params, seq, source 
     FROM 
         {}
     WHERE 
-        timestamp BETWEEN ? AND ?;
+        timestamp BETWEEN ? AND ?
+    ORDER BY 
+        timestamp, seq;
+    """
+    GET_FILTERED_LOGS_QUERY: ClassVar[str] = """
+    SELECT 
+        timestamp, tag, message, template_id, params, seq, source 
+    FROM 
+        {0}
+    WHERE 
+        timestamp BETWEEN ? AND ? AND {1}
+    ORDER BY 
+        timestamp, seq;
+    """
+    CREATE_FTS_TABLE_QUERY: ClassVar[str] = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS {0}_fts USING fts5(message, tokenize = 'trigram')
+    """
+    CREATE_FTS_TRIGGER_QUERY: ClassVar[str] = """
+    CREATE TRIGGER IF NOT EXISTS {0}_fts_insert AFTER INSERT ON {0} BEGIN
+        INSERT INTO {0}_fts (rowid, message) VALUES (new.rowid, log_message(new.message, new.template_id, new.params));
+    END
+    """
+    POPULATE_FTS_QUERY: ClassVar[str] = """
+    INSERT INTO {0}_fts (rowid, message) 
+    SELECT rowid, log_message(message, template_id, params) FROM {0}
+    """
+    COUNT_BY_TEMPLATE_QUERY: ClassVar[str] = """
+    SELECT 
+        template_id, COUNT(*) 
+    FROM 
+        {}
+    WHERE 
+        template_id IS NOT NULL AND timestamp BETWEEN ? AND ?
+    GROUP BY 
+        template_id;
+    """
+    TEMPLATE_TIMELINE_QUERY: ClassVar[str] = """
+    SELECT 
+        (strftime('%s', timestamp) - strftime('%s', ?)) / ? AS bucket, COUNT(*) 
+    FROM 
+        {}
+    WHERE 
+        template_id IN ({}) AND timestamp BETWEEN ? AND ?
+    GROUP BY 
+        bucket;
     """
     
-    def __init__(self, db_path: str, logs_table: str = "logs"):
+    def __init__(
+        self,
+        db_path: str,
+        logs_table: str = "logs",
+        template_miner: TemplateMiner | None = None,
+        templates_table: str = "log_templates",
+        persist_templates: bool = True,
+    ):
         self.__db_path: str = abspath(db_path)
         assert exists(self.__db_path), self.NON_EXISTENT_PATH
         
         self.__logs_table: str = logs_table
+        # Logs en cuarentena (timestamp fuera de los límites del LogPruner): nunca se consultan con los demás
+        self.__quarantine_table: str = f"{logs_table}_quarantine"
+        self.__templates_table: str = templates_table
+        self.__template_miner: TemplateMiner | None = template_miner
+        # Las bases particionadas delegan las plantillas al catálogo de ShardedSQliteConn
+        self.__persist_templates: bool = persist_templates and template_miner is not None
+        self.__persisted_templates: int = 0
+        self.__has_fts: bool = False
         self.__init_db_connection()
     
+    def __connect(self, check_same_thread: bool = True) -> Connection:
+        """Abre una conexión con las funciones que usan los filtros y el índice FTS.
+
+        - log_message(message, template_id, params): mensaje original de una fila
+        - regexp(pattern, value): operador `value REGEXP pattern` con patrones compilados una vez
+        """
+        conn: Connection = connect(self.__db_path, check_same_thread=check_same_thread)
+        conn.create_function("log_message", 3, self.__sql_message, deterministic=True)
+        conn.create_function("regexp", 2, LogFilter.regexp, deterministic=True)
+        return conn
+    
     def __init_db_connection(self) -> None:
         """Inicializa la conexión a la base de datos SQLite y crea la tabla si no existe.
     
         Este método es llamado durante la inicialización del SQliteConn y se encarga de:
         1. Establecer la conexión inicial con la base de datos
-        2. Crear la tabla de logs si no existe
-        3. Asegurar que la base de datos está lista para almacenar logs
+        2. Crear las tablas de logs y plantillas si no existen
+        3. Migrar tablas de logs creadas con un esquema anterior
+        4. Cargar las plantillas persistidas en el TemplateMiner (si `persist_templates`)
         
         Note:
             La estructura de la tabla se define en CREATE_TABLE_QUERY y contiene:
             - timestamp: TEXT - Marca temporal del log
             - tag: TEXT - Nivel o categoría del log
-            - message: TEXT - Contenido del mensaje
+            - message: TEXT - Contenido del mensaje (NULL si se guardó como plantilla)
+            - template_id: INTEGER - Versión de plantilla del mensaje
+            - params: TEXT - Parámetros de la plantilla separados por espacios
+            - seq: INTEGER - Secuencia de ingesta (única; NULL en filas anteriores a su introducción)
+            - source: TEXT - Aplicación que emitió el log ('default' en filas anteriores a su introducción)
+        
+        El índice (source, timestamp, seq) permite que las consultas de una sola
+        fuente recorran solo las filas de esa fuente. La tabla `<logs>_quarantine`
+        tiene las mismas columnas y guarda los logs en cuarentena, que ninguna
+        consulta de logs lee.
         """
         with connect(self.__db_path) as conn:
             conn.execute(self.CREATE_TABLE_QUERY.format(self.__logs_table))
+            self.__migrate_schema(conn)
+            conn.execute(self.CREATE_SEQ_INDEX_QUERY.format(self.__logs_table))
+            conn.execute(self.CREATE_TIMESTAMP_INDEX_QUERY.format(self.__logs_table))
+            conn.execute(self.CREATE_TEMPLATE_INDEX_QUERY.format(self.__logs_table))
+            conn.execute(self.CREATE_SOURCE_INDEX_QUERY.format(self.__logs_table))
+            conn.execute(self.CREATE_TABLE_QUERY.format(self.__quarantine_table))
+            conn.execute(self.CREATE_SEQ_INDEX_QUERY.format(self.__quarantine_table))
+            if self.__persist_templates:
+                conn.execute(self.CREATE_TEMPLATES_TABLE_QUERY.format(self.__templates_table))
             conn.commit()
+            
+            if self.__persist_templates:
+                self.__load_templates(conn)
+                self.__persisted_templates = self.__template_miner.templates_count
+            
+            self.__has_fts = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{self.__logs_table}_fts",)
+            ).fetchone() is not None
+            if self.__has_fts:
+                # La migración del esquema elimina el trigger junto con la tabla anterior
+                conn.execute(self.CREATE_FTS_TRIGGER_QUERY.format(self.__logs_table))
+                conn.commit()
         return
     
-    def save_logs(self, logs: list[LogEntry] | LogEntry) -> None:
+    def __load_templates(self, conn: Connection) -> None:
+        """Carga en el TemplateMiner las plantillas persistidas que todavía no conoce."""
+        cursor: Cursor = conn.execute(
+            f"SELECT template_id, cluster_id, template FROM {self.__templates_table} "
+            "WHERE template_id >= ? ORDER BY template_id",
+            (self.__template_miner.templates_count,)
+        )
+        self.__template_miner.restore(cursor)
+    
+    def __migrate_schema(self, conn: Connection) -> None:
+        """Reconstruye la tabla de logs si fue creada con un esquema anterior.
+
+        SQLite no permite modificar restricciones de columnas existentes, por lo
+        que la tabla se recrea con CREATE_TABLE_QUERY copiando las columnas comunes.
+        Se conserva el rowid de cada fila, que es la clave del índice FTS.
+
+        Args:
+            conn (Connection): Conexión abierta a la base de datos
+        """
+        columns: list[str] = [row[1] for row in conn.execute(f"PRAGMA table_info({self.__logs_table})")]
+        if tuple(columns) == self.LOGS_COLUMNS:
+            return
+        
+        common: str = ", ".join(column for column in columns if column in self.LOGS_COLUMNS)
+        legacy_table: str = f"{self.__logs_table}_legacy"
+        conn.execute(f"ALTER TABLE {self.__logs_table} RENAME TO {legacy_table}")
+        conn.execute(self.CREATE_TABLE_QUERY.format(self.__logs_table))
+        conn.execute(
+            f"INSERT INTO {self.__logs_table} (rowid, {common}) SELECT rowid, {common} FROM {legacy_table}"
+        )
+        conn.execute(f"DROP TABLE {legacy_table}")
+        print(f"Migrated table {self.__logs_table} to columns {self.LOGS_COLUMNS}")
+    
+    def __message(self, row: tuple) -> str:
+        """Mensaje de una fila (timestamp, tag, message, template_id, params, seq, source).
+
+        Si la fila usa una plantilla que el TemplateMiner no conoce (la creó
+        otro proceso, por ejemplo el CacheServer), se cargan las plantillas nuevas.
+        """
+        if row[3] is None:
+            return row[2]
+        assert self.__template_miner is not None, "A TemplateMiner is required to decode templated logs"
+        if row[3] >= self.__template_miner.templates_count and self.__persist_templates:
+            with connect(self.__db_path) as conn:
+                self.__load_templates(conn)
+        return self.__template_miner.render(row[3], row[4])
+    
+    def __sql_message(self, message: str | None, template_id: int | None, params: str | None) -> str:
+        return self.__message((None, None, message, template_id, params, None, None))
+    
+    def max_seq(self) -> int:
+        """Devuelve la mayor secuencia de ingesta persistida, incluida la cuarentena (0 si no hay ninguna)."""
+        with connect(self.__db_path) as conn:
+            (max_seq,) = conn.execute(
+                f"SELECT MAX(seq) FROM (SELECT MAX(seq) AS seq FROM {self.__logs_table} "
+                f"UNION ALL SELECT MAX(seq) FROM {self.__quarantine_table})"
+            ).fetchone()
+        return max_seq or 0
+    
+    def iter_records(self, batch_size: int = 10_000) -> Iterator[LogRecord]:
+        """Recorre todos los logs persistidos como LogRecord, sin reconstruir mensajes.
+
+        Se usa para copiar logs entre bases (por ejemplo al reparticionar).
+
+        Args:
+            batch_size (int): Filas leídas por cada fetchmany
+
+        Yields:
+            LogRecord: Registros en orden (timestamp, seq)
+        """
+        with connect(self.__db_path) as conn:
+            cursor: Cursor = conn.execute(
+                f"SELECT timestamp, tag, message, template_id, params, seq, source FROM {self.__logs_table} "
+                "ORDER BY timestamp, seq"
+            )
+            while rows := cursor.fetchmany(batch_size):
+                for timestamp, tag, message, template_id, params, seq, source in rows:
+                    yield LogRecord(
+                        datetime.fromisoformat(timestamp), tag, template_id,
+                        message if template_id is None else params, seq, source
+                    )
+    
+    def iter_rows(
+        self, start_time: datetime, end_time: datetime, batch_size: int = 10_000, source: str | None = None
+    ) -> Iterator[LogRow]:
+        """Recorre los logs de un rango como filas planas, sin construir LogEntry.
+
+        Las filas se leen del cursor de a `batch_size`, así que la memoria no
+        depende del tamaño del rango. El timestamp queda como el string ISO
+        guardado y solo se reconstruyen los mensajes codificados como plantilla.
+
+        Args:
+            start_time (datetime): Inicio del rango temporal (inclusive)
+            end_time (datetime): Fin del rango temporal (inclusive)
+            batch_size (int): Filas leídas por cada fetchmany
+            source (str | None): Solo los logs de esta fuente; None para todas
+
+        Yields:
+            LogRow: (timestamp ISO, tag, message, seq, source) en orden (timestamp, seq)
+
+        Raises:
+            ConnectionError: Si ocurre un error durante la consulta a la base de datos
+        """
+        # El generador puede consumirse desde distintos hilos (StreamingResponse), nunca a la vez
+        conn: Connection = connect(self.__db_path, check_same_thread=False)
+        try:
+            query, params = self.__rows_query(None, source)
+            cursor: Cursor = conn.execute(query, (start_time.isoformat(), end_time.isoformat(), *params))
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    yield row[0], row[1], self.__message(row), row[5], row[6]
+        except Exception as e:
+            raise ConnectionError(f"Error retrieving logs from database: {e}") from e
+        finally:
+            conn.close()
+    
+    def save_logs(self, logs: list[LogRecord] | LogRecord) -> None:
         """Guarda uno o varios logs en la base de datos SQLite.
     
         Este método maneja tanto logs individuales como listas de logs:
         1. Convierte el input en una lista si es un log individual
-        2. Inserta los logs en la base de datos usando una única transacción
-        3. Muestra información sobre el rango temporal de los logs guardados
+        2. Persiste las plantillas nuevas del TemplateMiner
+        3. Inserta los logs en la base de datos usando una única transacción
+        4. Muestra información sobre el rango temporal de los logs guardados
+        
+        Los logs codificados se guardan como template_id + params, con message NULL.
+        Los registros cuya secuencia ya está persistida se ignoran, por lo que
+        reintentar un guardado (por ejemplo tras reproducir el journal) es seguro.
         
         Args:
-            logs (list[LogEntry] | LogEntry): Log individual o lista de logs a guardar
+            logs (list[LogRecord] | LogRecord): Registro individual o lista de registros a guardar
         
         Raises:
             ConnectionError: Si ocurre un error durante la conexión o inserción en la base de datos
         
         Example:
             sqlite_conn = SQliteConn("logs.db")
-            log = LogEntry(timestamp=datetime.now(), tag="INFO", message="Test")
+            log = LogRecord(datetime.now(), "INFO", None, "Test", 1, "spark-etl")
             sqlite_conn.save_logs(log)  # Guarda un log individual
             sqlite_conn.save_logs([log1, log2])  # Guarda múltiples logs
         
@@ -75,48 +323,285 @@ class SQliteConn:
             Los timestamps se convierten a formato ISO antes de guardarse
             para garantizar consistencia en el almacenamiento.
         """
+        self.__save(logs, self.__logs_table)
+    
+    def save_quarantined(self, logs: list[LogRecord] | LogRecord) -> None:
+        """Guarda logs en cuarentena en su propia tabla, fuera de las consultas.
+
+        Son los logs que el LogPruner rechazó por tener un timestamp demasiado
+        adelantado: se conservan para auditarlos, pero GET /logs, las
+        exportaciones y los conteos por plantilla no los leen.
+
+        Args:
+            logs (list[LogRecord] | LogRecord): Registro individual o lista de registros a guardar
+
+        Raises:
+            ConnectionError: Si ocurre un error durante la conexión o inserción en la base de datos
+        """
+        self.__save(logs, self.__quarantine_table)
+    
+    def __save(self, logs: list[LogRecord] | LogRecord, table: str) -> None:
         if not logs:
             return
         
-        with connect(self.__db_path) as conn:
+        # __connect registra log_message, que usa el trigger del índice FTS
+        with self.__connect() as conn:
             try:
-                logs = list(logs) if not isinstance(logs, list) else logs
+                logs = [logs] if isinstance(logs, LogRecord) else list(logs)
+                
+                new_templates: list[tuple[int, int, str]] = list()
+                if self.__persist_templates:
+                    new_templates = self.__template_miner.templates_since(self.__persisted_templates)
+                    conn.executemany(
+                        f"INSERT OR IGNORE INTO {self.__templates_table} (template_id, cluster_id, template) VALUES (?, ?, ?)",
+                        new_templates
+                    )
                 
                 conn.executemany(
-                    f"INSERT INTO {self.__logs_table} (timestamp, tag, message) VALUES (?, ?, ?)",
-                    [(log.timestamp.isoformat(), log.tag, log.message) for log in logs]
+                    f"INSERT OR IGNORE INTO {table} (timestamp, tag, message, template_id, params, seq, source) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (log.timestamp.isoformat(), log.tag, log.payload, None, None, log.seq, log.source)
+                        if log.template_id is None
+                        else (log.timestamp.isoformat(), log.tag, None, log.template_id, log.payload, log.seq, log.source)
+                        for log in logs
+                    ]
                 )
                 conn.commit()
+                self.__persisted_templates += len(new_templates)
+                timestamps: list[datetime] = [log.timestamp for log in logs]
                 print(
-                    f"Saved {len(logs)} logs to database "
-                    f"(from {min(logs).timestamp.isoformat()} to {max(logs).timestamp.isoformat()})"
+                    f"Saved {len(logs)} logs to {table} "
+                    f"(from {min(timestamps).isoformat()} to {max(timestamps).isoformat()})"
                 )
             except Exception as e:
                 conn.rollback()
                 raise ConnectionError(f"Error saving logs to database: {e}") from e
             
-    @lru_cache(maxsize=50)  # agregamos cache a las consultas a la base de datos. 
-    def get_logs(self, start_time: datetime, end_time: datetime) -> list[LogEntry]:
-        """Recupera logs dentro de un rango de tiempo específico.
+    def __filter_clause(self, log_filter: LogFilter) -> tuple[str, list]:
+        """Traduce un LogFilter a condiciones SQL que se evalúan dentro de SQLite.
+
+        - contains: los mensajes sin plantilla se filtran con `instr` nativo y
+          los de plantillas cuyo texto fijo contiene la subcadena se aceptan por
+          template_id; solo el resto reconstruye el mensaje con `log_message`.
+          Si existe el índice FTS (trigram) se usa como prefiltro.
+        - regex: `log_message(...) REGEXP ?` con el patrón compilado una vez.
+
+        Returns:
+            tuple[str, list]: Condición SQL y sus parámetros
+        """
+        clauses: list[str] = list()
+        params: list = list()
+        if log_filter.contains is not None:
+            if self.__has_fts and len(log_filter.contains) >= 3:
+                clauses.append(
+                    f"rowid IN (SELECT rowid FROM {self.__logs_table}_fts WHERE {self.__logs_table}_fts MATCH ?)"
+                )
+                params.append('"' + log_filter.contains.replace('"', '""') + '"')
+            template_hits: list[int] = log_filter.template_hits(self.__template_miner)
+            contains: str = (
+                "(template_id IS NULL AND instr(message, ?) > 0) "
+                "OR (template_id IS NOT NULL AND instr(log_message(NULL, template_id, params), ?) > 0)"
+            )
+            if template_hits:
+                contains = f"template_id IN ({', '.join(map(str, template_hits))}) OR {contains}"
+            clauses.append(f"({contains})")
+            params.extend((log_filter.contains, log_filter.contains))
+        if log_filter.regex is not None:
+            clauses.append("log_message(message, template_id, params) REGEXP ?")
+            params.append(log_filter.regex)
+        return " AND ".join(clauses), params
+    
+    def __rows_query(
+        self, log_filter: LogFilter | None, source: str | None = None, tags: list[str] | None = None
+    ) -> tuple[str, list]:
+        """Consulta de filas de un rango, con los filtros de mensaje, fuente y tags que correspondan."""
+        clauses: list[str] = list()
+        params: list = list()
+        if source is not None:
+            # Con la igualdad sobre source, SQLite recorre idx_{tabla}_source (source, timestamp, seq)
+            clauses.append("source = ?")
+            params.append(source)
+        if tags is not None:
+            clauses.append(f"tag IN ({', '.join('?' for _ in tags)})" if tags else "0")
+            params.extend(tags)
+        if log_filter is not None and log_filter.active:
+            clause, filter_params = self.__filter_clause(log_filter)
+            clauses.append(clause)
+            params.extend(filter_params)
+        if not clauses:
+            return self.GET_LOGS_QUERY.format(self.__logs_table), params
+        return self.GET_FILTERED_LOGS_QUERY.format(self.__logs_table, " AND ".join(clauses)), params
+    
+    def get_rows_in_ranges(
+        self,
+        ranges: list[tuple[datetime, datetime]],
+        log_filter: LogFilter | None = None,
+        source: str | None = None,
+        tags: list[str] | None = None,
+    ) -> list[list[LogRow]]:
+        """Recupera los logs de varios rangos como filas planas, sin construir LogEntry.
+
+        Es el camino rápido de GET /logs y POST /logs/query: el timestamp queda
+        como el string ISO guardado y la fila se serializa directamente a JSON.
+        Los filtros de mensaje se resuelven dentro de SQLite (ver `__filter_clause`),
+        así que solo se leen las filas que los cumplen.
 
         Args:
-            start_time (str): Timestamp inicial en formato ISO (YYYY-MM-DDTHH:MM:SS)
-            end_time (str): Timestamp final en formato ISO (YYYY-MM-DDTHH:MM:SS)
+            ranges (list[tuple[datetime, datetime]]): Rangos (inicio, fin) inclusivos, normalizados
+            log_filter (LogFilter | None): Filtro por subcadena o expresión regular del mensaje
+            source (str | None): Solo los logs de esta fuente; None para todas
+            tags (list[str] | None): Solo los logs con alguno de estos tags; None para todos
 
         Returns:
-            list[LogEntry]: Lista de logs encontrados en el rango especificado
+            list[list[LogRow]]: Filas (timestamp ISO, tag, message, seq, source) de cada rango, en el mismo orden
 
         Raises:
             ConnectionError: Si ocurre un error durante la consulta a la base de datos
         """
+        with self.__connect() as conn:
+            try:
+                query, params = self.__rows_query(log_filter, source, tags)
+                return [
+                    [
+                        (row[0], row[1], self.__message(row), row[5], row[6])
+                        for row in conn.execute(query, (start.isoformat(), end.isoformat(), *params))
+                    ]
+                    for start, end in ranges
+                ]
+            except Exception as e:
+                raise ConnectionError(f"Error retrieving logs from database: {e}") from e
+    
+    def explain_rows_in_ranges(
+        self, ranges: list[tuple[datetime, datetime]], log_filter: LogFilter | None = None, source: str | None = None
+    ) -> list[str]:
+        """Plan de SQLite (EXPLAIN QUERY PLAN) de la consulta que ejecuta `get_rows_in_ranges`.
+
+        El plan es el mismo para todos los rangos, así que se obtiene con el primero.
+
+        Args:
+            ranges (list[tuple[datetime, datetime]]): Rangos de la consulta
+            log_filter (LogFilter | None): Filtro de mensajes de la consulta
+            source (str | None): Fuente de la consulta
+
+        Returns:
+            list[str]: Una línea por paso del plan, indentada según su nivel
+
+        Raises:
+            ConnectionError: Si ocurre un error al obtener el plan
+        """
+        if not ranges:
+            return list()
+        with self.__connect() as conn:
+            try:
+                query, params = self.__rows_query(log_filter, source)
+                start, end = ranges[0]
+                depths: dict[int, int] = {0: -1}
+                plan: list[str] = list()
+                for node_id, parent, _, detail in conn.execute(
+                    "EXPLAIN QUERY PLAN " + query, (start.isoformat(), end.isoformat(), *params)
+                ):
+                    depths[node_id] = depths.get(parent, -1) + 1
+                    plan.append("  " * depths[node_id] + detail)
+                return plan
+            except Exception as e:
+                raise ConnectionError(f"Error explaining query: {e}") from e
+    
+    def create_fts_index(self) -> 'SQliteConn':
+        """Crea un índice FTS5 (trigram) de los mensajes y lo mantiene con un trigger.
+
+        El índice guarda el mensaje reconstruido de cada fila y sirve de
+        prefiltro para los filtros `contains` de 3 o más caracteres. Lo llenan
+        las filas existentes y, desde entonces, cada inserción; todo proceso que
+        escriba en la tabla debe hacerlo a través de SQliteConn, que registra
+        la función `log_message` que usa el trigger.
+
+        Returns:
+            SQliteConn: Self para permitir encadenamiento de métodos
+
+        Raises:
+            ConnectionError: Si falla la creación del índice
+        """
+        if self.__has_fts:
+            return self
+        with self.__connect() as conn:
+            try:
+                conn.execute(self.CREATE_FTS_TABLE_QUERY.format(self.__logs_table))
+                conn.execute(self.POPULATE_FTS_QUERY.format(self.__logs_table))
+                conn.execute(self.CREATE_FTS_TRIGGER_QUERY.format(self.__logs_table))
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise ConnectionError(f"Error creating full-text index: {e}") from e
+        self.__has_fts = True
+        return self
+    
+    def count_by_template(self, start_time: datetime, end_time: datetime) -> dict[int, int]:
+        """Cuenta los logs persistidos por cluster de plantilla dentro de un rango.
+
+        La consulta se resuelve con el índice (template_id, timestamp).
+
+        Args:
+            start_time (datetime): Inicio del rango temporal (inclusive)
+            end_time (datetime): Fin del rango temporal (inclusive)
+
+        Returns:
+            dict[int, int]: Cantidad de logs por cluster_id
+
+        Raises:
+            ConnectionError: Si ocurre un error durante la consulta a la base de datos
+        """
+        if self.__template_miner is None:
+            return dict()
         
-        print(f"Searching in DB from {start_time} to {end_time}")
+        with connect(self.__db_path) as conn:
+            try:
+                cursor: Cursor = conn.execute(
+                    self.COUNT_BY_TEMPLATE_QUERY.format(self.__logs_table),
+                    (start_time.isoformat(), end_time.isoformat())
+                )
+                counts: dict[int, int] = dict()
+                for template_id, count in cursor:
+                    cluster_id: int = self.__template_miner.cluster_of(template_id)
+                    counts[cluster_id] = counts.get(cluster_id, 0) + count
+                return counts
+            except Exception as e:
+                raise ConnectionError(f"Error counting logs by template: {e}") from e
+    
+    def template_timeline(
+        self, cluster_id: int, start_time: datetime, end_time: datetime, bucket: timedelta
+    ) -> dict[datetime, int]:
+        """Cuenta los logs persistidos de un cluster de plantilla por intervalos de tiempo.
+
+        Args:
+            cluster_id (int): Cluster de plantilla
+            start_time (datetime): Inicio del rango temporal (inclusive)
+            end_time (datetime): Fin del rango temporal (inclusive)
+            bucket (timedelta): Tamaño de cada intervalo (segundos enteros), alineado a start_time
+
+        Returns:
+            dict[datetime, int]: Cantidad de logs por inicio de intervalo
+
+        Raises:
+            ConnectionError: Si ocurre un error durante la consulta a la base de datos
+        """
+        if self.__template_miner is None:
+            return dict()
+        template_ids: list[int] = self.__template_miner.versions(cluster_id)
+        if not template_ids:
+            return dict()
         
+        bucket_seconds: int = int(bucket.total_seconds())
         with connect(self.__db_path) as conn:
             try:
-                cursor: Cursor = conn.execute(self.GET_LOGS_QUERY.format(self.__logs_table), (start_time.isoformat(), end_time.isoformat()))
-                logs: list[LogEntry] = [LogEntry.from_db_row(row) for row in cursor] 
-                return logs
+                cursor: Cursor = conn.execute(
+                    self.TEMPLATE_TIMELINE_QUERY.format(self.__logs_table, ", ".join("?" * len(template_ids))),
+                    (start_time.isoformat(), bucket_seconds, *template_ids, start_time.isoformat(), end_time.isoformat())
+                )
+                return {
+                    start_time + index * timedelta(seconds=bucket_seconds): count
+                    for index, count in cursor
+                }
             except Exception as e:
-                raise ConnectionError(f"Error retrieving logs from database: {e}") from e
+                raise ConnectionError(f"Error retrieving template timeline: {e}") from e
     
\ No newline at end of file
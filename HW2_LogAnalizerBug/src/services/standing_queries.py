@@ -0,0 +1,228 @@
+from datetime import datetime, timedelta
+from hashlib import sha1
+from typing import Callable, Iterable
+
+from sortedcontainers import SortedList
+
+from src.model.log_entry import LogEntry
+from src.model.log_query import StandingQueryDefinition
+from src.model.log_row import LogRow, log_row_json
+from src.services.log_filter import LogFilter
+
+# Función que devuelve las filas (cache + base de datos) de un rango, filtradas por mensaje y fuente
+RowFetcher = Callable[[datetime, datetime, LogFilter | None, str | None], Iterable[LogRow]]
+# Función que devuelve el watermark de una fuente (None: el de todas las fuentes)
+WatermarkOf = Callable[[str | None], datetime | None]
+
+
+class StandingQuery:
+    """Resultado de una consulta permanente, mantenido log a log.
+
+    Guarda cada log que cumple el filtro ya serializado (`log_row_json`),
+    ordenado por (timestamp, seq), y descarta los que quedan antes de
+    `watermark - window`. El cuerpo de la respuesta se arma una sola vez por
+    versión: mientras no cambie el resultado, leerlo no recorre ni serializa
+    los logs.
+
+    Attributes:
+        id (str): Identificador derivado de la definición
+        definition (StandingQueryDefinition): Filtro y ventana de la consulta
+        version (int): Versión del resultado; cambia con cada log agregado o descartado
+        __window (timedelta): Ventana relativa al watermark
+        __log_filter (LogFilter | None): Filtro de mensaje (`contains` / `regex`)
+        __rows (SortedList): (timestamp, seq, JSON del log) de los logs en la ventana
+        __body (bytes | None): Cuerpo JSON de la versión actual
+    """
+    def __init__(self, query_id: str, definition: StandingQueryDefinition, version: int):
+        self.id: str = query_id
+        self.definition: StandingQueryDefinition = definition
+        self.version: int = version
+        self.__window: timedelta = timedelta(seconds=definition.window_seconds)
+        self.__tags: frozenset[str] | None = frozenset(definition.tags) if definition.tags else None
+        self.__log_filter: LogFilter | None = \
+            LogFilter.of(contains=definition.contains, regex=definition.regex) \
+            if definition.contains or definition.regex else None
+        self.__rows: SortedList = SortedList()
+        self.__body: bytes | None = None
+
+    @property
+    def log_filter(self) -> LogFilter | None:
+        return self.__log_filter
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.id}-{self.version}"'
+
+    def threshold(self, watermark: datetime) -> datetime:
+        return watermark - self.__window
+
+    def __component_matches(self, message: str) -> bool:
+        component: str | None = LogEntry.component_of(message)
+        prefix: str = self.definition.component
+        return component is not None and (component == prefix or component.startswith(prefix + "."))
+
+    def matches(self, tag: str, message: str, source: str, apply_log_filter: bool = True) -> bool:
+        if self.definition.source is not None and source != self.definition.source:
+            return False
+        if self.__tags is not None and tag not in self.__tags:
+            return False
+        if self.definition.component is not None and not self.__component_matches(message):
+            return False
+        return not apply_log_filter or self.__log_filter is None or self.__log_filter.matches(message)
+
+    def add(self, timestamp: datetime, row: LogRow, version: int) -> bool:
+        """Agrega un log que cumple el filtro; devuelve False si ya estaba."""
+        item: tuple = (timestamp, row[3] or 0, log_row_json(row))
+        if item in self.__rows:
+            return False
+        self.__rows.add(item)
+        self.version = version
+        self.__body = None
+        return True
+
+    def expire(self, threshold: datetime, version: int) -> bool:
+        """Descarta los logs anteriores al umbral; devuelve True si descartó alguno."""
+        index: int = self.__rows.bisect_left((threshold,))
+        if not index:
+            return False
+        del self.__rows[:index]
+        self.version = version
+        self.__body = None
+        return True
+
+    def body(self) -> bytes:
+        """Cuerpo {"logs": [...]} de la versión actual, con el mismo JSON que GET /logs."""
+        if self.__body is None:
+            self.__body = ('{"logs":[' + ",".join(item[2] for item in self.__rows) + ']}').encode("utf-8")
+        return self.__body
+
+    def stats(self) -> dict:
+        return {
+            "id": self.id,
+            **self.definition.model_dump(),
+            "count": len(self.__rows),
+            "etag": self.etag,
+        }
+
+
+class StandingQueries:
+    """Consultas permanentes registradas por los clientes (dashboards que consultan cada pocos segundos).
+
+    En lugar de repetir el rango filtrado en cada consulta, cada consulta
+    se resuelve una vez al registrarla (cache + base de datos) y después se
+    mantiene con cada log que recibe el TemporalCache. La ventana es relativa
+    al watermark de tiempo de evento ("los últimos 10 minutos" son los logs
+    con timestamp >= watermark - 10 min), así que avanza con la ingesta y no
+    con el reloj del servidor; un log con el reloj adelantado no vacía las
+    consultas más allá de lo que el LogPruner admite. Una consulta con
+    `source` usa el watermark de la partición de esa fuente, de modo que otra
+    fuente más adelantada no le vacía la ventana; solo las consultas sin
+    fuente usan el watermark global.
+
+    Dos registros con la misma definición comparten la consulta. Las
+    versiones salen de un contador único del registro, por lo que el ETag
+    (`"id-versión"`) no se repite aunque una consulta se borre y se vuelva a
+    registrar.
+
+    Attributes:
+        __max_queries (int): Máximo de consultas registradas a la vez
+        __queries (dict[str, StandingQuery]): Consultas por id
+        __version (int): Última versión asignada
+        __threshold_watermarks (dict[str | None, datetime]): Watermark del último descarte
+                                                             por ventana, por fuente (None: global)
+    """
+    def __init__(self, max_queries: int = 100):
+        assert max_queries > 0, "max_queries must be positive"
+        self.__max_queries: int = max_queries
+        self.__queries: dict[str, StandingQuery] = dict()
+        self.__version: int = 0
+        self.__threshold_watermarks: dict[str | None, datetime] = dict()
+
+    def __next_version(self) -> int:
+        self.__version += 1
+        return self.__version
+
+    @staticmethod
+    def query_id(definition: StandingQueryDefinition) -> str:
+        return sha1(definition.model_dump_json().encode("utf-8")).hexdigest()[:16]
+
+    def register(
+        self, definition: StandingQueryDefinition, watermark: datetime | None, fetch: RowFetcher
+    ) -> tuple[StandingQuery, bool]:
+        """Registra una consulta y calcula su resultado inicial.
+
+        Args:
+            definition (StandingQueryDefinition): Filtro y ventana
+            watermark (datetime | None): Watermark actual de la fuente de la consulta (el global si
+                                         no tiene fuente); None si todavía no hay logs
+            fetch (RowFetcher): Filas de un rango, del cache y de la base de datos
+
+        Returns:
+            tuple[StandingQuery, bool]: Consulta y True si se creó (False si ya existía)
+
+        Raises:
+            re.error: Si `regex` no es una expresión regular válida
+            ValueError: Si ya hay `max_queries` consultas registradas
+        """
+        query_id: str = self.query_id(definition)
+        existing: StandingQuery | None = self.__queries.get(query_id)
+        if existing is not None:
+            return existing, False
+        if len(self.__queries) >= self.__max_queries:
+            raise ValueError(f"Too many standing queries (max {self.__max_queries})")
+
+        query: StandingQuery = StandingQuery(query_id, definition, self.__next_version())
+        if watermark is not None:
+            start_time: datetime = query.threshold(watermark)
+            end_time: datetime = datetime.max.replace(tzinfo=start_time.tzinfo)
+            version: int = self.__next_version()
+            # Los filtros de mensaje y de fuente ya se aplicaron en el cache y en SQLite
+            for row in fetch(start_time, end_time, query.log_filter, definition.source):
+                if query.matches(row[1], row[2], row[4], apply_log_filter=False):
+                    query.add(datetime.fromisoformat(row[0]), row, version)
+        self.__queries[query_id] = query
+        return query, True
+
+    def get(self, query_id: str) -> StandingQuery | None:
+        return self.__queries.get(query_id)
+
+    def remove(self, query_id: str) -> bool:
+        return self.__queries.pop(query_id, None) is not None
+
+    def observe(self, log_entry: LogEntry, watermark_of: WatermarkOf) -> None:
+        """Actualiza las consultas con un log recibido por el cache (listener del TemporalCache).
+
+        Args:
+            log_entry (LogEntry): Log recibido
+            watermark_of (WatermarkOf): Watermark de cada fuente después de recibirlo
+        """
+        if not self.__queries:
+            return
+        row: LogRow | None = None
+        # Todos los cambios que provoca un mismo log comparten versión
+        version: int = self.__next_version()
+        watermarks: dict[str | None, datetime | None] = dict()
+        for query in self.__queries.values():
+            source: str | None = query.definition.source
+            if source not in watermarks:
+                watermarks[source] = watermark_of(source)
+            watermark: datetime | None = watermarks[source]
+            if watermark is None:
+                continue
+            if watermark != self.__threshold_watermarks.get(source):
+                query.expire(query.threshold(watermark), version)
+            if log_entry.timestamp < query.threshold(watermark):
+                continue
+            if not query.matches(log_entry.tag, log_entry.message, log_entry.source):
+                continue
+            if row is None:
+                row = (
+                    log_entry.timestamp.isoformat(), log_entry.tag, log_entry.message, log_entry.seq, log_entry.source
+                )
+            query.add(log_entry.timestamp, row, version)
+        self.__threshold_watermarks.update(
+            (source, watermark) for source, watermark in watermarks.items() if watermark is not None
+        )
+
+    def stats(self) -> list[dict]:
+        return [query.stats() for query in self.__queries.values()]
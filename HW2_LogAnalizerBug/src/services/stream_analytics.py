@@ -0,0 +1,225 @@
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from math import ceil, log, sqrt
+from typing import Callable, ClassVar
+
+from src.model.log_entry import LogEntry
+
+
+class RateTracker:
+    """Tasa de logs de una clave (un tag o un componente) por intervalos de tiempo de evento.
+
+    Mantiene la cantidad del intervalo en curso, una media y varianza EWMA de
+    las cantidades por intervalo cerrado y una ventana deslizante de
+    intervalos. Cada evento se procesa en O(1) amortizado: los intervalos sin
+    eventos se cierran recién cuando llega el siguiente evento de la clave.
+
+    Attributes:
+        interval (int | None): Intervalo en curso
+        count (int): Logs del intervalo en curso
+        mean (float): Media EWMA de logs por intervalo
+        variance (float): Varianza EWMA de logs por intervalo
+        closed_intervals (int): Intervalos cerrados desde el primer evento
+        window_count (int): Logs dentro de la ventana deslizante
+        alerted (bool): True si ya se alertó en el intervalo en curso
+    """
+    __slots__ = (
+        "interval", "count", "mean", "variance", "closed_intervals",
+        "window_count", "alerted", "__buckets", "__alpha", "__max_catch_up",
+    )
+
+    def __init__(self, window_intervals: int, alpha: float):
+        self.interval: int | None = None
+        self.count: int = 0
+        self.mean: float = 0.0
+        self.variance: float = 0.0
+        self.closed_intervals: int = 0
+        self.window_count: int = 0
+        self.alerted: bool = False
+        self.__buckets: list[int] = [0] * window_intervals
+        self.__alpha: float = alpha
+        # Intervalos vacíos tras los cuales el peso de la historia es menor al 0.1%
+        self.__max_catch_up: int = 1 if alpha == 1 else ceil(log(1e-3) / log(1 - alpha))
+
+    def __close(self, count: int) -> None:
+        """Incorpora la cantidad de un intervalo cerrado a la media y varianza EWMA."""
+        difference: float = count - self.mean
+        increment: float = self.__alpha * difference
+        self.mean += increment
+        self.variance = (1 - self.__alpha) * (self.variance + difference * increment)
+        self.closed_intervals += 1
+
+    def __advance(self, interval: int) -> None:
+        """Cierra los intervalos hasta `interval`, incluidos los que no tuvieron eventos."""
+        gap: int = interval - self.interval
+        self.__close(self.count)
+        for _ in range(min(gap - 1, self.__max_catch_up)):
+            self.__close(0)
+        for offset in range(1, min(gap, len(self.__buckets)) + 1):
+            index: int = (self.interval + offset) % len(self.__buckets)
+            self.window_count -= self.__buckets[index]
+            self.__buckets[index] = 0
+        self.interval = interval
+        self.count = 0
+        self.alerted = False
+
+    def observe(self, interval: int) -> None:
+        """Cuenta un evento. Los eventos atrasados se cuentan en el intervalo en curso."""
+        if self.interval is None:
+            self.interval = interval
+        elif interval > self.interval:
+            self.__advance(interval)
+        self.count += 1
+        self.window_count += 1
+        self.__buckets[self.interval % len(self.__buckets)] += 1
+
+    def sigma(self) -> float:
+        """Desvío estándar EWMA, con un piso de Poisson (raíz de la media, al menos 1)."""
+        return max(sqrt(self.variance), sqrt(self.mean), 1.0)
+
+
+class StreamAnalytics:
+    """Detección incremental de picos sobre el stream de ingesta.
+
+    Se registra como listener de `TemporalCache.add_log` y mantiene un
+    RateTracker por tag y por componente, sin consultar el cache ni SQLite.
+    Un intervalo se marca como pico cuando su cantidad de logs supera
+    `mean + k_sigma * sigma` de la línea base EWMA (y al menos `min_count`),
+    una vez que la clave acumuló `warmup_intervals` intervalos. Se emite a
+    lo sumo una alerta por clave e intervalo.
+
+    Attributes:
+        __interval (timedelta): Ancho de cada intervalo
+        __k_sigma (float): Cantidad de desvíos sobre la línea base para alertar
+        __min_count (int): Mínimo de logs en el intervalo para alertar
+        __warmup_intervals (int): Intervalos cerrados necesarios antes de alertar
+        __max_keys (int): Máximo de claves rastreadas por dimensión
+        __trackers (dict[tuple[str, str], RateTracker]): Trackers por (dimensión, clave)
+        __alerts (deque[dict]): Últimas alertas emitidas
+        __listeners (list[Callable[[dict], None]]): Funciones notificadas con cada alerta
+    """
+    DIMENSIONS: ClassVar[tuple[str, ...]] = ("tag", "component")
+    EPOCH: ClassVar[datetime] = datetime(1970, 1, 1)
+    EPOCH_UTC: ClassVar[datetime] = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+    def __init__(
+        self,
+        interval_seconds: int = 10,
+        window_seconds: int = 300,
+        alpha: float = 0.1,
+        k_sigma: float = 3.0,
+        min_count: int = 10,
+        warmup_intervals: int = 10,
+        max_keys: int = 1000,
+        alert_history: int = 100,
+    ):
+        assert interval_seconds > 0, "interval_seconds must be positive"
+        assert window_seconds >= interval_seconds, "window_seconds must cover at least one interval"
+        assert 0 < alpha <= 1, "alpha must be in (0, 1]"
+
+        self.__interval: timedelta = timedelta(seconds=interval_seconds)
+        self.__window_intervals: int = window_seconds // interval_seconds
+        self.__alpha: float = alpha
+        self.__k_sigma: float = k_sigma
+        self.__min_count: int = min_count
+        self.__warmup_intervals: int = warmup_intervals
+        self.__max_keys: int = max_keys
+        self.__trackers: dict[tuple[str, str], RateTracker] = dict()
+        self.__keys_per_dimension: dict[str, int] = {dimension: 0 for dimension in self.DIMENSIONS}
+        self.__untracked: int = 0
+        self.__alerts: deque[dict] = deque(maxlen=alert_history)
+        self.__listeners: list[Callable[[dict], None]] = list()
+
+    def add_listener(self, listener: Callable[[dict], None]) -> 'StreamAnalytics':
+        """Registra una función que recibe cada alerta (por ejemplo el live-tail).
+
+        Returns:
+            StreamAnalytics: Self para permitir encadenamiento de métodos
+        """
+        self.__listeners.append(listener)
+        return self
+
+    def __interval_of(self, timestamp: datetime) -> int:
+        epoch: datetime = self.EPOCH if timestamp.tzinfo is None else self.EPOCH_UTC
+        return (timestamp - epoch) // self.__interval
+
+    def __tracker(self, dimension: str, key: str) -> RateTracker | None:
+        tracker: RateTracker | None = self.__trackers.get((dimension, key))
+        if tracker is None:
+            if self.__keys_per_dimension[dimension] >= self.__max_keys:
+                self.__untracked += 1
+                return None
+            tracker = RateTracker(self.__window_intervals, self.__alpha)
+            self.__trackers[(dimension, key)] = tracker
+            self.__keys_per_dimension[dimension] += 1
+        return tracker
+
+    def __check_spike(self, dimension: str, key: str, tracker: RateTracker) -> None:
+        if (
+            tracker.alerted
+            or tracker.closed_intervals < self.__warmup_intervals
+            or tracker.count < self.__min_count
+        ):
+            return
+        threshold: float = tracker.mean + self.__k_sigma * tracker.sigma()
+        if tracker.count <= threshold:
+            return
+
+        tracker.alerted = True
+        alert: dict = {
+            "interval_start": (self.EPOCH + tracker.interval * self.__interval).isoformat(),
+            "dimension": dimension,
+            "key": key,
+            "count": tracker.count,
+            "baseline": round(tracker.mean, 3),
+            "sigma": round(tracker.sigma(), 3),
+            "threshold": round(threshold, 3),
+            "window_count": tracker.window_count,
+        }
+        self.__alerts.append(alert)
+        for listener in self.__listeners:
+            listener(alert)
+
+    def observe(self, log_entry: LogEntry) -> None:
+        """Actualiza las tasas del tag y del componente de un log y detecta picos.
+
+        Args:
+            log_entry (LogEntry): Log recién ingerido
+        """
+        interval: int = self.__interval_of(log_entry.timestamp)
+        for dimension, key in (("tag", log_entry.tag), ("component", log_entry.component)):
+            if key is None:
+                continue
+            tracker: RateTracker | None = self.__tracker(dimension, key)
+            if tracker is None:
+                continue
+            tracker.observe(interval)
+            self.__check_spike(dimension, key, tracker)
+
+    def alerts(self, dimension: str | None = None) -> list[dict]:
+        """Devuelve las últimas alertas, de la más antigua a la más reciente."""
+        return [alert for alert in self.__alerts if dimension is None or alert["dimension"] == dimension]
+
+    def rates(self, dimension: str | None = None) -> list[dict]:
+        """Devuelve el estado de cada tracker, ordenado por logs en la ventana deslizante."""
+        rates: list[dict] = [
+            {
+                "dimension": tracker_dimension,
+                "key": key,
+                "current_count": tracker.count,
+                "baseline": round(tracker.mean, 3),
+                "sigma": round(tracker.sigma(), 3),
+                "window_count": tracker.window_count,
+            }
+            for (tracker_dimension, key), tracker in self.__trackers.items()
+            if dimension is None or tracker_dimension == dimension
+        ]
+        return sorted(rates, key=lambda rate: rate["window_count"], reverse=True)
+
+    def stats(self) -> dict:
+        return {
+            "interval_seconds": int(self.__interval.total_seconds()),
+            "tracked_keys": dict(self.__keys_per_dimension),
+            "untracked_events": self.__untracked,
+            "alerts": len(self.__alerts),
+        }
@@ -0,0 +1,235 @@
+import re
+from typing import Callable, ClassVar, Iterable
+
+from src.model.log_entry import LogEntry
+from src.model.log_record import LogRecord
+
+
+class TemplateMiner:
+    """Minero de plantillas de logs en línea basado en el algoritmo Drain.
+
+    Cada mensaje se tokeniza por espacios y se busca en un árbol de parseo de
+    profundidad fija: el primer nivel agrupa por cantidad de tokens y los
+    siguientes por los primeros tokens del mensaje. En la hoja se elige el
+    cluster más similar; si supera `similarity_threshold` el mensaje se asigna
+    a ese cluster (generalizando con `<*>` los tokens que difieren), si no se
+    crea un cluster nuevo.
+
+    Las plantillas son inmutables: cuando un cluster se generaliza se crea una
+    nueva versión (`template_id`) y las anteriores se conservan, de modo que
+    cualquier registro codificado puede reconstruirse exactamente.
+
+    Attributes:
+        __depth (int): Profundidad del árbol de parseo
+        __similarity_threshold (float): Similitud mínima para asignar un cluster
+        __max_children (int): Máximo de hijos por nodo interno
+        __templates (list[tuple[int, tuple[str, ...]]]): (cluster_id, tokens) por template_id
+        __clusters (list[int]): Versión vigente (template_id) de cada cluster
+        __wildcards (list[tuple[int, ...]]): Posiciones de `<*>` por template_id
+    """
+    WILDCARD: ClassVar[str] = "<*>"
+    HAS_DIGIT: ClassVar[Callable[[str], re.Match | None]] = re.compile(r"\d").search
+
+    def __init__(self, depth: int = 4, similarity_threshold: float = 0.4, max_children: int = 100):
+        assert depth >= 3, "depth must be at least 3"
+        assert 0 < similarity_threshold <= 1, "similarity_threshold must be in (0, 1]"
+
+        self.__depth: int = depth
+        self.__similarity_threshold: float = similarity_threshold
+        self.__max_children: int = max_children
+        self.__root: dict[int, dict] = dict()
+        self.__templates: list[tuple[int, tuple[str, ...]]] = list()
+        self.__clusters: list[int] = list()
+        self.__wildcards: list[tuple[int, ...]] = list()
+        self.__versions: dict[int, list[int]] = dict()
+
+    @property
+    def templates_count(self) -> int:
+        return len(self.__templates)
+
+    @property
+    def clusters_count(self) -> int:
+        return len(self.__clusters)
+
+    def __route_token(self, token: str) -> str:
+        return self.WILDCARD if self.HAS_DIGIT(token) else token
+
+    def __find_leaf(self, tokens: list[str]) -> list[int]:
+        """Recorre el árbol de parseo, creando los nodos que falten, y devuelve la hoja."""
+        node: dict = self.__root.setdefault(len(tokens), dict())
+        prefix_levels: int = min(self.__depth - 2, len(tokens))
+        for level, token in enumerate(tokens[:prefix_levels]):
+            key: str = self.__route_token(token)
+            if key not in node and len(node) >= self.__max_children:
+                key = self.WILDCARD
+            if key not in node:
+                node[key] = list() if level == prefix_levels - 1 else dict()
+            node = node[key]
+        return node
+
+    def __similarity(self, template_id: int, tokens: list[str]) -> tuple[int, int]:
+        """Devuelve (tokens coincidentes, comodines) entre una plantilla y un mensaje."""
+        _, template = self.__templates[template_id]
+        matches: int = 0
+        for template_token, token in zip(template, tokens):
+            if template_token == token:
+                matches += 1
+        return matches, len(self.__wildcards[template_id])
+
+    def __add_template(self, cluster_id: int, tokens: tuple[str, ...]) -> int:
+        template_id: int = len(self.__templates)
+        self.__templates.append((cluster_id, tokens))
+        self.__wildcards.append(tuple(index for index, token in enumerate(tokens) if token == self.WILDCARD))
+        self.__versions.setdefault(cluster_id, list()).append(template_id)
+        if cluster_id == len(self.__clusters):
+            self.__clusters.append(template_id)
+        else:
+            self.__clusters[cluster_id] = template_id
+        return template_id
+
+    def __match(self, tokens: list[str]) -> int:
+        """Devuelve el template_id vigente para los tokens, creando o generalizando clusters."""
+        leaf: list[int] = self.__find_leaf(tokens)
+
+        best_cluster: int | None = None
+        best_score: tuple[int, int] = (-1, -1)
+        for cluster_id in leaf:
+            score: tuple[int, int] = self.__similarity(self.__clusters[cluster_id], tokens)
+            if score > best_score:
+                best_cluster, best_score = cluster_id, score
+
+        if best_cluster is None or best_score[0] / len(tokens) < self.__similarity_threshold:
+            cluster_id: int = len(self.__clusters)
+            leaf.append(cluster_id)
+            return self.__add_template(cluster_id, tuple(tokens))
+
+        template_id: int = self.__clusters[best_cluster]
+        # Todos los tokens que no son comodines coinciden: no hay que generalizar
+        if sum(best_score) == len(tokens):
+            return template_id
+
+        _, template = self.__templates[template_id]
+        merged: tuple[str, ...] = tuple(
+            template_token if template_token == token else self.WILDCARD
+            for template_token, token in zip(template, tokens)
+        )
+        if merged != template:
+            template_id = self.__add_template(best_cluster, merged)
+        return template_id
+
+    def encode(self, log_entry: LogEntry) -> LogRecord:
+        """Asigna una plantilla al mensaje y devuelve su representación compacta.
+
+        Los mensajes que no se pueden reconstruir exactamente a partir de sus
+        tokens (espacios múltiples, tabulaciones, saltos de línea o mensajes
+        vacíos) se guardan sin codificar.
+
+        Args:
+            log_entry (LogEntry): Log a codificar
+
+        Returns:
+            LogRecord: Registro con template_id y parámetros, o con el mensaje original
+
+        Example:
+            miner = TemplateMiner()
+            record = miner.encode(log)  # LogRecord(..., template_id=0, payload="3 7")
+        """
+        message: str = log_entry.message
+        tokens: list[str] = message.split()
+        if not tokens or " ".join(tokens) != message:
+            return LogRecord(log_entry.timestamp, log_entry.tag, None, message, log_entry.seq, log_entry.source)
+
+        template_id: int = self.__match(tokens)
+        params: str = " ".join([tokens[index] for index in self.__wildcards[template_id]])
+        return LogRecord(log_entry.timestamp, log_entry.tag, template_id, params, log_entry.seq, log_entry.source)
+
+    def render(self, template_id: int, params: str) -> str:
+        """Reconstruye el mensaje original a partir de una plantilla y sus parámetros.
+
+        Args:
+            template_id (int): Versión de plantilla
+            params (str): Parámetros separados por espacios
+
+        Returns:
+            str: Mensaje original
+        """
+        _, template = self.__templates[template_id]
+        values: Iterable[str] = iter(params.split(" ") if params else ())
+        return " ".join(
+            next(values) if token == self.WILDCARD else token
+            for token in template
+        )
+
+    def decode(self, record: LogRecord) -> LogEntry:
+        """Convierte un LogRecord en un LogEntry con el mensaje reconstruido.
+
+        Args:
+            record (LogRecord): Registro almacenado
+
+        Returns:
+            LogEntry: Log con el mensaje original
+        """
+        message: str = record.payload if record.template_id is None \
+            else self.render(record.template_id, record.payload)
+        return LogEntry(
+            timestamp=record.timestamp, tag=record.tag, message=message, seq=record.seq, source=record.source
+        )
+
+    def cluster_of(self, template_id: int) -> int:
+        return self.__templates[template_id][0]
+
+    def versions(self, cluster_id: int) -> list[int]:
+        """Devuelve todas las versiones (template_id) de un cluster."""
+        return list(self.__versions.get(cluster_id, ()))
+
+    def template(self, cluster_id: int) -> str:
+        """Devuelve el texto de la plantilla vigente de un cluster."""
+        _, tokens = self.__templates[self.__clusters[cluster_id]]
+        return " ".join(tokens)
+
+    def literals(self, template_id: int) -> list[str]:
+        """Devuelve los tramos fijos de una versión de plantilla, separados por sus `<*>`.
+
+        Todo mensaje codificado con la plantilla contiene cada uno de estos tramos.
+        """
+        literals: list[str] = list()
+        current: list[str] = list()
+        for token in self.__templates[template_id][1]:
+            if token == self.WILDCARD:
+                if current:
+                    literals.append(" ".join(current))
+                current = list()
+            else:
+                current.append(token)
+        if current:
+            literals.append(" ".join(current))
+        return literals
+
+    def templates_since(self, template_id: int) -> list[tuple[int, int, str]]:
+        """Devuelve las versiones de plantilla creadas a partir de `template_id`.
+
+        Returns:
+            list[tuple[int, int, str]]: Tuplas (template_id, cluster_id, plantilla)
+        """
+        return [
+            (index, cluster_id, " ".join(tokens))
+            for index, (cluster_id, tokens) in enumerate(self.__templates[template_id:], start=template_id)
+        ]
+
+    def restore(self, rows: Iterable[tuple[int, int, str]]) -> 'TemplateMiner':
+        """Reconstruye el minero a partir de las plantillas persistidas.
+
+        Args:
+            rows (Iterable[tuple[int, int, str]]): Tuplas (template_id, cluster_id, plantilla)
+                                                   ordenadas por template_id
+
+        Returns:
+            TemplateMiner: Self para permitir encadenamiento de métodos
+        """
+        for template_id, cluster_id, template in rows:
+            assert template_id == len(self.__templates), "Template ids must be contiguous"
+            tokens: tuple[str, ...] = tuple(template.split(" "))
+            if cluster_id == len(self.__clusters):
+                self.__find_leaf(list(tokens)).append(cluster_id)
+            self.__add_template(cluster_id, tokens)
+        return self
@@ -1,21 +1,105 @@
-from sortedcontainers import SortedDict
-from datetime import datetime
+from sortedcontainers import SortedList
+from datetime import datetime, timedelta
+from typing import Callable
 
 from src.model.log_entry import LogEntry
-from src.services.log_pruner import LogPruner
+from src.model.log_record import LogRecord
+from src.model.log_row import LogRow
+from src.services.log_pruner import Admission, LogPruner
+from src.services.template_miner import TemplateMiner
+from src.services.sorted_log_store import SortedLogStore
+from src.services.ring_buffer_log_store import RingBufferLogStore
+from src.services.heavy_hitters import HeavyHitters
+from src.services.log_filter import LogFilter
 
 class TemporalCache:
-    def __init__(self, pruner: LogPruner):
+    def __init__(
+        self,
+        pruner: LogPruner,
+        template_miner: TemplateMiner | None = None,
+        store: SortedLogStore | RingBufferLogStore | None = None,
+        heavy_hitters: HeavyHitters | None = None,
+    ):
         self.__pruner: LogPruner = pruner
-        self.__cache: SortedDict = SortedDict()
+        # Backend de almacenamiento: SortedDict (por defecto) o buffer circular por intervalos
+        self.__cache: SortedLogStore | RingBufferLogStore = store if store is not None else SortedLogStore()
+        self.__template_miner: TemplateMiner | None = template_miner
+        # Índice cluster_id -> timestamps de sus logs en cache
+        self.__template_index: dict[int, SortedList] = dict()
+        # Logs tardíos (fuera de la ventana) que van directo a la base de datos
+        self.__overflow: list[LogRecord] = list()
+        # Logs en cuarentena (timestamp demasiado adelantado) que van a su propia tabla
+        self.__quarantine: list[LogRecord] = list()
+        # Funciones notificadas con cada log aceptado en la ventana (live-tail, métricas, etc.)
+        self.__listeners: list[Callable[[LogEntry], None]] = list()
+        # Top-k aproximado de tags, componentes y plantillas de la ventana (opcional)
+        self.__heavy_hitters: HeavyHitters | None = heavy_hitters
+    
+    def add_listener(self, listener: Callable[[LogEntry], None]) -> 'TemporalCache':
+        """Registra una función que recibe cada log aceptado por `add_log`.
+
+        Los logs tardíos o en cuarentena no se notifican: no entran a la
+        ventana, así que el live-tail, las tasas y las consultas permanentes
+        solo ven lo que GET /logs devuelve desde el cache. Los listeners se
+        ejecutan de forma síncrona en `add_log`, por lo que no deben bloquear.
+
+        Args:
+            listener (Callable[[LogEntry], None]): Función a notificar
+
+        Returns:
+            TemporalCache: Self para permitir encadenamiento de métodos
+        """
+        self.__listeners.append(listener)
+        return self
+    
+    def __encode(self, log_entry: LogEntry) -> LogRecord:
+        if self.__template_miner is None:
+            return LogRecord(
+                log_entry.timestamp, log_entry.tag, None, log_entry.message, log_entry.seq, log_entry.source
+            )
+        return self.__template_miner.encode(log_entry)
+    
+    def __decode(self, record: LogRecord) -> LogEntry:
+        if record.template_id is None:
+            return LogEntry(
+                timestamp=record.timestamp, tag=record.tag, message=record.payload, seq=record.seq, source=record.source
+            )
+        return self.__template_miner.decode(record)
+    
+    def __index(self, record: LogRecord) -> None:
+        if record.template_id is None:
+            return
+        cluster_id: int = self.__template_miner.cluster_of(record.template_id)
+        if cluster_id not in self.__template_index:
+            self.__template_index[cluster_id] = SortedList()
+        self.__template_index[cluster_id].add(record.timestamp)
+    
+    def __unindex(self, record: LogRecord) -> None:
+        if record.template_id is None:
+            return
+        cluster_id: int = self.__template_miner.cluster_of(record.template_id)
+        timestamps: SortedList = self.__template_index[cluster_id]
+        timestamps.remove(record.timestamp)
+        if not timestamps:
+            del self.__template_index[cluster_id]
+        
+    def __count_heavy_hitters(self, log_entry: LogEntry, record: LogRecord) -> None:
+        template: int | None = \
+            None if record.template_id is None else self.__template_miner.cluster_of(record.template_id)
+        self.__heavy_hitters.add(
+            log_entry.timestamp, {"tag": log_entry.tag, "component": log_entry.component, "template": template}
+        )
         
     def add_log(self, log_entry: LogEntry) -> 'TemporalCache': 
         """Añade un nuevo log al cache temporal.
 
         Este método:
         1. Extrae el timestamp del log
-        2. Registra el timestamp en el pruner para seguimiento
-        3. Agrupa logs por timestamp en el cache
+        2. Consulta al pruner si el log entra en la ventana (y avanza el watermark)
+        3. Codifica el mensaje como plantilla + parámetros (si hay TemplateMiner)
+        4. Agrupa logs por timestamp en el cache, o los reserva para persistirlos
+           directamente si llegaron tarde o están en cuarentena
+        5. Notifica el log a los listeners registrados, solo si fue aceptado
 
         Args:
             log_entry (LogEntry): Log a añadir al cache
@@ -27,19 +111,55 @@ class TemporalCache:
             cache = TemporalCache(pruner)
             cache.add_log(log1).add_log(log2)  # Encadenamiento de métodos
         """
-        timestamp: datetime = log_entry.timestamp
-        self.__pruner.register_timestamp(timestamp)
+        if self.admit_log(log_entry) is Admission.ACCEPTED:
+            for listener in self.__listeners:
+                listener(log_entry)
+        return self
+    
+    def admit_log(self, log_entry: LogEntry) -> Admission:
+        """Como `add_log`, pero sin notificar a los listeners; devuelve la admisión del log.
+
+        Lo usan PartitionedTemporalCache, que notifica a sus propios listeners, y el
+        CacheServer, que devuelve a cada worker qué logs de su lote fueron aceptados.
+
+        Args:
+            log_entry (LogEntry): Log a añadir al cache
+
+        Returns:
+            Admission: ACCEPTED si entró a la ventana, LATE o QUARANTINED si se reservó para persistirlo
+        """
+        admission: Admission = self.__pruner.admit(log_entry.timestamp)
         
-        if timestamp not in self.__cache:
-            self.__cache[timestamp] = list()
-        self.__cache[timestamp].append(log_entry)
+        record: LogRecord = self.__encode(log_entry)
+        if admission is Admission.QUARANTINED:
+            self.__quarantine.append(record)
+        elif admission is Admission.LATE:
+            self.__overflow.append(record)
+        else:
+            self.__cache.add(record)
+            self.__index(record)
+            if self.__heavy_hitters is not None:
+                self.__count_heavy_hitters(log_entry, record)
+        return admission
+    
+    def add_logs(self, log_entries: list[LogEntry]) -> 'TemporalCache':
+        """Añade varios logs al cache temporal, en orden.
+
+        Args:
+            log_entries (list[LogEntry]): Logs a añadir
+
+        Returns:
+            TemporalCache: Self para permitir encadenamiento de métodos
+        """
+        for log_entry in log_entries:
+            self.add_log(log_entry)
         return self
     
     def get_logs(self, start_time: datetime, end_time: datetime) -> list[LogEntry]:
         """Obtiene logs dentro de un rango temporal específico.
 
-        Utiliza el método irange de SortedDict para obtener eficientemente
-        los logs que caen dentro del intervalo [start_time, end_time].
+        Utiliza el método irange del backend de almacenamiento para obtener
+        eficientemente los logs que caen dentro del intervalo [start_time, end_time].
 
         Args:
             start_time (datetime): Inicio del rango temporal (inclusive)
@@ -54,11 +174,43 @@ class TemporalCache:
                 datetime(2023, 4, 23, 10, 5)
             )
         """
-        logs: list[LogEntry] = list()
-        for timestamp in self.__cache.irange(start_time, end_time, inclusive=(True, True)):
-            for log in self.__cache[timestamp]:
-                logs.append(log)
-        return logs
+        return [self.__decode(record) for record in self.__cache.irange(start_time, end_time)]
+    
+    def get_rows(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        log_filter: LogFilter | None = None,
+        source: str | None = None,
+    ) -> list[LogRow]:
+        """Como `get_logs`, pero devuelve filas planas (timestamp ISO, tag, message, seq, source).
+
+        Evita construir un LogEntry por registro cuando los logs solo se
+        serializan a JSON o se mezclan con las filas de la base de datos. El
+        filtro de mensajes (patrones ya compilados) se aplica sobre los
+        registros antes de armar cada fila.
+
+        Args:
+            start_time (datetime): Inicio del rango temporal (inclusive)
+            end_time (datetime): Fin del rango temporal (inclusive)
+            log_filter (LogFilter | None): Filtro por subcadena o expresión regular del mensaje
+            source (str | None): Solo los logs de esta fuente; None para todas
+
+        Returns:
+            list[LogRow]: Filas del rango que cumplen el filtro
+        """
+        if log_filter is not None and not log_filter.active:
+            log_filter = None
+        rows: list[LogRow] = list()
+        for record in self.__cache.irange(start_time, end_time):
+            if source is not None and record.source != source:
+                continue
+            message: str = record.payload if record.template_id is None \
+                else self.__template_miner.render(record.template_id, record.payload)
+            if log_filter is not None and not log_filter.accepts(record.template_id, message, self.__template_miner):
+                continue
+            rows.append((record.timestamp.isoformat(), record.tag, message, record.seq, record.source))
+        return rows
     
     def get_all_logs(self) -> list[LogEntry]:
         """Obtiene todos los logs almacenados en el cache.
@@ -67,26 +219,136 @@ class TemporalCache:
             list[LogEntry]: Lista con todos los logs en orden temporal
 
         Note:
-            Los logs se devuelven en el orden en que fueron almacenados
-            debido a que SortedDict mantiene las claves ordenadas.
+            Los logs se devuelven en orden temporal porque ambos backends
+            recorren sus registros ordenados por timestamp.
+        """
+        return [self.__decode(record) for record in self.__cache]
+    
+    def count_by_template(self, start_time: datetime, end_time: datetime) -> dict[int, int]:
+        """Cuenta los logs del cache por cluster de plantilla dentro de un rango.
+
+        Usa el índice cluster_id -> timestamps, por lo que no recorre los logs.
+
+        Args:
+            start_time (datetime): Inicio del rango temporal (inclusive)
+            end_time (datetime): Fin del rango temporal (inclusive)
+
+        Returns:
+            dict[int, int]: Cantidad de logs por cluster_id
+        """
+        counts: dict[int, int] = dict()
+        for cluster_id, timestamps in self.__template_index.items():
+            count: int = timestamps.bisect_right(end_time) - timestamps.bisect_left(start_time)
+            if count:
+                counts[cluster_id] = count
+        return counts
+    
+    def template_timeline(
+        self, cluster_id: int, start_time: datetime, end_time: datetime, bucket: timedelta
+    ) -> dict[datetime, int]:
+        """Cuenta los logs de un cluster de plantilla por intervalos de tiempo.
+
+        Args:
+            cluster_id (int): Cluster de plantilla
+            start_time (datetime): Inicio del rango temporal (inclusive)
+            end_time (datetime): Fin del rango temporal (inclusive)
+            bucket (timedelta): Tamaño de cada intervalo, alineado a start_time
+
+        Returns:
+            dict[datetime, int]: Cantidad de logs por inicio de intervalo
         """
-        logs: list[LogEntry] = list()
-        for timestamp in self.__cache:
-            logs.extend(self.__cache[timestamp])
-        return logs
+        counts: dict[datetime, int] = dict()
+        timestamps: SortedList | None = self.__template_index.get(cluster_id)
+        if timestamps is None:
+            return counts
+        for timestamp in timestamps.irange(start_time, end_time):
+            bucket_start: datetime = start_time + ((timestamp - start_time) // bucket) * bucket
+            counts[bucket_start] = counts.get(bucket_start, 0) + 1
+        return counts
         
-    def prune_cache(self) -> list[LogEntry]:
+    def top(self, field: str, k: int) -> list[tuple[str | int, int, int]]:
+        """Valores más frecuentes de un campo entre los logs de la ventana.
+
+        Args:
+            field (str): "tag", "component" o "template" (cluster_id)
+            k (int): Cantidad de valores
+
+        Returns:
+            list[tuple[str | int, int, int]]: (valor, cuenta, max_error) por cuenta descendente
+
+        Raises:
+            ValueError: Si el cache no tiene HeavyHitters configurado
+        """
+        if self.__heavy_hitters is None:
+            raise ValueError("Heavy hitters are not enabled for this cache")
+        return self.__heavy_hitters.top(field, k)
+    
+    @property
+    def watermark(self) -> datetime | None:
+        """Watermark de tiempo de evento del LogPruner (None si no llegó ningún log)."""
+        return self.__pruner.watermark
+    
+    def watermark_of(self, source: str | None) -> datetime | None:
+        """Watermark que rige a los logs de una fuente: el cache tiene uno solo para todas."""
+        return self.__pruner.watermark
+    
+    def watermark_stats(self) -> dict:
+        """Devuelve el estado del watermark del LogPruner."""
+        return self.__pruner.stats()
+    
+    def prune_cache(self) -> list[LogRecord]:
         """Ejecuta la limpieza del cache eliminando logs antiguos.
 
         Delega la lógica de limpieza al LogPruner configurado,
         que determina qué logs deben ser eliminados basándose en
-        la ventana temporal configurada.
+        la ventana temporal configurada. Incluye además los logs que
+        nunca entraron al cache por llegar tarde; los de cuarentena se
+        obtienen aparte con `drain_quarantine`.
 
         Returns:
-            list[LogEntry]: Lista de logs que fueron eliminados del cache
+            list[LogRecord]: Lista de registros a persistir
 
         Note:
             Los logs eliminados se guardan en una base de datos
             para mantener un historial completo.
         """
-        return self.__pruner.prune(self.__cache)
\ No newline at end of file
+        pruned: list[LogRecord] = self.__cache.prune(self.__pruner)
+        if self.__heavy_hitters is not None:
+            self.__heavy_hitters.expire(self.__pruner.threshold)
+        if self.__template_index:
+            for record in pruned:
+                self.__unindex(record)
+        if self.__overflow:
+            pruned.extend(self.__overflow)
+            self.__overflow = list()
+        return pruned
+    
+    def evict(self) -> tuple[list[LogRecord], list[LogRecord]]:
+        """Devuelve todos los registros pendientes para persistirlos antes de descartar el cache.
+
+        A diferencia de `prune_cache` no espera a que el watermark avance: es
+        para una partición que dejó de recibir logs y cuya ventana no se va a
+        mover más. Después de llamarlo el cache no debe volver a usarse.
+
+        Returns:
+            tuple[list[LogRecord], list[LogRecord]]: Registros de la ventana y tardíos, y
+                registros en cuarentena
+        """
+        records: list[LogRecord] = list(self.__cache)
+        records.extend(self.__overflow)
+        self.__overflow = list()
+        self.__template_index = dict()
+        return records, self.drain_quarantine()
+    
+    def drain_quarantine(self) -> list[LogRecord]:
+        """Devuelve y olvida los logs en cuarentena pendientes de persistir.
+
+        Se guardan con `save_quarantined`, en una tabla que las consultas de
+        logs no leen.
+
+        Returns:
+            list[LogRecord]: Registros en cuarentena desde la última llamada
+        """
+        quarantine: list[LogRecord] = self.__quarantine
+        self.__quarantine = list()
+        return quarantine
@@ -0,0 +1,165 @@
+import pytest
+from datetime import datetime, timedelta
+from os import listdir
+from pathlib import Path
+
+from src.model.log_entry import LogEntry
+from src.model.log_record import LogRecord
+from src.services.ingest_journal import IngestJournal
+from src.services.sequence_generator import SequenceGenerator
+from src.services.sqlite_conn import SQliteConn
+
+BASE_TIME = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def entry(seq):
+    return LogEntry(timestamp=BASE_TIME + timedelta(seconds=seq), tag="INFO", message=f"log {seq}", seq=seq)
+
+
+def record(seq):
+    return LogRecord(BASE_TIME + timedelta(seconds=seq), "INFO", None, f"log {seq}", seq)
+
+
+def segments(journal_dir):
+    return sorted(name for name in listdir(journal_dir) if name.startswith(IngestJournal.SEGMENT_PREFIX))
+
+
+def segment_name(segment):
+    return f"{IngestJournal.SEGMENT_PREFIX}{segment:08d}{IngestJournal.SEGMENT_SUFFIX}"
+
+
+class TestIngestJournal:
+    """Pruebas de la eliminación de segmentos del IngestJournal"""
+
+    @pytest.fixture
+    def journal_dir(self, tmp_path):
+        return str(tmp_path / "journal")
+
+    def open_journal(self, journal_dir):
+        journal = IngestJournal(journal_dir, segment_max_entries=3)
+        self.journals.append(journal)
+        return journal
+
+    def setup_method(self):
+        self.journals = []
+
+    def teardown_method(self):
+        for journal in self.journals:
+            journal.close()
+
+    def test_rotated_segment_kept_until_fully_persisted(self, journal_dir):
+        journal = self.open_journal(journal_dir)
+        for seq in range(1, 6):
+            journal.append(entry(seq))
+        assert segments(journal_dir) == [segment_name(1), segment_name(2)]
+
+        journal.mark_persisted([record(1), record(2)])
+        assert segment_name(1) in segments(journal_dir)
+
+        journal.mark_persisted([record(3)])
+        assert segments(journal_dir) == [segment_name(2)]
+
+    def test_persisted_before_rotation(self, journal_dir):
+        journal = self.open_journal(journal_dir)
+        journal.append(entry(1)).append(entry(2))
+        journal.mark_persisted([record(1), record(2)])
+        # El segmento activo nunca se elimina
+        assert segments(journal_dir) == [segment_name(1)]
+
+        journal.append(entry(3))
+        assert segments(journal_dir) == [segment_name(1), segment_name(2)]
+
+        journal.mark_persisted([record(3)])
+        assert segments(journal_dir) == [segment_name(2)]
+
+    def test_persist_across_segments(self, journal_dir):
+        journal = self.open_journal(journal_dir)
+        for seq in range(1, 8):
+            journal.append(entry(seq))
+
+        journal.mark_persisted([record(4), record(5), record(6), record(3)])
+        assert segments(journal_dir) == [segment_name(1), segment_name(3)]
+
+        journal.mark_persisted([record(1), record(2)])
+        assert segments(journal_dir) == [segment_name(3)]
+
+    def test_duplicate_persist_does_not_release_other_segment(self, journal_dir):
+        journal = self.open_journal(journal_dir)
+        for seq in range(1, 8):
+            journal.append(entry(seq))
+        journal.mark_persisted([record(4), record(5), record(6)])
+        assert segments(journal_dir) == [segment_name(1), segment_name(3)]
+
+        # Un log de un segmento ya eliminado no cuenta para el segmento anterior
+        journal.mark_persisted([record(5), record(5), record(5)])
+        assert segments(journal_dir) == [segment_name(1), segment_name(3)]
+
+        journal.mark_persisted([record(1), record(2), record(3)])
+        assert segments(journal_dir) == [segment_name(3)]
+
+    def test_restart_with_partly_persisted_segment(self, journal_dir, tmp_path):
+        db_path = tmp_path / "logs.db"
+        db_path.touch()
+        db = SQliteConn(str(db_path))
+
+        journal = self.open_journal(journal_dir)
+        for seq in range(1, 6):
+            journal.append(entry(seq))
+        db.save_logs([record(1), record(2)])
+        journal.mark_persisted([record(1), record(2)])
+        journal.close()
+        self.journals.remove(journal)
+
+        restarted = self.open_journal(journal_dir)
+        replayed = list(restarted.replay())
+        assert [log_entry.seq for log_entry in replayed] == [1, 2, 3, 4, 5]
+        assert segments(journal_dir) == [segment_name(1), segment_name(2), segment_name(3)]
+
+        # La API continúa después de lo persistido y de lo registrado en el journal
+        assert db.max_seq() == 2
+        sequence = SequenceGenerator(db.max_seq())
+        for log_entry in replayed:
+            sequence.advance_to(log_entry.seq)
+        assert sequence.next() == 6
+
+        restarted.append(entry(6))
+        # Reintentar el guardado de los logs ya persistidos es seguro
+        db.save_logs([record(seq) for seq in range(1, 6)])
+        assert db.max_seq() == 5
+        restarted.mark_persisted([record(seq) for seq in range(1, 4)])
+        assert segments(journal_dir) == [segment_name(2), segment_name(3)]
+
+        restarted.mark_persisted([record(4), record(5)])
+        assert segments(journal_dir) == [segment_name(3)]
+
+    def test_replay_drops_empty_segments(self, journal_dir):
+        journal = self.open_journal(journal_dir)
+        for seq in range(1, 4):
+            journal.append(entry(seq))
+        journal.mark_persisted([record(1), record(2), record(3)])
+        journal.close()
+        self.journals.remove(journal)
+        assert segments(journal_dir) == [segment_name(2)]
+
+        restarted = self.open_journal(journal_dir)
+        assert list(restarted.replay()) == []
+        assert segments(journal_dir) == [segment_name(3)]
+
+    def test_legacy_segment_discarded_after_replay(self, journal_dir):
+        Path(journal_dir).mkdir()
+        legacy = LogEntry(timestamp=BASE_TIME, tag="INFO", message="legacy")
+        (Path(journal_dir) / segment_name(1)).write_text(legacy.model_dump_json() + "\n", encoding="utf-8")
+
+        journal = self.open_journal(journal_dir)
+        replayed = list(journal.replay())
+        assert [log_entry.seq for log_entry in replayed] == [None]
+        assert segment_name(1) in segments(journal_dir)
+
+        # La API vuelve a registrar el log con secuencia antes de descartar el segmento
+        journal.append(replayed[0].model_copy(update={"seq": 1}))
+        journal.discard_legacy()
+        assert segments(journal_dir) == [segment_name(2)]
+
+        journal.append(entry(2)).append(entry(3))
+        journal.mark_persisted([record(1), record(2), record(3)])
+        assert segments(journal_dir) == [segment_name(3)]
@@ -0,0 +1,52 @@
+import argparse
+from colorama import init, Fore, Style
+from src.database.bulk_loader import BulkLoader
+from src.database.connection import DatabaseConnection
+import os
+from src.database.schema import DATA_DIR, PROJECT_DIR
+
+init(autoreset=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga los CSV de data/ en la base configurada en .env")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Carpeta con un <tabla>.csv por tabla")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Filas por bloque (una transacción por bloque)")
+    parser.add_argument("--batch-size", type=int, default=1_000, help="Filas por executemany")
+    parser.add_argument("--workers", type=int, default=4, help="Hilos para cargar las dimensiones en paralelo")
+    parser.add_argument("--truncate", action="store_true", help="Vaciar las tablas antes de cargar")
+    parser.add_argument("--quarantine-dir", default=os.path.join(PROJECT_DIR, "quarantine"),
+                        help="Carpeta con un <tabla>.csv de filas rechazadas y sus códigos de motivo")
+    parser.add_argument("--date-fallback", default=None,
+                        help="Fecha YYYY-MM-DD para las fechas NOT NULL inválidas (por defecto DB_DATE_FALLBACK; "
+                             "sin ella esas filas se rechazan)")
+    args = parser.parse_args()
+
+    db = DatabaseConnection()
+    date_fallback = args.date_fallback or db.date_fallback
+    if db.backend_name == 'sqlite':
+        # Sin data_dir: la base embebida no se carga sola, la carga este comando
+        from src.database.sqlite_backend import SQLiteBackend
+        DatabaseConnection.use_backend(SQLiteBackend(db.sqlite_path, data_dir=None, date_fallback=date_fallback))
+
+    loader = BulkLoader(db, chunk_size=args.chunk_size, batch_size=args.batch_size, workers=args.workers,
+                        quarantine_dir=args.quarantine_dir, date_fallback=date_fallback)
+    report = loader.load(args.data_dir, truncate=args.truncate)
+
+    print(Fore.CYAN + "\n📥 Carga de datos")
+    print(f"{'Tabla':<12}{'Filas':>12}{'Rechazadas':>12}{'Inválidos':>12}{'Segundos':>10}{'Filas/s':>14}")
+    for table, stats in report.items():
+        color = Fore.YELLOW if stats['rejected'] else Fore.GREEN
+        print(f"{color}{table:<12}{Style.RESET_ALL}{stats['rows']:>12,}{stats['rejected']:>12,}"
+              f"{stats['invalid_values']:>12,}{stats['seconds']:>10.2f}{stats['rows_per_second']:>14,.0f}")
+
+    print(Fore.CYAN + "\n🧹 Reglas de limpieza con fallas")
+    print(f"{'Tabla':<12}{'Regla':<28}{'Fallas':>12}{'Segundos':>10}")
+    for table, stats in report.items():
+        for rule, result in stats['rules'].items():
+            if result['failed']:
+                print(f"{Fore.YELLOW}{table:<12}{Style.RESET_ALL}{rule:<28}{result['failed']:>12,}{result['seconds']:>10.3f}")
+    if any(stats['rejected'] for stats in report.values()):
+        print(f"\nFilas rechazadas en {args.quarantine_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import argparse
+from datetime import datetime
+from colorama import init, Fore
+from src.database.connection import DatabaseConnection
+from src.database.rollups import rebuild_rollups
+
+init(autoreset=True)
+
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d")
+
+def main():
+    parser = argparse.ArgumentParser(description="Recalcula las tablas de resumen diario desde la tabla sales")
+    parser.add_argument("--start", type=parse_date, help="Primer día a recalcular (YYYY-MM-DD)")
+    parser.add_argument("--end", type=parse_date, help="Último día a recalcular (YYYY-MM-DD)")
+    args = parser.parse_args()
+    if bool(args.start) != bool(args.end):
+        parser.error("--start y --end van juntos")
+
+    counts = rebuild_rollups(DatabaseConnection(), args.start, args.end)
+
+    print(Fore.CYAN + "\n🧮 Tablas de resumen diario")
+    for table, rows in counts.items():
+        print(f"{table:<24}{rows:>12,} filas")
+
+if __name__ == "__main__":
+    main()
@@ -28,7 +28,9 @@ setup(
     ],
     entry_points={
         "console_scripts": [
-            "grocery-dashboard=main:main"
+            "grocery-dashboard=main:main",
+            "grocery-load=load_data:main",
+            "grocery-rollups=rebuild_rollups:main"
         ]
     },
     python_requires=">=3.7",
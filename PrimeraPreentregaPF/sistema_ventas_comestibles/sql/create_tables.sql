@@ -79,6 +79,54 @@ CREATE TABLE IF NOT EXISTS sales (
     FOREIGN KEY (ProductID) REFERENCES products(ProductID)
 );
 
+-- Tablas de resumen diario de ventas (las mantiene src/database/rollups.py)
+CREATE TABLE IF NOT EXISTS daily_product_sales (
+    SalesDate DATE NOT NULL,
+    ProductID INT NOT NULL,
+    sales_count INT NOT NULL,
+    total_revenue DECIMAL(14,2) NOT NULL,
+    total_units INT NOT NULL,
+    PRIMARY KEY (SalesDate, ProductID)
+);
+
+CREATE TABLE IF NOT EXISTS daily_employee_sales (
+    SalesDate DATE NOT NULL,
+    SalesPersonID INT NOT NULL,
+    sales_count INT NOT NULL,
+    total_revenue DECIMAL(14,2) NOT NULL,
+    total_units INT NOT NULL,
+    PRIMARY KEY (SalesDate, SalesPersonID)
+);
+
+CREATE TABLE IF NOT EXISTS daily_city_sales (
+    SalesDate DATE NOT NULL,
+    CityID INT NOT NULL,
+    sales_count INT NOT NULL,
+    total_revenue DECIMAL(14,2) NOT NULL,
+    total_units INT NOT NULL,
+    PRIMARY KEY (SalesDate, CityID)
+);
+
+CREATE TABLE IF NOT EXISTS daily_discount_sales (
+    SalesDate DATE NOT NULL,
+    DiscountBand TINYINT NOT NULL,
+    sales_count INT NOT NULL,
+    total_revenue DECIMAL(14,2) NOT NULL,
+    total_units INT NOT NULL,
+    PRIMARY KEY (SalesDate, DiscountBand)
+);
+
+-- Solo para contar clientes distintos: tiene casi una fila por venta
+CREATE TABLE IF NOT EXISTS daily_customer_sales (
+    SalesDate DATE NOT NULL,
+    CustomerID INT NOT NULL,
+    DiscountBand TINYINT NOT NULL,
+    sales_count INT NOT NULL,
+    total_revenue DECIMAL(14,2) NOT NULL,
+    total_units INT NOT NULL,
+    PRIMARY KEY (SalesDate, CustomerID, DiscountBand)
+);
+
 -- Crear índices para mejorar performance
 CREATE INDEX idx_sales_date ON sales(SalesDate);
 CREATE INDEX idx_sales_customer ON sales(CustomerID);
@@ -1,3 +1,5 @@
+-- Reemplazado por load_data.py (python load_data.py --truncate), que no depende de
+-- rutas locales del servidor ni de LOAD DATA INFILE. Se conserva como referencia.
 USE grocery_sales_db;
 
 -- Deshabilitar verificaciones de claves foráneas temporalmente
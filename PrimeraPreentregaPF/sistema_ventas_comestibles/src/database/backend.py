@@ -0,0 +1,64 @@
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager
+from typing import Dict, List, Optional, Sequence
+
+
+class Transaction(ABC):
+    """Sentencias que se ejecutan en una misma conexión y se confirman o se deshacen juntas"""
+
+    @abstractmethod
+    def execute_query(self, query: str, params: Optional[Sequence] = None) -> List[Dict]:
+        """Ejecuta una consulta SQL de selección dentro de la transacción"""
+
+    @abstractmethod
+    def execute_insert(self, query: str, params: Optional[Sequence] = None) -> int:
+        """Ejecuta una inserción dentro de la transacción y devuelve el ID generado"""
+
+    @abstractmethod
+    def execute_update(self, query: str, params: Optional[Sequence] = None) -> int:
+        """Ejecuta una actualización dentro de la transacción y devuelve las filas afectadas"""
+
+
+class DatabaseBackend(ABC):
+    """Interfaz común de los motores de base de datos detrás de DatabaseConnection
+
+    Las consultas se escriben en el dialecto de MySQL con placeholders `%s`;
+    cada backend se encarga de traducirlas si su motor usa otro dialecto.
+    """
+
+    @abstractmethod
+    def execute_query(self, query: str, params: Optional[Sequence] = None) -> List[Dict]:
+        """Ejecuta una consulta SQL de selección y devuelve las filas como diccionarios"""
+
+    @abstractmethod
+    def execute_insert(self, query: str, params: Optional[Sequence] = None) -> int:
+        """Ejecuta una consulta SQL de inserción y devuelve el ID generado"""
+
+    @abstractmethod
+    def execute_update(self, query: str, params: Optional[Sequence] = None) -> int:
+        """Ejecuta una consulta SQL de actualización y devuelve las filas afectadas"""
+
+    @abstractmethod
+    def bulk_insert(self, query: str, rows: List[Sequence], batch_size: int = 1000) -> int:
+        """Inserta muchas filas en una sola transacción, con las claves foráneas deshabilitadas"""
+
+    @abstractmethod
+    def truncate(self, table: str) -> None:
+        """Vacía una tabla sin verificar las claves foráneas que la referencian"""
+
+    @abstractmethod
+    def transaction(self) -> AbstractContextManager[Transaction]:
+        """Abre una transacción en una sola conexión: se confirma al salir del bloque o se deshace si falla
+
+        Ejemplo:
+            with backend.transaction() as tx:
+                sales_id = tx.execute_insert("INSERT INTO sales (...) VALUES (...)", params)
+                tx.execute_update("INSERT INTO daily_product_sales ... ON DUPLICATE KEY UPDATE ...", (sales_id,))
+        """
+
+    def stats(self) -> Dict:
+        """Métricas propias del motor (por ejemplo, las del pool de conexiones)"""
+        return {}
+
+    def disconnect(self) -> None:
+        """Libera las conexiones del motor"""
@@ -0,0 +1,153 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import perf_counter
+from typing import Dict, List, Optional
+import logging
+import os
+
+import pandas as pd
+
+from .cleansing import DataCleanser
+from .rollups import rebuild_rollups
+from .schema import DATA_DIR, DIMENSION_TABLES, FACT_TABLES, TABLES, read_foreign_keys, read_schema
+
+
+class BulkLoader:
+    """Carga masiva de los CSV de data/ en la base, en reemplazo de LOAD DATA INFILE
+
+    Cada archivo se lee en bloques de `chunk_size` filas (memoria constante sin
+    importar el tamaño del archivo); cada bloque pasa por la limpieza columnar
+    de DataCleanser y se inserta en una sola transacción con `executemany` de
+    `batch_size` filas y las claves foráneas deshabilitadas. Las dimensiones
+    se cargan por niveles de dependencia (países y categorías, después
+    ciudades y productos, después clientes y empleados), en paralelo con
+    `workers` hilos dentro de cada nivel, para que las claves foráneas se
+    verifiquen contra las claves ya aceptadas; al final se carga la tabla de
+    ventas y, con `rollups`, se recalculan las tablas de resumen diario.
+
+    Las filas rechazadas se agregan a `<quarantine_dir>/<tabla>.csv` con sus
+    columnas originales y la columna `reason_codes`; sin `quarantine_dir`
+    solo se cuentan. Con `keep_invalid` no se rechaza ninguna fila y las
+    columnas NOT NULL conservan el texto original (útil en SQLite, que no
+    impone tipos), salvo las fechas. Las fechas NOT NULL inválidas siguen la
+    misma política en MySQL y en SQLite: con `date_fallback` toman esa fecha
+    (regla `SalesDate:fallback`) y sin ella la fila va a cuarentena.
+
+    Ejemplo:
+        report = BulkLoader(DatabaseConnection(), workers=4, quarantine_dir='quarantine').load('data', truncate=True)
+        print(report['sales']['rows_per_second'], report['sales']['rules']['SalesDate:parse'])
+    """
+
+    def __init__(self, db, chunk_size: int = 50_000, batch_size: int = 1_000, workers: int = 4,
+                 keep_invalid: bool = False, progress_every: int = 500_000, schema: Optional[Dict] = None,
+                 quarantine_dir: Optional[str] = None, rollups: bool = True, date_fallback: Optional[str] = None):
+        if chunk_size <= 0 or batch_size <= 0 or workers <= 0:
+            raise ValueError("chunk_size, batch_size y workers deben ser mayores a 0")
+        self.db = db
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.workers = workers
+        self.keep_invalid = keep_invalid
+        self.progress_every = progress_every
+        self.schema = schema or read_schema()
+        self.foreign_keys = read_foreign_keys()
+        self.quarantine_dir = quarantine_dir
+        self.rollups = rollups
+        self.date_fallback = date_fallback
+        self.cleanser = DataCleanser(self.schema, self.foreign_keys, keep_invalid=keep_invalid,
+                                     date_fallback=date_fallback)
+        self.logger = logging.getLogger(__name__)
+        self.__report_lock = Lock()
+        self.__report: Dict[str, Dict] = {}
+
+    def load(self, data_dir: str = DATA_DIR, truncate: bool = False) -> Dict[str, Dict]:
+        """Carga `<tabla>.csv` de cada tabla que tenga archivo y devuelve el reporte por tabla"""
+        self.__report = {}
+        started = perf_counter()
+        paths = {table: os.path.join(data_dir, f"{table}.csv") for table in TABLES}
+        for table, path in paths.items():
+            if not os.path.exists(path):
+                self.logger.info(f"Sin archivo para la tabla {table}: {path}")
+
+        if truncate:
+            for table in TABLES:
+                self.db.truncate(table)
+
+        dimensions = [table for table in DIMENSION_TABLES if os.path.exists(paths[table])]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for wave in self.__waves(dimensions):
+                # list() propaga la primera excepción de los hilos
+                list(executor.map(lambda table: self.load_table(table, paths[table]), wave))
+        for table in FACT_TABLES:
+            if os.path.exists(paths[table]):
+                self.load_table(table, paths[table])
+        if self.rollups and self.__report:
+            rebuild_rollups(self.db)
+
+        elapsed = perf_counter() - started
+        total = sum(stats['rows'] for stats in self.__report.values())
+        self.logger.info(f"Carga completa: {total} filas en {elapsed:.2f} s ({total / elapsed if elapsed else 0:,.0f} filas/s)")
+        return self.report()
+
+    def report(self) -> Dict[str, Dict]:
+        """Filas cargadas, rechazadas, valores inválidos, tiempos y resultado de cada regla por tabla"""
+        with self.__report_lock:
+            return {table: dict(self.__report[table]) for table in TABLES if table in self.__report}
+
+    def load_table(self, table: str, path: str) -> Dict:
+        """Limpia y carga un CSV en una tabla por bloques, una transacción por bloque"""
+        started = perf_counter()
+        self.cleanser.reset(table)
+        quarantine_path = None
+        if self.quarantine_dir:
+            os.makedirs(self.quarantine_dir, exist_ok=True)
+            quarantine_path = os.path.join(self.quarantine_dir, f"{table}.csv")
+            if os.path.exists(quarantine_path):
+                os.remove(quarantine_path)
+
+        rows_loaded, next_progress = 0, self.progress_every
+        chunks = pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=self.chunk_size, encoding='utf-8')
+        for chunk in chunks:
+            rows, columns, quarantine = self.cleanser.clean(table, chunk)
+            if rows:
+                query = (f"INSERT INTO {table} ({', '.join(columns)}) "
+                         f"VALUES ({', '.join('%s' for _ in columns)})")
+                self.db.bulk_insert(query, rows, batch_size=self.batch_size)
+            if quarantine_path and len(quarantine):
+                quarantine.to_csv(quarantine_path, mode='a', index=False, header=not os.path.exists(quarantine_path))
+            rows_loaded += len(rows)
+            if rows_loaded >= next_progress:
+                elapsed = perf_counter() - started
+                self.logger.info(f"{table}: {rows_loaded:,} filas ({rows_loaded / elapsed:,.0f} filas/s)")
+                next_progress += self.progress_every
+
+        cleansing = self.cleanser.stats(table)
+        stats = {'rows': rows_loaded, 'rejected': cleansing['quarantined'], 'invalid_values': cleansing['invalid_values']}
+        stats['seconds'] = round(perf_counter() - started, 3)
+        stats['rows_per_second'] = round(rows_loaded / stats['seconds'], 1) if stats['seconds'] else 0.0
+        stats['rules'] = {rule: {**result, 'seconds': round(result['seconds'], 4)}
+                          for rule, result in cleansing['rules'].items()}
+        if stats['invalid_values']:
+            self.logger.warning(f"{table}: {stats['invalid_values']} valores fuera del tipo o del dominio de su columna")
+        if stats['rejected']:
+            self.logger.warning(f"{table}: {stats['rejected']} filas en cuarentena"
+                                + (f" ({quarantine_path})" if quarantine_path else ""))
+        self.logger.info(f"{table}: {stats['rows']} filas cargadas desde {path} en {stats['seconds']} s")
+        with self.__report_lock:
+            self.__report[table] = stats
+        return stats
+
+    def __waves(self, tables: List[str]) -> List[List[str]]:
+        """Agrupa las dimensiones por nivel: cada una después de las que referencia"""
+        levels: Dict[str, int] = {}
+
+        def level(table: str) -> int:
+            if table not in levels:
+                references = [fk.table for fk in self.foreign_keys.get(table, []) if fk.table != table]
+                levels[table] = 1 + max((level(reference) for reference in references), default=-1)
+            return levels[table]
+
+        waves: Dict[int, List[str]] = {}
+        for table in tables:
+            waves.setdefault(level(table), []).append(table)
+        return [waves[depth] for depth in sorted(waves)]
@@ -0,0 +1,237 @@
+"""Limpieza columnar de los extractos CSV antes de cargarlos en la base"""
+from threading import Lock
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .schema import FALSE_VALUES, TRUE_VALUES, Column, read_foreign_keys, read_schema
+
+# Códigos de motivo de las filas en cuarentena
+MISSING_VALUE = 'MISSING_VALUE'
+INVALID_INT = 'INVALID_INT'
+INVALID_NUMBER = 'INVALID_NUMBER'
+INVALID_DATE = 'INVALID_DATE'
+DATE_FRAGMENT = 'DATE_FRAGMENT'
+INVALID_DOMAIN = 'INVALID_DOMAIN'
+MISSING_FK = 'MISSING_FK'
+
+# Dominio de las columnas con valores propios del extracto (en minúsculas) y su valor en la base; None es NULL
+DOMAIN_MAPPINGS = {
+    ('products', 'Resistant'): {'durable': 1, 'weak': 0, 'unknown': None},
+    ('products', 'IsAllergic'): {'true': 1, 'false': 0, 'unknown': None},
+}
+BOOLEAN_DOMAIN = {**{value: 1 for value in TRUE_VALUES}, **{value: 0 for value in FALSE_VALUES}}
+
+_ISO_DATE = r'\d{4}-\d{2}-\d{2}(?:[ T]|$)'
+_DATE_FRAGMENT = r'\d{1,2}:\d{2}(?:\.\d+)?$'
+
+
+class DataCleanser:
+    """Valida y limpia bloques de los CSV columna por columna, con operaciones vectorizadas
+
+    Cada columna pasa por las reglas que corresponden a su declaración en
+    create_tables.sql:
+
+    - parse: INT, DECIMAL y DATE se convierten en bloque (`to_numeric`,
+      `to_datetime`); las fechas que solo traen minutos y segundos
+      ('31:24.2') se informan como DATE_FRAGMENT.
+    - domain: BOOLEAN, ENUM y las columnas de DOMAIN_MAPPINGS se traducen
+      con un diccionario ('Durable' -> 1, 'Unknown' -> NULL).
+    - not_null: las columnas NOT NULL sin valor válido.
+    - fk: las claves foráneas deben existir entre las claves aceptadas de la
+      dimensión referenciada; si esa dimensión no se cargó en esta corrida
+      la regla se omite.
+    - fallback: con `date_fallback` ('2018-01-01'), las fechas NOT NULL
+      inválidas o vacías toman esa fecha en lugar de rechazar la fila.
+
+    Un valor inválido en una columna que admite NULL queda en NULL; si la
+    columna es NOT NULL o la clave foránea no existe, la fila va a
+    cuarentena con sus códigos de motivo ('DATE_FRAGMENT:SalesDate').
+    Con `keep_invalid` ninguna fila va a cuarentena y las columnas NOT NULL
+    conservan el texto original (útil en SQLite, que no impone tipos),
+    salvo las fechas: una columna DATE nunca guarda texto que no sea una
+    fecha, así que sin `date_fallback` la fila se rechaza igual que en MySQL.
+    """
+
+    def __init__(self, schema: Optional[Dict[str, List[Column]]] = None,
+                 foreign_keys: Optional[Dict] = None, keep_invalid: bool = False,
+                 date_fallback: Optional[str] = None):
+        if date_fallback is not None:
+            # Lanza ValueError si no es una fecha 'YYYY-MM-DD'
+            pd.to_datetime(date_fallback, format='%Y-%m-%d')
+        self.schema = schema or read_schema()
+        self.foreign_keys = foreign_keys if foreign_keys is not None else read_foreign_keys()
+        self.keep_invalid = keep_invalid
+        self.date_fallback = date_fallback
+        self.logger = logging.getLogger(__name__)
+        self.__referenced = {fk.table for fks in self.foreign_keys.values() for fk in fks}
+        self.__lock = Lock()
+        self.__keys: Dict[str, List[np.ndarray]] = {}
+        self.__key_index: Dict[str, pd.Index] = {}
+        self.__stats: Dict[str, Dict] = {}
+
+    def reset(self, table: str):
+        """Empieza de cero la tabla: estadísticas y claves aceptadas"""
+        with self.__lock:
+            self.__stats[table] = {'rows': 0, 'quarantined': 0, 'invalid_values': 0, 'rules': {}}
+            if table in self.__referenced:
+                self.__keys[table] = []
+                self.__key_index.pop(table, None)
+
+    def stats(self, table: str) -> Dict:
+        """Filas revisadas, en cuarentena, valores inválidos y fallas y tiempo de cada regla"""
+        with self.__lock:
+            stats = self.__stats.get(table) or {'rows': 0, 'quarantined': 0, 'invalid_values': 0, 'rules': {}}
+            return {**stats, 'rules': {rule: dict(result) for rule, result in stats['rules'].items()}}
+
+    def clean(self, table: str, frame: pd.DataFrame) -> Tuple[List[tuple], List[str], pd.DataFrame]:
+        """Limpia un bloque de texto crudo
+
+        Devuelve las filas aceptadas (tuplas de valores nativos de Python), los
+        nombres de sus columnas y las filas en cuarentena (las columnas
+        originales más `reason_codes`).
+        """
+        if table not in self.__stats:
+            self.reset(table)
+        stats = self.__stats[table]
+        header = {name.strip().lower(): name for name in frame.columns}
+        columns = [column for column in self.schema[table] if column.name.lower() in header]
+        quarantined = np.zeros(len(frame), dtype=bool)
+        reasons = pd.Series('', index=frame.index, dtype=object)
+        output = {}
+
+        for column in columns:
+            raw = frame[header[column.name.lower()]].fillna('').astype(str).str.strip()
+            present = raw != ''
+            values, invalid, codes = self.__parse(table, column, raw, present, stats)
+            stats['invalid_values'] += int(invalid.sum())
+
+            if column.not_null:
+                started = perf_counter()
+                failing = values.isna().to_numpy()
+                is_date = column.type == 'DATE'
+                if is_date and self.date_fallback is not None:
+                    values = values.where(~failing, self.date_fallback)
+                    self.__record(stats, f'{column.name}:fallback', int(failing.sum()), perf_counter() - started)
+                    failing = np.zeros(len(frame), dtype=bool)
+                if failing.any():
+                    if self.keep_invalid and not is_date:
+                        values = values.astype(object)
+                        values[failing] = raw[failing]
+                    else:
+                        quarantined |= failing
+                        reasons[failing] += codes[failing] + f':{column.name};'
+                self.__record(stats, f'{column.name}:not_null', int(failing.sum()), perf_counter() - started)
+            output[column.name] = values
+
+        for fk in self.foreign_keys.get(table, []):
+            if fk.column not in output:
+                continue
+            started = perf_counter()
+            keys = self.__accepted_keys(fk.table)
+            if keys is None:
+                self.__record(stats, f'{fk.column}:fk', 0, 0.0, skipped=True)
+                continue
+            values = pd.to_numeric(output[fk.column], errors='coerce')
+            missing = (values.notna() & ~values.isin(keys)).to_numpy()
+            if missing.any() and not self.keep_invalid:
+                quarantined |= missing
+                reasons[missing] += f'{MISSING_FK}:{fk.column};'
+            self.__record(stats, f'{fk.column}:fk', int(missing.sum()), perf_counter() - started)
+
+        accepted = ~quarantined
+        stats['rows'] += len(frame)
+        stats['quarantined'] += int(quarantined.sum())
+        self.__register_keys(table, columns, output, accepted)
+
+        names = list(output)
+        rows = list(zip(*(self.__native(output[name][accepted]) for name in names))) if names else []
+        quarantine = frame[quarantined].assign(reason_codes=reasons[quarantined].str.rstrip(';'))
+        return rows, names, quarantine
+
+    def __parse(self, table: str, column: Column, raw: pd.Series, present: pd.Series,
+                stats: Dict) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        """Aplica la regla de conversión o de dominio de la columna
+
+        Devuelve los valores (NULL si faltan o son inválidos), la máscara de
+        valores inválidos y el código de motivo de cada uno.
+        """
+        started = perf_counter()
+        codes = pd.Series(MISSING_VALUE, index=raw.index, dtype=object)
+        mapping = DOMAIN_MAPPINGS.get((table, column.name))
+        if mapping is None and column.type == 'BOOLEAN':
+            mapping = BOOLEAN_DOMAIN
+        if mapping is None and column.values:
+            mapping = {value.lower(): value for value in column.values}
+
+        if mapping is not None:
+            lowered = raw.str.lower()
+            invalid = present & ~lowered.isin(list(mapping))
+            values = lowered.map(mapping)
+            if all(value is None or isinstance(value, int) for value in mapping.values()):
+                values = values.astype('Int64')
+            codes[invalid] = INVALID_DOMAIN
+            rule = 'domain'
+        elif 'INT' in column.type:
+            numbers = pd.to_numeric(raw.where(present), errors='coerce')
+            invalid = present & ~(np.isfinite(numbers) & (numbers % 1 == 0))
+            values = numbers.where(~invalid).astype('Int64')
+            codes[invalid] = INVALID_INT
+            rule = 'parse'
+        elif column.type in ('DECIMAL', 'REAL', 'FLOAT', 'DOUBLE'):
+            numbers = pd.to_numeric(raw.where(present), errors='coerce')
+            invalid = present & ~np.isfinite(numbers)
+            values = numbers.where(~invalid)
+            codes[invalid] = INVALID_NUMBER
+            rule = 'parse'
+        elif column.type == 'DATE':
+            day = raw.str.slice(0, 10)
+            shaped = raw.str.match(_ISO_DATE)
+            parsed = pd.to_datetime(day.where(shaped), format='%Y-%m-%d', errors='coerce')
+            invalid = present & parsed.isna()
+            values = day.where(~invalid & present, None)
+            codes[invalid] = INVALID_DATE
+            codes[invalid & raw.str.match(_DATE_FRAGMENT)] = DATE_FRAGMENT
+            rule = 'parse'
+        else:
+            values = raw.where(present, None)
+            return values, pd.Series(False, index=raw.index), codes
+
+        self.__record(stats, f'{column.name}:{rule}', int(invalid.sum()), perf_counter() - started)
+        return values, invalid, codes
+
+    def __accepted_keys(self, table: str) -> Optional[pd.Index]:
+        """Claves aceptadas de una dimensión, o None si no se cargó en esta corrida"""
+        with self.__lock:
+            if table not in self.__keys:
+                return None
+            if table not in self.__key_index:
+                chunks = self.__keys[table]
+                self.__key_index[table] = pd.Index(np.concatenate(chunks) if chunks else np.array([], dtype=np.int64))
+            return self.__key_index[table]
+
+    def __register_keys(self, table: str, columns: List[Column], output: Dict[str, pd.Series], accepted: np.ndarray):
+        if table not in self.__referenced:
+            return
+        keys = [column.name for column in columns if column.primary_key]
+        if not keys:
+            return
+        values = pd.to_numeric(output[keys[0]][accepted], errors='coerce').dropna()
+        with self.__lock:
+            self.__keys[table].append(values.to_numpy(dtype=np.int64))
+            self.__key_index.pop(table, None)
+
+    @staticmethod
+    def __native(values: pd.Series) -> list:
+        """Valores como tipos de Python (int, float, str, None) para el conector"""
+        return values.astype(object).where(values.notna(), None).tolist()
+
+    def __record(self, stats: Dict, rule: str, failed: int, seconds: float, skipped: bool = False):
+        result = stats['rules'].setdefault(rule, {'failed': 0, 'seconds': 0.0})
+        result['failed'] += failed
+        result['seconds'] += seconds
+        if skipped:
+            result['skipped'] = True
@@ -1,102 +1,113 @@
-import mysql.connector
-from mysql.connector import Error
+from threading import Lock
 import os
 from dotenv import load_dotenv
 import logging
 
+from .backend import DatabaseBackend
+
 load_dotenv()
 
 class DatabaseConnection:
-    """Clase singleton para manejar la conexión a la base de datos MySQL"""
-    
+    """Clase singleton que da acceso a la base de datos a través del backend configurado
+
+    DB_BACKEND elige el motor: 'mysql' (por defecto) o 'sqlite', una base
+    embebida que carga los CSV de data/ para correr los reportes sin servidor.
+    DB_DATE_FALLBACK ('YYYY-MM-DD') es la fecha que toman las fechas NOT NULL
+    inválidas de los CSV al cargarlos en cualquiera de los dos motores; sin
+    ella esas filas se rechazan.
+    """
+
     _instance = None
-    _connection = None
-    
+    _backend = None
+    _backend_lock = Lock()
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DatabaseConnection, cls).__new__(cls)
         return cls._instance
-    
+
     def __init__(self):
         if not hasattr(self, 'initialized'):
+            self.backend_name = os.getenv('DB_BACKEND', 'mysql').lower()
             self.host = os.getenv('DB_HOST', 'localhost')
             self.port = int(os.getenv('DB_PORT', 3306))
             self.user = os.getenv('DB_USER')
             self.password = os.getenv('DB_PASSWORD')
             self.database = os.getenv('DB_NAME')
+            self.pool_size = int(os.getenv('DB_POOL_SIZE', 5))
+            self.pool_idle_timeout = float(os.getenv('DB_POOL_IDLE_TIMEOUT', 30))
+            self.pool_timeout = float(os.getenv('DB_POOL_TIMEOUT', 10))
+            self.sqlite_path = os.getenv('DB_SQLITE_PATH', ':memory:')
+            self.data_dir = os.getenv('DB_DATA_DIR')
+            self.date_fallback = os.getenv('DB_DATE_FALLBACK') or None
             self.initialized = True
-            
+
             # Configurar logging
             logging.basicConfig(level=logging.INFO)
             self.logger = logging.getLogger(__name__)
-    
-    def connect(self):
-        """Establece conexión con la base de datos"""
-        try:
-            if self._connection is None or not self._connection.is_connected():
-                self._connection = mysql.connector.connect(
-                    host=self.host,
-                    port=self.port,
-                    user=self.user,
-                    password=self.password,
-                    database=self.database,
-                    charset='utf8mb4',
-                    collation='utf8mb4_unicode_ci'
-                )
-                self.logger.info("Conexión exitosa a MySQL")
-            return self._connection
-        except Error as e:
-            self.logger.error(f"Error al conectar a MySQL: {e}")
-            raise
-    
+
+    def _create_backend(self) -> DatabaseBackend:
+        """Crea el backend indicado por DB_BACKEND"""
+        if self.backend_name == 'mysql':
+            from .mysql_backend import MySQLBackend
+            return MySQLBackend(
+                host=self.host, port=self.port, user=self.user, password=self.password,
+                database=self.database, pool_size=self.pool_size,
+                pool_idle_timeout=self.pool_idle_timeout, pool_timeout=self.pool_timeout
+            )
+        if self.backend_name == 'sqlite':
+            from .sqlite_backend import SQLiteBackend, DATA_DIR
+            self.logger.info("Usando la base embebida SQLite")
+            return SQLiteBackend(self.sqlite_path, data_dir=self.data_dir or DATA_DIR, date_fallback=self.date_fallback)
+        raise ValueError(f"DB_BACKEND debe ser 'mysql' o 'sqlite', no '{self.backend_name}'")
+
+    @property
+    def backend(self) -> DatabaseBackend:
+        """Backend en uso, creándolo la primera vez"""
+        with DatabaseConnection._backend_lock:
+            if DatabaseConnection._backend is None:
+                DatabaseConnection._backend = self._create_backend()
+            return DatabaseConnection._backend
+
+    @classmethod
+    def use_backend(cls, backend):
+        """Reemplaza el backend en uso (None vuelve al configurado por DB_BACKEND)"""
+        with cls._backend_lock:
+            previous, cls._backend = cls._backend, backend
+        if previous is not None and previous is not backend:
+            previous.disconnect()
+
+    def pool_stats(self):
+        """Estado del pool y tiempos de espera para obtener una conexión"""
+        return self.backend.stats()
+
     def disconnect(self):
-        """Cierra la conexión con la base de datos"""
-        if self._connection and self._connection.is_connected():
-            self._connection.close()
-            self._connection = None
-            self.logger.info("Conexión cerrada")
-    
+        """Cierra las conexiones del backend"""
+        with DatabaseConnection._backend_lock:
+            backend, DatabaseConnection._backend = DatabaseConnection._backend, None
+        if backend is not None:
+            backend.disconnect()
+
     def execute_query(self, query, params=None):
         """Ejecuta una consulta SQL de selección"""
-        cursor = None
-        try:
-            connection = self.connect()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(query, params)
-            return cursor.fetchall()
-        except Error as e:
-            self.logger.error(f"Error ejecutando consulta: {e}")
-            raise
-        finally:
-            if cursor:
-                cursor.close()
-    
+        return self.backend.execute_query(query, params)
+
     def execute_insert(self, query, params=None):
         """Ejecuta una consulta SQL de inserción"""
-        cursor = None
-        try:
-            connection = self.connect()
-            cursor = connection.cursor()
-            cursor.execute(query, params)
-            connection.commit()
-            return cursor.lastrowid
-        except Error as e:
-            connection.rollback()
-            self.logger.error(f"Error ejecutando inserción: {e}")
-            raise
-        finally:
-            if cursor:
-                cursor.close()
-    
+        return self.backend.execute_insert(query, params)
+
     def execute_update(self, query, params=None):
         """Ejecuta una consulta SQL de actualización"""
-        cursor = None
-        try:
-            connection = self.connect()
-            cursor = connection.cursor()
-            cursor.execute(query, params)
-            connection.commit()
-            return cursor.rowcount
-        finally:
-            if cursor:
-                cursor.close()
\ No newline at end of file
+        return self.backend.execute_update(query, params)
+
+    def bulk_insert(self, query, rows, batch_size=1000):
+        """Inserta muchas filas en una sola transacción, con las claves foráneas deshabilitadas"""
+        return self.backend.bulk_insert(query, rows, batch_size)
+
+    def truncate(self, table):
+        """Vacía una tabla sin verificar las claves foráneas que la referencian"""
+        self.backend.truncate(table)
+
+    def transaction(self):
+        """Ejecuta varias sentencias en una misma conexión y las confirma juntas (ver DatabaseBackend.transaction)"""
+        return self.backend.transaction()
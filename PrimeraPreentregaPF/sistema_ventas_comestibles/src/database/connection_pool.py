@@ -0,0 +1,186 @@
+from collections import deque
+from contextlib import contextmanager
+from threading import Condition
+from time import monotonic
+from typing import Any, Callable, Iterator, Optional, Tuple, Type
+import logging
+
+
+class PoolTimeoutError(Exception):
+    """No se liberó ninguna conexión del pool dentro del tiempo de espera"""
+
+
+class PoolClosedError(Exception):
+    """Se pidió una conexión a un pool ya cerrado con `close_all`"""
+
+
+class ConnectionPool:
+    """Pool de conexiones thread-safe con chequeo de salud solo tras inactividad.
+
+    Las conexiones se crean a demanda hasta `size`. Al pedir una conexión se
+    reutiliza la última devuelta (LIFO) y solo si estuvo inactiva más de
+    `idle_timeout` segundos se verifica con `health_check`; si falla se
+    descarta y se abre otra. Las conexiones que fallan con alguno de los
+    `broken_errors` se descartan al devolverse en lugar de volver al pool.
+    Después de `close_all` el pool no entrega más conexiones y cierra las
+    que siguen en uso cuando se devuelven.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 5, idle_timeout: float = 30.0,
+                 checkout_timeout: float = 10.0, health_check: Optional[Callable[[Any], bool]] = None,
+                 broken_errors: Tuple[Type[BaseException], ...] = ()):
+        if size <= 0:
+            raise ValueError("El tamaño del pool debe ser mayor a 0")
+        if idle_timeout < 0 or checkout_timeout < 0:
+            raise ValueError("Los tiempos del pool no pueden ser negativos")
+
+        self.__factory = factory
+        self.__size = size
+        self.__idle_timeout = idle_timeout
+        self.__checkout_timeout = checkout_timeout
+        self.__health_check = health_check
+        self.__broken_errors = broken_errors
+        self.__idle: deque = deque()  # (conexión, instante en que se devolvió)
+        self.__created = 0
+        self.__closed = False
+        self.__condition = Condition()
+        self.logger = logging.getLogger(__name__)
+
+        # Métricas
+        self.__checkouts = 0
+        self.__waited_checkouts = 0
+        self.__total_wait = 0.0
+        self.__max_wait = 0.0
+        self.__timeouts = 0
+        self.__health_checks = 0
+        self.__reconnects = 0
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    def acquire(self) -> Any:
+        """Toma una conexión del pool, esperando hasta `checkout_timeout` si están todas en uso"""
+        started = monotonic()
+        deadline = started + self.__checkout_timeout
+        connection, returned_at = None, None
+        with self.__condition:
+            while True:
+                if self.__closed:
+                    raise PoolClosedError("El pool de conexiones está cerrado")
+                if self.__idle:
+                    connection, returned_at = self.__idle.pop()
+                    break
+                if self.__created < self.__size:
+                    self.__created += 1
+                    break
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    self.__timeouts += 1
+                    raise PoolTimeoutError(
+                        f"No hay conexiones libres tras {self.__checkout_timeout} s (pool de {self.__size})"
+                    )
+                self.__condition.wait(remaining)
+            self.__record_wait(monotonic() - started)
+
+        if connection is not None and monotonic() - returned_at > self.__idle_timeout:
+            connection = self.__checked(connection)
+        if connection is None:
+            connection = self.__open()
+        return connection
+
+    def __record_wait(self, wait: float) -> None:
+        self.__checkouts += 1
+        self.__total_wait += wait
+        self.__max_wait = max(self.__max_wait, wait)
+        if wait > 0.001:
+            self.__waited_checkouts += 1
+
+    def __checked(self, connection: Any) -> Optional[Any]:
+        """Verifica una conexión inactiva; devuelve None si hay que reemplazarla"""
+        if self.__health_check is None:
+            return connection
+        self.__health_checks += 1
+        try:
+            if self.__health_check(connection):
+                return connection
+        except Exception as e:
+            self.logger.warning(f"Conexión inactiva descartada: {e}")
+        self.__close_quietly(connection)
+        self.__reconnects += 1
+        return None
+
+    def __open(self) -> Any:
+        """Abre una conexión nueva en un lugar ya reservado del pool"""
+        try:
+            return self.__factory()
+        except Exception:
+            with self.__condition:
+                self.__created -= 1
+                self.__condition.notify()
+            raise
+
+    def release(self, connection: Any, discard: bool = False) -> None:
+        """Devuelve una conexión al pool, o la cierra si `discard` (por ejemplo, se perdió) o el pool está cerrado"""
+        with self.__condition:
+            discard = discard or self.__closed
+            if discard:
+                self.__created -= 1
+            else:
+                self.__idle.append((connection, monotonic()))
+            self.__condition.notify()
+        if discard:
+            self.__close_quietly(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Context manager que toma una conexión y la devuelve al salir
+
+        Ejemplo:
+            with pool.connection() as connection:
+                cursor = connection.cursor()
+        """
+        connection = self.acquire()
+        discard = False
+        try:
+            yield connection
+        except self.__broken_errors:
+            discard = True
+            raise
+        finally:
+            self.release(connection, discard=discard)
+
+    def close_all(self) -> None:
+        """Cierra el pool: cierra las conexiones inactivas y las que están en uso al devolverse"""
+        with self.__condition:
+            self.__closed = True
+            idle = list(self.__idle)
+            self.__idle.clear()
+            self.__created -= len(idle)
+            self.__condition.notify_all()
+        for connection, _ in idle:
+            self.__close_quietly(connection)
+
+    def __close_quietly(self, connection: Any) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def stats(self) -> dict:
+        """Estado del pool y tiempos de espera para obtener una conexión"""
+        with self.__condition:
+            idle = len(self.__idle)
+            return {
+                "size": self.__size,
+                "open": self.__created,
+                "idle": idle,
+                "in_use": self.__created - idle,
+                "checkouts": self.__checkouts,
+                "waited_checkouts": self.__waited_checkouts,
+                "avg_wait_ms": round(self.__total_wait / self.__checkouts * 1000, 3) if self.__checkouts else 0.0,
+                "max_wait_ms": round(self.__max_wait * 1000, 3),
+                "timeouts": self.__timeouts,
+                "health_checks": self.__health_checks,
+                "reconnects": self.__reconnects,
+            }
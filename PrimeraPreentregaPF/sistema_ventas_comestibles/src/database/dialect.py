@@ -0,0 +1,155 @@
+"""Traducción de consultas del dialecto de MySQL al de SQLite
+
+Cubre lo que usan los modelos y los reportes: placeholders `%s`, literales
+con comillas dobles, identificadores con backticks, las funciones
+DATE_FORMAT, DATEDIFF, CONCAT, CURDATE y NOW, y los upsert con
+ON DUPLICATE KEY UPDATE y VALUES(columna). El resto de la consulta
+(JOIN, GROUP BY, RANK() OVER, CASE, ROUND...) es SQL común a ambos motores.
+"""
+from functools import lru_cache
+from typing import List, Tuple
+import re
+
+# Especificadores de DATE_FORMAT (MySQL) y su equivalente en strftime (SQLite)
+DATE_FORMAT_SPECIFIERS = {
+    '%Y': '%Y', '%m': '%m', '%d': '%d', '%H': '%H', '%i': '%M',
+    '%s': '%S', '%S': '%S', '%f': '%f', '%j': '%j', '%w': '%w', '%%': '%%',
+}
+
+_LITERAL_MARK = '\x00'
+_FUNCTION_CALL = re.compile(r'\b(DATE_FORMAT|DATEDIFF|CONCAT|CURDATE|NOW)\s*\(', re.IGNORECASE)
+_LITERAL_REF = re.compile(_LITERAL_MARK + r'(\d+)' + _LITERAL_MARK)
+_UPSERT = re.compile(r'\bON\s+DUPLICATE\s+KEY\s+UPDATE\b', re.IGNORECASE)
+_INSERTED_VALUE = re.compile(r'\bVALUES\s*\(\s*(\w+)\s*\)', re.IGNORECASE)
+
+
+def _extract_literals(query: str) -> Tuple[str, List[str]]:
+    """Reemplaza los literales de texto por marcas y devuelve sus valores"""
+    code, literals = [], []
+    i = 0
+    while i < len(query):
+        char = query[i]
+        if char not in ("'", '"', '`'):
+            code.append(char)
+            i += 1
+            continue
+        value, i = [], i + 1
+        while i < len(query):
+            if query[i] == '\\' and char != '`' and i + 1 < len(query):
+                value.append(query[i + 1])
+                i += 2
+            elif query[i] == char and query[i + 1:i + 2] == char:
+                value.append(char)
+                i += 2
+            elif query[i] == char:
+                break
+            else:
+                value.append(query[i])
+                i += 1
+        else:
+            raise ValueError("Literal sin cerrar en la consulta")
+        i += 1
+        value = ''.join(value)
+        if char == '`':
+            code.append('"' + value.replace('"', '""') + '"')
+        else:
+            code.append(f"{_LITERAL_MARK}{len(literals)}{_LITERAL_MARK}")
+            literals.append(value)
+    return ''.join(code), literals
+
+
+def _split_arguments(code: str, start: int) -> Tuple[List[str], int]:
+    """Separa los argumentos de la llamada que abre en `start`; devuelve también el fin"""
+    arguments, depth, current = [], 0, start
+    for i in range(start, len(code)):
+        if code[i] == '(':
+            depth += 1
+        elif code[i] == ')':
+            if depth == 0:
+                arguments.append(code[current:i].strip())
+                return [argument for argument in arguments if argument], i + 1
+            depth -= 1
+        elif code[i] == ',' and depth == 0:
+            arguments.append(code[current:i].strip())
+            current = i + 1
+    raise ValueError("Paréntesis sin cerrar en la consulta")
+
+
+def _strftime_format(mysql_format: str) -> str:
+    def replace(match):
+        if match.group(0) not in DATE_FORMAT_SPECIFIERS:
+            raise ValueError(f"Formato de DATE_FORMAT no soportado: {match.group(0)}")
+        return DATE_FORMAT_SPECIFIERS[match.group(0)]
+    return re.sub(r'%.', replace, mysql_format)
+
+
+def _rewrite_functions(code: str, literals: List[str]) -> str:
+    match = _FUNCTION_CALL.search(code)
+    if match is None:
+        return code
+    name = match.group(1).upper()
+    arguments, end = _split_arguments(code, match.end())
+    arguments = [_rewrite_functions(argument, literals) for argument in arguments]
+
+    if name == 'CONCAT':
+        replacement = '(' + ' || '.join(arguments) + ')'
+    elif name == 'DATEDIFF':
+        first, second = arguments
+        replacement = f"CAST(julianday(date({first})) - julianday(date({second})) AS INTEGER)"
+    elif name == 'DATE_FORMAT':
+        value, date_format = arguments
+        literal = _LITERAL_REF.fullmatch(date_format)
+        if literal is None:
+            raise ValueError("DATE_FORMAT solo se traduce con un formato literal")
+        index = int(literal.group(1))
+        literals[index] = _strftime_format(literals[index])
+        replacement = f"strftime({date_format}, {value})"
+    elif name == 'CURDATE':
+        replacement = "date('now', 'localtime')"
+    else:
+        replacement = "datetime('now', 'localtime')"
+    return code[:match.start()] + replacement + _rewrite_functions(code[end:], literals)
+
+
+def _rewrite_upsert(code: str) -> str:
+    """ON DUPLICATE KEY UPDATE pasa a ON CONFLICT DO UPDATE y VALUES(columna) a excluded.columna"""
+    match = _UPSERT.search(code)
+    if match is None:
+        return code
+    assignments = _INSERTED_VALUE.sub(r'excluded.\1', code[match.end():])
+    return code[:match.start()] + 'ON CONFLICT DO UPDATE SET' + assignments
+
+
+@lru_cache(maxsize=256)
+def to_sqlite(query: str) -> str:
+    """Traduce una consulta de MySQL al dialecto de SQLite
+
+    Ejemplo:
+        to_sqlite("SELECT DATE_FORMAT(SalesDate, '%Y-%m') FROM sales WHERE SalesID = %s")
+        # "SELECT strftime('%Y-%m', SalesDate) FROM sales WHERE SalesID = ?"
+    """
+    code, literals = _extract_literals(query)
+    code = code.replace('%s', '?')
+    code = _rewrite_upsert(_rewrite_functions(code, literals))
+    return _LITERAL_REF.sub(lambda match: "'" + literals[int(match.group(1))].replace("'", "''") + "'", code)
+
+
+def translate_ddl(script: str) -> List[str]:
+    """Convierte un script de creación de tablas de MySQL en sentencias de SQLite
+
+    Se omiten CREATE DATABASE y USE; los DECIMAL pasan a REAL para que las
+    divisiones entre montos no se hagan como divisiones enteras.
+    """
+    script = re.sub(r'--[^\n]*', '', script)
+    statements = []
+    for statement in script.split(';'):
+        statement = statement.strip()
+        if not statement or re.match(r'(CREATE\s+DATABASE|USE)\b', statement, re.IGNORECASE):
+            continue
+        statement = re.sub(r'\bINT\s+PRIMARY\s+KEY\s+AUTO_INCREMENT\b', 'INTEGER PRIMARY KEY', statement, flags=re.IGNORECASE)
+        statement = re.sub(r'\s*\bAUTO_INCREMENT\b', '', statement, flags=re.IGNORECASE)
+        statement = re.sub(r'\bENUM\s*\([^)]*\)', 'TEXT', statement, flags=re.IGNORECASE)
+        statement = re.sub(r'\bDECIMAL\s*\(\s*\d+\s*,\s*\d+\s*\)', 'REAL', statement, flags=re.IGNORECASE)
+        statement = re.sub(r'^CREATE\s+INDEX\s+(?!IF\s+NOT\s+EXISTS)', 'CREATE INDEX IF NOT EXISTS ', statement, flags=re.IGNORECASE)
+        statements.append(statement)
+    return statements
@@ -0,0 +1,221 @@
+import mysql.connector
+from mysql.connector import Error, errorcode, errors
+from contextlib import contextmanager
+from threading import Lock
+import logging
+
+from .backend import DatabaseBackend, Transaction
+from .connection_pool import ConnectionPool
+
+# Errores del cliente que indican que el servidor cerró la conexión
+LOST_CONNECTION_ERRORS = (
+    errorcode.CR_SERVER_GONE_ERROR,
+    errorcode.CR_SERVER_LOST,
+    errorcode.CR_SERVER_LOST_EXTENDED,
+)
+
+class _MySQLTransaction(Transaction):
+    """Sentencias de una transacción sobre el cursor de una conexión del pool"""
+
+    def __init__(self, cursor):
+        self.__cursor = cursor
+
+    def execute_query(self, query, params=None):
+        self.__cursor.execute(query, params)
+        return self.__cursor.fetchall()
+
+    def execute_insert(self, query, params=None):
+        self.__cursor.execute(query, params)
+        return self.__cursor.lastrowid
+
+    def execute_update(self, query, params=None):
+        self.__cursor.execute(query, params)
+        return self.__cursor.rowcount
+
+
+class MySQLBackend(DatabaseBackend):
+    """Backend MySQL con un pool de conexiones reutilizables entre hilos"""
+
+    def __init__(self, host='localhost', port=3306, user=None, password=None, database=None,
+                 pool_size=5, pool_idle_timeout=30.0, pool_timeout=10.0):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.database = database
+        self.pool_size = pool_size
+        self.pool_idle_timeout = pool_idle_timeout
+        self.pool_timeout = pool_timeout
+        self._pool = None
+        self._pool_lock = Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def _create_connection(self):
+        """Abre una conexión nueva para el pool"""
+        try:
+            connection = mysql.connector.connect(
+                host=self.host,
+                port=self.port,
+                user=self.user,
+                password=self.password,
+                database=self.database,
+                charset='utf8mb4',
+                collation='utf8mb4_unicode_ci',
+                # Sin autocommit una conexión reutilizada seguiría leyendo la
+                # instantánea de su primera consulta (REPEATABLE READ)
+                autocommit=True
+            )
+            self.logger.info("Conexión exitosa a MySQL")
+            return connection
+        except Error as e:
+            self.logger.error(f"Error al conectar a MySQL: {e}")
+            raise
+
+    @staticmethod
+    def _is_healthy(connection):
+        """Verifica una conexión inactiva, reconectándola si el servidor la cerró"""
+        connection.ping(reconnect=True, attempts=1, delay=0)
+        return True
+
+    def _get_pool(self):
+        """Devuelve el pool, creándolo la primera vez"""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ConnectionPool(
+                    self._create_connection,
+                    size=self.pool_size,
+                    idle_timeout=self.pool_idle_timeout,
+                    checkout_timeout=self.pool_timeout,
+                    health_check=self._is_healthy,
+                    broken_errors=(errors.OperationalError, errors.InterfaceError)
+                )
+            return self._pool
+
+    @contextmanager
+    def connection(self):
+        """Toma una conexión del pool y la devuelve al terminar el bloque"""
+        with self._get_pool().connection() as connection:
+            yield connection
+
+    def stats(self):
+        """Estado del pool y tiempos de espera para obtener una conexión"""
+        return self._get_pool().stats()
+
+    def disconnect(self):
+        """Cierra las conexiones del pool"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close_all()
+            self.logger.info("Conexiones cerradas")
+
+    def execute_query(self, query, params=None):
+        """Ejecuta una consulta SQL de selección"""
+        try:
+            return self._fetch_all(query, params)
+        except Error as e:
+            # Una consulta de lectura se puede repetir sin riesgo en otra conexión
+            if e.errno not in LOST_CONNECTION_ERRORS:
+                self.logger.error(f"Error ejecutando consulta: {e}")
+                raise
+            self.logger.warning(f"Conexión perdida, reintentando consulta: {e}")
+        try:
+            return self._fetch_all(query, params)
+        except Error as e:
+            self.logger.error(f"Error ejecutando consulta: {e}")
+            raise
+
+    def _fetch_all(self, query, params):
+        with self.connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+    def execute_insert(self, query, params=None):
+        """Ejecuta una consulta SQL de inserción"""
+        with self.connection() as connection:
+            cursor = None
+            try:
+                cursor = connection.cursor()
+                cursor.execute(query, params)
+                connection.commit()
+                return cursor.lastrowid
+            except Error as e:
+                if e.errno not in LOST_CONNECTION_ERRORS:
+                    connection.rollback()
+                self.logger.error(f"Error ejecutando inserción: {e}")
+                raise
+            finally:
+                if cursor:
+                    cursor.close()
+
+    def execute_update(self, query, params=None):
+        """Ejecuta una consulta SQL de actualización"""
+        with self.connection() as connection:
+            cursor = None
+            try:
+                cursor = connection.cursor()
+                cursor.execute(query, params)
+                connection.commit()
+                return cursor.rowcount
+            finally:
+                if cursor:
+                    cursor.close()
+
+    def bulk_insert(self, query, rows, batch_size=1000):
+        """Inserta muchas filas en una transacción, con executemany por lotes de `batch_size`"""
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+                connection.start_transaction()
+                for start in range(0, len(rows), batch_size):
+                    cursor.executemany(query, rows[start:start + batch_size])
+                connection.commit()
+                return len(rows)
+            except Error as e:
+                if e.errno not in LOST_CONNECTION_ERRORS:
+                    connection.rollback()
+                self.logger.error(f"Error en inserción masiva: {e}")
+                raise
+            finally:
+                # La conexión vuelve al pool: se restablece la verificación de claves foráneas
+                try:
+                    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+                except Error:
+                    pass
+                cursor.close()
+
+    @contextmanager
+    def transaction(self):
+        """Abre una transacción en una conexión del pool, que queda tomada hasta el final del bloque"""
+        with self.connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                connection.start_transaction()
+                yield _MySQLTransaction(cursor)
+                connection.commit()
+            except Exception as e:
+                if getattr(e, 'errno', None) not in LOST_CONNECTION_ERRORS:
+                    connection.rollback()
+                self.logger.error(f"Error en transacción: {e}")
+                raise
+            finally:
+                cursor.close()
+
+    def truncate(self, table):
+        """Vacía una tabla sin verificar las claves foráneas que la referencian"""
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+                cursor.execute(f"TRUNCATE TABLE {table}")
+            finally:
+                try:
+                    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+                except Error:
+                    pass
+                cursor.close()
@@ -0,0 +1,58 @@
+"""Esquema de las tablas, leído de sql/create_tables.sql"""
+from collections import namedtuple
+from typing import Dict, List
+import os
+import re
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SCHEMA_PATH = os.path.join(PROJECT_DIR, 'sql', 'create_tables.sql')
+DATA_DIR = os.path.join(PROJECT_DIR, 'data')
+
+# Tablas en orden de carga (las referenciadas antes que las que las referencian)
+TABLES = ('countries', 'cities', 'categories', 'products', 'customers', 'employees', 'sales')
+FACT_TABLES = ('sales',)
+DIMENSION_TABLES = tuple(table for table in TABLES if table not in FACT_TABLES)
+
+TRUE_VALUES = {'1', 'true', 't', 'yes', 'y'}
+FALSE_VALUES = {'0', 'false', 'f', 'no', 'n'}
+
+Column = namedtuple('Column', ['name', 'type', 'not_null', 'primary_key', 'values'], defaults=(False, ()))
+ForeignKey = namedtuple('ForeignKey', ['column', 'table', 'referenced_column'])
+
+_CREATE_TABLE = re.compile(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)\s*\((.*?)\)\s*;', re.IGNORECASE | re.DOTALL)
+_CONSTRAINT = re.compile(r'(PRIMARY|FOREIGN|UNIQUE|KEY|INDEX|CONSTRAINT|CHECK)\b', re.IGNORECASE)
+_FOREIGN_KEY = re.compile(r'FOREIGN\s+KEY\s*\((\w+)\)\s*REFERENCES\s+(\w+)\s*\((\w+)\)', re.IGNORECASE)
+_ENUM_VALUES = re.compile(r"ENUM\s*\(([^)]*)\)", re.IGNORECASE)
+
+
+def _read_tables(path: str) -> List[tuple]:
+    with open(path, encoding='utf-8') as schema_file:
+        script = re.sub(r'--[^\n]*', '', schema_file.read())
+    return _CREATE_TABLE.findall(script)
+
+
+def read_schema(path: str = SCHEMA_PATH) -> Dict[str, List[Column]]:
+    """Columnas de cada tabla del script de creación, con su tipo de MySQL y restricciones"""
+    schema = {}
+    for table, body in _read_tables(path):
+        columns = []
+        for line in body.splitlines():
+            line = line.strip().rstrip(',')
+            if not line or _CONSTRAINT.match(line):
+                continue
+            name, declared_type = line.split()[:2]
+            enum = _ENUM_VALUES.search(line)
+            primary_key = bool(re.search(r'\bPRIMARY\s+KEY\b', line, re.IGNORECASE))
+            columns.append(Column(
+                name, re.split(r'\(', declared_type)[0].upper(),
+                primary_key or bool(re.search(r'\bNOT\s+NULL\b', line, re.IGNORECASE)),
+                primary_key,
+                tuple(value.strip().strip("'") for value in enum.group(1).split(',')) if enum else (),
+            ))
+        schema[table] = columns
+    return schema
+
+
+def read_foreign_keys(path: str = SCHEMA_PATH) -> Dict[str, List[ForeignKey]]:
+    """Claves foráneas de cada tabla del script de creación"""
+    return {table: [ForeignKey(*match) for match in _FOREIGN_KEY.findall(body)] for table, body in _read_tables(path)}
@@ -0,0 +1,163 @@
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from threading import Lock
+from typing import Dict, List, Optional, Sequence
+import logging
+import sqlite3
+
+from .backend import DatabaseBackend, Transaction
+from .bulk_loader import BulkLoader
+from .dialect import to_sqlite, translate_ddl
+from .schema import DATA_DIR, SCHEMA_PATH, TABLES, read_schema
+
+
+def _adapt(value):
+    """Adapta un parámetro de Python a un tipo que SQLite guarda sin ambigüedad"""
+    if isinstance(value, datetime):
+        # Las columnas DATE se guardan como 'YYYY-MM-DD': a medianoche se pasa solo la fecha
+        # para que `SalesDate BETWEEN inicio AND fin` incluya el día inicial, como en MySQL
+        if value.time() == datetime.min.time():
+            return value.date().isoformat()
+        return value.isoformat(' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _dict_factory(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class _SQLiteTransaction(Transaction):
+    """Sentencias de una transacción sobre la conexión del backend, con su lock tomado"""
+
+    def __init__(self, execute):
+        self.__execute = execute
+
+    def execute_query(self, query, params=None):
+        return self.__execute(query, params).fetchall()
+
+    def execute_insert(self, query, params=None):
+        return self.__execute(query, params).lastrowid
+
+    def execute_update(self, query, params=None):
+        return self.__execute(query, params).rowcount
+
+
+class SQLiteBackend(DatabaseBackend):
+    """Backend embebido en SQLite que reemplaza a MySQL para correr los reportes localmente
+
+    Crea las tablas a partir de `sql/create_tables.sql` y, si la base está
+    vacía, carga los CSV de `data_dir` (uno por tabla, con el nombre de la
+    tabla). Las consultas en dialecto MySQL se traducen con `to_sqlite`.
+    Las fechas se devuelven como texto ISO ('YYYY-MM-DD') y los montos como
+    float, en lugar de date y Decimal como en MySQL. Las fechas NOT NULL
+    inválidas de los CSV toman `date_fallback` o se rechazan, igual que al
+    cargar MySQL con load_data.py.
+    """
+
+    def __init__(self, database: str = ':memory:', data_dir: Optional[str] = DATA_DIR,
+                 schema_path: str = SCHEMA_PATH, date_fallback: Optional[str] = None):
+        self.__connection = sqlite3.connect(database, check_same_thread=False)
+        self.__connection.row_factory = _dict_factory
+        self.__lock = Lock()
+        self.__load_stats: Dict[str, Dict[str, int]] = {}
+        self.__schema_path = schema_path
+        self.__date_fallback = date_fallback
+        self.logger = logging.getLogger(__name__)
+
+        with open(schema_path, encoding='utf-8') as schema_file:
+            self.create_schema(schema_file.read())
+        if data_dir and self.__is_empty():
+            self.load_csv_dir(data_dir)
+
+    def create_schema(self, script: str) -> None:
+        """Crea las tablas e índices de un script de MySQL que todavía no existan"""
+        with self.__lock, self.__connection:
+            for statement in translate_ddl(script):
+                self.__connection.execute(statement)
+
+    def __is_empty(self) -> bool:
+        with self.__lock:
+            return all(
+                self.__connection.execute(f"SELECT COUNT(*) AS total FROM {table}").fetchone()['total'] == 0
+                for table in TABLES
+            )
+
+    def load_csv_dir(self, data_dir: str) -> Dict[str, Dict]:
+        """Carga `<tabla>.csv` de cada tabla que tenga archivo con BulkLoader
+
+        Los valores que no se pueden convertir quedan en NULL, o tal cual si la
+        columna es NOT NULL, y se cuentan en `load_stats()`. Las fechas NOT
+        NULL inválidas toman `date_fallback` o la fila se rechaza.
+        """
+        report = BulkLoader(self, workers=1, keep_invalid=True, schema=read_schema(self.__schema_path),
+                            date_fallback=self.__date_fallback).load(data_dir)
+        self.__load_stats.update(
+            {table: {'rows': stats['rows'], 'rejected': stats['rejected'], 'invalid_values': stats['invalid_values']}
+             for table, stats in report.items()}
+        )
+        return report
+
+    def load_stats(self) -> Dict[str, Dict[str, int]]:
+        """Filas cargadas y valores inválidos de cada tabla cargada desde CSV"""
+        return dict(self.__load_stats)
+
+    def stats(self) -> Dict:
+        return {'backend': 'sqlite', 'tables': self.load_stats()}
+
+    def __execute(self, query: str, params: Optional[Sequence]):
+        return self.__connection.execute(to_sqlite(query), [_adapt(value) for value in params or ()])
+
+    def execute_query(self, query: str, params: Optional[Sequence] = None) -> List[Dict]:
+        """Ejecuta una consulta SQL de selección"""
+        try:
+            with self.__lock:
+                return self.__execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f"Error ejecutando consulta: {e}")
+            raise
+
+    def execute_insert(self, query: str, params: Optional[Sequence] = None) -> int:
+        """Ejecuta una consulta SQL de inserción"""
+        try:
+            with self.__lock, self.__connection:
+                return self.__execute(query, params).lastrowid
+        except sqlite3.Error as e:
+            self.logger.error(f"Error ejecutando inserción: {e}")
+            raise
+
+    def execute_update(self, query: str, params: Optional[Sequence] = None) -> int:
+        """Ejecuta una consulta SQL de actualización"""
+        with self.__lock, self.__connection:
+            return self.__execute(query, params).rowcount
+
+    def bulk_insert(self, query: str, rows: List[Sequence], batch_size: int = 1000) -> int:
+        """Inserta muchas filas en una transacción (SQLite no verifica claves foráneas por defecto)
+
+        Las filas ya vienen con tipos simples (texto, números o None), así que no se adaptan.
+        """
+        statement = to_sqlite(query)
+        with self.__lock, self.__connection:
+            for start in range(0, len(rows), batch_size):
+                self.__connection.executemany(statement, rows[start:start + batch_size])
+        return len(rows)
+
+    @contextmanager
+    def transaction(self):
+        """Abre una transacción; el lock de la conexión queda tomado hasta el final del bloque"""
+        with self.__lock, self.__connection:
+            yield _SQLiteTransaction(self.__execute)
+
+    def truncate(self, table: str) -> None:
+        """Vacía una tabla"""
+        with self.__lock, self.__connection:
+            self.__connection.execute(f"DELETE FROM {table}")
+
+    def disconnect(self) -> None:
+        """Cierra la base embebida (si es en memoria, sus datos se pierden)"""
+        with self.__lock:
+            self.__connection.close()
@@ -1,5 +1,6 @@
 from typing import Optional, List
 from src.database.connection import DatabaseConnection
+from src.database.rollups import refresh_customer_city
 
 class Customer:
     """Clase que representa un cliente en el sistema"""
@@ -101,14 +102,20 @@ class Customer:
             query = """UPDATE customers 
                        SET FirstName=%s, MiddleInitial=%s, LastName=%s, CityID=%s, Address=%s 
                        WHERE CustomerID=%s"""
-            db.execute_update(query, (
-                self.__first_name,
-                self.__middle_initial,
-                self.__last_name,
-                self.__city_id,
-                self.__address,
-                self.__customer_id
-            ))
+            # Las ventas por ciudad usan la ciudad actual del cliente: se mueven en la misma transacción
+            with db.transaction() as tx:
+                previous = tx.execute_query("SELECT CityID FROM customers WHERE CustomerID = %s",
+                                            (self.__customer_id,))
+                tx.execute_update(query, (
+                    self.__first_name,
+                    self.__middle_initial,
+                    self.__last_name,
+                    self.__city_id,
+                    self.__address,
+                    self.__customer_id
+                ))
+                if previous and previous[0]['CityID'] != self.__city_id:
+                    refresh_customer_city(tx, self.__customer_id, (previous[0]['CityID'], self.__city_id))
         return self.__customer_id
 
     @classmethod
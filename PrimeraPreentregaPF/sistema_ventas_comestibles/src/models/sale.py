@@ -2,6 +2,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional, List
 from src.database.connection import DatabaseConnection
+from src.database.rollups import record_sale
 
 class Sale:
     """Clase que representa una venta en el sistema"""
@@ -112,11 +113,15 @@ class Sale:
                                Discount, TotalPrice, SalesDate, TransactionNumber) 
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
             """
-            self.__sales_id = db.execute_insert(query, (
-                self.__sales_person_id, self.__customer_id, self.__product_id,
-                self.__quantity, float(self.__discount), float(self.__total_price),
-                self.__sales_date, self.__transaction_number
-            ))
+            # La venta y sus resúmenes diarios se confirman juntos, en una misma conexión
+            with db.transaction() as tx:
+                sales_id = tx.execute_insert(query, (
+                    self.__sales_person_id, self.__customer_id, self.__product_id,
+                    self.__quantity, float(self.__discount), float(self.__total_price),
+                    self.__sales_date, self.__transaction_number
+                ))
+                record_sale(tx, sales_id)
+            self.__sales_id = sales_id
         return self.__sales_id
 
     @classmethod
@@ -149,26 +154,20 @@ class Sale:
     def get_sales_summary(cls, start_date: Optional[datetime] = None,
                           end_date: Optional[datetime] = None) -> dict:
         db = DatabaseConnection()
-        if start_date and end_date:
-            query = """
-            SELECT COUNT(*) as total_sales,
-                   SUM(TotalPrice) as total_revenue,
-                   AVG(TotalPrice) as avg_sale,
-                   SUM(Quantity) as total_units_sold,
-                   COUNT(DISTINCT CustomerID) as unique_customers
-            FROM sales
-            WHERE SalesDate BETWEEN %s AND %s
-            """
-            result = db.execute_query(query, (start_date, end_date))
+        # Los totales salen del resumen por banda; los clientes distintos, del resumen por cliente
+        where = "WHERE SalesDate BETWEEN %s AND %s" if start_date and end_date else ""
+        query = f"""
+        SELECT CAST(COALESCE(SUM(sales_count), 0) AS SIGNED) as total_sales,
+               SUM(total_revenue) as total_revenue,
+               SUM(total_revenue) / SUM(sales_count) as avg_sale,
+               SUM(total_units) as total_units_sold,
+               (SELECT COUNT(DISTINCT CustomerID) FROM daily_customer_sales {where}) as unique_customers
+        FROM daily_discount_sales
+        {where}
+        """
+        if where:
+            result = db.execute_query(query, (start_date, end_date, start_date, end_date))
         else:
-            query = """
-            SELECT COUNT(*) as total_sales,
-                   SUM(TotalPrice) as total_revenue,
-                   AVG(TotalPrice) as avg_sale,
-                   SUM(Quantity) as total_units_sold,
-                   COUNT(DISTINCT CustomerID) as unique_customers
-            FROM sales
-            """
             result = db.execute_query(query)
         return result[0] if result else {}
 
@@ -1,10 +1,19 @@
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from src.database.connection import DatabaseConnection
+from src.database.rollups import discount_band_label_sql
 import logging
 
 class AnalyticsService:
-    """Servicio para análisis avanzados de datos de ventas"""
+    """Servicio para análisis avanzados de datos de ventas
+
+    La segmentación de clientes, las tendencias, los descuentos y el dashboard
+    se leen de las tablas de resumen diario (src/database/rollups.py): las
+    sumas, del resumen por banda de descuento, y los clientes distintos, del
+    resumen por cliente. Los reportes por empleado, ciudad y producto cuentan
+    clientes distintos de cada grupo, algo que esos resúmenes no guardan, y
+    siguen leyendo `sales`.
+    """
     
     def __init__(self):
         self.db = DatabaseConnection()
@@ -105,26 +114,32 @@ class AnalyticsService:
                 CONCAT(c.FirstName, ' ', c.LastName) as customer_name,
                 ci.CityName,
                 co.CountryName,
-                COUNT(s.SalesID) as total_purchases,
-                SUM(s.TotalPrice) as total_spent,
-                AVG(s.TotalPrice) as avg_purchase_amount,
-                MAX(s.SalesDate) as last_purchase_date,
-                DATEDIFF(CURDATE(), MAX(s.SalesDate)) as days_since_last_purchase,
+                CAST(COALESCE(r.total_purchases, 0) AS SIGNED) as total_purchases,
+                r.total_spent,
+                r.total_spent / r.total_purchases as avg_purchase_amount,
+                r.last_purchase_date,
+                DATEDIFF(CURDATE(), r.last_purchase_date) as days_since_last_purchase,
                 CASE 
-                    WHEN SUM(s.TotalPrice) >= 500 THEN 'High Value'
-                    WHEN SUM(s.TotalPrice) >= 200 THEN 'Medium Value'
+                    WHEN r.total_spent >= 500 THEN 'High Value'
+                    WHEN r.total_spent >= 200 THEN 'Medium Value'
                     ELSE 'Low Value'
                 END as customer_segment,
                 CASE 
-                    WHEN COUNT(s.SalesID) >= 10 THEN 'Frequent'
-                    WHEN COUNT(s.SalesID) >= 5 THEN 'Regular'
+                    WHEN r.total_purchases >= 10 THEN 'Frequent'
+                    WHEN r.total_purchases >= 5 THEN 'Regular'
                     ELSE 'Occasional'
                 END as purchase_frequency
             FROM customers c
-            LEFT JOIN sales s ON c.CustomerID = s.CustomerID
+            LEFT JOIN (
+                SELECT CustomerID,
+                       SUM(sales_count) as total_purchases,
+                       SUM(total_revenue) as total_spent,
+                       MAX(SalesDate) as last_purchase_date
+                FROM daily_customer_sales
+                GROUP BY CustomerID
+            ) r ON c.CustomerID = r.CustomerID
             LEFT JOIN cities ci ON c.CityID = ci.CityID
             LEFT JOIN countries co ON ci.CountryID = co.CountryID
-            GROUP BY c.CustomerID, c.FirstName, c.LastName, ci.CityName, co.CountryName
             ORDER BY total_spent DESC
             """
             
@@ -138,24 +153,33 @@ class AnalyticsService:
         try:
             if period == 'daily':
                 date_format = '%Y-%m-%d'
-                group_by = 'DATE(s.SalesDate)'
+                group_by = 'DATE(r.SalesDate)'
             elif period == 'monthly':
                 date_format = '%Y-%m'
-                group_by = 'DATE_FORMAT(s.SalesDate, "%Y-%m")'
+                group_by = 'DATE_FORMAT(r.SalesDate, "%Y-%m")'
             else:
                 raise ValueError("Período debe ser 'daily' o 'monthly'")
             
             query = f"""
             SELECT 
-                DATE_FORMAT(s.SalesDate, '{date_format}') as period,
-                COUNT(s.SalesID) as total_sales,
-                SUM(s.TotalPrice) as total_revenue,
-                AVG(s.TotalPrice) as avg_sale_amount,
-                SUM(s.Quantity) as total_units_sold,
-                COUNT(DISTINCT s.CustomerID) as unique_customers
-            FROM sales s
-            GROUP BY {group_by}
-            ORDER BY period
+                t.period, t.total_sales, t.total_revenue, t.avg_sale_amount, t.total_units_sold,
+                u.unique_customers
+            FROM (
+                SELECT DATE_FORMAT(r.SalesDate, '{date_format}') as period,
+                       CAST(SUM(r.sales_count) AS SIGNED) as total_sales,
+                       SUM(r.total_revenue) as total_revenue,
+                       SUM(r.total_revenue) / SUM(r.sales_count) as avg_sale_amount,
+                       SUM(r.total_units) as total_units_sold
+                FROM daily_discount_sales r
+                GROUP BY {group_by}
+            ) t
+            JOIN (
+                SELECT DATE_FORMAT(r.SalesDate, '{date_format}') as period,
+                       COUNT(DISTINCT r.CustomerID) as unique_customers
+                FROM daily_customer_sales r
+                GROUP BY {group_by}
+            ) u ON t.period = u.period
+            ORDER BY t.period
             """
             
             return self.db.execute_query(query)
@@ -166,32 +190,22 @@ class AnalyticsService:
     def get_discount_effectiveness_analysis(self) -> List[Dict]:
         """Análisis de efectividad de descuentos"""
         try:
-            query = """
+            query = f"""
             SELECT 
-                CASE 
-                    WHEN s.Discount = 0 THEN 'No Discount'
-                    WHEN s.Discount <= 0.05 THEN '1% - 5%'
-                    WHEN s.Discount <= 0.10 THEN '6% - 10%'
-                    WHEN s.Discount <= 0.15 THEN '11% - 15%'
-                    WHEN s.Discount <= 0.20 THEN '16% - 20%'
-                    ELSE '> 20%'
-                END as discount_range,
-                COUNT(s.SalesID) as total_sales,
-                AVG(s.TotalPrice) as avg_sale_amount,
-                SUM(s.TotalPrice) as total_revenue,
-                AVG(s.Quantity) as avg_quantity,
-                COUNT(DISTINCT s.CustomerID) as unique_customers
-            FROM sales s
-            GROUP BY discount_range
-            ORDER BY 
-                CASE 
-                    WHEN s.Discount = 0 THEN 0
-                    WHEN s.Discount <= 0.05 THEN 1
-                    WHEN s.Discount <= 0.10 THEN 2
-                    WHEN s.Discount <= 0.15 THEN 3
-                    WHEN s.Discount <= 0.20 THEN 4
-                    ELSE 5
-                END
+                {discount_band_label_sql('r.DiscountBand')} as discount_range,
+                CAST(SUM(r.sales_count) AS SIGNED) as total_sales,
+                SUM(r.total_revenue) / SUM(r.sales_count) as avg_sale_amount,
+                SUM(r.total_revenue) as total_revenue,
+                SUM(r.total_units) * 1.0 / SUM(r.sales_count) as avg_quantity,
+                u.unique_customers
+            FROM daily_discount_sales r
+            JOIN (
+                SELECT DiscountBand, COUNT(DISTINCT CustomerID) as unique_customers
+                FROM daily_customer_sales
+                GROUP BY DiscountBand
+            ) u ON r.DiscountBand = u.DiscountBand
+            GROUP BY r.DiscountBand, u.unique_customers
+            ORDER BY r.DiscountBand
             """
             
             return self.db.execute_query(query)
@@ -205,19 +219,19 @@ class AnalyticsService:
             # Métricas generales
             general_metrics = self.db.execute_query("""
                 SELECT 
-                    COUNT(SalesID) as total_sales,
-                    SUM(TotalPrice) as total_revenue,
-                    AVG(TotalPrice) as avg_sale_amount,
-                    COUNT(DISTINCT CustomerID) as unique_customers,
-                    COUNT(DISTINCT ProductID) as products_sold
-                FROM sales
+                    CAST(COALESCE(SUM(sales_count), 0) AS SIGNED) as total_sales,
+                    SUM(total_revenue) as total_revenue,
+                    SUM(total_revenue) / SUM(sales_count) as avg_sale_amount,
+                    (SELECT COUNT(DISTINCT CustomerID) FROM daily_customer_sales) as unique_customers,
+                    (SELECT COUNT(DISTINCT ProductID) FROM daily_product_sales) as products_sold
+                FROM daily_discount_sales
             """)[0]
             
             # Top 5 productos
             top_products = self.db.execute_query("""
-                SELECT p.ProductName, SUM(s.TotalPrice) as revenue
-                FROM sales s
-                JOIN products p ON s.ProductID = p.ProductID
+                SELECT p.ProductName, SUM(r.total_revenue) as revenue
+                FROM daily_product_sales r
+                JOIN products p ON r.ProductID = p.ProductID
                 GROUP BY p.ProductID, p.ProductName
                 ORDER BY revenue DESC
                 LIMIT 5
@@ -226,20 +240,19 @@ class AnalyticsService:
             # Top 5 empleados
             top_employees = self.db.execute_query("""
                 SELECT CONCAT(e.FirstName, ' ', e.LastName) as employee_name, 
-                       SUM(s.TotalPrice) as revenue
-                FROM sales s
-                JOIN employees e ON s.SalesPersonID = e.EmployeeID
+                       SUM(r.total_revenue) as revenue
+                FROM daily_employee_sales r
+                JOIN employees e ON r.SalesPersonID = e.EmployeeID
                 GROUP BY e.EmployeeID, e.FirstName, e.LastName
                 ORDER BY revenue DESC
                 LIMIT 5
             """)
             
-            # Ventas por país
+            # Ventas por país (la ciudad del resumen es la del cliente)
             sales_by_country = self.db.execute_query("""
-                SELECT co.CountryName, SUM(s.TotalPrice) as revenue
-                FROM sales s
-                JOIN customers cu ON s.CustomerID = cu.CustomerID
-                JOIN cities ci ON cu.CityID = ci.CityID
+                SELECT co.CountryName, SUM(r.total_revenue) as revenue
+                FROM daily_city_sales r
+                JOIN cities ci ON r.CityID = ci.CityID
                 JOIN countries co ON ci.CountryID = co.CountryID
                 GROUP BY co.CountryID, co.CountryName
                 ORDER BY revenue DESC
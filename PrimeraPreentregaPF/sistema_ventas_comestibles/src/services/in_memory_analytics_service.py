@@ -0,0 +1,347 @@
+from typing import Dict, List, Optional
+from datetime import date, datetime
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.database.rollups import DISCOUNT_BANDS, DISCOUNT_RANGES
+from src.services.analytics_service import AnalyticsService
+
+# Columnas que se leen de cada tabla
+TABLE_COLUMNS = {
+    'sales': ['SalesID', 'SalesPersonID', 'CustomerID', 'ProductID', 'Quantity', 'Discount', 'TotalPrice', 'SalesDate'],
+    'employees': ['EmployeeID', 'FirstName', 'LastName'],
+    'customers': ['CustomerID', 'FirstName', 'LastName', 'CityID'],
+    'products': ['ProductID', 'ProductName', 'Price', 'CategoryID', 'Class'],
+    'categories': ['CategoryID', 'CategoryName'],
+    'cities': ['CityID', 'CityName', 'CountryID'],
+    'countries': ['CountryID', 'CountryName'],
+}
+
+
+def _distinct_count(groups: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """COUNT(DISTINCT value) por grupo, con grupos y valores codificados como enteros (-1 = NULL)"""
+    valid = (groups >= 0) & (values >= 0)
+    if not valid.any():
+        return np.zeros(n_groups, dtype=np.int64)
+    base = int(values[valid].max()) + 1
+    pairs = np.unique(groups[valid].astype(np.int64) * base + values[valid])
+    return np.bincount(pairs // base, minlength=n_groups)
+
+
+def _full_name(first: pd.Series, last: pd.Series) -> pd.Series:
+    """CONCAT(first, ' ', last): NULL si falta alguna de las partes"""
+    return (first + ' ' + last).where(first.notna() & last.notna(), None)
+
+
+def _records(frame: pd.DataFrame) -> List[Dict]:
+    """Filas como diccionarios con tipos de Python (None en lugar de NaN)"""
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+class InMemoryAnalyticsService(AnalyticsService):
+    """Servicio de análisis que calcula los reportes en memoria con pandas y NumPy
+
+    Carga una sola vez la tabla de ventas y sus dimensiones en arreglos
+    columnares; las claves foráneas de las ventas se codifican como la
+    posición de la fila en su dimensión, así cada reporte es un group-by
+    vectorizado (np.bincount) en lugar de un JOIN sobre toda la tabla de
+    ventas. Devuelve los mismos diccionarios que AnalyticsService; los
+    métodos que no redefine (como el dashboard ejecutivo) siguen usando SQL.
+    """
+
+    def __init__(self, tables: Optional[Dict[str, pd.DataFrame]] = None):
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+        self.__tables = tables
+        self.__loaded = False
+
+    def refresh(self) -> None:
+        """Descarta los datos cargados; se vuelven a leer de la base en el próximo reporte"""
+        self.__tables = None
+        self.__loaded = False
+
+    def __load(self) -> None:
+        if self.__loaded:
+            return
+        tables = self.__tables
+        if tables is None:
+            tables = {
+                table: pd.DataFrame.from_records(
+                    self.db.execute_query(f"SELECT {', '.join(columns)} FROM {table}"), columns=columns
+                )
+                for table, columns in TABLE_COLUMNS.items()
+            }
+        self.__prepare({table: tables[table][columns] for table, columns in TABLE_COLUMNS.items()})
+        self.__tables = None
+        self.__loaded = True
+
+    def __prepare(self, tables: Dict[str, pd.DataFrame]) -> None:
+        """Convierte las tablas en arreglos con las claves foráneas codificadas como enteros"""
+        for name in ('employees', 'customers', 'products', 'categories', 'cities', 'countries'):
+            tables[name] = tables[name].reset_index(drop=True)
+        self.__employees = tables['employees']
+        self.__customers = tables['customers']
+        self.__products = tables['products']
+        self.__categories = tables['categories']
+        self.__cities = tables['cities']
+        self.__countries = tables['countries']
+
+        sales = tables['sales']
+        self.__has_sale = pd.to_numeric(sales['SalesID'], errors='coerce').notna().to_numpy()
+        self.__quantity = pd.to_numeric(sales['Quantity'], errors='coerce').to_numpy(dtype=float)
+        self.__total = pd.to_numeric(sales['TotalPrice'], errors='coerce').to_numpy(dtype=float)
+        self.__discount = pd.to_numeric(sales['Discount'], errors='coerce').to_numpy(dtype=float)
+        # Las fechas pueden llegar como date, datetime o texto ISO; las inválidas quedan en NaT
+        self.__sales_date = pd.to_datetime(
+            sales['SalesDate'].map(lambda value: str(value)[:10] if value is not None else None),
+            format='%Y-%m-%d', errors='coerce'
+        )
+
+        # Posición de la fila de cada dimensión (-1 si la venta no tiene fila en la dimensión)
+        self.__employee_code = self.__codes(sales['SalesPersonID'], self.__employees['EmployeeID'])
+        self.__customer_code = self.__codes(sales['CustomerID'], self.__customers['CustomerID'])
+        self.__product_code = self.__codes(sales['ProductID'], self.__products['ProductID'])
+        self.__customer_city = self.__codes(self.__customers['CityID'], self.__cities['CityID'])
+        self.__city_country = self.__codes(self.__cities['CountryID'], self.__countries['CountryID'])
+        self.__product_category = self.__codes(self.__products['CategoryID'], self.__categories['CategoryID'])
+        # Códigos densos de los valores de las ventas para COUNT(DISTINCT ...)
+        self.__customer_value = pd.factorize(sales['CustomerID'])[0]
+        self.__product_value = pd.factorize(sales['ProductID'])[0]
+
+    @staticmethod
+    def __codes(keys: pd.Series, index: pd.Series) -> np.ndarray:
+        return pd.Index(index).get_indexer(keys)
+
+    @staticmethod
+    def __follow(codes: np.ndarray, next_codes: np.ndarray) -> np.ndarray:
+        """Encadena dos claves foráneas (por ejemplo, cliente -> ciudad -> país)"""
+        if len(next_codes) == 0:
+            return np.full(len(codes), -1)
+        return np.where(codes >= 0, next_codes[np.maximum(codes, 0)], -1)
+
+    @staticmethod
+    def __lookup(values: pd.Series, codes: np.ndarray) -> pd.Series:
+        """Valor de la dimensión para cada código (None si el código es -1, como un LEFT JOIN)"""
+        if len(values) == 0:
+            return pd.Series([None] * len(codes), dtype=object)
+        looked_up = values.to_numpy(dtype=object)[np.maximum(codes, 0)]
+        return pd.Series(np.where(codes >= 0, looked_up, None), dtype=object)
+
+    def __aggregate(self, groups: np.ndarray, n_groups: int, mask: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """COUNT, SUM y AVG de las ventas por grupo; sin ventas, SUM y AVG quedan en NULL"""
+        groups = np.where(self.__has_sale, groups, -1)
+        if mask is not None:
+            groups = np.where(mask, groups, -1)
+        valid = groups >= 0
+        count = np.bincount(groups[valid], minlength=n_groups)
+        revenue = np.bincount(groups[valid], weights=self.__total[valid], minlength=n_groups)
+        units = np.bincount(groups[valid], weights=self.__quantity[valid], minlength=n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            frame = pd.DataFrame({
+                'count': count,
+                'revenue': np.where(count > 0, revenue, np.nan),
+                'avg': np.where(count > 0, revenue / count, np.nan),
+                'units': pd.array(np.where(count > 0, units, np.nan), dtype='Int64'),
+                'avg_quantity': np.where(count > 0, units / count, np.nan),
+                'customers': _distinct_count(groups, self.__customer_value, n_groups),
+                'products': _distinct_count(groups, self.__product_value, n_groups),
+            })
+        return frame
+
+    @staticmethod
+    def __round(values: np.ndarray, decimals: int = 2) -> np.ndarray:
+        """ROUND de SQL: redondea la mitad alejándose de cero"""
+        factor = 10 ** decimals
+        return np.sign(values) * np.floor(np.abs(values) * factor + 0.5) / factor
+
+    def get_sales_performance_by_employee(self, start_date: datetime = None,
+                                        end_date: datetime = None) -> List[Dict]:
+        """Analiza el rendimiento de ventas por empleado"""
+        try:
+            self.__load()
+            n_employees = len(self.__employees)
+            mask = None
+            if start_date and end_date:
+                dates = self.__sales_date
+                mask = ((dates >= pd.Timestamp(start_date)) & (dates <= pd.Timestamp(end_date))).to_numpy()
+            stats = self.__aggregate(self.__employee_code, n_employees, mask)
+
+            result = pd.DataFrame({
+                'EmployeeID': self.__employees['EmployeeID'],
+                'employee_name': _full_name(self.__employees['FirstName'], self.__employees['LastName']),
+                'total_sales': stats['count'],
+                'total_revenue': stats['revenue'],
+                'avg_sale_amount': stats['avg'],
+                'total_units_sold': stats['units'],
+                'unique_customers_served': stats['customers'],
+            })
+            # El filtro por fechas está en el WHERE: los empleados sin ventas en el rango no aparecen
+            if mask is not None:
+                result = result[stats['count'].to_numpy() > 0]
+            result['revenue_rank'] = result['total_revenue'].rank(
+                method='min', ascending=False, na_option='bottom'
+            ).astype('int64')
+            result = result.sort_values('total_revenue', ascending=False, na_position='last', kind='stable')
+            return _records(result)
+        except Exception as e:
+            self.logger.error(f"Error en análisis de rendimiento de empleados: {e}")
+            return []
+
+    def get_geographic_sales_analysis(self) -> List[Dict]:
+        """Análisis geográfico de ventas por país y ciudad"""
+        try:
+            self.__load()
+            n_cities = len(self.__cities)
+            # JOIN (no LEFT JOIN): solo ventas con cliente, ciudad y país existentes
+            city_code = self.__follow(self.__customer_code, self.__customer_city)
+            city_code = np.where(self.__follow(city_code, self.__city_country) >= 0, city_code, -1)
+            stats = self.__aggregate(city_code, n_cities)
+
+            result = pd.DataFrame({
+                'CountryName': self.__lookup(self.__countries['CountryName'], self.__city_country),
+                'CityName': self.__cities['CityName'],
+                'total_sales': stats['count'],
+                'total_revenue': stats['revenue'],
+                'avg_sale_amount': stats['avg'],
+                'unique_customers': stats['customers'],
+                'products_sold': stats['products'],
+            })
+            result = result[stats['count'].to_numpy() > 0]
+            result = result.sort_values(['CountryName', 'total_revenue'], ascending=[True, False], kind='stable')
+            return _records(result)
+        except Exception as e:
+            self.logger.error(f"Error en análisis geográfico: {e}")
+            return []
+
+    def get_product_performance_analysis(self) -> List[Dict]:
+        """Análisis de rendimiento de productos"""
+        try:
+            self.__load()
+            stats = self.__aggregate(self.__product_code, len(self.__products))
+            units = stats['units'].to_numpy(dtype=float, na_value=np.nan)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                avg_selling_price = np.where(units > 0, self.__round(stats['revenue'].to_numpy() / units), np.nan)
+
+            result = pd.DataFrame({
+                'ProductID': self.__products['ProductID'],
+                'ProductName': self.__products['ProductName'],
+                'CategoryName': self.__lookup(self.__categories['CategoryName'], self.__product_category),
+                'product_class': self.__products['Class'],
+                'total_sales': stats['count'],
+                'total_units_sold': stats['units'],
+                'total_revenue': stats['revenue'],
+                'avg_sale_amount': stats['avg'],
+                'unique_customers': stats['customers'],
+                'current_price': pd.to_numeric(self.__products['Price'], errors='coerce'),
+                'avg_selling_price': avg_selling_price,
+            })
+            result = result.sort_values('total_revenue', ascending=False, na_position='last', kind='stable')
+            return _records(result)
+        except Exception as e:
+            self.logger.error(f"Error en análisis de productos: {e}")
+            return []
+
+    def get_customer_segmentation(self) -> List[Dict]:
+        """Segmentación de clientes basada en comportamiento de compra"""
+        try:
+            self.__load()
+            n_customers = len(self.__customers)
+            stats = self.__aggregate(self.__customer_code, n_customers)
+
+            # MAX(SalesDate) por cliente: fechas como días desde la época, NaT excluido
+            days = self.__sales_date.to_numpy(dtype='datetime64[D]').astype(np.int64)
+            valid = (self.__customer_code >= 0) & self.__has_sale & self.__sales_date.notna().to_numpy()
+            last_day = np.full(n_customers, np.iinfo(np.int64).min)
+            np.maximum.at(last_day, self.__customer_code[valid], days[valid])
+            has_date = last_day != np.iinfo(np.int64).min
+            last_day = np.where(has_date, last_day, 0)
+            last_purchase = pd.Series(
+                pd.to_datetime(last_day, unit='D').date, dtype=object
+            ).where(has_date, None)
+            today = np.datetime64(date.today(), 'D').astype(np.int64)
+            days_since = pd.Series(today - last_day).astype('Int64').where(has_date, pd.NA)
+
+            spent = stats['revenue'].fillna(0).to_numpy()
+            purchases = stats['count'].to_numpy()
+            city_code = self.__customer_city
+            result = pd.DataFrame({
+                'CustomerID': self.__customers['CustomerID'],
+                'customer_name': _full_name(self.__customers['FirstName'], self.__customers['LastName']),
+                'CityName': self.__lookup(self.__cities['CityName'], city_code),
+                'CountryName': self.__lookup(
+                    self.__countries['CountryName'], self.__follow(city_code, self.__city_country)
+                ),
+                'total_purchases': purchases,
+                'total_spent': stats['revenue'],
+                'avg_purchase_amount': stats['avg'],
+                'last_purchase_date': last_purchase,
+                'days_since_last_purchase': days_since,
+                'customer_segment': np.select(
+                    [spent >= 500, spent >= 200], ['High Value', 'Medium Value'], 'Low Value'
+                ),
+                'purchase_frequency': np.select(
+                    [purchases >= 10, purchases >= 5], ['Frequent', 'Regular'], 'Occasional'
+                ),
+            })
+            result = result.sort_values('total_spent', ascending=False, na_position='last', kind='stable')
+            return _records(result)
+        except Exception as e:
+            self.logger.error(f"Error en segmentación de clientes: {e}")
+            return []
+
+    def get_sales_trends_by_period(self, period: str = 'daily') -> List[Dict]:
+        """Análisis de tendencias de ventas por período"""
+        try:
+            if period == 'daily':
+                date_format = '%Y-%m-%d'
+            elif period == 'monthly':
+                date_format = '%Y-%m'
+            else:
+                raise ValueError("Período debe ser 'daily' o 'monthly'")
+            self.__load()
+
+            # Las ventas sin fecha forman su propio período (NULL), primero al ordenar
+            periods, labels = pd.factorize(self.__sales_date.dt.strftime(date_format), sort=True,
+                                           use_na_sentinel=False)
+            stats = self.__aggregate(periods, len(labels))
+            result = pd.DataFrame({
+                'period': pd.Series(labels, dtype=object),
+                'total_sales': stats['count'],
+                'total_revenue': stats['revenue'],
+                'avg_sale_amount': stats['avg'],
+                'total_units_sold': stats['units'],
+                'unique_customers': stats['customers'],
+            })
+            result = result[stats['count'].to_numpy() > 0]
+            result = result.sort_values('period', na_position='first', kind='stable')
+            return _records(result)
+        except Exception as e:
+            self.logger.error(f"Error en análisis de tendencias: {e}")
+            return []
+
+    def get_discount_effectiveness_analysis(self) -> List[Dict]:
+        """Análisis de efectividad de descuentos"""
+        try:
+            self.__load()
+            discount = self.__discount
+            # Igual que DISCOUNT_BAND_SQL: un descuento NULL no cumple ninguna condición y cae en la última banda
+            with np.errstate(invalid='ignore'):
+                conditions = [discount == 0] + [discount <= limit for limit, _ in DISCOUNT_RANGES]
+            labels = list(DISCOUNT_BANDS)
+            ranges = np.select(conditions, list(range(len(conditions))), len(conditions))
+            stats = self.__aggregate(ranges, len(labels))
+
+            result = pd.DataFrame({
+                'discount_range': labels,
+                'total_sales': stats['count'],
+                'avg_sale_amount': stats['avg'],
+                'total_revenue': stats['revenue'],
+                'avg_quantity': stats['avg_quantity'],
+                'unique_customers': stats['customers'],
+            })
+            return _records(result[stats['count'].to_numpy() > 0])
+        except Exception as e:
+            self.logger.error(f"Error en análisis de descuentos: {e}")
+            return []
@@ -0,0 +1,124 @@
+import pytest
+from src.database.bulk_loader import BulkLoader
+from src.database.schema import DATA_DIR, read_schema
+from src.database.sqlite_backend import SQLiteBackend
+
+CSV_FILES = {
+    "countries.csv": "CountryID,CountryName,CountryCode\n1,Argentina,AR\n2,Chile,CL\n",
+    "cities.csv": "CityID,CityName,Zipcode,CountryID\n1,Rosario,2000,1\n2,Santiago,8320000,2\n",
+    "categories.csv": "CategoryID,CategoryName\n1,Dairy\n",
+    "products.csv": ("ProductID,ProductName,Price,CategoryID,Class,ModifyDate,Resistant,IsAllergic,VitalityDays\n"
+                     "1,Milk,10.5,1,Low,2018-01-01 00:00:00.000,Unknown,False,7\n"),
+    "employees.csv": ("EmployeeID,FirstName,MiddleInitial,LastName,BirthDate,Gender,CityID,HireDate\n"
+                      "1,Nicole,T,Fuller,1981-03-07 00:00:00.000,F,1,2011-06-20 07:15:36.920\n"),
+}
+
+SALES_HEADER = "SalesID,SalesPersonID,CustomerID,ProductID,Quantity,Discount,TotalPrice,SalesDate,TransactionNumber\n"
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for name, content in CSV_FILES.items():
+        (tmp_path / name).write_text(content, encoding="utf-8")
+    rows = [f"{i},1,{i % 7 + 1},1,{i % 5 + 1},0,{i * 1.5},2018-01-{i % 28 + 1:02d} 10:00:00.000,TX{i}\n" for i in range(1, 251)]
+    rows.append("251,1,1,1,2,0,3,31:24.2,TX251\n")   # fecha inválida en columna NOT NULL
+    rows.append("252,1,1,1,abc,0,3,2018-01-01,TX252\n")  # cantidad inválida en columna NOT NULL
+    (tmp_path / "sales.csv").write_text(SALES_HEADER + "".join(rows), encoding="utf-8")
+    return str(tmp_path)
+
+@pytest.fixture
+def backend():
+    return SQLiteBackend(data_dir=None)
+
+def count(backend, table):
+    return backend.execute_query(f"SELECT COUNT(*) AS total FROM {table}")[0]["total"]
+
+def test_read_schema():
+    columns = {column.name: column for column in read_schema()["sales"]}
+    assert columns["SalesDate"].type == "DATE"
+    assert columns["SalesDate"].not_null
+    assert columns["Discount"].type == "DECIMAL"
+    assert not columns["Discount"].not_null
+
+def test_load_report(backend, data_dir):
+    report = BulkLoader(backend, chunk_size=40, batch_size=7).load(data_dir)
+    assert list(report) == ["countries", "cities", "categories", "products", "employees", "sales"]
+    assert report["sales"]["rows"] == 250
+    assert report["sales"]["rejected"] == 2
+    assert report["sales"]["invalid_values"] == 2
+    assert report["sales"]["rows_per_second"] > 0
+    assert count(backend, "sales") == 250
+
+def test_coerces_types(backend, data_dir):
+    BulkLoader(backend).load(data_dir)
+    product = backend.execute_query("SELECT * FROM products")[0]
+    assert product["Price"] == 10.5
+    assert product["ModifyDate"] == "2018-01-01"
+    assert product["Resistant"] is None
+    assert product["IsAllergic"] == 0
+    sale = backend.execute_query("SELECT * FROM sales WHERE SalesID = 1")[0]
+    assert sale["SalesDate"] == "2018-01-02"
+    assert sale["TotalPrice"] == 1.5
+
+def test_keep_invalid(backend, data_dir):
+    report = BulkLoader(backend, keep_invalid=True).load(data_dir)
+    # Solo la fecha inválida se rechaza: la cantidad inválida conserva su texto
+    assert report["sales"]["rejected"] == 1
+    assert backend.execute_query("SELECT Quantity FROM sales WHERE SalesID = 252")[0]["Quantity"] == "abc"
+    assert not backend.execute_query("SELECT SalesDate FROM sales WHERE SalesID = 251")
+
+@pytest.mark.parametrize("keep_invalid", [False, True])
+def test_date_fallback(backend, data_dir, keep_invalid):
+    report = BulkLoader(backend, keep_invalid=keep_invalid, date_fallback="2018-01-01").load(data_dir)
+    assert report["sales"]["rules"]["SalesDate:fallback"]["failed"] == 1
+    assert backend.execute_query("SELECT SalesDate FROM sales WHERE SalesID = 251")[0]["SalesDate"] == "2018-01-01"
+
+def test_bundled_data_sales_dates(backend, tmp_path):
+    """Los SalesDate del extracto de data/ solo traen minutos y segundos ('31:24.2') o están vacíos"""
+    report = BulkLoader(backend, quarantine_dir=str(tmp_path)).load(DATA_DIR)
+    assert report["sales"]["rows"] == 0
+    assert report["sales"]["rejected"] == 50_000
+    assert report["sales"]["rules"]["SalesDate:parse"]["failed"] == 49_501
+    assert report["sales"]["rules"]["SalesDate:not_null"]["failed"] == 50_000
+    reasons = (tmp_path / "sales.csv").read_text(encoding="utf-8").splitlines()[1:]
+    assert sum(line.endswith(",DATE_FRAGMENT:SalesDate") for line in reasons) == 49_501
+    assert sum(line.endswith(",MISSING_VALUE:SalesDate") for line in reasons) == 499
+
+    report = BulkLoader(backend, keep_invalid=True, date_fallback="2018-01-01").load(DATA_DIR, truncate=True)
+    assert report["sales"]["rows"] == 50_000
+    assert report["sales"]["rules"]["SalesDate:fallback"]["failed"] == 50_000
+    assert backend.execute_query("SELECT DISTINCT SalesDate FROM sales") == [{"SalesDate": "2018-01-01"}]
+
+def test_quarantine_file(backend, data_dir, tmp_path):
+    quarantine_dir = tmp_path / "quarantine"
+    report = BulkLoader(backend, chunk_size=40, quarantine_dir=str(quarantine_dir)).load(data_dir)
+    assert report["sales"]["rules"]["SalesDate:parse"]["failed"] == 1
+    assert report["sales"]["rules"]["Quantity:parse"]["failed"] == 1
+    lines = (quarantine_dir / "sales.csv").read_text(encoding="utf-8").splitlines()
+    assert lines[0].endswith(",reason_codes")
+    assert lines[1:] == ["251,1,1,1,2,0,3,31:24.2,TX251,DATE_FRAGMENT:SalesDate",
+                         "252,1,1,1,abc,0,3,2018-01-01,TX252,INVALID_INT:Quantity"]
+    assert not (quarantine_dir / "products.csv").exists()
+
+def test_chunk_size_does_not_change_result(data_dir):
+    results = []
+    for chunk_size in (1, 13, 10_000):
+        backend = SQLiteBackend(data_dir=None)
+        BulkLoader(backend, chunk_size=chunk_size, workers=2).load(data_dir)
+        results.append(backend.execute_query("SELECT SUM(TotalPrice) AS revenue, COUNT(*) AS total FROM sales")[0])
+    assert results[0] == results[1] == results[2]
+
+def test_truncate_reload(backend, data_dir):
+    loader = BulkLoader(backend)
+    loader.load(data_dir)
+    loader.load(data_dir, truncate=True)
+    assert count(backend, "sales") == 250
+    assert count(backend, "countries") == 2
+
+def test_missing_files_are_skipped(backend, tmp_path):
+    (tmp_path / "categories.csv").write_text(CSV_FILES["categories.csv"], encoding="utf-8")
+    report = BulkLoader(backend).load(str(tmp_path))
+    assert list(report) == ["categories"]
+
+def test_invalid_parameters(backend):
+    with pytest.raises(ValueError):
+        BulkLoader(backend, chunk_size=0)
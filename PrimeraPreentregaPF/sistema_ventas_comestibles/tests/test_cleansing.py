@@ -0,0 +1,103 @@
+import pandas as pd
+import pytest
+from src.database.cleansing import DataCleanser
+
+def frame(header, *rows):
+    return pd.DataFrame([row.split(",") for row in rows], columns=header.split(","), dtype=str)
+
+PRODUCTS = "ProductID,ProductName,Price,CategoryID,Class,ModifyDate,Resistant,IsAllergic,VitalityDays"
+SALES = "SalesID,SalesPersonID,CustomerID,ProductID,Quantity,Discount,TotalPrice,SalesDate,TransactionNumber"
+
+@pytest.fixture
+def cleanser():
+    return DataCleanser()
+
+def test_domain_mapping_and_dates(cleanser):
+    rows, columns, quarantine = cleanser.clean("products", frame(
+        PRODUCTS,
+        "1,Milk,10.5,1,Low,2018-01-01 00:00:00.000,Durable,TRUE,7",
+        "2,Cheese,20,1,High,21:49.2,Unknown,FALSE,",
+        "3,Bread,3,1,Medium,2018-02-30,Weak,Unknown,2.5",
+    ))
+    products = [dict(zip(columns, row)) for row in rows]
+    assert [(p["Resistant"], p["IsAllergic"]) for p in products] == [(1, 1), (None, 0), (0, None)]
+    assert [p["ModifyDate"] for p in products] == ["2018-01-01", None, None]
+    assert products[2]["VitalityDays"] is None
+    assert type(products[0]["ProductID"]) is int and type(products[0]["Price"]) is float
+    assert quarantine.empty
+    stats = cleanser.stats("products")
+    assert stats["invalid_values"] == 3
+    assert stats["rules"]["ModifyDate:parse"]["failed"] == 2
+    assert stats["rules"]["Resistant:domain"]["failed"] == 0
+
+def test_not_null_failures_are_quarantined_with_reasons(cleanser):
+    rows, _, quarantine = cleanser.clean("sales", frame(
+        SALES,
+        "1,1,1,1,2,0,3,2018-01-01,TX1",
+        "2,1,1,1,2,0,3,31:24.2,TX2",
+        "3,1,1,1,abc,0,3,,TX3",
+        "4,1,1,1,2,0,3,hoy,TX4",
+    ))
+    assert len(rows) == 1
+    assert list(quarantine["SalesID"]) == ["2", "3", "4"]
+    assert list(quarantine["reason_codes"]) == [
+        "DATE_FRAGMENT:SalesDate",
+        "INVALID_INT:Quantity;MISSING_VALUE:SalesDate",
+        "INVALID_DATE:SalesDate",
+    ]
+    assert cleanser.stats("sales")["quarantined"] == 3
+
+def test_foreign_keys_checked_against_accepted_keys(cleanser):
+    cleanser.clean("categories", frame("CategoryID,CategoryName", "1,Dairy", "x,Broken"))
+    rows, _, quarantine = cleanser.clean("products", frame(
+        PRODUCTS,
+        "1,Milk,10.5,1,Low,2018-01-01,Weak,FALSE,7",
+        "2,Cheese,20,2,High,2018-01-01,Weak,FALSE,7",
+    ))
+    assert [row[0] for row in rows] == [1]
+    assert list(quarantine["reason_codes"]) == ["MISSING_FK:CategoryID"]
+    assert cleanser.stats("products")["rules"]["CategoryID:fk"]["failed"] == 1
+
+def test_foreign_key_rule_skipped_without_dimension(cleanser):
+    rows, _, _ = cleanser.clean("sales", frame(SALES, "1,1,99,1,2,0,3,2018-01-01,TX1"))
+    assert len(rows) == 1
+    assert cleanser.stats("sales")["rules"]["CustomerID:fk"]["skipped"]
+
+def test_keep_invalid_keeps_raw_text():
+    cleanser = DataCleanser(keep_invalid=True)
+    cleanser.clean("employees", frame("EmployeeID,FirstName,LastName,Gender,CityID", "1,Ana,Gomez,X,1"))
+    rows, columns, quarantine = cleanser.clean("sales", frame(
+        SALES, "1,2,1,1,abc,0,3,2018-01-01,TX1", "2,1,1,1,2,0,3,31:24.2,TX2"
+    ))
+    sale = dict(zip(columns, rows[0]))
+    assert sale["Quantity"] == "abc"
+    # Una columna DATE no guarda texto que no sea una fecha: sin fallback la fila se rechaza igual
+    assert list(quarantine["reason_codes"]) == ["DATE_FRAGMENT:SalesDate"]
+    assert cleanser.stats("sales")["rules"]["SalesPersonID:fk"]["failed"] == 1
+    assert cleanser.stats("employees")["rules"]["Gender:domain"]["failed"] == 1
+
+def test_date_fallback_imputes_not_null_dates():
+    cleanser = DataCleanser(date_fallback="2018-01-01")
+    rows, columns, quarantine = cleanser.clean("sales", frame(
+        SALES, "1,1,1,1,2,0,3,2018-02-03,TX1", "2,1,1,1,2,0,3,31:24.2,TX2", "3,1,1,1,2,0,3,,TX3"
+    ))
+    assert [dict(zip(columns, row))["SalesDate"] for row in rows] == ["2018-02-03", "2018-01-01", "2018-01-01"]
+    assert quarantine.empty
+    rules = cleanser.stats("sales")["rules"]
+    assert rules["SalesDate:parse"]["failed"] == 1
+    assert rules["SalesDate:fallback"]["failed"] == 2
+    assert rules["SalesDate:not_null"]["failed"] == 0
+    # Las columnas DATE que admiten NULL no toman la fecha
+    products, columns, _ = cleanser.clean("products", frame(PRODUCTS, "1,Milk,10.5,1,Low,21:49.2,Weak,FALSE,7"))
+    assert dict(zip(columns, products[0]))["ModifyDate"] is None
+
+def test_invalid_date_fallback():
+    with pytest.raises(ValueError):
+        DataCleanser(date_fallback="31:24.2")
+
+def test_reset_clears_keys_and_stats(cleanser):
+    cleanser.clean("categories", frame("CategoryID,CategoryName", "1,Dairy"))
+    cleanser.reset("categories")
+    assert cleanser.stats("categories")["rows"] == 0
+    _, _, quarantine = cleanser.clean("products", frame(PRODUCTS, "1,Milk,10.5,1,Low,2018-01-01,Weak,FALSE,7"))
+    assert list(quarantine["reason_codes"]) == ["MISSING_FK:CategoryID"]
@@ -0,0 +1,201 @@
+import pytest
+import threading
+import time
+from src.database.connection_pool import ConnectionPool, PoolClosedError, PoolTimeoutError
+from src.database.mysql_backend import MySQLBackend
+
+class FakeConnection:
+    """Conexión de prueba que registra si se cerró"""
+
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+class BrokenConnectionError(Exception):
+    pass
+
+class TestConnectionPool:
+    """Pruebas unitarias para la clase ConnectionPool"""
+
+    def setup_method(self):
+        self.opened = []
+        self.health_checks = []
+
+    def factory(self):
+        connection = FakeConnection(len(self.opened) + 1)
+        self.opened.append(connection)
+        return connection
+
+    def healthy(self, connection):
+        self.health_checks.append(connection)
+        return True
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            ConnectionPool(self.factory, size=0)
+
+    def test_reuses_connection(self):
+        pool = ConnectionPool(self.factory, size=2)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        assert first is second
+        assert len(self.opened) == 1
+
+    def test_opens_up_to_size(self):
+        pool = ConnectionPool(self.factory, size=2)
+        first = pool.acquire()
+        second = pool.acquire()
+        assert first is not second
+        assert pool.stats()["in_use"] == 2
+        pool.release(first)
+        pool.release(second)
+        assert pool.stats()["idle"] == 2
+
+    def test_checkout_timeout(self):
+        pool = ConnectionPool(self.factory, size=1, checkout_timeout=0.05)
+        connection = pool.acquire()
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire()
+        assert pool.stats()["timeouts"] == 1
+        pool.release(connection)
+
+    def test_waits_for_released_connection(self):
+        pool = ConnectionPool(self.factory, size=1, checkout_timeout=5)
+        connection = pool.acquire()
+        releaser = threading.Timer(0.05, pool.release, args=(connection,))
+        releaser.start()
+        assert pool.acquire() is connection
+        releaser.join()
+        stats = pool.stats()
+        assert stats["waited_checkouts"] == 1
+        assert stats["max_wait_ms"] > 0
+
+    def test_health_check_only_after_idle_timeout(self):
+        pool = ConnectionPool(self.factory, size=1, idle_timeout=0.05, health_check=self.healthy)
+        with pool.connection():
+            pass
+        with pool.connection():
+            pass
+        assert self.health_checks == []
+        time.sleep(0.06)
+        with pool.connection():
+            pass
+        assert len(self.health_checks) == 1
+
+    def test_unhealthy_connection_is_replaced(self):
+        pool = ConnectionPool(self.factory, size=1, idle_timeout=0, health_check=lambda c: False)
+        with pool.connection() as first:
+            pass
+        time.sleep(0.001)
+        with pool.connection() as second:
+            pass
+        assert first.closed
+        assert second is not first
+        assert pool.stats()["reconnects"] == 1
+
+    def test_broken_connection_is_discarded(self):
+        pool = ConnectionPool(self.factory, size=1, broken_errors=(BrokenConnectionError,))
+        with pytest.raises(BrokenConnectionError):
+            with pool.connection() as first:
+                raise BrokenConnectionError()
+        assert first.closed
+        with pool.connection() as second:
+            assert second is not first
+
+    def test_other_errors_keep_connection(self):
+        pool = ConnectionPool(self.factory, size=1, broken_errors=(BrokenConnectionError,))
+        with pytest.raises(ValueError):
+            with pool.connection() as first:
+                raise ValueError()
+        with pool.connection() as second:
+            assert second is first
+
+    def test_failed_open_frees_slot(self):
+        attempts = []
+
+        def failing_factory():
+            attempts.append(1)
+            raise BrokenConnectionError()
+
+        pool = ConnectionPool(failing_factory, size=1, checkout_timeout=0)
+        for _ in range(2):
+            with pytest.raises(BrokenConnectionError):
+                pool.acquire()
+        assert len(attempts) == 2
+        assert pool.stats()["open"] == 0
+
+    def test_close_all(self):
+        pool = ConnectionPool(self.factory, size=2)
+        with pool.connection() as connection:
+            pass
+        pool.close_all()
+        assert connection.closed
+        assert pool.stats()["open"] == 0
+
+    def test_close_all_with_connection_in_use(self):
+        pool = ConnectionPool(self.factory, size=2)
+        idle = pool.acquire()
+        in_use = pool.acquire()
+        pool.release(idle)
+        pool.close_all()
+        assert idle.closed
+        assert not in_use.closed
+        pool.release(in_use)
+        assert in_use.closed
+        assert pool.stats()["open"] == 0
+        assert pool.stats()["idle"] == 0
+
+    def test_acquire_after_close_all(self):
+        pool = ConnectionPool(self.factory, size=1)
+        pool.close_all()
+        with pytest.raises(PoolClosedError):
+            pool.acquire()
+        assert self.opened == []
+
+    def test_close_all_wakes_waiters(self):
+        pool = ConnectionPool(self.factory, size=1, checkout_timeout=5)
+        connection = pool.acquire()
+        closer = threading.Timer(0.05, pool.close_all)
+        closer.start()
+        with pytest.raises(PoolClosedError):
+            pool.acquire()
+        closer.join()
+        pool.release(connection)
+        assert connection.closed
+
+class FakeMySQLBackend(MySQLBackend):
+    """MySQLBackend que abre conexiones de prueba en lugar de conectarse a un servidor"""
+
+    def __init__(self):
+        super().__init__(pool_size=2)
+        self.opened = []
+
+    def _create_connection(self):
+        connection = FakeConnection(len(self.opened) + 1)
+        self.opened.append(connection)
+        return connection
+
+class TestMySQLBackendDisconnect:
+    """Pruebas de MySQLBackend.disconnect con conexiones en uso"""
+
+    def test_disconnect_while_connection_checked_out(self):
+        backend = FakeMySQLBackend()
+        with backend.connection() as connection:
+            backend.disconnect()
+            assert not connection.closed
+        assert connection.closed
+
+    def test_reconnects_after_disconnect(self):
+        backend = FakeMySQLBackend()
+        with backend.connection() as first:
+            pass
+        backend.disconnect()
+        assert first.closed
+        with backend.connection() as second:
+            assert second is not first
+            assert not second.closed
@@ -0,0 +1,142 @@
+import pytest
+import random
+from datetime import date, datetime
+from src.database.connection import DatabaseConnection
+from src.database.sqlite_backend import SQLiteBackend
+from src.services.analytics_service import AnalyticsService
+from src.services.in_memory_analytics_service import InMemoryAnalyticsService
+
+def build_csv_files(seed=7):
+    """Datos sintéticos con casos borde: empleados, clientes y productos sin ventas,
+    clientes sin ciudad, ventas de clientes inexistentes y descuentos en los límites"""
+    rng = random.Random(seed)
+    files = {
+        "countries.csv": ["CountryID,CountryName,CountryCode"] + [f"{i},Country {i},C{i}" for i in range(1, 5)],
+        "cities.csv": ["CityID,CityName,Zipcode,CountryID"] + [f"{i},City {i},{1000 + i},{(i % 4) + 1}" for i in range(1, 9)],
+        "categories.csv": ["CategoryID,CategoryName"] + [f"{i},Category {i}" for i in range(1, 4)],
+        "products.csv": ["ProductID,ProductName,Price,CategoryID,Class,ModifyDate,Resistant,IsAllergic,VitalityDays"]
+            + [f"{i},Product {i},{rng.randint(100, 9999) / 100},{(i % 4) + 1},Medium,,Unknown,False,0" for i in range(1, 21)],
+        "customers.csv": ["CustomerID,FirstName,MiddleInitial,LastName,CityID,Address"]
+            + [f"{i},Name{i},,Last{i},{99 if i == 30 else (i % 8) + 1},Street {i}" for i in range(1, 31)],
+        "employees.csv": ["EmployeeID,FirstName,MiddleInitial,LastName,BirthDate,Gender,CityID,HireDate"]
+            + [f"{i},Emp{i},A,Surname{i},1980-01-01,F,1,2010-01-01" for i in range(1, 8)],
+    }
+    discounts = ["0", "0.05", "0.1", "0.15", "0.2", "0.25", "0.03", "0.12"]
+    sales = ["SalesID,SalesPersonID,CustomerID,ProductID,Quantity,Discount,TotalPrice,SalesDate,TransactionNumber"]
+    for sales_id in range(1, 601):
+        quantity = rng.randint(1, 25)
+        sales.append(",".join(str(value) for value in (
+            sales_id,
+            rng.randint(1, 6),                  # el empleado 7 no tiene ventas
+            rng.choice(range(1, 29)) if sales_id % 50 else 40,  # 29 sin ventas, 40 no existe
+            rng.randint(1, 19),                 # el producto 20 no tiene ventas
+            quantity,
+            rng.choice(discounts),
+            round(quantity * rng.randint(50, 5000) / 100, 2),
+            f"2018-{rng.randint(1, 5):02d}-{rng.randint(1, 28):02d} 10:00:00.000",
+            f"TX{sales_id}",
+        )))
+    files["sales.csv"] = sales
+    return {name: "\n".join(lines) + "\n" for name, lines in files.items()}
+
+@pytest.fixture(scope="module")
+def services(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp("data")
+    for name, content in build_csv_files().items():
+        (data_dir / name).write_text(content, encoding="utf-8")
+    DatabaseConnection.use_backend(SQLiteBackend(data_dir=str(data_dir)))
+    yield AnalyticsService(), InMemoryAnalyticsService()
+    DatabaseConnection.use_backend(None)
+
+def normalize(rows):
+    """Fechas como texto ISO y números con tolerancia para comparar ambos motores"""
+    normalized = []
+    for row in rows:
+        values = {}
+        for key, value in row.items():
+            if isinstance(value, date):
+                value = value.isoformat()
+            elif isinstance(value, float):
+                value = pytest.approx(value, rel=1e-9, abs=1e-9)
+            values[key] = value
+        normalized.append(values)
+    return normalized
+
+def assert_parity(sql_rows, memory_rows, key, order_by):
+    assert sql_rows, "el reporte SQL no devolvió filas"
+    assert [list(row) for row in memory_rows] == [list(row) for row in sql_rows]
+    # Mismo orden según la clave del ORDER BY (los empates pueden salir en cualquier orden)
+    assert normalize([{column: row[column] for column in order_by} for row in memory_rows]) == \
+        [{column: row[column] for column in order_by} for row in sql_rows]
+    by_key = lambda row: tuple(row[column] for column in key)
+    assert normalize(sorted(memory_rows, key=by_key)) == sorted(sql_rows, key=by_key)
+
+def test_employee_performance_parity(services):
+    sql, memory = services
+    assert_parity(sql.get_sales_performance_by_employee(), memory.get_sales_performance_by_employee(),
+                  key=["EmployeeID"], order_by=["total_revenue"])
+
+def test_employee_performance_date_range_parity(services):
+    sql, memory = services
+    start, end = datetime(2018, 2, 1), datetime(2018, 3, 15)
+    assert_parity(sql.get_sales_performance_by_employee(start, end),
+                  memory.get_sales_performance_by_employee(start, end),
+                  key=["EmployeeID"], order_by=["total_revenue"])
+
+def test_employee_without_sales(services):
+    _, memory = services
+    employee = next(row for row in memory.get_sales_performance_by_employee() if row["EmployeeID"] == 7)
+    assert employee["total_sales"] == 0
+    assert employee["total_revenue"] is None
+
+def test_geographic_parity(services):
+    sql, memory = services
+    assert_parity(sql.get_geographic_sales_analysis(), memory.get_geographic_sales_analysis(),
+                  key=["CityName"], order_by=["CountryName", "total_revenue"])
+
+def test_product_performance_parity(services):
+    sql, memory = services
+    assert_parity(sql.get_product_performance_analysis(), memory.get_product_performance_analysis(),
+                  key=["ProductID"], order_by=["total_revenue"])
+
+def test_customer_segmentation_parity(services):
+    sql, memory = services
+    memory_rows = memory.get_customer_segmentation()
+    assert_parity(sql.get_customer_segmentation(), memory_rows,
+                  key=["CustomerID"], order_by=["total_spent"])
+    assert isinstance(memory_rows[0]["last_purchase_date"], date)
+
+def test_sales_trends_parity(services):
+    sql, memory = services
+    for period in ("daily", "monthly"):
+        assert_parity(sql.get_sales_trends_by_period(period), memory.get_sales_trends_by_period(period),
+                      key=["period"], order_by=["period"])
+
+def test_invalid_trend_period_returns_empty(services):
+    _, memory = services
+    assert memory.get_sales_trends_by_period("yearly") == []
+
+def test_discount_effectiveness_parity(services):
+    sql, memory = services
+    assert_parity(sql.get_discount_effectiveness_analysis(), memory.get_discount_effectiveness_analysis(),
+                  key=["discount_range"], order_by=["discount_range"])
+
+def test_reports_from_dataframes():
+    import pandas as pd
+    tables = {
+        "sales": pd.DataFrame({"SalesID": [1, 2], "SalesPersonID": [1, 1], "CustomerID": [1, 2], "ProductID": [1, 1],
+                               "Quantity": [2, 3], "Discount": [0, 0.1], "TotalPrice": [10.0, 15.0],
+                               "SalesDate": ["2018-01-01", "2018-02-01"]}),
+        "employees": pd.DataFrame({"EmployeeID": [1], "FirstName": ["Ana"], "LastName": ["Diaz"]}),
+        "customers": pd.DataFrame({"CustomerID": [1, 2], "FirstName": ["A", "B"], "LastName": ["X", "Y"], "CityID": [1, 1]}),
+        "products": pd.DataFrame({"ProductID": [1], "ProductName": ["Milk"], "Price": [5.0], "CategoryID": [1], "Class": ["Low"]}),
+        "categories": pd.DataFrame({"CategoryID": [1], "CategoryName": ["Dairy"]}),
+        "cities": pd.DataFrame({"CityID": [1], "CityName": ["Rosario"], "CountryID": [1]}),
+        "countries": pd.DataFrame({"CountryID": [1], "CountryName": ["Argentina"]}),
+    }
+    service = InMemoryAnalyticsService(tables)
+    assert service.get_sales_performance_by_employee() == [{
+        "EmployeeID": 1, "employee_name": "Ana Diaz", "total_sales": 2, "total_revenue": 25.0,
+        "avg_sale_amount": 12.5, "total_units_sold": 5, "unique_customers_served": 2, "revenue_rank": 1,
+    }]
+    assert [row["period"] for row in service.get_sales_trends_by_period("monthly")] == ["2018-01", "2018-02"]
@@ -0,0 +1,128 @@
+import pytest
+from datetime import datetime
+from src.database.bulk_loader import BulkLoader
+from src.database.connection import DatabaseConnection
+from src.database.rollups import ROLLUP_TABLES, rebuild_rollups
+from src.database.sqlite_backend import SQLiteBackend
+from src.models.customer import Customer
+from src.models.sale import Sale
+from src.services.analytics_service import AnalyticsService
+from tests.test_sqlite_backend import CSV_FILES, DATE_FALLBACK
+
+@pytest.fixture
+def backend(tmp_path):
+    for name, content in CSV_FILES.items():
+        (tmp_path / name).write_text(content, encoding="utf-8")
+    backend = SQLiteBackend(data_dir=str(tmp_path), date_fallback=DATE_FALLBACK)
+    DatabaseConnection.use_backend(backend)
+    yield backend
+    DatabaseConnection.use_backend(None)
+
+def snapshot(backend, tables=ROLLUP_TABLES):
+    return {table: sorted(tuple(row.values()) for row in backend.execute_query(f"SELECT * FROM {table}"))
+            for table in tables}
+
+def test_bulk_loader_populates_rollups(backend):
+    rows = backend.execute_query("SELECT * FROM daily_product_sales ORDER BY SalesDate, ProductID")
+    assert [(r["SalesDate"], r["ProductID"], r["sales_count"], r["total_revenue"], r["total_units"]) for r in rows] == [
+        ("2018-01-05", 1, 1, 21.0, 2), ("2018-01-20", 2, 1, 18.0, 1), ("2018-02-03", 2, 1, 48.0, 3), (DATE_FALLBACK, 1, 1, 10.5, 1)
+    ]
+    bands = backend.execute_query("SELECT SalesDate, DiscountBand, sales_count, total_revenue FROM daily_discount_sales "
+                                  "ORDER BY SalesDate")
+    assert [(r["SalesDate"], r["DiscountBand"], r["sales_count"], r["total_revenue"]) for r in bands] == [
+        ("2018-01-05", 0, 1, 21.0), ("2018-01-20", 2, 1, 18.0), ("2018-02-03", 4, 1, 48.0), (DATE_FALLBACK, 0, 1, 10.5)
+    ]
+    customers = backend.execute_query("SELECT DiscountBand, COUNT(DISTINCT CustomerID) AS total FROM daily_customer_sales "
+                                      "GROUP BY DiscountBand ORDER BY DiscountBand")
+    assert [(r["DiscountBand"], r["total"]) for r in customers] == [(0, 2), (2, 1), (4, 1)]
+    cities = backend.execute_query("SELECT CityID, SUM(total_revenue) AS revenue FROM daily_city_sales GROUP BY CityID")
+    assert sorted((r["CityID"], r["revenue"]) for r in cities) == [(1, 69.0), (2, 28.5)]
+
+def test_loader_without_rollups(tmp_path):
+    (tmp_path / "sales.csv").write_text(CSV_FILES["sales.csv"], encoding="utf-8")
+    backend = SQLiteBackend(data_dir=None)
+    BulkLoader(backend, rollups=False).load(str(tmp_path))
+    assert all(not rows for rows in snapshot(backend).values())
+
+def test_save_updates_rollups_incrementally(backend):
+    for day, discount in ((5, 0), (5, 0), (6, 0.12), (7, 0.3)):
+        Sale(None, 1, 2, 1, 2, discount, 15.0, datetime(2018, 1, day), "TX").save()
+    incremental = snapshot(backend)
+    rebuild_rollups(backend)
+    assert snapshot(backend) == incremental
+    row = backend.execute_query("SELECT * FROM daily_customer_sales WHERE SalesDate = '2018-01-05' AND CustomerID = 2")[0]
+    assert (row["DiscountBand"], row["sales_count"], row["total_revenue"], row["total_units"]) == (0, 2, 30.0, 4)
+
+def test_sales_summary_matches_sales_table(backend):
+    Sale(None, 2, 1, 2, 4, 0.05, 40.0, datetime(2018, 1, 20), "TX5").save()
+    expected = backend.execute_query("""
+        SELECT COUNT(*) AS total_sales, SUM(TotalPrice) AS total_revenue, AVG(TotalPrice) AS avg_sale,
+               SUM(Quantity) AS total_units_sold, COUNT(DISTINCT CustomerID) AS unique_customers
+        FROM sales WHERE SalesDate BETWEEN %s AND %s
+    """, (datetime(2018, 1, 1), datetime(2018, 1, 31)))[0]
+    assert Sale.get_sales_summary(datetime(2018, 1, 1), datetime(2018, 1, 31)) == expected
+    assert Sale.get_sales_summary()["total_sales"] == 5
+    assert Sale.get_sales_summary(datetime(2019, 1, 1), datetime(2019, 1, 31))["total_sales"] == 0
+
+def test_rebuild_date_range(backend):
+    before = snapshot(backend)
+    backend.execute_update("UPDATE daily_employee_sales SET sales_count = 99")
+    counts = rebuild_rollups(backend, datetime(2018, 1, 1), datetime(2018, 2, 28))
+    assert counts["daily_employee_sales"] == 3
+    # El día fuera del rango conserva el valor alterado
+    assert backend.execute_query("SELECT sales_count FROM daily_employee_sales WHERE SalesDate = %s",
+                                 (DATE_FALLBACK,))[0]["sales_count"] == 99
+    rebuild_rollups(backend)
+    assert snapshot(backend) == before
+
+def test_reports_read_rollups(backend):
+    backend.execute_update("UPDATE daily_discount_sales SET sales_count = sales_count * 10")
+    service = AnalyticsService()
+    assert service.generate_executive_dashboard()["general_metrics"]["total_sales"] == 40
+    assert service.generate_executive_dashboard()["general_metrics"]["unique_customers"] == 2
+    assert sum(row["total_sales"] for row in service.get_discount_effectiveness_analysis()) == 40
+    # El rendimiento por empleado cuenta clientes distintos y sigue leyendo sales
+    assert sum(row["total_sales"] for row in service.get_sales_performance_by_employee()) == 4
+
+def test_save_is_atomic_with_rollups(backend):
+    before = snapshot(backend)
+    backend.execute_update("DROP TABLE daily_customer_sales")
+    with pytest.raises(Exception):
+        Sale(None, 1, 2, 1, 2, 0, 15.0, datetime(2018, 1, 5), "TX").save()
+    # Ni la venta ni los resúmenes que ya se habían sumado quedan confirmados
+    assert backend.execute_query("SELECT COUNT(*) AS total FROM sales")[0]["total"] == 4
+    before.pop("daily_customer_sales")
+    assert snapshot(backend, before) == before
+
+def test_rebuild_date_range_is_atomic(backend):
+    backend.execute_update("UPDATE daily_employee_sales SET sales_count = 99")
+    backend.execute_update("DROP TABLE daily_customer_sales")
+    with pytest.raises(Exception):
+        rebuild_rollups(backend, datetime(2018, 1, 1), datetime(2018, 2, 28))
+    rows = backend.execute_query("SELECT sales_count FROM daily_employee_sales")
+    assert [row["sales_count"] for row in rows] == [99] * 4
+
+def test_customer_city_change_moves_city_sales(backend):
+    customer = Customer.find_by_id(1)
+    customer.city_id = 2
+    customer.save()
+    live = backend.execute_query("""
+        SELECT co.CountryName, SUM(s.TotalPrice) AS revenue
+        FROM sales s
+        JOIN customers cu ON s.CustomerID = cu.CustomerID
+        JOIN cities ci ON cu.CityID = ci.CityID
+        JOIN countries co ON ci.CountryID = co.CountryID
+        GROUP BY co.CountryID, co.CountryName
+    """)
+    dashboard = AnalyticsService().generate_executive_dashboard()["sales_by_country"]
+    assert dashboard == live == [{"CountryName": "Chile", "revenue": 97.5}]
+    incremental = snapshot(backend)
+    rebuild_rollups(backend)
+    assert snapshot(backend) == incremental
+
+def test_customer_save_without_city_change_keeps_city_sales(backend):
+    before = snapshot(backend)
+    customer = Customer.find_by_id(2)
+    customer.address = "Calle 3"
+    customer.save()
+    assert snapshot(backend) == before
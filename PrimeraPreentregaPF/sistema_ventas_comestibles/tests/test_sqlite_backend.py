@@ -0,0 +1,166 @@
+import pytest
+from datetime import datetime
+from src.database.connection import DatabaseConnection
+from src.database.dialect import to_sqlite, translate_ddl
+from src.database.sqlite_backend import SQLiteBackend
+from src.models.sale import Sale
+from src.services.analytics_service import AnalyticsService
+
+CSV_FILES = {
+    "countries.csv": "CountryID,CountryName,CountryCode\n1,Argentina,AR\n2,Chile,CL\n",
+    "cities.csv": "CityID,CityName,Zipcode,CountryID\n1,Rosario,2000,1\n2,Santiago,8320000,2\n",
+    "categories.csv": "CategoryID,CategoryName\n1,Dairy\n",
+    "products.csv": ("ProductID,ProductName,Price,CategoryID,Class,ModifyDate,Resistant,IsAllergic,VitalityDays\n"
+                     "1,Milk,10.5,1,Low,2018-01-01 00:00:00.000,Unknown,False,7\n"
+                     "2,Cheese,20,1,High,21:49.2,Durable,True,30\n"),
+    "customers.csv": ("CustomerID,FirstName,MiddleInitial,LastName,CityID,Address\n"
+                      "1,Ana,M,Gomez,1,Calle 1\n2,Luis,,Perez,2,Calle 2\n"),
+    "employees.csv": ("EmployeeID,FirstName,MiddleInitial,LastName,BirthDate,Gender,CityID,HireDate\n"
+                      "1,Nicole,T,Fuller,1981-03-07 00:00:00.000,F,1,2011-06-20 07:15:36.920\n"
+                      "2,Pablo,R,Diaz,1975-05-02 00:00:00.000,M,2,2012-01-10 00:00:00.000\n"),
+    "sales.csv": ("SalesID,SalesPersonID,CustomerID,ProductID,Quantity,Discount,TotalPrice,SalesDate,TransactionNumber\n"
+                  "1,1,1,1,2,0,21,2018-01-05 10:00:00.000,TX1\n"
+                  "2,1,2,2,1,0.1,18,2018-01-20 11:00:00.000,TX2\n"
+                  "3,2,1,2,3,0.2,48,2018-02-03 12:00:00.000,TX3\n"
+                  "4,2,2,1,1,0,10.5,31:24.2,TX4\n"),
+}
+# Fecha que toma la venta 4, cuyo SalesDate solo trae minutos y segundos
+DATE_FALLBACK = "2018-03-31"
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for name, content in CSV_FILES.items():
+        (tmp_path / name).write_text(content, encoding="utf-8")
+    return str(tmp_path)
+
+@pytest.fixture
+def backend(data_dir):
+    backend = SQLiteBackend(data_dir=data_dir, date_fallback=DATE_FALLBACK)
+    DatabaseConnection.use_backend(backend)
+    yield backend
+    DatabaseConnection.use_backend(None)
+
+class TestDialect:
+    """Pruebas unitarias para la traducción de MySQL a SQLite"""
+
+    def test_placeholders(self):
+        assert to_sqlite("SELECT * FROM sales WHERE SalesID = %s") == "SELECT * FROM sales WHERE SalesID = ?"
+
+    def test_placeholders_inside_literals_untouched(self):
+        assert to_sqlite("SELECT 'a %s b' FROM t WHERE x = %s") == "SELECT 'a %s b' FROM t WHERE x = ?"
+
+    def test_double_quoted_literal(self):
+        assert to_sqlite('SELECT "it\'s"') == "SELECT 'it''s'"
+
+    def test_concat(self):
+        assert to_sqlite("SELECT CONCAT(a, ' ', b) FROM t") == "SELECT (a || ' ' || b) FROM t"
+
+    def test_date_format(self):
+        query = to_sqlite('SELECT DATE_FORMAT(s.SalesDate, "%Y-%m") FROM sales s')
+        assert query == "SELECT strftime('%Y-%m', s.SalesDate) FROM sales s"
+
+    def test_date_format_unsupported_specifier(self):
+        with pytest.raises(ValueError):
+            to_sqlite("SELECT DATE_FORMAT(d, '%M %Y') FROM t")
+
+    def test_nested_datediff(self):
+        query = to_sqlite("SELECT DATEDIFF(CURDATE(), MAX(d)) FROM t")
+        assert query == ("SELECT CAST(julianday(date(date('now', 'localtime'))) - "
+                         "julianday(date(MAX(d))) AS INTEGER) FROM t")
+
+    def test_upsert(self):
+        query = to_sqlite("INSERT INTO t (k, n) SELECT s.k, 1 FROM s WHERE s.id = %s "
+                          "ON DUPLICATE KEY UPDATE n = n + VALUES(n)")
+        assert query == ("INSERT INTO t (k, n) SELECT s.k, 1 FROM s WHERE s.id = ? "
+                         "ON CONFLICT DO UPDATE SET n = n + excluded.n")
+
+    def test_translate_ddl(self):
+        statements = translate_ddl("""
+            CREATE DATABASE IF NOT EXISTS db;
+            USE db;
+            -- Comentario
+            CREATE TABLE t (id INT PRIMARY KEY AUTO_INCREMENT, g ENUM('M', 'F'), price DECIMAL(10,2));
+            CREATE INDEX idx_t ON t(g);
+        """)
+        assert statements == [
+            "CREATE TABLE t (id INTEGER PRIMARY KEY, g TEXT, price REAL)",
+            "CREATE INDEX IF NOT EXISTS idx_t ON t(g)",
+        ]
+
+class TestSQLiteBackend:
+    """Pruebas del backend embebido con los reportes existentes"""
+
+    def test_load_csv(self, backend):
+        stats = backend.load_stats()
+        assert stats["sales"] == {"rows": 4, "rejected": 0, "invalid_values": 1}
+        # Resistant e IsAllergic se traducen con su dominio; solo ModifyDate es inválida
+        assert stats["products"]["invalid_values"] == 1
+        products = backend.execute_query("SELECT ProductID, Resistant, IsAllergic FROM products ORDER BY ProductID")
+        assert [(row["Resistant"], row["IsAllergic"]) for row in products] == [(None, 0), (1, 1)]
+
+    def test_invalid_date_takes_fallback(self, backend):
+        rows = backend.execute_query("SELECT SalesDate FROM sales ORDER BY SalesID")
+        assert [row["SalesDate"] for row in rows] == ["2018-01-05", "2018-01-20", "2018-02-03", DATE_FALLBACK]
+
+    def test_invalid_date_rejected_without_fallback(self, data_dir):
+        backend = SQLiteBackend(data_dir=data_dir)
+        assert backend.load_stats()["sales"] == {"rows": 3, "rejected": 1, "invalid_values": 1}
+        assert [row["SalesID"] for row in backend.execute_query("SELECT SalesID FROM sales ORDER BY SalesID")] == [1, 2, 3]
+
+    def test_insert_and_find_sale(self, backend):
+        sale = Sale(None, 1, 2, 1, 4, 0.05, 40.0, datetime(2018, 3, 1), "TX5")
+        sales_id = sale.save()
+        found = Sale.find_by_id(sales_id)
+        assert found.total_price == sale.total_price
+        assert found.sales_date == "2018-03-01"
+
+    def test_employee_performance(self, backend):
+        results = AnalyticsService().get_sales_performance_by_employee()
+        assert [(r["employee_name"], r["total_sales"], r["revenue_rank"]) for r in results] == [
+            ("Pablo Diaz", 2, 1), ("Nicole Fuller", 2, 2)
+        ]
+
+    def test_employee_performance_date_range(self, backend):
+        results = AnalyticsService().get_sales_performance_by_employee(datetime(2018, 1, 1), datetime(2018, 1, 31))
+        assert [(r["EmployeeID"], r["total_sales"]) for r in results] == [(1, 2)]
+
+    def test_date_range_includes_start_day(self, backend):
+        rows = backend.execute_query("SELECT SalesID FROM sales WHERE SalesDate BETWEEN %s AND %s",
+                                     (datetime(2018, 1, 5), datetime(2018, 1, 20)))
+        assert [row["SalesID"] for row in rows] == [1, 2]
+
+    def test_geographic_analysis(self, backend):
+        results = AnalyticsService().get_geographic_sales_analysis()
+        assert [(r["CountryName"], r["CityName"], r["total_revenue"]) for r in results] == [
+            ("Argentina", "Rosario", 69.0), ("Chile", "Santiago", 28.5)
+        ]
+
+    def test_product_performance(self, backend):
+        results = AnalyticsService().get_product_performance_analysis()
+        assert results[0]["ProductName"] == "Cheese"
+        assert results[0]["avg_selling_price"] == 16.5
+
+    def test_customer_segmentation(self, backend):
+        results = AnalyticsService().get_customer_segmentation()
+        assert [(r["customer_name"], r["last_purchase_date"]) for r in results] == [
+            ("Ana Gomez", "2018-02-03"), ("Luis Perez", DATE_FALLBACK)
+        ]
+        assert results[0]["days_since_last_purchase"] > 0
+
+    def test_sales_trends(self, backend):
+        service = AnalyticsService()
+        monthly = service.get_sales_trends_by_period("monthly")
+        assert [(r["period"], r["total_sales"]) for r in monthly] == [("2018-01", 2), ("2018-02", 1), ("2018-03", 1)]
+        assert len(service.get_sales_trends_by_period("daily")) == 4
+
+    def test_discount_effectiveness(self, backend):
+        results = AnalyticsService().get_discount_effectiveness_analysis()
+        assert [(r["discount_range"], r["total_sales"]) for r in results] == [
+            ("No Discount", 2), ("6% - 10%", 1), ("16% - 20%", 1)
+        ]
+
+    def test_executive_dashboard(self, backend):
+        dashboard = AnalyticsService().generate_executive_dashboard()
+        assert dashboard["general_metrics"]["total_sales"] == 4
+        assert dashboard["top_products"][0]["ProductName"] == "Cheese"
+        assert len(dashboard["sales_by_country"]) == 2